@@ -0,0 +1,18 @@
+"""データベースのテーブルを作成するスクリプト
+
+使い方:
+    PYTHONPATH=src python scripts/db_init.py
+"""
+import asyncio
+
+from infrastructure.database.session import dispose_engine, init_db
+
+
+async def main() -> None:
+    """DATABASE_URLのデータベースにテーブルを作成する"""
+    await init_db()
+    await dispose_engine()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
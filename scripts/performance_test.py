@@ -0,0 +1,83 @@
+"""測定データ取り込み経路のベンチマークを実行し、結果をJSONに保存するスクリプト
+
+使い方:
+    python scripts/performance_test.py --sizes 10,1000,10000,100000 --invalid-ratio 0.05 \
+        --output benchmarks/results.json --baseline benchmarks/baseline.json
+
+DATABASE_URLを指定しない場合は一時ディレクトリのSQLiteを使う。
+--baselineを指定すると中央値を比較し、--thresholdを超えて遅くなったベンチマークを表示する
+（--fail-on-regression指定時は終了コード1）。
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the measurements ingestion benchmark suite")
+    parser.add_argument("--sizes", default="10,1000,10000,100000", help="comma separated rows per request")
+    parser.add_argument("--invalid-ratio", type=float, default=0.05, help="ratio of invalid rows (0-1)")
+    parser.add_argument("--rounds", type=int, default=5, help="maximum rounds per benchmark")
+    parser.add_argument("--only", default=None, help="comma separated benchmark names")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=ROOT / "benchmarks" / "results.json")
+    parser.add_argument("--baseline", type=Path, default=None, help="previous results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="median slowdown treated as regression")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+
+    # アプリケーションの設定が読み込まれる前にデータベースを決める
+    temp_dir = None
+    if "DATABASE_URL" not in os.environ:
+        temp_dir = tempfile.TemporaryDirectory(prefix="healthsync-bench-")
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{temp_dir.name}/bench.db"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    from infrastructure.database.session import dispose_engine, init_db
+    from tests.performance.benchmark import build_report, compare_reports, write_report
+    from tests.performance.suite import run_suite
+
+    async def setup() -> None:
+        await init_db()
+        await dispose_engine()
+
+    asyncio.run(setup())
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    only = args.only.split(",") if args.only else None
+    results = run_suite(sizes=sizes, invalid_ratio=args.invalid_ratio, rounds=args.rounds, only=only, seed=args.seed)
+    report = build_report(results, sizes=sizes, invalid_ratio=args.invalid_ratio, seed=args.seed)
+    write_report(report, args.output)
+
+    for entry in report["benchmarks"]:
+        ops = f"  {entry['ops_per_second']:>14,.0f} ops/s" if "ops_per_second" in entry else ""
+        print(f"{entry['key']:<70} median {entry['median'] * 1000:>10.2f} ms{ops}")
+    print(f"results written to {args.output}")
+
+    exit_code = 0
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        for comparison in compare_reports(baseline, report, args.threshold):
+            flag = "REGRESSION" if comparison["regression"] else ""
+            print(f"{comparison['key']:<70} x{comparison['ratio']:.2f} {flag}")
+            if comparison["regression"] and args.fail_on_regression:
+                exit_code = 1
+
+    if temp_dir is not None:
+        temp_dir.cleanup()
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,84 @@
+"""読み取りAPIのレスポンスキャッシュとETagによる条件付きリクエスト"""
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any, Optional
+
+import structlog
+from fastapi import Request, Response, status
+
+from core.metrics import RESPONSE_CACHE_REQUESTS
+from infrastructure.cache import CacheScope, ResponseCache
+
+logger = structlog.get_logger(__name__)
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Matchのいずれかのタグが一致するかどうか（弱い比較）"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+async def cached_json_response(
+    request: Request,
+    cache: Optional[ResponseCache],
+    endpoint: str,
+    scope: CacheScope,
+    params: Mapping[str, Any],
+    build: Callable[[], Awaitable[Response]],
+) -> Response:
+    """
+    キャッシュ済みのレスポンスを返し、なければ生成して保存する
+
+    ETagはデータを読まずにバージョンから求めるため、If-None-Matchが一致する場合は
+    データベースの参照・シリアライズ・キャッシュの参照をせずに304を返す。
+    キャッシュのバックエンドが失敗した場合はログに記録し、キャッシュを使わずに生成する。
+
+    Args:
+        request: リクエスト（If-None-Matchの参照用）
+        cache: レスポンスキャッシュ（Noneの場合は常にbuildを呼ぶ）
+        endpoint: エンドポイント名（メトリクスのラベル・キーの接頭辞）
+        scope: レスポンスが依存するデータの範囲
+        params: レスポンスを決めるリクエストの条件
+        build: レスポンスを生成する関数（200以外のレスポンスは保存しない）
+
+    Returns:
+        レスポンス（200、304、またはbuildが返したレスポンス）
+    """
+    if cache is None:
+        return await build()
+
+    try:
+        tag = await cache.tag(endpoint, scope, params)
+    except Exception:
+        logger.exception("Response cache tag lookup failed", endpoint=endpoint)
+        RESPONSE_CACHE_REQUESTS.inc(labels=(endpoint, "error"))
+        return await build()
+    headers = {"ETag": f'"{tag}"', "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        RESPONSE_CACHE_REQUESTS.inc(labels=(endpoint, "not_modified"))
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    try:
+        body = await cache.get(endpoint, tag)
+    except Exception:
+        logger.exception("Response cache read failed", endpoint=endpoint)
+        body = None
+    if body is not None:
+        RESPONSE_CACHE_REQUESTS.inc(labels=(endpoint, "hit"))
+        return Response(content=body, media_type=JSON_MEDIA_TYPE, headers=headers)
+
+    RESPONSE_CACHE_REQUESTS.inc(labels=(endpoint, "miss"))
+    response = await build()
+    if response.status_code == status.HTTP_200_OK:
+        try:
+            await cache.set(endpoint, tag, bytes(response.body))
+        except Exception:
+            logger.exception("Response cache write failed", endpoint=endpoint)
+        response.headers.update(headers)
+    return response
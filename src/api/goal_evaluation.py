@@ -0,0 +1,192 @@
+"""取り込んだ測定データによるゴールの評価
+
+保存したバッチの行をゴール・期間ごとの合計と件数にまとめて進捗に加算し、
+新たに目標に達した期間の達成イベントを通知する。進捗は期間ごとの累積値のみを保持するため、
+評価の計算量はバッチの行数に比例し、過去の測定を読み直さない。
+
+進捗の加算と達成イベントのアウトボックスへの保存は測定データを保存するトランザクション内で行い、
+イベントの通知はコミットの後に行う。通知に失敗したイベントはアウトボックスに残り、
+GoalEventRelayが再度通知する。
+"""
+import asyncio
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+from typing import Optional
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from core.metrics import GOALS_ACHIEVED
+from domain.entities.goal import GoalAchievedEvent
+from domain.entities.measurement_batch import MeasurementBatch
+from infrastructure.database.goal_repository import GoalRepository
+from infrastructure.database.measurement_repository import StoredBatchHook
+from infrastructure.events import GoalEventPublisher
+
+logger = structlog.get_logger(__name__)
+
+
+class GoalEvaluator:
+    """保存したバッチでユーザーのゴールを評価する"""
+
+    def __init__(self, repository: GoalRepository, publisher: GoalEventPublisher) -> None:
+        """
+        Args:
+            repository: ゴールリポジトリ
+            publisher: 達成イベントの通知先
+        """
+        self._repository = repository
+        self._publisher = publisher
+
+    async def record(
+        self, conn: AsyncConnection, batch: MeasurementBatch, now: Optional[datetime] = None
+    ) -> list[GoalAchievedEvent]:
+        """
+        測定データを保存するトランザクション内で、バッチの行を進捗に加算する
+
+        期間の達成は未達成の進捗を条件付きで更新して記録するため、同じ期間の
+        イベントは同時に取り込みが行われても1回だけアウトボックスに保存する。
+        記録に失敗した場合は例外をそのまま送出し、測定データの保存とともにロールバックさせる。
+
+        Args:
+            conn: 測定データを保存するトランザクションの接続
+            batch: 保存した測定データのバッチ
+            now: 達成日時（省略時は現在時刻）
+
+        Returns:
+            新たに達成した期間のイベント（コミットした後にpublishで通知する）
+        """
+        if not len(batch):
+            return []
+        return await self._repository.record_progress(conn, batch, now or datetime.now(UTC))
+
+    def recorder(self, events: list[GoalAchievedEvent]) -> StoredBatchHook:
+        """
+        MeasurementRepositoryの登録に渡す、登録した行をrecordで記録するフックを返す
+
+        Args:
+            events: 記録したイベントを追加するリスト（コミットした後にpublishに渡す）
+        """
+
+        async def record(conn: AsyncConnection, batch: MeasurementBatch) -> None:
+            events.extend(await self.record(conn, batch))
+
+        return record
+
+    async def publish(self, events: Sequence[GoalAchievedEvent]) -> bool:
+        """
+        コミットした達成イベントを通知し、アウトボックスから削除する
+
+        通知の失敗は取り込みの結果に影響させず、ログに記録する。
+
+        Args:
+            events: recordで記録したイベント
+
+        Returns:
+            通知したかどうか（失敗したイベントはアウトボックスに残る）
+        """
+        for event in events:
+            GOALS_ACHIEVED.inc(labels=(event.period,))
+        return await self._deliver(events)
+
+    async def publish_pending(self, achieved_before: datetime, limit: int = 100) -> int:
+        """
+        アウトボックスに残っている達成イベントを通知する
+
+        Args:
+            achieved_before: 通知するイベントの達成日時の上限（含まない）
+            limit: 1回に通知する最大件数
+
+        Returns:
+            通知したイベント数
+        """
+        events = await self._repository.list_pending_events(achieved_before, limit)
+        if not events or not await self._deliver(events):
+            return 0
+        return len(events)
+
+    async def _deliver(self, events: Sequence[GoalAchievedEvent]) -> bool:
+        if not events:
+            return True
+        try:
+            await self._publisher.publish(events)
+            await self._repository.delete_events(events)
+        except Exception:
+            logger.exception("Goal event publishing failed", event_count=len(events))
+            return False
+        return True
+
+
+class GoalEventRelay:
+    """アウトボックスに残った達成イベントを定期的に通知する
+
+    取り込みの直後の通知に失敗したイベントや、通知する前にプロセスが停止したイベントを
+    通知する。取り込みの直後に通知中のイベントと重ならないよう、達成してから
+    grace_seconds以上経過したイベントのみを対象とする（重複して通知した場合は
+    イベントのevent_idで重複を除ける）。
+    """
+
+    def __init__(
+        self,
+        evaluator: GoalEvaluator,
+        interval_seconds: float = 30.0,
+        grace_seconds: float = 60.0,
+        batch_size: int = 100,
+    ) -> None:
+        """
+        Args:
+            evaluator: イベントを通知するゴールの評価
+            interval_seconds: アウトボックスを確認する間隔（秒）
+            grace_seconds: 通知の対象とする、達成してからの経過秒数
+            batch_size: 1回に通知する最大件数
+        """
+        self._evaluator = evaluator
+        self._interval_seconds = interval_seconds
+        self._grace_seconds = grace_seconds
+        self._batch_size = batch_size
+        self._stopping = False
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def start(self) -> None:
+        """バックグラウンドで通知を開始する"""
+        self._stopping = False
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """通知を止める（未通知のイベントはアウトボックスに残り、次の起動で通知する）"""
+        self._stopping = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self) -> None:
+        """停止を要求されるまで一定間隔でアウトボックスのイベントを通知する"""
+        while not self._stopping:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Goal event relay failed")
+            await asyncio.sleep(self._interval_seconds)
+
+    async def run_once(self, now: Optional[datetime] = None) -> int:
+        """
+        達成してからgrace_seconds以上経過した未通知のイベントをbatch_size件ずつすべて通知する
+
+        Args:
+            now: 現在時刻（省略時は現在時刻）
+
+        Returns:
+            通知したイベント数
+        """
+        achieved_before = (now or datetime.now(UTC)) - timedelta(seconds=self._grace_seconds)
+        published = 0
+        while True:
+            count = await self._evaluator.publish_pending(achieved_before, self._batch_size)
+            published += count
+            # 残りがない、または通知に失敗した場合は次の確認まで待つ
+            if count < self._batch_size:
+                return published
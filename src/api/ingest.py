@@ -0,0 +1,386 @@
+"""測定データの取り込み処理
+
+一括登録（JSON・列指向バイナリ）・ストリーム登録のエンドポイントと非同期登録のワーカーで共有する。
+"""
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from operator import itemgetter
+from typing import Any, Optional
+
+import numpy as np
+import structlog
+from pydantic import ValidationError
+
+from api.goal_evaluation import GoalEvaluator
+from core.metrics import (
+    BULK_DUPLICATE_ROWS,
+    BULK_FAILED_RATIO,
+    BULK_PERSISTENCE_DURATION,
+    BULK_ROWS,
+    BULK_VALIDATION_DURATION,
+)
+from core.profiling import profile_stage
+from core.timestamps import from_epoch_milliseconds
+from domain.entities.goal import GoalAchievedEvent
+from domain.entities.measurement import MetricType
+from domain.entities.measurement_batch import MeasurementBatch
+from domain.services.measurement_validation import (
+    ensure_utc,
+    validate_measurement_columns,
+)
+from infrastructure.archive import MeasurementArchiver
+from infrastructure.cache import ResponseCache
+from infrastructure.database.measurement_repository import MeasurementRepository
+from schemas.requests.measurement import (
+    MAX_DEVICE_ID_LENGTH,
+    MeasurementCreateRequest,
+    MeasurementCreateRequestList,
+)
+from schemas.requests.measurement_columnar import (
+    MAX_EPOCH_MS,
+    MIN_EPOCH_MS,
+    NO_DEVICE,
+    ColumnarMeasurements,
+)
+
+logger = structlog.get_logger(__name__)
+
+_METRIC_TYPE_VALUES = frozenset(metric.value for metric in MetricType)
+
+
+def parse_measurement_requests(
+    raw_rows: list[Any],
+    indexes: Optional[Sequence[int]] = None,
+) -> tuple[list[tuple[int, MeasurementCreateRequest]], list[dict[str, Any]]]:
+    """生データ配列を一括でスキーマ検証する
+
+    配列全体を1回のTypeAdapter呼び出しで検証し、失敗した行のエラーを
+    単行検証時と同じ形式（index/message/field）で収集する。
+
+    Args:
+        raw_rows: リクエストボディの測定データ配列
+        indexes: 各行のリクエスト全体でのインデックス（省略時は位置）
+
+    Returns:
+        (元のインデックス, 検証済みリクエスト)のリストとエラー詳細のリスト
+    """
+    if indexes is None:
+        indexes = range(len(raw_rows))
+    try:
+        parsed = MeasurementCreateRequestList.validate_python(raw_rows)
+        return list(zip(indexes, parsed, strict=True)), []
+    except ValidationError as e:
+        errors = []
+        failed_positions = set()
+        for error in e.errors():
+            position, *field_loc = error["loc"]
+            failed_positions.add(position)
+            errors.append({
+                "index": indexes[position],
+                "message": error["msg"],
+                "field": ".".join(str(loc) for loc in field_loc) if field_loc else None
+            })
+
+    # スキーマ検証に通った行のみを再検証してモデルを得る
+    valid_positions = [i for i in range(len(raw_rows)) if i not in failed_positions]
+    parsed = MeasurementCreateRequestList.validate_python(
+        [raw_rows[i] for i in valid_positions]
+    )
+    return [
+        (indexes[position], request)
+        for position, request in zip(valid_positions, parsed, strict=True)
+    ], errors
+
+
+@dataclass
+class IngestResult:
+    """バリデーション・保存の結果"""
+
+    batch: MeasurementBatch
+    errors: list[dict[str, Any]]
+    duplicate_count: int = 0
+    validation_seconds: float = 0.0
+    persistence_seconds: float = 0.0
+
+
+def record_bulk_metrics(
+    endpoint: str,
+    total_count: int,
+    success_count: int,
+    validation_seconds: float,
+    persistence_seconds: float,
+    duplicate_count: int = 0,
+) -> None:
+    """一括登録リクエストの行数・処理時間・失敗率・重複行数を記録する"""
+    labels = (endpoint,)
+    BULK_ROWS.observe(total_count, labels)
+    BULK_VALIDATION_DURATION.observe(validation_seconds, labels)
+    BULK_PERSISTENCE_DURATION.observe(persistence_seconds, labels)
+    if duplicate_count:
+        BULK_DUPLICATE_ROWS.inc(duplicate_count, labels)
+    if total_count:
+        failed_count = total_count - success_count - duplicate_count
+        BULK_FAILED_RATIO.observe(failed_count / total_count, labels)
+
+
+def validate_measurements(
+    raw_rows: list[Any],
+    user_id: str,
+    indexes: Optional[Sequence[int]] = None,
+    created_at: Optional[datetime] = None,
+) -> tuple[MeasurementBatch, list[dict[str, Any]]]:
+    """生データをスキーマ・ドメインルールでバリデーションし、有効な行をバッチに変換する
+
+    Args:
+        raw_rows: 測定データの生データ
+        user_id: 認証済みユーザーID
+        indexes: 各行のリクエスト全体でのインデックス（省略時は位置）
+        created_at: 登録日時（省略時は現在時刻）
+
+    Returns:
+        有効な行のバッチとエラー詳細（インデックス順）
+    """
+    # まずスキーマを配列全体で一括バリデーション
+    with profile_stage("schema_validation"):
+        parsed_requests, errors = parse_measurement_requests(raw_rows, indexes)
+
+    # 次にドメインルールを列単位で一括バリデーション
+    with profile_stage("domain_validation"):
+        requests = [request for _, request in parsed_requests]
+        measured_at = [ensure_utc(request.measured_at) for request in requests]
+        validation = validate_measurement_columns(
+            metric_types=[request.metric_type for request in requests],
+            values=[request.value for request in requests],
+            units=[request.unit for request in requests],
+            measured_at=measured_at,
+            indexes=[index for index, _ in parsed_requests],
+        )
+        if validation.errors:
+            errors.extend(validation.errors)
+            # 行ごとの処理と同じくインデックス順に並べる（同一行内の順序は保持）
+            errors.sort(key=itemgetter("index"))
+
+    # 成功した行を列指向のバッチに変換（以降はリクエストモデルを参照しない）
+    with profile_stage("row_construction"):
+        valid_positions = validation.valid_mask.nonzero()[0].tolist()
+        valid_requests = [requests[position] for position in valid_positions]
+        batch = MeasurementBatch.from_columns(
+            user_id=user_id,
+            created_at=created_at or datetime.now(UTC),
+            metric_types=[request.metric_type for request in valid_requests],
+            values=[request.value for request in valid_requests],
+            units=[request.unit for request in valid_requests],
+            measured_at=[measured_at[position] for position in valid_positions],
+            device_ids=[request.device_id for request in valid_requests],
+            metadata=[request.metadata for request in valid_requests],
+            notes=[request.notes for request in valid_requests],
+        )
+    return batch, errors
+
+
+def validate_columnar_measurements(
+    columns: ColumnarMeasurements,
+    user_id: str,
+    created_at: Optional[datetime] = None,
+) -> tuple[MeasurementBatch, list[dict[str, Any]]]:
+    """列指向の測定データをJSONの行と同じルールでバリデーションし、有効な行をバッチに変換する
+
+    未知のメトリックタイプ・datetimeで表せない測定日時・長すぎるデバイスID・metadata/notesの型の誤りなど、
+    スキーマ検証で失敗しうる行のみをJSONと同じ形式の行に戻してスキーマ検証し、
+    エラー詳細をJSONの一括登録と一致させる。それ以外の行は列のままドメインルールを適用する。
+
+    Args:
+        columns: デコードした列指向の測定データ
+        user_id: 認証済みユーザーID
+        created_at: 登録日時（省略時は現在時刻）
+
+    Returns:
+        有効な行のバッチとエラー詳細（インデックス順）
+    """
+    with profile_stage("schema_validation"):
+        known_metric = np.array(
+            [metric in _METRIC_TYPE_VALUES for metric in columns.metric_types], dtype=np.bool_
+        )
+        suspect = ~known_metric[columns.metric_codes] | (columns.measured_at_ms < MIN_EPOCH_MS) | (
+            columns.measured_at_ms > MAX_EPOCH_MS
+        )
+        long_devices = [
+            code for code, device_id in enumerate(columns.device_ids)
+            if len(device_id) > MAX_DEVICE_ID_LENGTH
+        ]
+        if long_devices:
+            suspect |= np.isin(columns.device_codes, long_devices)
+        for position, extra in columns.extras.items():
+            metadata = extra.get("metadata")
+            notes = extra.get("notes")
+            if not (metadata is None or isinstance(metadata, dict)) or not (
+                notes is None or isinstance(notes, str)
+            ):
+                suspect[position] = True
+        suspect_positions = suspect.nonzero()[0].tolist()
+        parsed_requests, errors = parse_measurement_requests(
+            columns.to_rows(suspect_positions), suspect_positions
+        )
+
+        # スキーマ検証に通った行を列から取り出す（検証し直した行はリクエストの値を使う）
+        reparsed = dict(parsed_requests)
+        positions = sorted([*(~suspect).nonzero()[0].tolist(), *reparsed])
+        metric_table = np.asarray(columns.metric_types, dtype=object)
+        unit_table = np.asarray(columns.units, dtype=object)
+        device_table = np.asarray([*columns.device_ids, None], dtype=object)
+        device_codes = columns.device_codes[positions].astype(np.int64)
+        device_codes[device_codes == NO_DEVICE] = len(columns.device_ids)
+        metric_types = metric_table[columns.metric_codes[positions]].tolist()
+        values = columns.values[positions].tolist()
+        units = unit_table[columns.unit_codes[positions]].tolist()
+        measured_at = [
+            from_epoch_milliseconds(milliseconds)
+            for milliseconds in columns.measured_at_ms[positions].tolist()
+        ]
+        device_ids = device_table[device_codes].tolist()
+        extras = [columns.extras.get(position, {}) for position in positions]
+        metadata = [extra.get("metadata") for extra in extras]
+        notes = [extra.get("notes") for extra in extras]
+        for slot, position in enumerate(positions):
+            request = reparsed.get(position)
+            if request is not None:
+                metric_types[slot] = request.metric_type
+                values[slot] = request.value
+                units[slot] = request.unit
+                measured_at[slot] = ensure_utc(request.measured_at)
+                device_ids[slot] = request.device_id
+                metadata[slot] = request.metadata
+                notes[slot] = request.notes
+
+    with profile_stage("domain_validation"):
+        validation = validate_measurement_columns(
+            metric_types=metric_types,
+            values=values,
+            units=units,
+            measured_at=measured_at,
+            indexes=positions,
+        )
+        if validation.errors:
+            errors.extend(validation.errors)
+            errors.sort(key=itemgetter("index"))
+
+    with profile_stage("row_construction"):
+        valid_slots = validation.valid_mask.nonzero()[0].tolist()
+        batch = MeasurementBatch.from_columns(
+            user_id=user_id,
+            created_at=created_at or datetime.now(UTC),
+            metric_types=[metric_types[slot] for slot in valid_slots],
+            values=[values[slot] for slot in valid_slots],
+            units=[units[slot] for slot in valid_slots],
+            measured_at=[measured_at[slot] for slot in valid_slots],
+            device_ids=[device_ids[slot] for slot in valid_slots],
+            metadata=[metadata[slot] for slot in valid_slots],
+            notes=[notes[slot] for slot in valid_slots],
+        )
+    return batch, errors
+
+
+async def _store_batch(
+    batch: MeasurementBatch,
+    errors: list[dict[str, Any]],
+    validation_started: float,
+    repository: MeasurementRepository,
+    cache: Optional[ResponseCache],
+    archiver: Optional[MeasurementArchiver],
+    goal_evaluator: Optional[GoalEvaluator],
+) -> IngestResult:
+    """バリデーション済みのバッチを一括保存し、取り込み結果を返す"""
+    # 有効な行とゴールの進捗を1トランザクションで一括保存
+    persistence_started = time.perf_counter()
+    achieved: list[GoalAchievedEvent] = []
+    with profile_stage("persistence"):
+        stored = await repository.bulk_insert(
+            batch, on_stored=goal_evaluator.recorder(achieved) if goal_evaluator else None
+        )
+        # 保存はコミット済みのため、以降の処理の失敗はログに記録して取り込みの結果を返す
+        # （エラーを返すとクライアントの再送で保存済みの行がすべて重複となる）
+        if cache is not None and len(stored):
+            try:
+                await cache.invalidate_batch(stored)
+            except Exception:
+                logger.exception("Response cache invalidation failed after ingest write")
+    if archiver is not None:
+        try:
+            archiver.add(stored)
+        except Exception:
+            logger.exception("Archiving stored measurements failed")
+    if goal_evaluator is not None:
+        # 達成イベントはコミットした後に通知する
+        with profile_stage("goal_evaluation"):
+            await goal_evaluator.publish(achieved)
+    finished = time.perf_counter()
+    return IngestResult(
+        batch=stored,
+        errors=errors,
+        duplicate_count=len(batch) - len(stored),
+        validation_seconds=persistence_started - validation_started,
+        persistence_seconds=finished - persistence_started,
+    )
+
+
+async def ingest_rows(
+    raw_rows: list[Any],
+    user_id: str,
+    repository: MeasurementRepository,
+    indexes: Optional[Sequence[int]] = None,
+    cache: Optional[ResponseCache] = None,
+    archiver: Optional[MeasurementArchiver] = None,
+    goal_evaluator: Optional[GoalEvaluator] = None,
+) -> IngestResult:
+    """生データをバリデーションし、有効な行を一括保存する
+
+    Args:
+        raw_rows: 測定データの生データ
+        user_id: 認証済みユーザーID
+        repository: 測定データリポジトリ
+        indexes: 各行のリクエスト全体でのインデックス（省略時は位置）
+        cache: 保存した行に依存するレスポンスを無効化するレスポンスキャッシュ
+        archiver: 保存した行を渡す生データアーカイバー（書き出しはバックグラウンドで行う）
+        goal_evaluator: 保存した行でユーザーのゴールを評価するエバリュエーター
+
+    Returns:
+        保存したバッチ（登録済みの測定と重複した行を除く）とエラー詳細（インデックス順）、
+        重複行数、各段階の処理時間
+    """
+    validation_started = time.perf_counter()
+    batch, errors = validate_measurements(raw_rows, user_id, indexes)
+    return await _store_batch(
+        batch, errors, validation_started, repository, cache, archiver, goal_evaluator
+    )
+
+
+async def ingest_columnar(
+    columns: ColumnarMeasurements,
+    user_id: str,
+    repository: MeasurementRepository,
+    cache: Optional[ResponseCache] = None,
+    archiver: Optional[MeasurementArchiver] = None,
+    goal_evaluator: Optional[GoalEvaluator] = None,
+) -> IngestResult:
+    """列指向の測定データをバリデーションし、有効な行を一括保存する
+
+    Args:
+        columns: デコードした列指向の測定データ
+        user_id: 認証済みユーザーID
+        repository: 測定データリポジトリ
+        cache: 保存した行に依存するレスポンスを無効化するレスポンスキャッシュ
+        archiver: 保存した行を渡す生データアーカイバー
+        goal_evaluator: 保存した行でユーザーのゴールを評価するエバリュエーター
+
+    Returns:
+        ingest_rowsと同じ取り込み結果
+    """
+    validation_started = time.perf_counter()
+    batch, errors = validate_columnar_measurements(columns, user_id)
+    return await _store_batch(
+        batch, errors, validation_started, repository, cache, archiver, goal_evaluator
+    )
+
+
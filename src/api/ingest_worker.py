@@ -0,0 +1,221 @@
+"""非同期一括登録のワーカー
+
+キューに溜まったジョブをまとめて取り出し、ジョブごとにバリデーションしたうえで
+ユーザーごとに1つのバッチに連結し、1トランザクションで保存する。小さなリクエストが
+多数届いても、データベースへの書き込みは少数の大きなINSERTになる。
+"""
+import asyncio
+import time
+from datetime import UTC, datetime
+from operator import itemgetter
+from typing import Optional
+
+import structlog
+
+from api.goal_evaluation import GoalEvaluator
+from api.ingest import record_bulk_metrics, validate_measurements
+from core.metrics import INGEST_WRITE_ROWS
+from domain.entities.goal import GoalAchievedEvent
+from domain.entities.measurement_batch import MeasurementBatch
+from infrastructure.archive import MeasurementArchiver
+from infrastructure.cache import ResponseCache
+from infrastructure.database.measurement_repository import MeasurementRepository
+from infrastructure.queue import IngestJob, IngestJobState, IngestJobStatus, IngestQueue
+
+logger = structlog.get_logger(__name__)
+
+
+class IngestWorker:
+    """非同期一括登録のジョブを処理するワーカー"""
+
+    def __init__(
+        self,
+        queue: IngestQueue,
+        repository: MeasurementRepository,
+        cache: Optional[ResponseCache] = None,
+        batch_rows: int = 5000,
+        poll_timeout_seconds: float = 1.0,
+        archiver: Optional[MeasurementArchiver] = None,
+        goal_evaluator: Optional[GoalEvaluator] = None,
+    ) -> None:
+        """
+        Args:
+            queue: 非同期登録キュー
+            repository: 測定データリポジトリ
+            cache: 保存した行に依存するレスポンスを無効化するレスポンスキャッシュ
+            batch_rows: 1回の書き込みにまとめる最大行数
+            poll_timeout_seconds: ジョブを待つ最大秒数（停止要求はこの間隔で確認する）
+            archiver: 保存した行を渡す生データアーカイバー
+            goal_evaluator: 保存した行でユーザーのゴールを評価するエバリュエーター
+        """
+        self._queue = queue
+        self._repository = repository
+        self._cache = cache
+        self._batch_rows = batch_rows
+        self._poll_timeout_seconds = poll_timeout_seconds
+        self._archiver = archiver
+        self._goal_evaluator = goal_evaluator
+        self._stopping = False
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def start(self) -> None:
+        """バックグラウンドでジョブの処理を開始する"""
+        self._stopping = False
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """待機中のジョブを処理し終えてから停止する"""
+        self._stopping = True
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def run(self) -> None:
+        """停止を要求され、待機中のジョブがなくなるまでジョブを処理する"""
+        while True:
+            processed = await self.run_once(self._poll_timeout_seconds)
+            if not processed and self._stopping:
+                return
+
+    async def run_once(self, timeout_seconds: float = 0.0) -> int:
+        """
+        待機中のジョブをまとめて取り出して処理する
+
+        Args:
+            timeout_seconds: ジョブがない場合に待つ最大秒数
+
+        Returns:
+            処理したジョブ数
+        """
+        jobs = await self._queue.get_batch(self._batch_rows, timeout_seconds)
+        if not jobs:
+            return 0
+        try:
+            await self._process(jobs)
+        except Exception:
+            logger.exception("Coalesced ingest write failed", job_count=len(jobs))
+            if len(jobs) == 1:
+                await self._fail(jobs[0])
+            else:
+                # 原因のジョブ以外は保存できるよう、1件ずつ処理し直す
+                for job in jobs:
+                    try:
+                        await self._process([job])
+                    except Exception:
+                        logger.exception("Ingest job failed", batch_id=job.batch_id)
+                        await self._fail(job)
+        return len(jobs)
+
+    async def _process(self, jobs: list[IngestJob]) -> None:
+        """ジョブをバリデーションし、ユーザーごとに連結して1トランザクションで保存する"""
+        created_at = datetime.now(UTC)
+        validated: list[tuple[IngestJob, MeasurementBatch, list[dict], float]] = []
+        for job in jobs:
+            started = time.perf_counter()
+            batch, errors = validate_measurements(job.rows, job.user_id, job.indexes, created_at)
+            validated.append((job, batch, errors, time.perf_counter() - started))
+
+        batches_by_user: dict[str, list[MeasurementBatch]] = {}
+        for _, batch, _, _ in validated:
+            if len(batch):
+                batches_by_user.setdefault(batch.user_id, []).append(batch)
+        merged = [MeasurementBatch.concat(batches) for batches in batches_by_user.values()]
+
+        persistence_started = time.perf_counter()
+        # ゴールの進捗は測定データと同じトランザクションで加算する
+        achieved: list[GoalAchievedEvent] = []
+        stored_batches = await self._repository.bulk_insert_many(
+            merged,
+            on_stored=self._goal_evaluator.recorder(achieved) if self._goal_evaluator else None,
+        )
+        await self._after_commit(stored_batches, achieved)
+        persistence_seconds = time.perf_counter() - persistence_started
+        write_rows = sum(len(batch) for batch in merged)
+        if write_rows:
+            INGEST_WRITE_ROWS.observe(write_rows)
+        stored_ids = {row_id for stored in stored_batches for row_id in stored.ids}
+
+        for job, batch, errors, validation_seconds in validated:
+            ids = [row_id for row_id in batch.ids if row_id in stored_ids]
+            state = IngestJobState(
+                batch_id=job.batch_id,
+                user_id=job.user_id,
+                status=IngestJobStatus.COMPLETED,
+                total_count=job.total_count,
+                success_count=len(ids),
+                duplicate_count=len(batch) - len(ids),
+                ids=ids,
+                errors=sorted(job.errors + errors, key=itemgetter("index")),
+            )
+            await self._complete(state)
+            record_bulk_metrics(
+                "bulk_async",
+                total_count=job.total_count,
+                success_count=state.success_count,
+                validation_seconds=validation_seconds,
+                persistence_seconds=persistence_seconds,
+                duplicate_count=state.duplicate_count,
+            )
+        logger.info(
+            "Ingest jobs processed",
+            job_count=len(jobs),
+            user_count=len(merged),
+            write_rows=write_rows,
+            stored_rows=len(stored_ids)
+        )
+
+    async def _after_commit(
+        self, stored_batches: list[MeasurementBatch], achieved: list[GoalAchievedEvent]
+    ) -> None:
+        """
+        コミットした行に依存する処理（キャッシュの無効化・アーカイブ・達成イベントの通知）を行う
+
+        書き込みは完了しているため、失敗してもジョブを処理し直さずにログに記録する
+        （処理し直すと保存済みの行が重複として扱われ、ジョブの結果から欠ける）。
+
+        Args:
+            stored_batches: ユーザーごとの登録した行のバッチ
+            achieved: 書き込みと同じトランザクションで記録した達成イベント
+        """
+        if self._cache is not None:
+            try:
+                for stored in stored_batches:
+                    if len(stored):
+                        await self._cache.invalidate_batch(stored)
+            except Exception:
+                logger.exception("Response cache invalidation failed after ingest write")
+        if self._archiver is not None:
+            try:
+                for stored in stored_batches:
+                    self._archiver.add(stored)
+            except Exception:
+                logger.exception("Archiving stored measurements failed")
+        if self._goal_evaluator is not None:
+            try:
+                await self._goal_evaluator.publish(achieved)
+            except Exception:
+                # イベントはアウトボックスに残り、GoalEventRelayが通知する
+                logger.exception("Goal event publishing failed after ingest write")
+
+    async def _complete(self, state: IngestJobState) -> None:
+        """
+        保存したジョブの結果をキューに記録する
+
+        書き込みは完了しているため、失敗してもジョブを処理し直さずにログに記録する
+        （ジョブは処理中のまま残り、キューのタイムアウト後に再処理される）。
+        """
+        try:
+            await self._queue.complete(state)
+        except Exception:
+            logger.exception("Recording ingest job result failed", batch_id=state.batch_id)
+
+    async def _fail(self, job: IngestJob) -> None:
+        """保存できなかったジョブを失敗として記録する"""
+        await self._queue.complete(IngestJobState(
+            batch_id=job.batch_id,
+            user_id=job.user_id,
+            status=IngestJobStatus.FAILED,
+            total_count=job.total_count,
+            errors=list(job.errors),
+            message="Failed to store measurements",
+        ))
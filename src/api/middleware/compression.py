@@ -0,0 +1,457 @@
+"""リクエストボディの展開とレスポンスの圧縮を行うASGIミドルウェア
+
+- RequestDecompressionMiddleware: Content-Encoding（gzip・zstd）付きのリクエストボディを
+  ストリームで展開し、展開後のボディをアプリケーションに渡す
+- ResponseCompressionMiddleware: Accept-Encodingに応じて一定サイズ以上のレスポンスを
+  圧縮する
+
+zstdにはzstandardパッケージが必要（ない場合はgzipのみ扱う）。
+"""
+import zlib
+from collections.abc import Callable
+from typing import Optional, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandardは任意の依存
+    zstandard = None
+
+# zstdは入力1バイトあたり最大約32KBに展開されるため、入力を小分けにして展開し、
+# 1回の展開で確保するメモリを（上限の確認前でも）約16MBに抑える
+_ZSTD_INPUT_SLICE = 512
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+# 不正な圧縮データの展開で送出される例外
+_DECODE_ERRORS: tuple[type[Exception], ...] = (
+    (zlib.error, zstandard.ZstdError) if zstandard is not None else (zlib.error,)
+)
+
+
+class _Decoder(Protocol):
+    """zlib.decompressobjと同じインターフェースの展開器"""
+
+    @property
+    def unconsumed_tail(self) -> bytes: ...
+
+    @property
+    def unused_data(self) -> bytes: ...
+
+    @property
+    def eof(self) -> bool: ...
+
+    def decompress(self, data: bytes, max_length: int = 0) -> bytes: ...
+
+
+class _ZstdDecoder:
+    """zstandardの展開器をmax_length・unconsumed_tail付きで扱うラッパー"""
+
+    def __init__(self) -> None:
+        self._obj = zstandard.ZstdDecompressor().decompressobj()
+        self.unconsumed_tail = b""
+        self.unused_data = b""
+
+    @property
+    def eof(self) -> bool:
+        return self._obj.eof
+
+    def decompress(self, data: bytes, max_length: int = 0) -> bytes:
+        output = []
+        size = 0
+        position = 0
+        while (
+            position < len(data)
+            and not self._obj.eof
+            and (not max_length or size < max_length)
+        ):
+            piece = self._obj.decompress(data[position:position + _ZSTD_INPUT_SLICE])
+            position += _ZSTD_INPUT_SLICE
+            output.append(piece)
+            size += len(piece)
+        if self._obj.eof:
+            # フレームの終端を越えた入力は次のフレームとして扱う
+            self.unused_data = self._obj.unused_data + data[position:]
+            self.unconsumed_tail = b""
+        else:
+            self.unconsumed_tail = data[position:]
+            self.unused_data = b""
+        return b"".join(output)
+
+
+def _gzip_decoder() -> _Decoder:
+    return zlib.decompressobj(_GZIP_WBITS)
+
+
+def _decoders() -> dict[str, Callable[[], _Decoder]]:
+    """Content-Encodingごとの展開器の生成関数"""
+    decoders: dict[str, Callable[[], _Decoder]] = {
+        "gzip": _gzip_decoder,
+        "x-gzip": _gzip_decoder,
+    }
+    if zstandard is not None:
+        decoders["zstd"] = _ZstdDecoder
+    return decoders
+
+
+class _DecompressingReceiver:
+    """1リクエスト分のボディを受信したチャンクごとに展開してアプリケーションに渡すreceive"""
+
+    def __init__(
+        self,
+        receive: Receive,
+        new_decoder: Callable[[], _Decoder],
+        encoding: str,
+        chunk_size: int,
+        max_decompressed_bytes: int,
+    ) -> None:
+        self._receive = receive
+        self._new_decoder = new_decoder
+        self._encoding = encoding
+        self._chunk_size = chunk_size
+        self._max_decompressed_bytes = max_decompressed_bytes
+        self._decoder = new_decoder()
+        self._pending = b""
+        self._finished = False
+        self._total = 0
+
+    async def __call__(self) -> Message:
+        while True:
+            if self._pending:
+                body = self._decompress_pending()
+                if body:
+                    return {"type": "http.request", "body": body, "more_body": True}
+                continue
+            if self._finished:
+                if not self._decoder.eof:
+                    raise HTTPException(400, f"Truncated {self._encoding} request body")
+                return {"type": "http.request", "body": b"", "more_body": False}
+            message = await self._receive()
+            if message["type"] != "http.request":
+                return message
+            self._pending = message.get("body", b"")
+            self._finished = not message.get("more_body", False)
+            if (
+                self._finished
+                and not self._pending
+                and self._total == 0
+                and not self._decoder.eof
+            ):
+                # 空のボディはそのまま空として扱う
+                return {"type": "http.request", "body": b"", "more_body": False}
+
+    def _decompress_pending(self) -> bytes:
+        """未展開の入力からchunk_sizeを目安に展開する（展開後のサイズの上限を確認する）"""
+        if self._decoder.eof:
+            # 連結された次のgzipメンバー・zstdフレーム
+            self._decoder = self._new_decoder()
+        try:
+            body = self._decoder.decompress(self._pending, self._chunk_size)
+        except _DECODE_ERRORS as e:
+            raise HTTPException(400, f"Invalid {self._encoding} request body") from e
+        self._pending = self._decoder.unconsumed_tail or self._decoder.unused_data
+        self._total += len(body)
+        limit = self._max_decompressed_bytes
+        if self._total > limit:
+            raise HTTPException(413, f"Decompressed request body exceeds {limit} bytes")
+        return body
+
+
+class RequestDecompressionMiddleware:
+    """Content-Encoding付きのリクエストボディをストリームで展開する
+
+    ボディ全体をメモリに読み込まずに、受信したチャンクごとにchunk_size単位で展開して
+    アプリケーションに渡す（NDJSONのストリーム登録もそのまま展開しながら読める）。
+    展開後のサイズがmax_decompressed_bytesを超えた時点で413とし、圧縮率の極端に高い
+    ボディ（zip bomb）で展開後のデータをメモリに展開しきることを防ぐ。
+    展開後の長さは事前にわからないため、Content-EncodingとContent-Lengthは取り除く。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_decompressed_bytes: int = 64 * 1024 * 1024,
+        chunk_size: int = 64 * 1024,
+    ) -> None:
+        """
+        Args:
+            app: ASGIアプリケーション
+            max_decompressed_bytes: 展開後のボディの最大バイト数
+            chunk_size: アプリケーションに渡す1回分の展開後のバイト数の目安
+        """
+        self.app = app
+        self.max_decompressed_bytes = max_decompressed_bytes
+        self.chunk_size = chunk_size
+        self._decoders = _decoders()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = Headers(scope=scope).get("content-encoding", "").strip().lower()
+        if encoding in ("", "identity"):
+            await self.app(scope, receive, send)
+            return
+
+        new_decoder = self._decoders.get(encoding)
+        if new_decoder is None:
+            response = JSONResponse(
+                {"detail": f"Unsupported Content-Encoding: {encoding}"},
+                status_code=415,
+                headers={"Accept-Encoding": ", ".join(self._decoders)},
+            )
+            await response(scope, receive, send)
+            return
+
+        headers = [
+            (name, value) for name, value in scope["headers"]
+            if name not in (b"content-encoding", b"content-length")
+        ]
+        receiver = _DecompressingReceiver(
+            receive, new_decoder, encoding, self.chunk_size, self.max_decompressed_bytes
+        )
+        await self.app({**scope, "headers": headers}, receiver, send)
+
+
+def _parse_accept_encoding(value: str) -> dict[str, float]:
+    """Accept-Encodingをコーディングごとのq値に変換する"""
+    weights: dict[str, float] = {}
+    for item in value.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, raw = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(raw)
+                except ValueError:
+                    quality = 0.0
+        weights[coding] = quality
+    return weights
+
+
+def negotiate_encoding(
+    accept_encoding: str, supported: tuple[str, ...]
+) -> Optional[str]:
+    """
+    Accept-Encodingから使うコーディングを選ぶ
+
+    Args:
+        accept_encoding: Accept-Encodingヘッダーの値
+        supported: 使えるコーディング（q値が同じ場合は先頭を優先）
+
+    Returns:
+        q値が最大のコーディング（受け入れられるものがない場合はNone）
+    """
+    weights = _parse_accept_encoding(accept_encoding)
+    wildcard = weights.get("*", 0.0)
+    best: Optional[str] = None
+    best_quality = 0.0
+    for coding in supported:
+        quality = weights.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class _Encoder(Protocol):
+    """レスポンスの圧縮器"""
+
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush_block(self) -> bytes:
+        """ここまでのデータをクライアントが展開できるようにフラッシュする"""
+        ...
+
+    def flush(self) -> bytes:
+        """圧縮を終了する"""
+        ...
+
+
+class _GzipEncoder:
+    """zlibによるgzipの圧縮器"""
+
+    def __init__(self, level: int) -> None:
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, _GZIP_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush_block(self) -> bytes:
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class _ZstdEncoder:
+    """zstandardによるzstdの圧縮器"""
+
+    def __init__(self, level: int) -> None:
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush_block(self) -> bytes:
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+# 圧縮の対象とするContent-Type（JSON・NDJSON・テキスト）
+_COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def _is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";")[0].strip().lower()
+    return media_type.startswith(_COMPRESSIBLE_TYPES) or media_type.endswith("+json")
+
+
+class _CompressingSender:
+    """1レスポンス分のボディを圧縮して送るsend"""
+
+    def __init__(
+        self,
+        send: Send,
+        encoding: Optional[str],
+        new_encoder: Callable[[str], _Encoder],
+        minimum_size: int,
+    ) -> None:
+        self._send = send
+        self._encoding = encoding
+        self._new_encoder = new_encoder
+        self._minimum_size = minimum_size
+        self._start: Optional[Message] = None
+        self._encoder: Optional[_Encoder] = None
+        self._passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        if self._passthrough:
+            await self._send(message)
+        elif message["type"] == "http.response.start":
+            await self._on_start(message)
+        elif message["type"] != "http.response.body" or self._start is None:
+            await self._send(message)
+        elif self._encoder is not None:
+            await self._send_compressed(message)
+        elif not await self._on_first_body(self._start, message):
+            await self._send_compressed(message)
+
+    async def _on_start(self, message: Message) -> None:
+        headers = Headers(raw=message.get("headers", []))
+        if (
+            message["status"] in (204, 304)
+            or "content-encoding" in headers
+            or not _is_compressible(headers.get("content-type", ""))
+        ):
+            self._passthrough = True
+            await self._send(message)
+        else:
+            # ボディの大きさがわかるまでヘッダーの送信を遅らせる
+            self._start = message
+
+    async def _on_first_body(self, start: Message, message: Message) -> bool:
+        """
+        ボディの最初のメッセージでヘッダーを確定して送る
+
+        Returns:
+            メッセージを送り終えたかどうか（Falseの場合は圧縮器を用意したので続けて圧縮して送る）
+        """
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not more_body and len(body) < self._minimum_size:
+            self._passthrough = True
+            await self._send(start)
+            await self._send(message)
+            return True
+        headers = MutableHeaders(raw=list(start.get("headers", [])))
+        headers.add_vary_header("Accept-Encoding")
+        if self._encoding is None:
+            self._passthrough = True
+            await self._send({**start, "headers": headers.raw})
+            await self._send(message)
+            return True
+        encoder = self._new_encoder(self._encoding)
+        headers["Content-Encoding"] = self._encoding
+        etag = headers.get("etag")
+        if etag is not None and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        if not more_body:
+            compressed = encoder.compress(body) + encoder.flush()
+            headers["Content-Length"] = str(len(compressed))
+            await self._send({**start, "headers": headers.raw})
+            await self._send({"type": "http.response.body", "body": compressed})
+            return True
+        del headers["Content-Length"]
+        await self._send({**start, "headers": headers.raw})
+        self._encoder = encoder
+        return False
+
+    async def _send_compressed(self, message: Message) -> None:
+        encoder = self._encoder
+        assert encoder is not None
+        body = message.get("body", b"")
+        if message.get("more_body", False):
+            chunk = encoder.compress(body) + encoder.flush_block()
+            if chunk:
+                await self._send(
+                    {"type": "http.response.body", "body": chunk, "more_body": True}
+                )
+        else:
+            await self._send({
+                "type": "http.response.body",
+                "body": encoder.compress(body) + encoder.flush(),
+            })
+
+
+class ResponseCompressionMiddleware:
+    """Accept-Encodingに応じてレスポンスをzstdまたはgzipで圧縮する
+
+    minimum_size以上のJSON・テキストのレスポンスを圧縮する。ストリームのレスポンスは
+    チャンクごとに圧縮してフラッシュする。圧縮したレスポンスの強いETagは、
+    圧縮前と同じ表現ではなくなるため弱いETagにする（If-None-Matchは弱い比較のため304は維持される）。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        zstd_level: int = 3,
+    ) -> None:
+        """
+        Args:
+            app: ASGIアプリケーション
+            minimum_size: 圧縮するレスポンスボディの最小バイト数
+            gzip_level: gzipの圧縮レベル
+            zstd_level: zstdの圧縮レベル
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+        self.encodings: tuple[str, ...] = (
+            ("zstd", "gzip") if zstandard is not None else ("gzip",)
+        )
+
+    def _encoder(self, encoding: str) -> _Encoder:
+        if encoding == "zstd":
+            return _ZstdEncoder(self.zstd_level)
+        return _GzipEncoder(self.gzip_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), self.encodings
+        )
+        sender = _CompressingSender(send, encoding, self._encoder, self.minimum_size)
+        await self.app(scope, receive, sender)
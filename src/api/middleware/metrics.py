@@ -0,0 +1,57 @@
+"""リクエストのレイテンシ・サイズを記録するASGIミドルウェア"""
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.metrics import HTTP_REQUEST_DURATION, HTTP_REQUEST_SIZE, HTTP_RESPONSE_SIZE
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """ルート・ステータスコードごとにレイテンシとペイロードサイズを記録する
+
+    BaseHTTPMiddlewareを使わない純粋なASGIミドルウェアとして実装し、
+    リクエストごとの追加処理をメッセージのバイト数の加算と計測値の記録に限定する。
+    ルートのラベルにはパスではなくルーティングのテンプレート（例: /v1/measurements/bulk）を使う。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        request_size = 0
+        response_size = 0
+        status_code = 500
+
+        async def receive_wrapper() -> Message:
+            nonlocal request_size
+            message = await receive()
+            if message["type"] == "http.request":
+                request_size += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_size, status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            method = scope["method"]
+            status_label = str(status_code)
+            HTTP_REQUEST_DURATION.observe(elapsed, (method, route_path, status_label))
+            HTTP_REQUEST_SIZE.observe(request_size, (method, route_path))
+            HTTP_RESPONSE_SIZE.observe(response_size, (method, route_path, status_label))
@@ -0,0 +1,117 @@
+"""リクエストの処理段階を計測するプロファイリング用ASGIミドルウェア"""
+import cProfile
+import random
+import re
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.profiling import start_profile, stop_profile
+
+PROFILE_HEADER = b"x-profile"
+SERVER_TIMING_HEADER = b"server-timing"
+
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9_.-]+")
+# cProfileはプロセス内で同時に1つしか有効にできない（3.12以降は2つ目のenableがValueError）
+_profiler_lock = threading.Lock()
+
+
+class ProfilingMiddleware:
+    """オプトインしたリクエストの処理段階を計測する
+
+    X-Profileヘッダー（header_enabled時）またはsample_rateの割合で選ばれたリクエストに
+    RequestProfileを設定する。ハンドラーが記録した段階に、ハンドラー終了から
+    レスポンス送信開始まで（シリアライズ）と全体の時間を加えてServer-Timingヘッダーに出力する。
+    dump_dirを指定した場合は対象リクエストのcProfileの結果を.profファイルとして保存する
+    （cProfileはスレッド単位のため、同時に処理中の他のリクエストの処理も含まれる）。
+    cProfileはプロセス内で1つしか動かせないため、他のリクエストや別のプロファイラーが
+    計測中の場合は.profの保存だけを省略する（Server-Timingは付与し、リクエストは失敗させない）。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        header_enabled: bool = False,
+        sample_rate: float = 0.0,
+        server_timing: bool = True,
+        dump_dir: Optional[str] = None,
+        random_func: Callable[[], float] = random.random,
+    ) -> None:
+        """
+        Args:
+            app: ASGIアプリケーション
+            header_enabled: X-Profileヘッダーによるプロファイリングを許可するか
+            sample_rate: ヘッダーなしでプロファイリングするリクエストの割合（0〜1）
+            server_timing: Server-Timingヘッダーを付与するか
+            dump_dir: cProfileの結果を保存するディレクトリ（Noneの場合は保存しない）
+            random_func: サンプリングに使う乱数関数
+        """
+        self.app = app
+        self.header_enabled = header_enabled
+        self.sample_rate = sample_rate
+        self.server_timing = server_timing
+        self.dump_dir = Path(dump_dir) if dump_dir else None
+        self._random = random_func
+
+    def _should_profile(self, scope: Scope) -> bool:
+        if self.header_enabled:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER and value.strip() not in (b"", b"0", b"false"):
+                    return True
+        return self.sample_rate > 0 and self._random() < self.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile, token = start_profile()
+        profiler = cProfile.Profile() if self.dump_dir is not None else None
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                now = time.perf_counter()
+                if profile.handler_finished is not None:
+                    profile.record("response_serialization", now - profile.handler_finished)
+                profile.record("total", now - profile.started)
+                if self.server_timing:
+                    headers = list(message.get("headers", []))
+                    headers.append((SERVER_TIMING_HEADER, profile.server_timing().encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        if profiler is not None and not self._enable(profiler):
+            profiler = None
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                _profiler_lock.release()
+                self._dump(profiler, scope)
+            stop_profile(token)
+
+    @staticmethod
+    def _enable(profiler: cProfile.Profile) -> bool:
+        """他に計測中のプロファイラーがなければcProfileを開始する"""
+        if not _profiler_lock.acquire(blocking=False):
+            return False
+        try:
+            profiler.enable()
+        except ValueError:
+            # ミドルウェア以外で起動されたプロファイラー（cProfileを使う他のツールなど）が有効な場合
+            _profiler_lock.release()
+            return False
+        return True
+
+    def _dump(self, profiler: cProfile.Profile, scope: Scope) -> None:
+        """cProfileの結果を保存する"""
+        assert self.dump_dir is not None
+        self.dump_dir.mkdir(parents=True, exist_ok=True)
+        path = _UNSAFE_FILENAME_CHARS.sub("_", scope["path"].strip("/")) or "root"
+        filename = f"{time.strftime('%Y%m%dT%H%M%S')}-{time.perf_counter_ns()}-{scope['method']}-{path}.prof"
+        profiler.dump_stats(self.dump_dir / filename)
@@ -0,0 +1,49 @@
+"""APIレスポンスクラス"""
+from collections.abc import Mapping
+from typing import Any, Optional
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from starlette.background import BackgroundTask
+
+
+class ModelJSONResponse(JSONResponse):
+    """Pydanticモデルを直接JSONのバイト列にシリアライズするレスポンス
+
+    エンドポイントがこのレスポンスを返すと、FastAPIによるレスポンスモデルの
+    再検証と辞書への変換（jsonable_encoder）を経由せず、pydantic-coreの
+    シリアライザで1回だけ変換する。出力はFastAPIのデフォルト（区切り文字なし、
+    非ASCII文字はそのまま、日時はISO 8601）と同じ形式になる。
+    """
+
+    exclude_unset = False
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+        background: Optional[BackgroundTask] = None,
+        exclude_unset: bool = False,
+    ) -> None:
+        """
+        Args:
+            content: レスポンスのモデルまたはJSONに変換できる値
+            status_code: ステータスコード
+            headers: レスポンスヘッダー
+            media_type: メディアタイプ
+            background: レスポンス送信後に実行するタスク
+            exclude_unset: 値を設定していないフィールドを出力しないかどうか
+                （入れ子のモデルにも適用される）
+        """
+        self.exclude_unset = exclude_unset
+        super().__init__(content, status_code, headers, media_type, background)
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return type(content).__pydantic_serializer__.to_json(
+                content, exclude_unset=self.exclude_unset
+            )
+        return pydantic_core.to_json(content)
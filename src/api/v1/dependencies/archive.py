@@ -0,0 +1,41 @@
+"""生データアーカイブの依存関数"""
+from typing import Optional
+
+from core.config import get_settings
+from infrastructure.archive import (
+    ArchiveStorage,
+    LocalArchiveStorage,
+    MeasurementArchiver,
+    S3ArchiveStorage,
+    get_archive_format,
+)
+
+_measurement_archiver: Optional[MeasurementArchiver] = None
+
+
+def get_measurement_archiver() -> Optional[MeasurementArchiver]:
+    """アプリケーション共有のアーカイバーを取得する（ARCHIVE_BACKEND=noneの場合はNone）"""
+    global _measurement_archiver
+    settings = get_settings()
+    if settings.archive_backend == "none":
+        return None
+    if _measurement_archiver is None:
+        storage: ArchiveStorage = (
+            S3ArchiveStorage.from_settings(
+                settings.s3_bucket_name,
+                prefix=settings.archive_s3_prefix,
+                region=settings.aws_region,
+                endpoint_url=settings.archive_s3_endpoint_url,
+            )
+            if settings.archive_backend == "s3"
+            else LocalArchiveStorage(settings.archive_local_path)
+        )
+        _measurement_archiver = MeasurementArchiver(
+            storage,
+            get_archive_format(settings.archive_format),
+            max_rows=settings.archive_max_rows,
+            max_age_seconds=settings.archive_max_age_seconds,
+            flush_interval_seconds=settings.archive_flush_interval_seconds,
+            max_buffered_rows=settings.archive_max_buffered_rows,
+        )
+    return _measurement_archiver
@@ -5,9 +5,19 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
+from jose import JWTError
+from pydantic import ValidationError
 
-from src.core.security import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from src.core.jwt_backends import create_jwt_backend
+from src.core.security import (
+    SECRET_KEY,
+    ALGORITHM,
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    JWT_BACKEND,
+    TOKEN_CACHE_MAX_SIZE,
+    TOKEN_CACHE_TTL_SECONDS,
+)
+from src.core.token_cache import TokenVerificationCache
 from src.domain.entities.user import UserInToken
 
 
@@ -31,6 +41,15 @@ class HTTPBearer401(HTTPBearer):
 # Bearer認証スキーム
 security = HTTPBearer401()
 
+# トークンのエンコード・デコードに使うJWTバックエンド
+jwt_backend = create_jwt_backend(JWT_BACKEND, SECRET_KEY, ALGORITHM)
+
+# 検証済みトークンのキャッシュ（同一トークンの再検証を省略する）
+token_cache = TokenVerificationCache(
+    max_size=TOKEN_CACHE_MAX_SIZE,
+    ttl_seconds=TOKEN_CACHE_TTL_SECONDS,
+)
+
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -51,7 +70,7 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
         expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt_backend.encode(to_encode)
     
     return encoded_jwt
 
@@ -69,7 +88,7 @@ def verify_token(token: str) -> Dict[str, Any]:
     Raises:
         JWTError: トークンが無効な場合
     """
-    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    payload = jwt_backend.decode(token)
     return payload
 
 
@@ -77,6 +96,9 @@ async def get_user_from_token(token: str) -> UserInToken:
     """
     トークンからユーザー情報を取得する（内部関数）
     
+    検証済みのトークンはキャッシュし、有効期限内の再利用時は
+    署名検証とUserInTokenの生成を省略する。
+    
     Args:
         token: JWTトークン
         
@@ -84,8 +106,12 @@ async def get_user_from_token(token: str) -> UserInToken:
         認証済みユーザー情報
         
     Raises:
-        HTTPException: 認証に失敗した場合
+        HTTPException: 認証に失敗した場合（subがない・長すぎるトークンを含む）
     """
+    cached_user = token_cache.get(token)
+    if cached_user is not None:
+        return cached_user
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -105,10 +131,11 @@ async def get_user_from_token(token: str) -> UserInToken:
             user_id=user_id,
             email=payload.get("email")
         )
+        token_cache.set(token, user, expires_at=payload.get("exp"))
         
         return user
         
-    except JWTError:
+    except (JWTError, ValidationError):
         raise credentials_exception
 
 
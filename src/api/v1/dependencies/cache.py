@@ -0,0 +1,23 @@
+"""レスポンスキャッシュの依存関数"""
+from typing import Optional
+
+from core.config import get_settings
+from infrastructure.cache import InMemoryCacheBackend, RedisCacheBackend, ResponseCache
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """アプリケーション共有のレスポンスキャッシュを取得する（CACHE_BACKEND=noneの場合はNone）"""
+    global _response_cache
+    settings = get_settings()
+    if settings.cache_backend == "none":
+        return None
+    if _response_cache is None:
+        backend = (
+            RedisCacheBackend.from_url(settings.cache_redis_url)
+            if settings.cache_backend == "redis"
+            else InMemoryCacheBackend(max_entries=settings.cache_max_entries)
+        )
+        _response_cache = ResponseCache(backend, ttl_seconds=settings.cache_ttl_seconds)
+    return _response_cache
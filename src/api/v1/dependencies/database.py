@@ -0,0 +1,31 @@
+"""データベース関連の依存関数"""
+from datetime import timedelta
+
+from core.config import get_settings
+from infrastructure.database.goal_repository import GoalRepository
+from infrastructure.database.idempotency_repository import IdempotencyRepository
+from infrastructure.database.measurement_repository import MeasurementRepository
+from infrastructure.database.session import get_engine
+
+
+def get_measurement_repository() -> MeasurementRepository:
+    """測定データリポジトリを取得する（FastAPIエンドポイント用）"""
+    return MeasurementRepository(
+        get_engine(),
+        chunk_size=get_settings().db_bulk_insert_chunk_size,
+    )
+
+
+def get_idempotency_repository() -> IdempotencyRepository:
+    """Idempotency-Keyリポジトリを取得する（FastAPIエンドポイント用）"""
+    settings = get_settings()
+    return IdempotencyRepository(
+        get_engine(),
+        ttl=timedelta(seconds=settings.idempotency_key_ttl_seconds),
+        lock_timeout=timedelta(seconds=settings.idempotency_lock_timeout_seconds),
+    )
+
+
+def get_goal_repository() -> GoalRepository:
+    """ゴールリポジトリを取得する（FastAPIエンドポイント用）"""
+    return GoalRepository(get_engine())
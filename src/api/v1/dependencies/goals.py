@@ -0,0 +1,48 @@
+"""ゴールの評価の依存関数"""
+from typing import Optional
+
+from api.goal_evaluation import GoalEvaluator, GoalEventRelay
+from api.v1.dependencies.database import get_goal_repository
+from api.v1.dependencies.webhooks import get_webhook_dispatcher
+from core.config import get_settings
+from infrastructure.events import GoalEventPublisher, LoggingGoalEventPublisher
+
+_goal_event_publisher: Optional[GoalEventPublisher] = None
+_goal_event_relay: Optional[GoalEventRelay] = None
+
+
+def get_goal_event_publisher() -> GoalEventPublisher:
+    """アプリケーション共有のゴール達成イベントの通知先を取得する
+
+    WEBHOOK_URLSを指定した場合はWebhookの送信処理、指定しない場合はログに出力する。
+    """
+    global _goal_event_publisher
+    if _goal_event_publisher is None:
+        _goal_event_publisher = get_webhook_dispatcher() or LoggingGoalEventPublisher()
+    return _goal_event_publisher
+
+
+def get_goal_evaluator() -> Optional[GoalEvaluator]:
+    """ゴールの評価を取得する（GOAL_EVALUATION_ENABLED=falseの場合はNone）"""
+    if not get_settings().goal_evaluation_enabled:
+        return None
+    return GoalEvaluator(get_goal_repository(), get_goal_event_publisher())
+
+
+def get_goal_event_relay() -> Optional[GoalEventRelay]:
+    """アプリケーション共有の未通知の達成イベントの通知処理を取得する
+
+    GOAL_EVALUATION_ENABLED=falseの場合はNone。
+    """
+    global _goal_event_relay
+    evaluator = get_goal_evaluator()
+    if evaluator is None:
+        return None
+    if _goal_event_relay is None:
+        settings = get_settings()
+        _goal_event_relay = GoalEventRelay(
+            evaluator,
+            interval_seconds=settings.goal_event_relay_interval,
+            grace_seconds=settings.goal_event_relay_grace,
+        )
+    return _goal_event_relay
@@ -0,0 +1,25 @@
+"""非同期一括登録キューの依存関数"""
+from typing import Optional
+
+from core.config import get_settings
+from infrastructure.queue import InMemoryIngestQueue, IngestQueue, SQLiteIngestQueue
+
+_ingest_queue: Optional[IngestQueue] = None
+
+
+def get_ingest_queue() -> Optional[IngestQueue]:
+    """アプリケーション共有の非同期登録キューを取得する（INGEST_QUEUE_BACKEND=noneの場合はNone）"""
+    global _ingest_queue
+    settings = get_settings()
+    if settings.ingest_queue_backend == "none":
+        return None
+    if _ingest_queue is None:
+        _ingest_queue = (
+            SQLiteIngestQueue(
+                settings.ingest_queue_path,
+                result_ttl_seconds=settings.ingest_result_ttl_seconds,
+            )
+            if settings.ingest_queue_backend == "sqlite"
+            else InMemoryIngestQueue()
+        )
+    return _ingest_queue
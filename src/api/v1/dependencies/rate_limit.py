@@ -0,0 +1,110 @@
+"""ユーザーごとのレート制限の依存関数"""
+import math
+from typing import Optional
+
+from fastapi import Depends, HTTPException, status
+
+from api.v1.dependencies.auth import get_current_user
+from core.config import get_settings
+from core.metrics import RATE_LIMITED_REQUESTS
+from domain.entities.user import UserInToken
+from infrastructure.rate_limit import (
+    InMemoryRateLimitBackend,
+    RateLimitBackend,
+    RateLimitDecision,
+    RateLimiter,
+    RedisRateLimitBackend,
+)
+
+_rate_limit_backend: Optional[RateLimitBackend] = None
+
+
+def get_rate_limit_backend() -> Optional[RateLimitBackend]:
+    """アプリケーション共有のレート制限の保存先を取得する（RATE_LIMIT_BACKEND=noneの場合はNone）"""
+    global _rate_limit_backend
+    settings = get_settings()
+    if settings.rate_limit_backend == "none":
+        return None
+    if _rate_limit_backend is None:
+        _rate_limit_backend = (
+            RedisRateLimitBackend.from_url(settings.rate_limit_redis_url)
+            if settings.rate_limit_backend == "redis"
+            else InMemoryRateLimitBackend(max_keys=settings.rate_limit_max_keys)
+        )
+    return _rate_limit_backend
+
+
+def get_request_rate_limiter(
+    backend: Optional[RateLimitBackend] = Depends(get_rate_limit_backend),
+) -> Optional[RateLimiter]:
+    """期間あたりのリクエスト数の制限を取得する（レート制限が無効な場合はNone）"""
+    if backend is None:
+        return None
+    settings = get_settings()
+    return RateLimiter(backend, settings.rate_limit_requests, settings.rate_limit_period, "requests")
+
+
+def get_row_rate_limiter(
+    backend: Optional[RateLimitBackend] = Depends(get_rate_limit_backend),
+) -> Optional[RateLimiter]:
+    """期間あたりの登録行数の制限を取得する（レート制限が無効な場合はNone）"""
+    if backend is None:
+        return None
+    settings = get_settings()
+    return RateLimiter(backend, settings.rate_limit_rows, settings.rate_limit_period, "rows")
+
+
+def _rate_limit_headers(decision: RateLimitDecision) -> dict[str, str]:
+    """RateLimit-*ヘッダー（draft-ietf-httpapi-ratelimit-headers）とRetry-After"""
+    headers = {
+        "RateLimit-Limit": str(decision.limit),
+        "RateLimit-Remaining": str(decision.remaining),
+        "RateLimit-Reset": str(math.ceil(decision.reset_seconds)),
+    }
+    if decision.retry_after_seconds is not None:
+        headers["Retry-After"] = str(max(1, math.ceil(decision.retry_after_seconds)))
+    return headers
+
+
+async def charge_rate_limit(limiter: Optional[RateLimiter], user_id: str, cost: int = 1) -> None:
+    """
+    ユーザーの制限からコストを消費する
+
+    Args:
+        limiter: レート制限（Noneの場合は何もしない）
+        user_id: 認証済みユーザーID
+        cost: 消費する量（リクエスト数・行数）
+
+    Raises:
+        HTTPException: 上限に達している場合（429、Retry-After付き）、
+            コストが期間あたりの上限を超えていて再試行しても受け付けられない場合（413）
+    """
+    if limiter is None:
+        return
+    decision = await limiter.acquire(user_id, cost)
+    if decision.allowed:
+        return
+    RATE_LIMITED_REQUESTS.inc(labels=(limiter.name,))
+    if decision.retry_after_seconds is None:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Request exceeds the rate limit of {limiter.limit} {limiter.name} "
+            f"per {limiter.period_seconds:g} seconds",
+        )
+    raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=f"Rate limit of {limiter.limit} {limiter.name} per {limiter.period_seconds:g} seconds exceeded",
+        headers=_rate_limit_headers(decision),
+    )
+
+
+async def enforce_request_rate_limit(
+    current_user: UserInToken = Depends(get_current_user),
+    limiter: Optional[RateLimiter] = Depends(get_request_rate_limiter),
+) -> None:
+    """認証済みユーザーのリクエスト数を制限する（ルーターの依存関数として使う）
+
+    Raises:
+        HTTPException: 上限に達している場合（429）
+    """
+    await charge_rate_limit(limiter, current_user.user_id)
@@ -0,0 +1,27 @@
+"""Webhook通知の依存関数"""
+from typing import Optional
+
+from core.config import get_settings
+from infrastructure.webhooks import WebhookDeliveryQueue, WebhookDispatcher
+
+_webhook_dispatcher: Optional[WebhookDispatcher] = None
+
+
+def get_webhook_dispatcher() -> Optional[WebhookDispatcher]:
+    """アプリケーション共有のWebhookの送信処理を取得する（WEBHOOK_URLSが空の場合はNone）"""
+    global _webhook_dispatcher
+    settings = get_settings()
+    if not settings.webhook_urls:
+        return None
+    if _webhook_dispatcher is None:
+        _webhook_dispatcher = WebhookDispatcher(
+            WebhookDeliveryQueue(settings.webhook_queue_path),
+            settings.webhook_urls,
+            timeout_seconds=settings.webhook_timeout,
+            retry_count=settings.webhook_retry_count,
+            batch_size=settings.webhook_batch_size,
+            max_concurrency_per_host=settings.webhook_max_concurrency_per_host,
+            backoff_base_seconds=settings.webhook_backoff_base_seconds,
+            backoff_max_seconds=settings.webhook_backoff_max_seconds,
+        )
+    return _webhook_dispatcher
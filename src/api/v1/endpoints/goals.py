@@ -0,0 +1,164 @@
+"""ゴールエンドポイント"""
+
+from datetime import UTC, datetime
+from typing import Optional
+
+import structlog
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response, status
+from pydantic import ValidationError
+
+from api.responses import ModelJSONResponse
+from api.v1.dependencies.auth import get_current_user
+from api.v1.dependencies.database import get_goal_repository
+from api.v1.dependencies.rate_limit import enforce_request_rate_limit
+from domain.entities.goal import Goal, GoalProgress
+from domain.entities.user import UserInToken
+from domain.services.goal_evaluation import period_start
+from infrastructure.database.goal_repository import GoalRepository
+from schemas.requests.goal import GoalPutRequest
+from schemas.responses.goal import GoalListResponse, GoalProgressResponse, GoalResponse
+
+logger = structlog.get_logger(__name__)
+router = APIRouter(
+    prefix="/v1/goals",
+    tags=["goals"],
+    default_response_class=ModelJSONResponse,
+    dependencies=[Depends(enforce_request_rate_limit)],
+)
+
+goal_id_path = Path(
+    ..., max_length=64, pattern=r"^[A-Za-z0-9_-]+$", description="ゴールID（ユーザーごとに一意）"
+)
+history_query = Query(7, ge=1, le=366, description="返す進捗の期間数（新しい期間から）")
+
+
+def _progress_response(goal: Goal, progress: GoalProgress) -> GoalProgressResponse:
+    """進捗をレスポンスに変換する"""
+    return GoalProgressResponse(
+        period_start=progress.period_start,
+        value=progress.value(goal.aggregation),
+        sample_count=progress.sample_count,
+        achieved=progress.achieved_at is not None,
+        achieved_at=progress.achieved_at,
+        streak=progress.streak,
+    )
+
+
+def _goal_response(
+    goal: Goal,
+    current: Optional[GoalProgress] = None,
+    history: Optional[list[GoalProgress]] = None,
+) -> GoalResponse:
+    """ゴールをレスポンスに変換する"""
+    return GoalResponse(
+        goal_id=goal.goal_id,
+        metric_type=goal.metric_type,
+        target=goal.target,
+        aggregation=goal.aggregation,
+        period=goal.period,
+        unit=goal.unit,
+        created_at=goal.created_at,
+        updated_at=goal.updated_at,
+        current_progress=_progress_response(goal, current) if current is not None else None,
+        history=[_progress_response(goal, progress) for progress in history]
+        if history is not None else None,
+    )
+
+
+@router.put(
+    "/{goal_id}",
+    response_model=GoalResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_200_OK: {"model": GoalResponse, "description": "既存のゴールを置き換えた"}},
+)
+async def put_goal(
+    goal_data: GoalPutRequest,
+    goal_id: str = goal_id_path,
+    current_user: UserInToken = Depends(get_current_user),
+    repository: GoalRepository = Depends(get_goal_repository),
+) -> ModelJSONResponse:
+    """ゴールを作成または置き換える（認証必須）
+
+    作成した場合は201、置き換えた場合は200を返す。ゴールの進捗は作成後に一括登録した
+    測定データで集計する（作成した期間より前の測定は対象外）。集計の対象・方法・期間を
+    変更した場合は進捗をリセットし、目標値のみの変更では進捗を引き継ぐ。
+    期間はUTCの日・週（月曜始まり）とする。
+    """
+    now = datetime.now(UTC)
+    try:
+        goal = Goal(
+            goal_id=goal_id,
+            user_id=current_user.user_id,
+            **goal_data.model_dump(),
+            created_at=now,
+            updated_at=now,
+        )
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.errors()[0]["msg"],
+        ) from e
+
+    stored, created = await repository.put(goal)
+    logger.info(
+        "Goal saved",
+        user_id=current_user.user_id,
+        goal_id=goal_id,
+        metric_type=stored.metric_type.value,
+        created=created,
+    )
+    current = await repository.get_progress(
+        stored.user_id, stored.goal_id, period_start(now, stored.period)
+    )
+    return ModelJSONResponse(
+        _goal_response(stored, current),
+        status_code=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+    )
+
+
+@router.get("", response_model=GoalListResponse)
+async def list_goals(
+    current_user: UserInToken = Depends(get_current_user),
+    repository: GoalRepository = Depends(get_goal_repository),
+) -> ModelJSONResponse:
+    """ゴールの一覧と現在の期間の進捗を取得する（認証必須）"""
+    now = datetime.now(UTC)
+    items = []
+    for goal in await repository.list_for_user(current_user.user_id):
+        current = await repository.get_progress(
+            goal.user_id, goal.goal_id, period_start(now, goal.period)
+        )
+        items.append(_goal_response(goal, current))
+    return ModelJSONResponse(GoalListResponse(items=items))
+
+
+@router.get("/{goal_id}", response_model=GoalResponse)
+async def get_goal(
+    goal_id: str = goal_id_path,
+    history: int = history_query,
+    current_user: UserInToken = Depends(get_current_user),
+    repository: GoalRepository = Depends(get_goal_repository),
+) -> ModelJSONResponse:
+    """ゴールと直近の期間の進捗を取得する（認証必須）
+
+    historyには測定のあった期間のみを新しい順に含める。
+    """
+    goal = await repository.get(current_user.user_id, goal_id)
+    if goal is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Goal not found")
+    progress = await repository.list_progress(goal.user_id, goal.goal_id, limit=history)
+    current_start = period_start(datetime.now(UTC), goal.period)
+    current = next((item for item in progress if item.period_start == current_start), None)
+    return ModelJSONResponse(_goal_response(goal, current, progress))
+
+
+@router.delete("/{goal_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_goal(
+    goal_id: str = goal_id_path,
+    current_user: UserInToken = Depends(get_current_user),
+    repository: GoalRepository = Depends(get_goal_repository),
+) -> Response:
+    """ゴールと進捗を削除する（認証必須）"""
+    if not await repository.delete(current_user.user_id, goal_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Goal not found")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
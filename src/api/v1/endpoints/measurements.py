@@ -1,35 +1,517 @@
 """測定データエンドポイント"""
 
-import uuid
+import hashlib
+import json
+from collections.abc import AsyncIterator, Awaitable, Callable
 from datetime import UTC, datetime
-from typing import Any
+from enum import Enum
+from operator import itemgetter
+from typing import Any, Optional, Union
 
 import structlog
-from fastapi import APIRouter, Body, Depends, HTTPException, Response, status
-from pydantic import ValidationError
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
 
+from api.caching import cached_json_response
+from api.goal_evaluation import GoalEvaluator
+from api.ingest import (
+    ingest_columnar,
+    ingest_rows,
+    parse_measurement_requests,
+    record_bulk_metrics,
+)
+from api.responses import ModelJSONResponse
+from api.v1.dependencies.archive import get_measurement_archiver
 from api.v1.dependencies.auth import get_current_user
-from domain.entities.measurement import Measurement
+from api.v1.dependencies.cache import get_response_cache
+from api.v1.dependencies.database import (
+    get_idempotency_repository,
+    get_measurement_repository,
+)
+from api.v1.dependencies.goals import get_goal_evaluator
+from api.v1.dependencies.queue import get_ingest_queue
+from api.v1.dependencies.rate_limit import (
+    charge_rate_limit,
+    enforce_request_rate_limit,
+    get_row_rate_limiter,
+)
+from core.config import get_settings
+from core.ids import uuid7
+from core.profiling import current_profile, profile_stage
+from domain.entities.measurement import MetricType
 from domain.entities.user import UserInToken
-from schemas.requests.measurement import MeasurementCreateRequest
+from domain.services.measurement_query import (
+    MEASUREMENT_FIELDS,
+    MeasurementQuery,
+    PageCursor,
+    SortOrder,
+    parse_fields,
+)
+from domain.services.measurement_series import (
+    SeriesMethod,
+    aggregate_series_buckets,
+    downsample_lttb,
+)
+from domain.services.measurement_summary import (
+    SummaryPeriod,
+    summarize_by_metric,
+    summary_window,
+)
+from domain.services.measurement_validation import ensure_utc
+from infrastructure.archive import MeasurementArchiver
+from infrastructure.cache import CacheScope, ResponseCache
+from infrastructure.database.idempotency_repository import (
+    IdempotencyRecord,
+    IdempotencyRepository,
+)
+from infrastructure.database.measurement_repository import MeasurementRepository
+from infrastructure.queue import IngestJob, IngestJobStatus, IngestQueue
+from infrastructure.rate_limit import RateLimiter
+from schemas.requests.measurement_columnar import (
+    COLUMNAR_MEDIA_TYPE,
+    ColumnarFormatError,
+    ColumnarMeasurements,
+    decode_columnar_measurements,
+)
 from schemas.responses.measurement import (
+    MeasurementBulkAcceptedResponse,
+    MeasurementBulkCreateMinimalResponse,
     MeasurementBulkCreateResponse,
+    MeasurementBulkStatusResponse,
+    MeasurementPageItemResponse,
+    MeasurementPageResponse,
     MeasurementResponse,
+    MeasurementSeriesResponse,
+    MeasurementStreamCreateResponse,
+    MeasurementSummaryResponse,
+    MetricSummaryResponse,
+    SeriesPointResponse,
+    SummaryBucketResponse,
 )
 
 logger = structlog.get_logger(__name__)
-router = APIRouter(prefix="/v1/measurements", tags=["measurements"])
+router = APIRouter(
+    prefix="/v1/measurements",
+    tags=["measurements"],
+    default_response_class=ModelJSONResponse,
+    dependencies=[Depends(enforce_request_rate_limit)],
+)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# 非同期登録キューが上限に達した場合に再送を待つよう求める秒数
+INGEST_QUEUE_RETRY_AFTER_SECONDS = 5
+
+
+class BulkResponseMode(str, Enum):
+    """一括登録レスポンスの形式"""
+    FULL = "full"
+    MINIMAL = "minimal"
 
 
 measurements_body = Body(..., description="Array of measurement data")
+bulk_response_mode_query = Query(
+    None,
+    alias="response",
+    description="minimalの場合は登録データの代わりに採番したIDのみを返す（Prefer: return=minimal と同じ）",
+)
+prefer_header = Header(None, description="return=minimal で簡易レスポンスを要求する（RFC 7240）")
+idempotency_key_header = Header(
+    None,
+    max_length=255,
+    description="再送時に最初のレスポンスを返すためのキー（同じキーは同じリクエストボディでのみ再利用できる）",
+)
+summary_period_query = Query(..., description="集計期間（day: 時間バケット, week/month: 日バケット）")
+summary_metric_type_query = Query(None, description="絞り込むメトリックタイプ")
+summary_end_query = Query(None, description="集計期間の終端（省略時は現在時刻）")
+list_metric_type_query = Query(None, description="絞り込むメトリックタイプ")
+list_device_id_query = Query(None, max_length=255, description="絞り込むデバイスID")
+list_start_query = Query(None, description="測定日時の下限（含む）")
+list_end_query = Query(None, description="測定日時の上限（含まない）")
+list_cursor_query = Query(None, description="前のページのnext_cursor（同じ絞り込み条件・並び順で指定する）")
+list_limit_query = Query(100, ge=1, le=1000, description="1ページの最大件数")
+list_order_query = Query(SortOrder.DESC, description="測定日時の並び順")
+series_metric_type_query = Query(..., description="メトリックタイプ")
+series_start_query = Query(..., description="期間の開始（含む）")
+series_end_query = Query(None, description="期間の終了（含まない、省略時は現在時刻）")
+series_points_query = Query(
+    500, ge=3, le=5000, description="返す点の最大数（minmaxの場合はバケット数）"
+)
+series_method_query = Query(SeriesMethod.LTTB, description="ダウンサンプリングの方式")
+list_fields_query = Query(
+    None,
+    description=f"返すフィールド（カンマ区切り、省略時はすべて）: {', '.join(MEASUREMENT_FIELDS)}",
+)
+
+
+async def _iter_ndjson_lines(request: Request, max_line_bytes: int) -> AsyncIterator[bytes]:
+    """リクエストボディをストリームで読み、NDJSONの行を順に返す
+
+    行をまたぐチャンクの端数のみを保持するため、メモリ使用量は
+    最大行長とチャンクサイズで抑えられる。
+
+    Args:
+        request: HTTPリクエスト
+        max_line_bytes: 1行の最大バイト数
+
+    Raises:
+        HTTPException: 行が最大バイト数を超えた場合（413）
+    """
+    pending = b""
+    async for chunk in request.stream():
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        if len(pending) > max_line_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"NDJSON line exceeds {max_line_bytes} bytes"
+            )
+        for line in lines:
+            if len(line) > max_line_bytes:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"NDJSON line exceeds {max_line_bytes} bytes"
+                )
+            yield line
+    yield pending
 
-@router.post("/bulk", response_model=MeasurementBulkCreateResponse, status_code=status.HTTP_201_CREATED)
+
+def _preferences(prefer: Optional[str]) -> set[str]:
+    """Preferヘッダーの値（パラメータを含む各トークン）を小文字で返す"""
+    if not prefer:
+        return set()
+    return {token.strip().lower() for part in prefer.split(",") for token in part.split(";")}
+
+
+def _prefers_minimal(prefer: Optional[str]) -> bool:
+    """Preferヘッダーにreturn=minimalが含まれるかを判定する"""
+    return "return=minimal" in _preferences(prefer)
+
+
+def _prefers_async(prefer: Optional[str]) -> bool:
+    """Preferヘッダーにrespond-asyncが含まれるかを判定する"""
+    return "respond-async" in _preferences(prefer)
+
+
+@router.post(
+    "/bulk",
+    response_model=Union[MeasurementBulkCreateResponse, MeasurementBulkCreateMinimalResponse],
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        status.HTTP_202_ACCEPTED: {
+            "model": MeasurementBulkAcceptedResponse,
+            "description": "Prefer: respond-async で受け付けた（保存はワーカーが行う）",
+        },
+    },
+)
 async def create_measurements_bulk(
-    response: Response,
+    request: Request,
     measurements_data: list[dict[str, Any]] = measurements_body,
-    current_user: UserInToken = Depends(get_current_user)
-) -> MeasurementBulkCreateResponse:
-    """測定データを一括登録する（認証必須）"""
+    response_mode: Optional[BulkResponseMode] = bulk_response_mode_query,
+    prefer: Optional[str] = prefer_header,
+    idempotency_key: Optional[str] = idempotency_key_header,
+    current_user: UserInToken = Depends(get_current_user),
+    repository: MeasurementRepository = Depends(get_measurement_repository),
+    idempotency_repository: IdempotencyRepository = Depends(get_idempotency_repository),
+    cache: Optional[ResponseCache] = Depends(get_response_cache),
+    queue: Optional[IngestQueue] = Depends(get_ingest_queue),
+    archiver: Optional[MeasurementArchiver] = Depends(get_measurement_archiver),
+    goal_evaluator: Optional[GoalEvaluator] = Depends(get_goal_evaluator),
+    row_limiter: Optional[RateLimiter] = Depends(get_row_rate_limiter)
+) -> Response:
+    """測定データを一括登録する（認証必須）
+
+    `?response=minimal` または `Prefer: return=minimal` を指定した場合は、登録データを
+    返さず件数・エラー・採番したIDのみを返す（クエリパラメータが優先）。
+
+    非同期登録が有効な場合に `Prefer: respond-async` を指定すると、スキーマ検証のみを行って
+    キューに入れ、202とbatch_idを返す。結果は `GET /v1/measurements/bulk/{batch_id}` で
+    確認する。待機中の行数が上限に達している場合は503（Retry-After付き）を返す。
+
+    (メトリックタイプ, 測定日時, デバイスID)が登録済みの測定と重複する行は
+    保存せず、duplicate_countとして報告する（期間が重なるデータの再送は書き込みを伴わない）。
+
+    `Idempotency-Key` ヘッダーを指定した場合は、同じキーの再送に最初のレスポンスを
+    そのまま返す（`Idempotent-Replayed: true` を付与）。異なるリクエストボディでの
+    キーの再利用は422、最初のリクエストの処理中は409とする。
+
+    リクエスト数に加えて、期間あたりの行数（RATE_LIMIT_ROWS）をユーザーごとに制限する。
+    上限に達している場合は429（Retry-After付き）、1リクエストの行数が上限を超える場合は413とする。
+    Idempotency-Keyによる再送の応答は行数を消費しない。
+
+    保存した行は同じトランザクションでユーザーのゴール（`PUT /v1/goals/{goal_id}`）の進捗に
+    加算し、新たに達成した期間の達成イベントをコミットした後に通知する
+    （非同期登録の場合はワーカーが行う）。
+
+    プロファイリング対象のリクエストでは、各処理段階の所要時間を
+    完了ログ（timings_ms）とServer-Timingヘッダーに出力する。
+    """
+    profile = current_profile()
+    if profile is not None:
+        profile.mark_handler_started()
+
+    return await _with_idempotency(
+        request,
+        idempotency_key,
+        current_user.user_id,
+        idempotency_repository,
+        lambda: _create_measurements_bulk(
+            measurements_data, response_mode, prefer, current_user, repository, cache, queue,
+            archiver, goal_evaluator, row_limiter
+        ),
+    )
+
+
+@router.post(
+    "/bulk/columnar",
+    response_model=Union[MeasurementBulkCreateResponse, MeasurementBulkCreateMinimalResponse],
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        status.HTTP_202_ACCEPTED: {
+            "model": MeasurementBulkAcceptedResponse,
+            "description": "Prefer: respond-async で受け付けた（保存はワーカーが行う）",
+        },
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {COLUMNAR_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}}},
+            "description": "列指向バイナリ形式の測定データ（schemas/requests/measurement_columnar.py参照）",
+        }
+    },
+)
+async def create_measurements_bulk_columnar(
+    request: Request,
+    response_mode: Optional[BulkResponseMode] = bulk_response_mode_query,
+    prefer: Optional[str] = prefer_header,
+    idempotency_key: Optional[str] = idempotency_key_header,
+    current_user: UserInToken = Depends(get_current_user),
+    repository: MeasurementRepository = Depends(get_measurement_repository),
+    idempotency_repository: IdempotencyRepository = Depends(get_idempotency_repository),
+    cache: Optional[ResponseCache] = Depends(get_response_cache),
+    queue: Optional[IngestQueue] = Depends(get_ingest_queue),
+    archiver: Optional[MeasurementArchiver] = Depends(get_measurement_archiver),
+    goal_evaluator: Optional[GoalEvaluator] = Depends(get_goal_evaluator),
+    row_limiter: Optional[RateLimiter] = Depends(get_row_rate_limiter)
+) -> Response:
+    """列指向バイナリ形式の測定データを一括登録する（認証必須）
+
+    メトリックコード・測定値・エポックミリ秒の配列と単位・デバイスIDの辞書からなるボディを
+    JSONを経由せずに列のままバリデーションする。バリデーションのルール・エラー詳細・
+    レスポンス形式・Prefer・Idempotency-Key・ゴールの評価の扱いは `POST /v1/measurements/bulk` と同じ。
+    形式として読めないボディは400とする。
+    """
+    profile = current_profile()
+    if profile is not None:
+        profile.mark_handler_started()
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type != COLUMNAR_MEDIA_TYPE:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Content-Type must be {COLUMNAR_MEDIA_TYPE}"
+        )
+    with profile_stage("decode"):
+        try:
+            columns = decode_columnar_measurements(await request.body())
+        except ColumnarFormatError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+    return await _with_idempotency(
+        request,
+        idempotency_key,
+        current_user.user_id,
+        idempotency_repository,
+        lambda: _create_measurements_bulk(
+            columns, response_mode, prefer, current_user, repository, cache, queue, archiver,
+            goal_evaluator, row_limiter
+        ),
+    )
+
+
+async def _with_idempotency(
+    request: Request,
+    idempotency_key: Optional[str],
+    user_id: str,
+    idempotency_repository: IdempotencyRepository,
+    create: Callable[[], Awaitable[Response]],
+) -> Response:
+    """Idempotency-Keyが指定された場合は、同じキーの再送に最初のレスポンスを返す"""
+    if idempotency_key is None:
+        return await create()
+
+    request_hash = hashlib.sha256(await request.body()).hexdigest()
+    record = await idempotency_repository.claim(user_id, idempotency_key, request_hash)
+    if record is not None:
+        return _replay_idempotent_response(record, request_hash, user_id, idempotency_key)
+
+    try:
+        response = await create()
+    except Exception:
+        # 失敗したリクエストは保存せず、同じキーで再試行できるようにする
+        await idempotency_repository.release(user_id, idempotency_key)
+        raise
+    await idempotency_repository.complete(
+        user_id,
+        idempotency_key,
+        status_code=response.status_code,
+        headers=dict(response.headers),
+        body=response.body,
+    )
+    return response
+
+
+async def _enqueue_measurements(
+    measurements_data: list[dict[str, Any]],
+    current_user: UserInToken,
+    queue: IngestQueue,
+) -> ModelJSONResponse:
+    """
+    スキーマ検証に通った行を非同期登録キューに入れ、202を返す
+
+    Raises:
+        HTTPException: 待機中の行数が上限に達している場合（503）、
+            すべての行がスキーマ検証に失敗した場合（422）
+    """
+    settings = get_settings()
+    if await queue.pending_rows() >= settings.ingest_queue_max_rows:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Ingest queue is full",
+            headers={"Retry-After": str(INGEST_QUEUE_RETRY_AFTER_SECONDS)},
+        )
+
+    with profile_stage("schema_validation"):
+        parsed_requests, errors = parse_measurement_requests(measurements_data)
+    if not parsed_requests:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=errors
+        )
+
+    job = IngestJob(
+        batch_id=uuid7(),
+        user_id=current_user.user_id,
+        rows=[measurements_data[index] for index, _ in parsed_requests],
+        indexes=[index for index, _ in parsed_requests],
+        errors=errors,
+        total_count=len(measurements_data),
+    )
+    with profile_stage("enqueue"):
+        await queue.put(job)
+
+    logger.info(
+        "Bulk measurement creation accepted",
+        user_id=current_user.user_id,
+        batch_id=job.batch_id,
+        total_count=job.total_count,
+        accepted_count=len(job.rows),
+        failed_count=len(errors)
+    )
+    return ModelJSONResponse(
+        MeasurementBulkAcceptedResponse(
+            batch_id=job.batch_id,
+            status=IngestJobStatus.QUEUED.value,
+            accepted_count=len(job.rows),
+            failed_count=len(errors),
+            errors=errors or None,
+        ),
+        status_code=status.HTTP_202_ACCEPTED,
+        headers={
+            "Location": f"{router.prefix}/bulk/{job.batch_id}",
+            "Preference-Applied": "respond-async",
+        },
+    )
+
+
+@router.get("/bulk/{batch_id}", response_model=MeasurementBulkStatusResponse)
+async def get_measurements_bulk_status(
+    batch_id: str,
+    current_user: UserInToken = Depends(get_current_user),
+    queue: Optional[IngestQueue] = Depends(get_ingest_queue)
+) -> ModelJSONResponse:
+    """非同期一括登録の状態と結果を取得する（認証必須）
+
+    他のユーザーのbatch_id、結果の保持期間を過ぎたbatch_idは404とする。
+    """
+    state = await queue.status(batch_id) if queue is not None else None
+    if state is None or state.user_id != current_user.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Batch not found"
+        )
+    return ModelJSONResponse(
+        MeasurementBulkStatusResponse(
+            batch_id=state.batch_id,
+            status=state.status.value,
+            total_count=state.total_count,
+            success_count=state.success_count,
+            failed_count=len(state.errors),
+            duplicate_count=state.duplicate_count,
+            ids=state.ids if state.status is IngestJobStatus.COMPLETED else None,
+            errors=state.errors or None,
+            message=state.message,
+            updated_at=state.updated_at,
+        )
+    )
+
+
+def _replay_idempotent_response(
+    record: IdempotencyRecord, request_hash: str, user_id: str, idempotency_key: str
+) -> Response:
+    """
+    Idempotency-Keyに保存したレスポンスを返す
+
+    Raises:
+        HTTPException: キーが異なるリクエストボディで使われた場合（422）、
+            最初のリクエストが処理中の場合（409）
+    """
+    if record.request_hash != request_hash:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key has already been used with a different request body"
+        )
+    if not record.completed or record.body is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A request with this Idempotency-Key is still being processed"
+        )
+    logger.info(
+        "Bulk measurement creation replayed",
+        user_id=user_id,
+        idempotency_key=idempotency_key,
+        status_code=record.status_code,
+    )
+    return Response(
+        content=record.body,
+        status_code=record.status_code,
+        headers={**record.headers, "Idempotent-Replayed": "true"},
+    )
+
+
+async def _create_measurements_bulk(
+    measurements_data: Union[list[dict[str, Any]], ColumnarMeasurements],
+    response_mode: Optional[BulkResponseMode],
+    prefer: Optional[str],
+    current_user: UserInToken,
+    repository: MeasurementRepository,
+    cache: Optional[ResponseCache] = None,
+    queue: Optional[IngestQueue] = None,
+    archiver: Optional[MeasurementArchiver] = None,
+    goal_evaluator: Optional[GoalEvaluator] = None,
+    row_limiter: Optional[RateLimiter] = None,
+) -> ModelJSONResponse:
+    """測定データを一括登録し、レスポンスを生成する（respond-asyncの場合はキューに入れる）"""
+    profile = current_profile()
+    columnar = isinstance(measurements_data, ColumnarMeasurements)
 
     # 認証されたユーザー情報をロギング
     bound_logger = logger.bind(
@@ -38,92 +520,482 @@ async def create_measurements_bulk(
     )
 
     # 空配列チェック
-    if not measurements_data:
+    if not len(measurements_data):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Measurements array cannot be empty"
         )
+    # 不正な行もバリデーションの負荷になるため、リクエストの全行数を消費する
+    await charge_rate_limit(row_limiter, current_user.user_id, len(measurements_data))
 
-    # 結果を格納する変数
-    successful_measurements = []
-    errors = []
+    if queue is not None and _prefers_async(prefer):
+        # キューには列指向の行もJSONと同じ形式の行として入れる
+        rows = measurements_data.to_rows() if columnar else measurements_data
+        return await _enqueue_measurements(rows, current_user, queue)
 
-    # 各測定データを処理
-    for index, raw_data in enumerate(measurements_data):
-        try:
-            # まずPydanticモデルでバリデーション
-            measurement_request = MeasurementCreateRequest(**raw_data)
-
-            # 次にMeasurementエンティティでバリデーション
-            measurement = Measurement(
-                metric_type=measurement_request.metric_type,
-                value=measurement_request.value,
-                unit=measurement_request.unit,
-                measured_at=measurement_request.measured_at,
-                device_id=measurement_request.device_id,
-                metadata=measurement_request.metadata,
-                notes=measurement_request.notes
-            )
+    if columnar:
+        result = await ingest_columnar(
+            measurements_data, current_user.user_id, repository, cache=cache, archiver=archiver,
+            goal_evaluator=goal_evaluator
+        )
+    else:
+        result = await ingest_rows(
+            measurements_data, current_user.user_id, repository, cache=cache, archiver=archiver,
+            goal_evaluator=goal_evaluator
+        )
+    errors = result.errors
+
+    headers: dict[str, str] = {}
+    if response_mode is None:
+        minimal = _prefers_minimal(prefer)
+        if minimal:
+            headers["Preference-Applied"] = "return=minimal"
+    else:
+        minimal = response_mode is BulkResponseMode.MINIMAL
 
-            # 成功した場合、レスポンス用のデータを作成（モック実装）
-            measurement_response = MeasurementResponse(
-                id=str(uuid.uuid4()),
-                metric_type=measurement.metric_type,
-                value=measurement.value,
-                unit=measurement.unit,
-                measured_at=measurement.measured_at,
-                device_id=measurement.device_id,
-                metadata=measurement.metadata,
-                notes=measurement.notes,
-                created_at=datetime.now(UTC)
+    # レスポンス用データを作成（値は検証済みのため再バリデーションは行わない）
+    batch = result.batch
+    success_count = len(batch)
+    duplicate_count = result.duplicate_count
+    with profile_stage("response_construction"):
+        bulk_response: Union[MeasurementBulkCreateResponse, MeasurementBulkCreateMinimalResponse, None] = None
+        if (success_count or duplicate_count) and minimal:
+            bulk_response = MeasurementBulkCreateMinimalResponse(
+                success_count=success_count,
+                failed_count=len(errors),
+                duplicate_count=duplicate_count,
+                ids=batch.ids,
+                errors=errors or None
+            )
+        elif success_count or duplicate_count:
+            bulk_response = MeasurementBulkCreateResponse(
+                success_count=success_count,
+                failed_count=len(errors),
+                duplicate_count=duplicate_count,
+                measurements=[
+                    MeasurementResponse.model_construct(
+                        id=row_id,
+                        metric_type=metric_type,
+                        value=value,
+                        unit=unit,
+                        measured_at=measured_at,
+                        device_id=device_id,
+                        metadata=metadata,
+                        notes=notes,
+                        created_at=batch.created_at,
+                    )
+                    for row_id, metric_type, value, unit, measured_at, device_id, metadata, notes in zip(
+                        batch.ids, batch.metric_types, batch.values, batch.units,
+                        batch.measured_at, batch.device_ids, batch.metadata, batch.notes,
+                        strict=True,
+                    )
+                ],
+                errors=errors or None
             )
-            successful_measurements.append(measurement_response)
-
-        except ValidationError as e:
-            # Pydanticバリデーションエラーの場合
-            for error in e.errors():
-                field_path = ".".join(str(loc) for loc in error["loc"]) if error["loc"] else None
-                errors.append({
-                    "index": index,
-                    "message": error["msg"],
-                    "field": field_path
-                })
-        except ValueError as e:
-            # Measurementエンティティのバリデーションエラー
-            errors.append({
-                "index": index,
-                "message": str(e)
-            })
 
     # ログ出力
     bound_logger.info(
         "Bulk measurement creation completed",
         total_count=len(measurements_data),
-        success_count=len(successful_measurements),
-        failed_count=len(errors)
+        success_count=success_count,
+        failed_count=len(errors),
+        duplicate_count=duplicate_count,
+        response_mode="minimal" if minimal else "full",
+        body_format="columnar" if columnar else "json",
+        **({"timings_ms": profile.timings_ms()} if profile is not None else {})
     )
+    record_bulk_metrics(
+        "bulk_columnar" if columnar else "bulk",
+        total_count=len(measurements_data),
+        success_count=success_count,
+        validation_seconds=result.validation_seconds,
+        persistence_seconds=result.persistence_seconds,
+        duplicate_count=duplicate_count,
+    )
+    if profile is not None:
+        profile.mark_handler_finished()
+
+    # すべて失敗した場合は422（登録済みの測定との重複は失敗としない）
+    if bulk_response is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=errors
+        )
 
     # 一部失敗がある場合は207 Multi-Status
-    if errors and successful_measurements:
-        response.status_code = 207  # Multi-Status
-        return MeasurementBulkCreateResponse(
-            success_count=len(successful_measurements),
-            failed_count=len(errors),
-            measurements=successful_measurements,
-            errors=errors
+    # （モデルを直接シリアライズするため、ステータスとヘッダーもここで指定する）
+    return ModelJSONResponse(
+        bulk_response,
+        status_code=207 if errors else status.HTTP_201_CREATED,
+        headers=headers,
+    )
+
+
+@router.post(
+    "/bulk/stream",
+    response_model=MeasurementStreamCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}}},
+            "description": "1行に1件の測定データ（JSONオブジェクト）を記述したNDJSON",
+        }
+    },
+)
+async def create_measurements_bulk_stream(
+    request: Request,
+    current_user: UserInToken = Depends(get_current_user),
+    repository: MeasurementRepository = Depends(get_measurement_repository),
+    cache: Optional[ResponseCache] = Depends(get_response_cache),
+    archiver: Optional[MeasurementArchiver] = Depends(get_measurement_archiver),
+    goal_evaluator: Optional[GoalEvaluator] = Depends(get_goal_evaluator),
+    row_limiter: Optional[RateLimiter] = Depends(get_row_rate_limiter)
+) -> ModelJSONResponse:
+    """NDJSON形式の測定データをストリームで一括登録する（認証必須）
+
+    リクエストボディ全体を読み込まずに、一定行数ごとにバリデーション・保存する。
+    バッチごとに別トランザクションで保存するため、途中で接続が切れた場合でも
+    それまでのバッチは保存済みとなる。大量データを返さないよう、
+    レスポンスには件数とエラー詳細のみを含める。
+
+    行数の制限はバッチごとに消費する。途中のバッチで上限に達した場合は、
+    それまでのバッチを保存したまま429を返す。
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type != NDJSON_MEDIA_TYPE:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Content-Type must be {NDJSON_MEDIA_TYPE}"
+        )
+
+    bound_logger = logger.bind(
+        user_id=current_user.user_id,
+        user_email=current_user.email
+    )
+    settings = get_settings()
+
+    total_count = 0
+    success_count = 0
+    duplicate_count = 0
+    validation_seconds = 0.0
+    persistence_seconds = 0.0
+    errors: list[dict[str, Any]] = []
+    batch: list[Any] = []
+    batch_indexes: list[int] = []
+
+    async def flush() -> None:
+        nonlocal success_count, duplicate_count, validation_seconds, persistence_seconds
+        await charge_rate_limit(row_limiter, current_user.user_id, len(batch))
+        result = await ingest_rows(
+            batch, current_user.user_id, repository, batch_indexes, cache=cache,
+            archiver=archiver, goal_evaluator=goal_evaluator
         )
+        success_count += len(result.batch)
+        duplicate_count += result.duplicate_count
+        validation_seconds += result.validation_seconds
+        persistence_seconds += result.persistence_seconds
+        errors.extend(result.errors)
+        batch.clear()
+        batch_indexes.clear()
+
+    async for line in _iter_ndjson_lines(request, settings.bulk_stream_max_line_bytes):
+        if not line.strip():
+            continue
+        index = total_count
+        total_count += 1
+        try:
+            batch.append(json.loads(line))
+        except ValueError as e:
+            # JSONとして解釈できない行はバッチに含めずエラーとして記録
+            errors.append({"index": index, "message": f"Invalid JSON: {e}", "field": None})
+            continue
+        batch_indexes.append(index)
+        if len(batch) >= settings.bulk_stream_batch_size:
+            await flush()
+
+    if batch:
+        await flush()
 
-    # すべて失敗した場合は422
-    if errors and not successful_measurements:
+    if total_count == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Measurements stream cannot be empty"
+        )
+
+    # JSONエラーとバッチごとのエラーをインデックス順に並べる
+    errors.sort(key=itemgetter("index"))
+
+    bound_logger.info(
+        "Bulk measurement stream ingestion completed",
+        total_count=total_count,
+        success_count=success_count,
+        failed_count=len(errors),
+        duplicate_count=duplicate_count
+    )
+    record_bulk_metrics(
+        "bulk_stream",
+        total_count=total_count,
+        success_count=success_count,
+        validation_seconds=validation_seconds,
+        persistence_seconds=persistence_seconds,
+        duplicate_count=duplicate_count,
+    )
+
+    if errors and not success_count and not duplicate_count:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=errors
         )
 
-    # すべて成功
-    return MeasurementBulkCreateResponse(
-        success_count=len(successful_measurements),
-        failed_count=0,
-        measurements=successful_measurements,
-        errors=None
+    return ModelJSONResponse(
+        MeasurementStreamCreateResponse(
+            success_count=success_count,
+            failed_count=len(errors),
+            duplicate_count=duplicate_count,
+            errors=errors or None
+        ),
+        status_code=207 if errors else status.HTTP_201_CREATED,  # 一部失敗は207 Multi-Status
+    )
+
+
+@router.get("", response_model=MeasurementPageResponse, response_model_exclude_unset=True)
+async def list_measurements(
+    request: Request,
+    metric_type: Optional[MetricType] = list_metric_type_query,
+    device_id: Optional[str] = list_device_id_query,
+    start: Optional[datetime] = list_start_query,
+    end: Optional[datetime] = list_end_query,
+    cursor: Optional[str] = list_cursor_query,
+    limit: int = list_limit_query,
+    order: SortOrder = list_order_query,
+    fields: Optional[str] = list_fields_query,
+    current_user: UserInToken = Depends(get_current_user),
+    repository: MeasurementRepository = Depends(get_measurement_repository),
+    cache: Optional[ResponseCache] = Depends(get_response_cache)
+) -> Response:
+    """測定データの一覧を取得する（認証必須）
+
+    (measured_at, id)のキーセットページネーションで、レスポンスのnext_cursorを
+    cursorに指定すると続きを取得できる。OFFSETを使わないため、深いページでも
+    取得時間は変わらない。
+
+    レスポンスはキャッシュし、ETagが一致するIf-None-Matchには304を返す。
+    """
+    try:
+        query = MeasurementQuery(
+            user_id=current_user.user_id,
+            limit=limit,
+            metric_type=metric_type,
+            device_id=device_id,
+            start=ensure_utc(start) if start else None,
+            end=ensure_utc(end) if end else None,
+            after=PageCursor.decode(cursor) if cursor else None,
+            order=order,
+            fields=parse_fields(fields),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+    async def build() -> ModelJSONResponse:
+        rows, next_cursor = await repository.fetch_page(query)
+        selected = set(query.fields)
+
+        logger.info(
+            "Measurements listed",
+            user_id=current_user.user_id,
+            count=len(rows),
+            has_next=next_cursor is not None
+        )
+
+        return ModelJSONResponse(
+            MeasurementPageResponse(
+                items=[
+                    MeasurementPageItemResponse.model_construct(selected, **row)
+                    for row in rows
+                ],
+                next_cursor=next_cursor.encode() if next_cursor else None,
+            ),
+            exclude_unset=True,
+        )
+
+    return await cached_json_response(
+        request,
+        cache,
+        "list",
+        CacheScope(current_user.user_id, query.metric_type, query.start, query.end),
+        {
+            "metric_type": query.metric_type,
+            "device_id": query.device_id,
+            "start": query.start,
+            "end": query.end,
+            "after": cursor,
+            "limit": query.limit,
+            "order": query.order,
+            "fields": query.fields,
+        },
+        build,
+    )
+
+
+@router.get("/series", response_model=MeasurementSeriesResponse, response_model_exclude_unset=True)
+async def get_measurements_series(
+    request: Request,
+    metric_type: MetricType = series_metric_type_query,
+    start: datetime = series_start_query,
+    end: Optional[datetime] = series_end_query,
+    points: int = series_points_query,
+    method: SeriesMethod = series_method_query,
+    current_user: UserInToken = Depends(get_current_user),
+    repository: MeasurementRepository = Depends(get_measurement_repository),
+    cache: Optional[ResponseCache] = Depends(get_response_cache)
+) -> Response:
+    """期間内の測定データをグラフ表示用にダウンサンプリングして取得する（認証必須）
+
+    期間の長さや件数によらず、lttbは最大points点、minmaxは最大points個の
+    時間バケットを返すため、レスポンスの大きさは一定になる。
+
+    endを指定した場合はレスポンスをキャッシュし、ETagが一致するIf-None-Matchには
+    304を返す（省略時は現在時刻で期間が毎回変わるためキャッシュしない）。
+    """
+    window_start = ensure_utc(start)
+    window_end = ensure_utc(end) if end else datetime.now(UTC)
+    if window_start >= window_end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must be before end"
+        )
+
+    async def build() -> ModelJSONResponse:
+        timestamps, values = await repository.fetch_series(
+            user_id=current_user.user_id,
+            metric_type=metric_type,
+            start=window_start,
+            end=window_end,
+        )
+        response = MeasurementSeriesResponse.model_construct(
+            metric_type=metric_type.value,
+            method=method.value,
+            start=window_start,
+            end=window_end,
+            source_count=len(values),
+        )
+        if method is SeriesMethod.LTTB:
+            response.points = [
+                SeriesPointResponse.model_construct(measured_at=point.measured_at, value=point.value)
+                for point in downsample_lttb(timestamps, values, points)
+            ]
+        else:
+            response.buckets = [
+                SummaryBucketResponse.model_construct(
+                    bucket_start=bucket.bucket_start,
+                    count=bucket.count,
+                    avg=bucket.mean,
+                    min=bucket.minimum,
+                    max=bucket.maximum,
+                )
+                for bucket in aggregate_series_buckets(
+                    timestamps, values, window_start, window_end, points
+                )
+            ]
+
+        logger.info(
+            "Measurement series requested",
+            user_id=current_user.user_id,
+            metric_type=metric_type.value,
+            method=method.value,
+            source_count=len(values),
+            point_count=len(response.points or response.buckets or [])
+        )
+
+        return ModelJSONResponse(response, exclude_unset=True)
+
+    return await cached_json_response(
+        request,
+        cache if end is not None else None,
+        "series",
+        CacheScope(current_user.user_id, metric_type, window_start, window_end),
+        {"points": points, "method": method, "start": window_start, "end": window_end},
+        build,
+    )
+
+
+@router.get("/summary", response_model=MeasurementSummaryResponse)
+async def get_measurements_summary(
+    request: Request,
+    period: SummaryPeriod = summary_period_query,
+    metric_type: Optional[MetricType] = summary_metric_type_query,
+    end: Optional[datetime] = summary_end_query,
+    current_user: UserInToken = Depends(get_current_user),
+    repository: MeasurementRepository = Depends(get_measurement_repository),
+    cache: Optional[ResponseCache] = Depends(get_response_cache)
+) -> Response:
+    """期間内の測定データのサマリーを取得する（認証必須）
+
+    取り込み時に更新されるロールアップを併合して集計するため、生データは走査しない。
+    dayは時間バケット、week/monthは日バケットを併合する。
+    単位の異なる値（kgとlbなど）は混ぜずに、(メトリックタイプ, 単位)ごとに集計する。
+
+    レスポンスはキャッシュし、ETagが一致するIf-None-Matchには304を返す。
+    集計期間はバケット境界に揃うため、endを省略した場合も同じバケットの間は同じETagになる。
+    """
+    window = summary_window(period, ensure_utc(end) if end else datetime.now(UTC))
+
+    async def build() -> ModelJSONResponse:
+        aggregates = await repository.fetch_rollups(
+            user_id=current_user.user_id,
+            granularity=window.granularity,
+            start=window.start,
+            end=window.end,
+            metric_type=metric_type,
+        )
+        summaries = summarize_by_metric(aggregates)
+
+        logger.info(
+            "Measurement summary requested",
+            user_id=current_user.user_id,
+            period=period.value,
+            metric_count=len(summaries),
+            bucket_count=len(aggregates)
+        )
+
+        return ModelJSONResponse(
+            MeasurementSummaryResponse(
+                period=period,
+                granularity=window.granularity,
+                start=window.start,
+                end=window.end,
+                metrics=[
+                    MetricSummaryResponse(
+                        metric_type=summary.metric_type,
+                        unit=summary.unit,
+                        count=summary.statistics.count,
+                        sum=summary.statistics.total,
+                        avg=summary.statistics.mean,
+                        min=summary.statistics.minimum,
+                        max=summary.statistics.maximum,
+                        stddev=summary.statistics.stddev,
+                        buckets=[
+                            SummaryBucketResponse(
+                                bucket_start=bucket.bucket_start,
+                                count=bucket.statistics.count,
+                                avg=bucket.statistics.mean,
+                                min=bucket.statistics.minimum,
+                                max=bucket.statistics.maximum,
+                            )
+                            for bucket in summary.buckets
+                        ],
+                    )
+                    for summary in summaries
+                ],
+            )
+        )
+
+    return await cached_json_response(
+        request,
+        cache,
+        "summary",
+        CacheScope(current_user.user_id, metric_type, window.start, window.end),
+        {"period": period, "metric_type": metric_type, "start": window.start},
+        build,
     )
@@ -0,0 +1,125 @@
+"""時刻順に並ぶ識別子（UUIDv7、RFC 9562）の生成
+
+先頭48ビットがミリ秒単位のUnix時刻のため、生成順に主キーのB-treeの末尾へ
+追記され、ランダムなUUIDv4のようにInnoDBのクラスタインデックス全体へ
+挿入が分散しない。同じミリ秒内（および時計が戻った場合）は残りの
+74ビットを1ずつ増やすため、プロセス内では常に単調増加する。
+"""
+import os
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+_COUNTER_BITS = 74
+_COUNTER_MAX = (1 << _COUNTER_BITS) - 1
+_RAND_B_BITS = 62
+_RAND_B_MASK = (1 << _RAND_B_BITS) - 1
+# バージョン（0111）とバリアント（10）のビット
+_VERSION_AND_VARIANT = (0x7 << 76) | (0b10 << 62)
+
+
+def _format(value: int) -> str:
+    """128ビット整数をハイフン付きの16進文字列に変換する"""
+    h = f"{value:032x}"
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+class UUIDv7Generator:
+    """プロセス内で単調増加するUUIDv7の生成器（スレッドセーフ）"""
+
+    def __init__(
+        self,
+        clock: Callable[[], int] | None = None,
+        random_bytes: Callable[[int], bytes] = os.urandom,
+    ) -> None:
+        """
+        Args:
+            clock: 現在時刻（Unixエポックからのミリ秒）を返す関数（省略時はtime.time_ns）
+            random_bytes: 乱数のバイト列を返す関数
+        """
+        self._clock = clock
+        self._random_bytes = random_bytes
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._last_counter = 0
+
+    def _now_ms(self) -> int:
+        if self._clock is not None:
+            return self._clock()
+        return time.time_ns() // 1_000_000
+
+    def _random_counter(self) -> int:
+        """ミリ秒が進んだときのカウンター初期値（上位1ビットを0にして桁あふれの余裕を残す）"""
+        return int.from_bytes(self._random_bytes(10), "big") >> (80 - _COUNTER_BITS + 1)
+
+    def _reserve(self, count: int) -> tuple[int, int]:
+        """count個分の(ミリ秒, 先頭カウンター)を確保する"""
+        with self._lock:
+            now = self._now_ms()
+            if now > self._last_ms:
+                timestamp, counter = now, self._random_counter()
+            else:
+                # 同じミリ秒内、または時計が戻った場合は前回の値から続ける
+                timestamp, counter = self._last_ms, self._last_counter + 1
+            if counter + count - 1 > _COUNTER_MAX:
+                timestamp, counter = timestamp + 1, self._random_counter()
+            self._last_ms = timestamp
+            self._last_counter = counter + count - 1
+        return timestamp, counter
+
+    def generate(self) -> str:
+        """UUIDv7を1つ生成する"""
+        return self.generate_batch(1)[0]
+
+    def generate_batch(self, count: int) -> list[str]:
+        """
+        UUIDv7をまとめて生成する（時刻の取得と乱数の生成はバッチで1回）
+
+        Args:
+            count: 生成する数
+
+        Returns:
+            昇順に並んだUUIDv7の文字列
+        """
+        if count <= 0:
+            return []
+        timestamp, first = self._reserve(count)
+        prefix = (timestamp << 80) | _VERSION_AND_VARIANT
+        return [
+            _format(prefix | ((counter >> _RAND_B_BITS) << 64) | (counter & _RAND_B_MASK))
+            for counter in range(first, first + count)
+        ]
+
+
+_generator = UUIDv7Generator()
+
+
+def uuid7() -> str:
+    """UUIDv7を1つ生成する（プロセス共有の生成器を使用）"""
+    return _generator.generate()
+
+
+def uuid7_batch(count: int) -> list[str]:
+    """UUIDv7をまとめて生成する（プロセス共有の生成器を使用）"""
+    return _generator.generate_batch(count)
+
+
+def uuid7_datetime(value: str) -> datetime:
+    """
+    UUIDv7に含まれる生成時刻を取得する
+
+    Args:
+        value: UUIDv7の文字列
+
+    Returns:
+        ミリ秒精度のUTC日時
+
+    Raises:
+        ValueError: UUIDv7でない場合
+    """
+    parsed = uuid.UUID(value)
+    if parsed.version != 7:
+        raise ValueError(f"Not a UUIDv7: {value}")
+    return datetime.fromtimestamp((parsed.int >> 80) / 1000, UTC)
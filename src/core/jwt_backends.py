@@ -0,0 +1,280 @@
+"""
+JWTのエンコード・デコードを行うバックエンド
+
+python-joseによる実装と、HS256専用にhmac/hashlibで署名検証する軽量実装を提供する。
+どちらのバックエンドも同じトークンを受理・拒否し、拒否時はpython-joseと同じ
+例外（JWTError、ExpiredSignatureError、JWTClaimsError）を送出する。
+"""
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from calendar import timegm
+from datetime import datetime
+from typing import Any, Callable, Dict, Mapping, Optional, Protocol
+
+from jose import jwt
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError, JWTError
+
+
+class JWTBackend(Protocol):
+    """JWTバックエンドのインターフェース"""
+
+    name: str
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        """クレームを署名付きJWTにエンコードする"""
+        ...
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """JWTの署名と登録済みクレームを検証してペイロードを返す"""
+        ...
+
+
+class JoseJWTBackend:
+    """python-joseによるJWTバックエンド"""
+
+    name = "jose"
+
+    def __init__(self, secret_key: str, algorithm: str = "HS256") -> None:
+        """
+        Args:
+            secret_key: 署名鍵
+            algorithm: 署名アルゴリズム
+        """
+        self._secret_key = secret_key
+        self._algorithm = algorithm
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        """クレームを署名付きJWTにエンコードする"""
+        return jwt.encode(dict(claims), self._secret_key, algorithm=self._algorithm)
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """
+        JWTの署名と登録済みクレームを検証してペイロードを返す
+
+        Raises:
+            JWTError: トークンが無効な場合
+        """
+        return jwt.decode(token, self._secret_key, algorithms=[self._algorithm])
+
+
+def _base64url_encode(data: bytes) -> bytes:
+    """パディングなしのbase64urlエンコード"""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _base64url_decode(data: bytes) -> bytes:
+    """パディングを補ってbase64urlデコードする（python-joseと同じ寛容さ）"""
+    remainder = len(data) % 4
+    if remainder:
+        data += b"=" * (4 - remainder)
+    return base64.urlsafe_b64decode(data)
+
+
+def _int_claim(claims: Mapping[str, Any], name: str, message: str) -> int:
+    """数値クレームを整数として取り出す"""
+    try:
+        return int(claims[name])
+    except (TypeError, ValueError) as e:
+        raise JWTClaimsError(message) from e
+
+
+_TIME_CLAIMS = ("exp", "iat", "nbf")
+
+
+class HMACJWTBackend:
+    """HS256専用の軽量JWTバックエンド
+
+    ヘッダーのエンコード結果と鍵を設定済みのHMACオブジェクトを事前に用意し、
+    トークンごとの処理をbase64url・JSON変換とHMAC計算だけにする。
+    エンコード結果はpython-joseとバイト単位で一致し、デコード時の検証内容
+    （アルゴリズム、署名、exp/nbf/iat/aud/sub/jti/at_hash）もpython-joseの
+    デフォルト設定に合わせている。
+    """
+
+    name = "hmac"
+    algorithm = "HS256"
+
+    def __init__(
+        self,
+        secret_key: str,
+        algorithm: str = "HS256",
+        clock: Optional[Callable[[], float]] = None,
+    ) -> None:
+        """
+        Args:
+            secret_key: 署名鍵
+            algorithm: 署名アルゴリズム（HS256のみ対応）
+            clock: 現在時刻（エポック秒）を返す関数（省略時はtime.time）
+
+        Raises:
+            ValueError: HS256以外のアルゴリズムが指定された場合
+        """
+        if algorithm != self.algorithm:
+            raise ValueError(f"HMACJWTBackend supports only {self.algorithm}, got {algorithm}")
+        self._clock = clock
+        self._mac = hmac.new(secret_key.encode("utf-8"), digestmod=hashlib.sha256)
+        header = json.dumps(
+            {"alg": self.algorithm, "typ": "JWT"},
+            separators=(",", ":"),
+            sort_keys=True,
+        ).encode("utf-8")
+        self._encoded_header = _base64url_encode(header)
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        """署名対象のHMAC-SHA256を計算する"""
+        mac = self._mac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        """クレームを署名付きJWTにエンコードする"""
+        if any(isinstance(claims.get(name), datetime) for name in _TIME_CLAIMS):
+            claims = dict(claims)
+            for name in _TIME_CLAIMS:
+                value = claims.get(name)
+                if isinstance(value, datetime):
+                    claims[name] = timegm(value.utctimetuple())
+
+        payload = json.dumps(claims, separators=(",", ":")).encode("utf-8")
+        signing_input = self._encoded_header + b"." + _base64url_encode(payload)
+        signature = _base64url_encode(self._sign(signing_input))
+        return (signing_input + b"." + signature).decode("utf-8")
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """
+        JWTの署名と登録済みクレームを検証してペイロードを返す
+
+        Raises:
+            JWTError: トークンが無効な場合
+            ExpiredSignatureError: トークンの有効期限が切れている場合
+            JWTClaimsError: 登録済みクレームの形式・値が不正な場合
+        """
+        raw = token.encode("utf-8") if isinstance(token, str) else token
+        signing_input, header, payload, signature = self._split(raw)
+        self._verify(header, signing_input, signature)
+
+        try:
+            claims = json.loads(payload.decode("utf-8"))
+        except ValueError as e:
+            raise JWTError(f"Invalid payload string: {e}") from e
+        if not isinstance(claims, Mapping):
+            raise JWTError("Invalid payload string: must be a json object")
+
+        self._validate_claims(claims)
+        return claims
+
+    @staticmethod
+    def _split(raw: bytes) -> tuple[bytes, Mapping[str, Any], bytes, bytes]:
+        """トークンを署名対象・ヘッダー・ペイロード・署名に分解する"""
+        try:
+            signing_input, crypto_segment = raw.rsplit(b".", 1)
+            header_segment, claims_segment = signing_input.split(b".", 1)
+            header_data = _base64url_decode(header_segment)
+        except ValueError as e:
+            raise JWTError("Not enough segments") from e
+        except (TypeError, binascii.Error) as e:
+            raise JWTError("Invalid header padding") from e
+
+        try:
+            header = json.loads(header_data.decode("utf-8"))
+        except ValueError as e:
+            raise JWTError(f"Invalid header string: {e}") from e
+        if not isinstance(header, Mapping):
+            raise JWTError("Invalid header string: must be a json object")
+
+        try:
+            payload = _base64url_decode(claims_segment)
+            signature = _base64url_decode(crypto_segment)
+        except (TypeError, binascii.Error) as e:
+            raise JWTError("Invalid payload padding") from e
+        return signing_input, header, payload, signature
+
+    def _verify(self, header: Mapping[str, Any], signing_input: bytes, signature: bytes) -> None:
+        """ヘッダーのアルゴリズムと署名を検証する"""
+        alg = header.get("alg")
+        if not alg:
+            raise JWTError("No algorithm was specified in the JWS header.")
+        if alg != self.algorithm:
+            raise JWTError("The specified alg value is not allowed")
+        if not hmac.compare_digest(signature, self._sign(signing_input)):
+            raise JWTError("Signature verification failed.")
+
+    def _validate_claims(self, claims: Mapping[str, Any]) -> None:
+        """登録済みクレームをpython-joseと同じ順序・条件で検証する"""
+        self._validate_time_claims(claims)
+        self._validate_audience(claims)
+
+        if "sub" in claims and not isinstance(claims["sub"], str):
+            raise JWTClaimsError("Subject must be a string.")
+
+        if "jti" in claims and not isinstance(claims["jti"], str):
+            raise JWTClaimsError("JWT ID must be a string.")
+
+        # access_tokenを渡さないため、at_hashクレームを含むトークンは常に拒否される
+        if "at_hash" in claims:
+            raise JWTClaimsError("No access_token provided to compare against at_hash claim.")
+
+    def _validate_time_claims(self, claims: Mapping[str, Any]) -> None:
+        """iat・nbf・expクレームを検証する"""
+        if "iat" in claims:
+            _int_claim(claims, "iat", "Issued At claim (iat) must be an integer.")
+
+        now = int(self._clock() if self._clock is not None else time.time())
+        if "nbf" in claims:
+            nbf = _int_claim(claims, "nbf", "Not Before claim (nbf) must be an integer.")
+            if nbf > now:
+                raise JWTClaimsError("The token is not yet valid (nbf)")
+
+        if "exp" in claims:
+            exp = _int_claim(claims, "exp", "Expiration Time claim (exp) must be an integer.")
+            if exp < now:
+                raise ExpiredSignatureError("Signature has expired.")
+
+    @staticmethod
+    def _validate_audience(claims: Mapping[str, Any]) -> None:
+        """audクレームを検証する"""
+        # audienceを指定しないため、audクレームを含むトークンは常に拒否される
+        if "aud" not in claims:
+            return
+        audience_claims = claims["aud"]
+        if isinstance(audience_claims, str):
+            audience_claims = [audience_claims]
+        if not isinstance(audience_claims, list) or any(
+            not isinstance(c, str) for c in audience_claims
+        ):
+            raise JWTClaimsError("Invalid claim format in token")
+        raise JWTClaimsError("Invalid audience")
+
+
+JWT_BACKENDS: Dict[str, Callable[..., JWTBackend]] = {
+    JoseJWTBackend.name: JoseJWTBackend,
+    HMACJWTBackend.name: HMACJWTBackend,
+}
+
+
+def create_jwt_backend(name: str, secret_key: str, algorithm: str = "HS256") -> JWTBackend:
+    """
+    名前からJWTバックエンドを生成する
+
+    Args:
+        name: バックエンド名（"jose" または "hmac"）
+        secret_key: 署名鍵
+        algorithm: 署名アルゴリズム
+
+    Returns:
+        JWTバックエンド
+
+    Raises:
+        ValueError: 未知のバックエンド名が指定された場合
+    """
+    try:
+        backend_class = JWT_BACKENDS[name]
+    except KeyError as e:
+        raise ValueError(
+            f"Unknown JWT backend: {name} (expected one of {', '.join(sorted(JWT_BACKENDS))})"
+        ) from e
+    return backend_class(secret_key, algorithm)
@@ -1,36 +1,282 @@
 """構造化ロギングの設定と管理"""
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
 import sys
-from datetime import UTC
-from typing import Any, Optional
+import threading
+import time
+from datetime import UTC, datetime
+from typing import Any, Callable, Literal, Optional
 
 import structlog
 from structlog.types import EventDict, Processor
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjsonは任意の依存
+    orjson = None
+
+OverflowPolicy = Literal["drop_newest", "drop_oldest", "block"]
+JSONSerializerName = Literal["json", "orjson"]
+
 
 def add_timestamp(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
     """タイムスタンプをISO形式で追加"""
-    from datetime import datetime
     event_dict["timestamp"] = datetime.now(UTC).isoformat().replace("+00:00", "Z")
     return event_dict
 
 
-def configure_logging(log_level: str = "INFO") -> None:
+class CachedTimestamper:
+    """秒単位までの書式化結果をキャッシュしてタイムスタンプを追加するプロセッサ
+
+    出力はadd_timestampと同じISO形式（マイクロ秒が0の場合は省略）で、
+    同じ秒に発生したイベントではdatetimeの生成と書式化を省略する。
+    """
+
+    def __init__(self) -> None:
+        # (秒, プレフィックス)を1つの属性で保持し、複数スレッドから呼ばれても組を整合させる
+        self._cache: tuple[Optional[int], str] = (None, "")
+
+    def __call__(self, logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
+        # 浮動小数点の丸めでマイクロ秒がずれないよう、整数のナノ秒から求める
+        second, nanosecond = divmod(time.time_ns(), 1_000_000_000)
+        cached_second, prefix = self._cache
+        if second != cached_second:
+            prefix = datetime.fromtimestamp(second, UTC).strftime("%Y-%m-%dT%H:%M:%S")
+            self._cache = (second, prefix)
+        microsecond = nanosecond // 1_000
+        if microsecond:
+            event_dict["timestamp"] = f"{prefix}.{microsecond:06d}Z"
+        else:
+            event_dict["timestamp"] = f"{prefix}Z"
+        return event_dict
+
+
+def _orjson_dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None, **kwargs: Any) -> str:
+    """orjsonでJSON文字列にシリアライズする（JSONRendererのserializer互換）"""
+    return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+def get_json_serializer(name: JSONSerializerName = "json") -> Callable[..., str]:
+    """
+    JSONRendererで使うシリアライザを取得
+
+    Args:
+        name: "json"（標準ライブラリ）または "orjson"
+
+    Returns:
+        シリアライザ関数（orjsonが未インストールの場合は標準ライブラリ）
+
+    Raises:
+        ValueError: 未知のシリアライザ名が指定された場合
+    """
+    if name == "json":
+        return json.dumps
+    if name == "orjson":
+        return _orjson_dumps if orjson is not None else json.dumps
+    raise ValueError(f"Unknown JSON serializer: {name}")
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """上限付きキューに書き込むQueueHandler
+
+    キューが満杯のときはoverflow_policyに従って処理する。
+
+    - drop_newest: 新しいレコードを破棄する
+    - drop_oldest: 最も古いレコードを破棄して新しいレコードを追加する
+    - block: 空きができるまで待つ（イベントループが停止する可能性がある）
+    """
+
+    def __init__(self, log_queue: "queue.Queue[Any]", overflow_policy: OverflowPolicy = "drop_newest") -> None:
+        """
+        Args:
+            log_queue: 書き込み先のキュー（maxsizeで上限を指定）
+            overflow_policy: キューが満杯のときの処理方法
+
+        Raises:
+            ValueError: 未知のポリシーが指定された場合
+        """
+        if overflow_policy not in ("drop_newest", "drop_oldest", "block"):
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        super().__init__(log_queue)
+        self.overflow_policy = overflow_policy
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def _count_drop(self) -> None:
+        with self._dropped_lock:
+            self.dropped += 1
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """ポリシーに従ってレコードをキューに追加する"""
+        if self.overflow_policy == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            if self.overflow_policy == "drop_newest":
+                self._count_drop()
+                return
+        # drop_oldest: 古いレコードを1件捨てて再試行する
+        try:
+            self.queue.get_nowait()
+            self._count_drop()
+        except queue.Empty:
+            pass
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self._count_drop()
+
+
+class BatchStreamHandler(logging.StreamHandler):
+    """複数のレコードをまとめて1回の書き込みとフラッシュで出力するハンドラー"""
+
+    def emit_batch(self, records: list[logging.LogRecord]) -> None:
+        """
+        レコードをまとめて出力する
+
+        Args:
+            records: 出力するレコード
+        """
+        try:
+            text = "".join(self.format(record) + self.terminator for record in records)
+            with self.lock:
+                self.stream.write(text)
+                self.flush()
+        except Exception:
+            self.handleError(records[-1])
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """キューからレコードをまとめて取り出し、バックグラウンドスレッドで出力するリスナー"""
+
+    def __init__(self, log_queue: "queue.Queue[Any]", handler: BatchStreamHandler, batch_size: int = 100) -> None:
+        """
+        Args:
+            log_queue: 読み出し元のキュー
+            handler: 出力先ハンドラー
+            batch_size: 1回の書き込みにまとめる最大レコード数
+        """
+        super().__init__(log_queue, handler)
+        self.batch_size = max(1, batch_size)
+
+    def enqueue_sentinel(self) -> None:
+        """停止用の番兵は満杯でも破棄されないようブロッキングで追加する"""
+        self.queue.put(self._sentinel)
+
+    def _flush(self, batch: list[logging.LogRecord]) -> None:
+        if batch:
+            for handler in self.handlers:
+                handler.emit_batch(batch)
+
+    def _monitor(self) -> None:
+        """最初のレコードを待ち、続くレコードをbatch_size件まで取り出して出力する"""
+        q = self.queue
+        while True:
+            record = self.dequeue(True)
+            batch: list[logging.LogRecord] = []
+            stop = record is self._sentinel
+            if not stop:
+                batch.append(self.prepare(record))
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    record = self.dequeue(False)
+                except queue.Empty:
+                    break
+                if record is self._sentinel:
+                    stop = True
+                else:
+                    batch.append(self.prepare(record))
+            self._flush(batch)
+            for _ in range(len(batch) + int(stop)):
+                q.task_done()
+            if stop:
+                break
+
+
+_listener: Optional[BatchingQueueListener] = None
+_queue_handler: Optional[BoundedQueueHandler] = None
+_atexit_registered = False
+
+
+def shutdown_logging() -> None:
+    """非同期ロギングのリスナーを停止し、キューに残ったレコードを出力する"""
+    global _listener, _queue_handler
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    _queue_handler = None
+
+
+def get_logging_stats() -> dict[str, int]:
+    """
+    非同期ロギングのキュー状態を取得
+
+    Returns:
+        queued（キュー内のレコード数）、dropped（破棄したレコード数）を含む辞書
+        （非同期モードでない場合は0）
+    """
+    if _queue_handler is None:
+        return {"queued": 0, "dropped": 0}
+    return {"queued": _queue_handler.queue.qsize(), "dropped": _queue_handler.dropped}
+
+
+def configure_logging(
+    log_level: str = "INFO",
+    async_mode: bool = False,
+    queue_size: int = 10000,
+    batch_size: int = 100,
+    overflow_policy: OverflowPolicy = "drop_newest",
+    json_serializer: JSONSerializerName = "json",
+) -> None:
     """構造化ロギングを設定
 
+    非同期モードではログを呼び出し元でJSONにレンダリングして上限付きキューに積み、
+    バックグラウンドスレッドがまとめて標準出力に書き込む。標準出力が詰まっても
+    イベントループは停止しない（キューが満杯の場合はoverflow_policyに従う）。
+
     Args:
         log_level: ログレベル (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        async_mode: キュー経由でバックグラウンドスレッドから出力するかどうか
+        queue_size: 非同期モードのキューの上限
+        batch_size: 非同期モードで1回の書き込みにまとめる最大レコード数
+        overflow_policy: キューが満杯のときの処理方法
+        json_serializer: JSONシリアライザ ("json" または "orjson")
     """
+    global _listener, _queue_handler, _atexit_registered
+
+    # 前回の非同期リスナーを停止
+    shutdown_logging()
+
     # 既存のハンドラーをクリア
     logging.root.handlers = []
 
-    # Python標準ロギングの設定
-    logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
-        level=getattr(logging, log_level.upper()),
-        force=True,
-    )
+    level = getattr(logging, log_level.upper())
+    if async_mode:
+        log_queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        stream_handler = BatchStreamHandler(sys.stdout)
+        stream_handler.setFormatter(logging.Formatter("%(message)s"))
+        _queue_handler = BoundedQueueHandler(log_queue, overflow_policy=overflow_policy)
+        _queue_handler.setFormatter(logging.Formatter("%(message)s"))
+        _listener = BatchingQueueListener(log_queue, stream_handler, batch_size=batch_size)
+        _listener.start()
+        logging.basicConfig(handlers=[_queue_handler], level=level, force=True)
+        if not _atexit_registered:
+            atexit.register(shutdown_logging)
+            _atexit_registered = True
+    else:
+        # Python標準ロギングの設定
+        logging.basicConfig(
+            format="%(message)s",
+            stream=sys.stdout,
+            level=level,
+            force=True,
+        )
 
     # structlogの設定
     processors: list[Processor] = [
@@ -38,8 +284,8 @@ def configure_logging(log_level: str = "INFO") -> None:
         structlog.stdlib.add_log_level,
         # ログ名を追加
         structlog.stdlib.add_logger_name,
-        # タイムスタンプを追加
-        add_timestamp,
+        # タイムスタンプを追加（秒単位の書式化結果を再利用）
+        CachedTimestamper(),
         # 位置引数をフォーマット
         structlog.stdlib.PositionalArgumentsFormatter(),
         # スタックトレースをレンダリング
@@ -51,7 +297,7 @@ def configure_logging(log_level: str = "INFO") -> None:
         # Unicode文字をデコード
         structlog.processors.UnicodeDecoder(),
         # JSON形式で出力
-        structlog.processors.JSONRenderer(),
+        structlog.processors.JSONRenderer(serializer=get_json_serializer(json_serializer)),
     ]
 
     structlog.configure(
@@ -0,0 +1,352 @@
+"""Prometheusテキスト形式のメトリクス
+
+外部ライブラリに依存しない最小限のカウンター・ヒストグラムと、
+アプリケーションで使うメトリクスの定義を提供する。
+
+記録はスレッドごとのシャードに対して行うため、記録時にロックを取らない
+（シャードの追加時と収集時のみロックする）。メトリクスはプロセス単位で
+集計されるため、複数ワーカーで起動した場合は各ワーカーが自身の値を公開する。
+"""
+import bisect
+import math
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from typing import Optional, TypeVar
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    """Prometheusの数値表記に変換する"""
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape_label_value(str(value))}"'
+        for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    """スレッドごとのシャードを持つメトリクスの基底クラス"""
+
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: list[dict[LabelValues, list[float]]] = []
+
+    def _new_shard(self) -> list[float]:
+        raise NotImplementedError
+
+    def _shard(self, labels: LabelValues) -> list[float]:
+        """現在のスレッドのシャードを取得する（初回のみロックして登録）"""
+        shards = getattr(self._local, "shards", None)
+        if shards is None:
+            shards = self._local.shards = {}
+            with self._lock:
+                self._shards.append(shards)
+        shard = shards.get(labels)
+        if shard is None:
+            if len(labels) != len(self.label_names):
+                raise ValueError(
+                    f"{self.name} expects labels {self.label_names}, got {labels}"
+                )
+            shard = self._new_shard()
+            with self._lock:
+                shards[labels] = shard
+        return shard
+
+    def _merged(self) -> dict[LabelValues, list[float]]:
+        """全スレッドのシャードをラベルごとに合算する"""
+        merged: dict[LabelValues, list[float]] = {}
+        with self._lock:
+            for shards in self._shards:
+                for labels, shard in list(shards.items()):
+                    total = merged.get(labels)
+                    if total is None:
+                        merged[labels] = list(shard)
+                    else:
+                        for i, value in enumerate(shard):
+                            total[i] += value
+        return merged
+
+    def clear(self) -> None:
+        """記録済みの値をすべて破棄する（テスト用）"""
+        with self._lock:
+            for shards in self._shards:
+                shards.clear()
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Prometheusテキスト形式で出力する"""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+        lines.extend(self._samples())
+        return "\n".join(lines) + "\n"
+
+
+class Counter(_Metric):
+    """単調増加するカウンター"""
+
+    metric_type = "counter"
+
+    def _new_shard(self) -> list[float]:
+        return [0]
+
+    def inc(self, amount: float = 1, labels: LabelValues = ()) -> None:
+        """
+        カウンターを増やす
+
+        Args:
+            amount: 増分
+            labels: ラベル値（label_namesと同じ順序）
+        """
+        self._shard(labels)[0] += amount
+
+    def _samples(self) -> Iterable[str]:
+        for labels, (value,) in sorted(self._merged().items()):
+            yield f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    """累積バケットを持つヒストグラム"""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Sequence[float],
+        label_names: Sequence[str] = (),
+    ) -> None:
+        """
+        Args:
+            name: メトリクス名
+            documentation: 説明
+            buckets: バケットの上限値（昇順、+Infは自動で追加）
+            label_names: ラベル名
+
+        Raises:
+            ValueError: バケットが昇順でない場合
+        """
+        super().__init__(name, documentation, label_names)
+        bounds = [float(bound) for bound in buckets if bound != math.inf]
+        if bounds != sorted(set(bounds)):
+            raise ValueError("Histogram buckets must be sorted and unique")
+        self.buckets = tuple(bounds)
+
+    def _new_shard(self) -> list[float]:
+        # [バケットごとの件数..., +Infの件数, 合計値]
+        return [0] * (len(self.buckets) + 1) + [0.0]
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        """
+        値を記録する
+
+        Args:
+            value: 観測値
+            labels: ラベル値（label_namesと同じ順序）
+        """
+        shard = self._shard(labels)
+        shard[bisect.bisect_left(self.buckets, value)] += 1
+        shard[-1] += value
+
+    def _samples(self) -> Iterable[str]:
+        bucket_labels = self.label_names + ("le",)
+        for labels, shard in sorted(self._merged().items()):
+            cumulative = 0
+            # 末尾の合計値を除いた件数をバケットの上限と対応させる
+            counts = shard[:-1]
+            for bound, count in zip(self.buckets + (math.inf,), counts, strict=True):
+                cumulative += count
+                le = _format_value(bound)
+                yield f"{self.name}_bucket{_format_labels(bucket_labels, labels + (le,))} {cumulative}"
+            label_text = _format_labels(self.label_names, labels)
+            yield f"{self.name}_sum{label_text} {_format_value(shard[-1])}"
+            yield f"{self.name}_count{label_text} {cumulative}"
+
+
+class CallbackMetric:
+    """収集時に関数を呼び出して値を得るメトリクス（gauge/counter）"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], float],
+        metric_type: str = "gauge",
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.metric_type = metric_type
+        self._callback = callback
+
+    def render(self) -> str:
+        """Prometheusテキスト形式で出力する"""
+        return (
+            f"# HELP {self.name} {self.documentation}\n"
+            f"# TYPE {self.name} {self.metric_type}\n"
+            f"{self.name} {_format_value(self._callback())}\n"
+        )
+
+
+MetricT = TypeVar("MetricT", bound="_Metric | CallbackMetric")
+
+
+class MetricsRegistry:
+    """メトリクスの登録と一括出力"""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric | CallbackMetric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: MetricT) -> MetricT:
+        """
+        メトリクスを登録する（同名のメトリクスは置き換える）
+
+        Returns:
+            登録したメトリクス
+        """
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional["_Metric | CallbackMetric"]:
+        """名前からメトリクスを取得する"""
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """登録済みのメトリクスをすべてPrometheusテキスト形式で出力する"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "".join(metric.render() for metric in metrics)
+
+
+REGISTRY = MetricsRegistry()
+
+# レイテンシ目標（p95 < 200ms、p99 < 500ms）を判定できるよう0.2と0.5を含める
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.2, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+ROW_BUCKETS = (1, 10, 100, 500, 1_000, 5_000, 10_000, 50_000, 100_000)
+RATIO_BUCKETS = (0.0, 0.01, 0.05, 0.1, 0.25, 0.5, 0.75, 1.0)
+
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency in seconds",
+    LATENCY_BUCKETS,
+    ("method", "route", "status"),
+))
+HTTP_REQUEST_SIZE = REGISTRY.register(Histogram(
+    "http_request_size_bytes",
+    "HTTP request body size in bytes",
+    SIZE_BUCKETS,
+    ("method", "route"),
+))
+HTTP_RESPONSE_SIZE = REGISTRY.register(Histogram(
+    "http_response_size_bytes",
+    "HTTP response body size in bytes",
+    SIZE_BUCKETS,
+    ("method", "route", "status"),
+))
+BULK_ROWS = REGISTRY.register(Histogram(
+    "bulk_ingest_rows",
+    "Rows received per bulk ingest request",
+    ROW_BUCKETS,
+    ("endpoint",),
+))
+BULK_VALIDATION_DURATION = REGISTRY.register(Histogram(
+    "bulk_ingest_validation_duration_seconds",
+    "Time spent validating bulk ingest rows in seconds",
+    LATENCY_BUCKETS,
+    ("endpoint",),
+))
+BULK_PERSISTENCE_DURATION = REGISTRY.register(Histogram(
+    "bulk_ingest_persistence_duration_seconds",
+    "Time spent persisting bulk ingest rows in seconds",
+    LATENCY_BUCKETS,
+    ("endpoint",),
+))
+BULK_DUPLICATE_ROWS = REGISTRY.register(Counter(
+    "bulk_ingest_duplicate_rows_total",
+    "Rows skipped as already stored measurements",
+    ("endpoint",),
+))
+INGEST_WRITE_ROWS = REGISTRY.register(Histogram(
+    "ingest_worker_write_rows",
+    "Rows per coalesced write by the asynchronous ingest workers",
+    ROW_BUCKETS,
+))
+ARCHIVE_ROWS = REGISTRY.register(Counter(
+    "archive_rows_total",
+    "Measurement rows written to archive files",
+))
+ARCHIVE_WRITE_FAILURES = REGISTRY.register(Counter(
+    "archive_write_failures_total",
+    "Archive file writes that failed and were retried later",
+))
+ARCHIVE_DROPPED_ROWS = REGISTRY.register(Counter(
+    "archive_dropped_rows_total",
+    "Buffered archive rows dropped because the buffer limit was reached",
+))
+GOALS_ACHIEVED = REGISTRY.register(Counter(
+    "goals_achieved_total",
+    "Goal periods newly achieved by ingested measurements",
+    ("period",),
+))
+WEBHOOK_DELIVERIES = REGISTRY.register(Counter(
+    "webhook_deliveries_total",
+    "Webhook delivery attempts by result (delivered, retried, dead_lettered)",
+    ("result",),
+))
+WEBHOOK_DELIVERY_DURATION = REGISTRY.register(Histogram(
+    "webhook_delivery_duration_seconds",
+    "Webhook delivery request latency",
+    LATENCY_BUCKETS,
+))
+WEBHOOK_DELIVERY_EVENTS = REGISTRY.register(Histogram(
+    "webhook_delivery_events",
+    "Events batched into one webhook delivery",
+    ROW_BUCKETS,
+))
+RATE_LIMITED_REQUESTS = REGISTRY.register(Counter(
+    "rate_limited_requests_total",
+    "Requests rejected by the per-user rate limits",
+    ("limit",),
+))
+RESPONSE_CACHE_REQUESTS = REGISTRY.register(Counter(
+    "response_cache_requests_total",
+    "Cached read requests by result (hit, miss, not_modified, error)",
+    ("endpoint", "result"),
+))
+BULK_FAILED_RATIO = REGISTRY.register(Histogram(
+    "bulk_ingest_failed_row_ratio",
+    "Ratio of rejected rows per bulk ingest request",
+    RATIO_BUCKETS,
+    ("endpoint",),
+))
@@ -0,0 +1,96 @@
+"""リクエスト単位の処理段階ごとの計測
+
+プロファイリング対象のリクエストではRequestProfileをコンテキスト変数に設定し、
+ハンドラー内の各段階の処理時間を記録する。対象外のリクエストでは
+profile_stageは何もしないコンテキストマネージャーを返すため、計測コストはほぼかからない。
+"""
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar, Token
+from typing import Optional
+
+_NULL_STAGE = nullcontext()
+
+
+class RequestProfile:
+    """1リクエストの処理段階ごとの所要時間"""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.handler_finished: Optional[float] = None
+        self.stages: dict[str, float] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        段階の所要時間を加算する
+
+        Args:
+            name: 段階名
+            seconds: 所要時間（秒）
+        """
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """withブロックの所要時間を段階として記録する"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def mark_handler_started(self, name: str = "request_parsing") -> None:
+        """リクエスト受信からハンドラー開始まで（ボディの解析・認証）を段階として記録する"""
+        self.record(name, time.perf_counter() - self.started)
+
+    def mark_handler_finished(self) -> None:
+        """ハンドラーの終了時刻を記録する（以降をレスポンスのシリアライズとみなす）"""
+        self.handler_finished = time.perf_counter()
+
+    def timings_ms(self) -> dict[str, float]:
+        """段階ごとの所要時間（ミリ秒）"""
+        return {name: round(seconds * 1000, 3) for name, seconds in self.stages.items()}
+
+    def server_timing(self) -> str:
+        """Server-Timingヘッダーの値"""
+        return ", ".join(
+            f"{name};dur={milliseconds:.3f}" for name, milliseconds in self.timings_ms().items()
+        )
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    """現在のリクエストのRequestProfile（プロファイリング対象外の場合はNone）"""
+    return _current_profile.get()
+
+
+def start_profile() -> tuple[RequestProfile, Token[Optional[RequestProfile]]]:
+    """
+    現在のコンテキストでプロファイリングを開始する
+
+    Returns:
+        RequestProfileと、stop_profileに渡すトークン
+    """
+    profile = RequestProfile()
+    return profile, _current_profile.set(profile)
+
+
+def stop_profile(token: Token[Optional[RequestProfile]]) -> None:
+    """start_profileで開始したプロファイリングを終了する"""
+    _current_profile.reset(token)
+
+
+def profile_stage(name: str) -> AbstractContextManager[None]:
+    """
+    プロファイリング対象のリクエストであればwithブロックの所要時間を記録する
+
+    Args:
+        name: 段階名
+    """
+    profile = _current_profile.get()
+    if profile is None:
+        return _NULL_STAGE
+    return profile.stage(name)
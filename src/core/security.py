@@ -10,6 +10,12 @@ from passlib.context import CryptContext
 SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here-change-in-production")
 ALGORITHM: str = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+# JWTバックエンド（"hmac": HS256専用の軽量実装、"jose": python-jose）
+JWT_BACKEND: str = os.getenv("JWT_BACKEND", "hmac")
+
+# 検証済みトークンキャッシュ設定
+TOKEN_CACHE_MAX_SIZE: int = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "10000"))
+TOKEN_CACHE_TTL_SECONDS: float = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
 
 # パスワードハッシュ設定（将来の拡張用）
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
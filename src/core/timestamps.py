@@ -0,0 +1,44 @@
+"""エポック（1970-01-01T00:00:00Z）からの整数時刻とdatetimeの変換
+
+列指向の処理・キャッシュのキー・列指向バイナリ形式では、測定日時をエポックからの
+マイクロ秒・ミリ秒・日数の整数で扱う。変換はすべてこのモジュールの定数と関数で行う。
+"""
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import numpy.typing as npt
+
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+ONE_MICROSECOND = timedelta(microseconds=1)
+ONE_MILLISECOND = timedelta(milliseconds=1)
+ONE_DAY = timedelta(days=1)
+
+
+def epoch_microseconds(moment: datetime) -> int:
+    """タイムゾーン付き日時をエポックからのマイクロ秒に変換"""
+    return (moment - EPOCH) // ONE_MICROSECOND
+
+
+def epoch_days(moment: datetime) -> int:
+    """UTCの日の通し番号（エポックからの日数）"""
+    return (moment - EPOCH) // ONE_DAY
+
+
+def from_epoch_microseconds(microseconds: int) -> datetime:
+    """エポックからのマイクロ秒をUTCの日時に変換"""
+    return EPOCH + timedelta(microseconds=microseconds)
+
+
+def from_epoch_milliseconds(milliseconds: int) -> datetime:
+    """エポックからのミリ秒をUTCの日時に変換"""
+    return EPOCH + timedelta(milliseconds=milliseconds)
+
+
+def to_epoch_microseconds(measured_at: Sequence[datetime]) -> npt.NDArray[np.int64]:
+    """タイムゾーン付き日時の列をエポックからのマイクロ秒の配列に変換"""
+    return np.fromiter(
+        ((value - EPOCH) // ONE_MICROSECOND for value in measured_at),
+        dtype=np.int64,
+        count=len(measured_at),
+    )
@@ -0,0 +1,105 @@
+"""
+検証済みJWTトークンのキャッシュ
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from src.domain.entities.user import UserInToken
+
+
+class TokenVerificationCache:
+    """検証済みトークンのユーザー情報を保持するTTL付きLRUキャッシュ
+
+    トークン文字列そのものは保持せず、SHA-256ハッシュをキーとする。
+    各エントリはトークンの有効期限（exp）とTTLのうち早い方で失効する。
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        ttl_seconds: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Args:
+            max_size: 保持する最大エントリ数（0の場合はキャッシュしない）
+            ttl_seconds: エントリの最大保持秒数
+            clock: 現在時刻（エポック秒）を返す関数
+        """
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[bytes, tuple[float, UserInToken]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        """トークンのハッシュ値をキャッシュキーとして返す"""
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[UserInToken]:
+        """
+        キャッシュからユーザー情報を取得する
+
+        Args:
+            token: JWTトークン
+
+        Returns:
+            有効なエントリがあればユーザー情報、なければNone
+        """
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, user = entry
+                if self._clock() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return user
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, token: str, user: UserInToken, expires_at: Optional[float] = None) -> None:
+        """
+        検証済みのユーザー情報をキャッシュに登録する
+
+        Args:
+            token: JWTトークン
+            user: 検証済みのユーザー情報
+            expires_at: トークンの有効期限（エポック秒、expクレーム）
+        """
+        if self._max_size <= 0:
+            return
+        deadline = self._clock() + self._ttl_seconds
+        if expires_at is not None:
+            deadline = min(deadline, float(expires_at))
+
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (deadline, user)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """すべてのエントリと統計情報を削除する"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """ヒット数・ミス数・現在のエントリ数を返す"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_size": self._max_size,
+            }
@@ -1,5 +1,6 @@
 """ドメインエンティティパッケージ"""
 from .measurement import Measurement, MetricType
+from .measurement_batch import MeasurementBatch, MeasurementRow
 
-__all__ = ["Measurement", "MetricType"]
+__all__ = ["Measurement", "MeasurementBatch", "MeasurementRow", "MetricType"]
 
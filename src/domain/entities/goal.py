@@ -0,0 +1,145 @@
+"""ゴールのドメインエンティティ"""
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from .measurement import VALID_UNITS, MetricType
+
+
+class GoalPeriod(str, Enum):
+    """ゴールの達成を判定する期間（UTC、週は月曜始まり）"""
+    DAY = "day"
+    WEEK = "week"
+
+
+class GoalAggregation(str, Enum):
+    """期間内の測定値の集計方法"""
+    SUM = "sum"
+    AVERAGE = "average"
+
+
+class Goal(BaseModel):
+    """ゴールエンティティ
+
+    期間ごとに、対象のメトリックタイプ・単位の測定値を集計した値がtarget以上になったときに
+    達成とする（例: 1日の歩数の合計が10,000以上）。単位の異なる測定値は合算しないため、
+    単位が複数あるメトリックタイプでは単位の指定を必須とする。
+    """
+
+    model_config = ConfigDict(frozen=True, use_enum_values=False)
+
+    goal_id: str = Field(..., description="ゴールID（ユーザーごとに一意）")
+    user_id: str = Field(..., description="ユーザーID")
+    metric_type: MetricType = Field(..., description="対象のメトリックタイプ")
+    target: float = Field(..., gt=0, description="達成とする集計値の下限")
+    aggregation: GoalAggregation = Field(GoalAggregation.SUM, description="集計方法")
+    period: GoalPeriod = Field(GoalPeriod.DAY, description="判定する期間")
+    unit: Optional[str] = Field(
+        None, description="集計する単位（単位が1つのメトリックタイプでは省略可）"
+    )
+    created_at: datetime = Field(..., description="作成日時")
+    updated_at: datetime = Field(..., description="更新日時")
+
+    @model_validator(mode="before")
+    @classmethod
+    def default_single_unit(cls, data: Any) -> Any:
+        """単位が1つのメトリックタイプで単位を省略した場合はその単位とする"""
+        if not isinstance(data, dict) or data.get("unit") is not None:
+            return data
+        try:
+            valid_units = VALID_UNITS.get(MetricType(data.get("metric_type")), set())
+        except ValueError:
+            return data
+        if len(valid_units) == 1:
+            return {**data, "unit": next(iter(valid_units))}
+        return data
+
+    @model_validator(mode="after")
+    def validate_unit_for_metric_type(self) -> "Goal":
+        """メトリックタイプに対して単位が適切かを確認"""
+        valid_units = VALID_UNITS.get(self.metric_type, set())
+        if self.unit is None and len(valid_units) > 1:
+            raise ValueError(
+                f"Unit is required for metric type {self.metric_type.value}. "
+                f"Valid units are: {', '.join(sorted(valid_units))}"
+            )
+        if self.unit is not None and valid_units and self.unit not in valid_units:
+            raise ValueError(
+                f"Invalid unit '{self.unit}' for metric type {self.metric_type.value}. "
+                f"Valid units are: {', '.join(sorted(valid_units))}"
+            )
+        return self
+
+    def same_definition(self, other: "Goal") -> bool:
+        """集計の対象・方法・期間が同じかどうか（異なる場合は進捗を引き継げない）"""
+        return (self.metric_type, self.aggregation, self.period, self.unit) == (
+            other.metric_type, other.aggregation, other.period, other.unit
+        )
+
+    def is_achieved(self, value_sum: float, sample_count: int) -> bool:
+        """期間内の合計・件数がゴールを満たすかどうか"""
+        if sample_count == 0:
+            return False
+        if self.aggregation is GoalAggregation.AVERAGE:
+            return value_sum >= self.target * sample_count
+        return value_sum >= self.target
+
+
+@dataclass(frozen=True)
+class GoalProgress:
+    """ゴールの1期間分の進捗（取り込みごとに加算する累積値）
+
+    Attributes:
+        period_start: 期間の開始（UTC）
+        value_sum: 期間内の測定値の合計
+        sample_count: 期間内の測定数
+        achieved_at: 達成した日時（未達成の場合はNone）
+        streak: 達成した場合の、この期間までの連続達成期間数
+    """
+
+    period_start: datetime
+    value_sum: float
+    sample_count: int
+    achieved_at: Optional[datetime] = None
+    streak: int = 0
+
+    def value(self, aggregation: GoalAggregation) -> float:
+        """集計方法に応じた期間の値（合計または平均）"""
+        if aggregation is GoalAggregation.AVERAGE:
+            return self.value_sum / self.sample_count if self.sample_count else 0.0
+        return self.value_sum
+
+
+@dataclass(frozen=True)
+class GoalAchievedEvent:
+    """ゴールを達成したことを表すドメインイベント（ゴールの期間ごとに1回だけ発行する）
+
+    Attributes:
+        user_id: ユーザーID
+        goal_id: ゴールID
+        metric_type: 対象のメトリックタイプ
+        period: 判定した期間
+        period_start: 達成した期間の開始（UTC）
+        value: 達成時の集計値
+        target: ゴールの目標値
+        streak: この期間までの連続達成期間数
+        achieved_at: 達成した日時
+    """
+
+    user_id: str
+    goal_id: str
+    metric_type: str
+    period: str
+    period_start: datetime
+    value: float
+    target: float
+    streak: int
+    achieved_at: datetime
+
+    @property
+    def event_id(self) -> str:
+        """イベントの識別子（同じゴールの同じ期間では同じ値、通知の重複排除に使う）"""
+        return f"{self.user_id}:{self.goal_id}:{self.period_start.date().isoformat()}"
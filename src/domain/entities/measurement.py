@@ -55,6 +55,39 @@ VALUE_RANGES: dict[MetricType, tuple[float, float]] = {
     MetricType.CALORIES_BURNED: (0.0, 10000.0),
 }
 
+# 0以下の値を許可するメトリックタイプ
+NON_NEGATIVE_METRIC_TYPES: frozenset[MetricType] = frozenset(
+    {MetricType.STEPS, MetricType.CALORIES_BURNED}
+)
+
+
+def format_non_positive_message(value: float) -> str:
+    """0以下の値に対するエラーメッセージを生成"""
+    return f"Value must be greater than 0, got {value}"
+
+
+def format_invalid_unit_message(metric_type: MetricType, unit: str) -> str:
+    """メトリックタイプに適さない単位に対するエラーメッセージを生成"""
+    valid_units = VALID_UNITS.get(metric_type, set())
+    return (
+        f"Invalid unit '{unit}' for metric type {metric_type.value}. "
+        f"Valid units are: {', '.join(valid_units)}"
+    )
+
+
+def format_out_of_range_message(metric_type: MetricType, value: float) -> str:
+    """範囲外の値に対するエラーメッセージを生成"""
+    min_val, max_val = VALUE_RANGES[metric_type]
+    if metric_type == MetricType.HEART_RATE:
+        return (
+            f"Heart rate value {value} is out of range. "
+            f"Expected range: {min_val} to {max_val}"
+        )
+    return (
+        f"Value {value} is out of range for {metric_type.value}. "
+        f"Expected range: {min_val} to {max_val}"
+    )
+
 
 class Measurement(BaseModel):
     """測定データエンティティ"""
@@ -74,8 +107,8 @@ class Measurement(BaseModel):
         if v <= 0:
             # ステップ数やカロリーは0を許可
             metric_type = info.data.get("metric_type")
-            if metric_type not in [MetricType.STEPS, MetricType.CALORIES_BURNED]:
-                raise ValueError(f"Value must be greater than 0, got {v}")
+            if metric_type not in NON_NEGATIVE_METRIC_TYPES:
+                raise ValueError(format_non_positive_message(v))
         return v
 
     @field_validator("measured_at")
@@ -96,10 +129,7 @@ class Measurement(BaseModel):
         """メトリックタイプに対して単位が適切かを確認"""
         valid_units = VALID_UNITS.get(self.metric_type, set())
         if valid_units and self.unit not in valid_units:
-            raise ValueError(
-                f"Invalid unit '{self.unit}' for metric type {self.metric_type.value}. "
-                f"Valid units are: {', '.join(valid_units)}"
-            )
+            raise ValueError(format_invalid_unit_message(self.metric_type, self.unit))
         return self
 
     @model_validator(mode="after")
@@ -109,16 +139,9 @@ class Measurement(BaseModel):
         if value_range:
             min_val, max_val = value_range
             if not min_val <= self.value <= max_val:
-                if self.metric_type == MetricType.HEART_RATE:
-                    raise ValueError(
-                        f"Heart rate value {self.value} is out of range. "
-                        f"Expected range: {min_val} to {max_val}"
-                    )
-                else:
-                    raise ValueError(
-                        f"Value {self.value} is out of range for {self.metric_type.value}. "
-                        f"Expected range: {min_val} to {max_val}"
-                    )
+                raise ValueError(
+                    format_out_of_range_message(self.metric_type, self.value)
+                )
         return self
 
     @field_serializer("measured_at", when_used="json")
@@ -0,0 +1,254 @@
+"""測定データの内部表現（取り込み・集計の高速経路用）
+
+Pydanticモデル（Measurement、リクエスト・レスポンススキーマ）はAPIの境界でのみ使い、
+検証済みデータの受け渡しには行ごとのオブジェクトを作らない列指向のMeasurementBatchを使う。
+1件ずつ扱う必要がある場合は__slots__付きのMeasurementRowに変換する。
+"""
+from array import array
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Optional
+
+from core.ids import uuid7_batch
+
+
+@dataclass(slots=True, frozen=True)
+class MeasurementRow:
+    """検証済みの測定データ1件"""
+
+    id: str
+    user_id: str
+    metric_type: str
+    value: float
+    unit: str
+    measured_at: datetime
+    device_id: Optional[str]
+    metadata: Optional[dict[str, Any]]
+    notes: Optional[str]
+    created_at: datetime
+
+    def to_dict(self) -> dict[str, Any]:
+        """measurementsテーブルのカラム名をキーとする辞書に変換する"""
+        return {name: getattr(self, name) for name in MEASUREMENT_COLUMNS}
+
+
+# measurementsテーブルのカラム（MeasurementRow.to_dict・MeasurementBatch.to_rowsのキー）
+MEASUREMENT_COLUMNS: tuple[str, ...] = MeasurementRow.__slots__
+
+
+@dataclass(slots=True)
+class MeasurementBatch:
+    """検証済みの測定データの列指向コンテナ（struct-of-arrays）
+
+    1回の取り込み単位（1ユーザー、同一の登録日時）の行を列ごとのリストで保持する。
+    user_idとcreated_atはバッチで共有し、測定値はfloatオブジェクトではなく
+    array('d')に格納するため、行ごとの辞書やモデルより1行あたりのメモリが小さい。
+
+    Attributes:
+        user_id: ユーザーID
+        created_at: 登録日時
+        ids: 測定データID
+        metric_types: メトリックタイプの値
+        values: 測定値
+        units: 単位
+        measured_at: タイムゾーン付きの測定日時
+        device_ids: 測定デバイスID
+        metadata: 追加メタデータ
+        notes: メモ
+    """
+
+    user_id: str
+    created_at: datetime
+    ids: list[str] = field(default_factory=list)
+    metric_types: list[str] = field(default_factory=list)
+    values: array = field(default_factory=lambda: array("d"))
+    units: list[str] = field(default_factory=list)
+    measured_at: list[datetime] = field(default_factory=list)
+    device_ids: list[Optional[str]] = field(default_factory=list)
+    metadata: list[Optional[dict[str, Any]]] = field(default_factory=list)
+    notes: list[Optional[str]] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        """
+        Raises:
+            ValueError: 列の長さが揃っていない場合
+        """
+        if not isinstance(self.values, array):
+            self.values = array("d", self.values)
+        lengths = {
+            len(self.ids), len(self.metric_types), len(self.values), len(self.units),
+            len(self.measured_at), len(self.device_ids), len(self.metadata), len(self.notes),
+        }
+        if len(lengths) > 1:
+            raise ValueError(f"MeasurementBatch columns must have the same length, got {sorted(lengths)}")
+
+    @classmethod
+    def from_columns(
+        cls,
+        user_id: str,
+        created_at: datetime,
+        metric_types: Sequence[str],
+        values: Sequence[float],
+        units: Sequence[str],
+        measured_at: Sequence[datetime],
+        device_ids: Optional[Sequence[Optional[str]]] = None,
+        metadata: Optional[Sequence[Optional[dict[str, Any]]]] = None,
+        notes: Optional[Sequence[Optional[str]]] = None,
+        ids: Optional[Sequence[str]] = None,
+        id_generator: Callable[[int], list[str]] = uuid7_batch,
+    ) -> "MeasurementBatch":
+        """
+        列データからバッチを生成する
+
+        Args:
+            user_id: ユーザーID
+            created_at: 登録日時
+            metric_types: メトリックタイプの値
+            values: 測定値
+            units: 単位
+            measured_at: タイムゾーン付きの測定日時
+            device_ids: 測定デバイスID（省略時はすべてNone）
+            metadata: 追加メタデータ（省略時はすべてNone）
+            notes: メモ（省略時はすべてNone）
+            ids: 測定データID（省略時はid_generatorで採番）
+            id_generator: 指定した数のIDをまとめて採番する関数
+                （省略時は時刻順に並ぶUUIDv7）
+
+        Returns:
+            測定データのバッチ
+
+        Raises:
+            ValueError: 列の長さが揃っていない場合
+        """
+        size = len(values)
+        return cls(
+            user_id=user_id,
+            created_at=created_at,
+            ids=list(ids) if ids is not None else id_generator(size),
+            metric_types=list(metric_types),
+            values=array("d", values),
+            units=list(units),
+            measured_at=list(measured_at),
+            device_ids=list(device_ids) if device_ids is not None else [None] * size,
+            metadata=list(metadata) if metadata is not None else [None] * size,
+            notes=list(notes) if notes is not None else [None] * size,
+        )
+
+    @classmethod
+    def concat(cls, batches: Sequence["MeasurementBatch"]) -> "MeasurementBatch":
+        """
+        同じユーザーの複数のバッチを連結する
+
+        Args:
+            batches: 連結するバッチ（1つ以上、created_atは先頭のバッチの値を使う）
+
+        Returns:
+            各バッチの行をこの順に並べたバッチ
+
+        Raises:
+            ValueError: バッチがない、またはユーザーIDが異なる場合
+        """
+        if not batches:
+            raise ValueError("concat requires at least one batch")
+        first = batches[0]
+        if any(batch.user_id != first.user_id for batch in batches):
+            raise ValueError("concat requires batches of the same user")
+        if len(batches) == 1:
+            return first
+        merged = cls(user_id=first.user_id, created_at=first.created_at)
+        for batch in batches:
+            merged.ids.extend(batch.ids)
+            merged.metric_types.extend(batch.metric_types)
+            merged.values.extend(batch.values)
+            merged.units.extend(batch.units)
+            merged.measured_at.extend(batch.measured_at)
+            merged.device_ids.extend(batch.device_ids)
+            merged.metadata.extend(batch.metadata)
+            merged.notes.extend(batch.notes)
+        return merged
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def row(self, position: int) -> MeasurementRow:
+        """
+        指定位置の行を取得する
+
+        Args:
+            position: 行の位置
+
+        Returns:
+            測定データ1件
+        """
+        return MeasurementRow(
+            id=self.ids[position],
+            user_id=self.user_id,
+            metric_type=self.metric_types[position],
+            value=self.values[position],
+            unit=self.units[position],
+            measured_at=self.measured_at[position],
+            device_id=self.device_ids[position],
+            metadata=self.metadata[position],
+            notes=self.notes[position],
+            created_at=self.created_at,
+        )
+
+    def __iter__(self) -> Iterator[MeasurementRow]:
+        return (self.row(position) for position in range(len(self)))
+
+    def take(self, positions: Sequence[int]) -> "MeasurementBatch":
+        """
+        指定位置の行だけを含むバッチを生成する
+
+        Args:
+            positions: 行の位置（この順序で並べる）
+
+        Returns:
+            user_idとcreated_atを共有する新しいバッチ
+        """
+        return MeasurementBatch(
+            user_id=self.user_id,
+            created_at=self.created_at,
+            ids=[self.ids[position] for position in positions],
+            metric_types=[self.metric_types[position] for position in positions],
+            values=array("d", [self.values[position] for position in positions]),
+            units=[self.units[position] for position in positions],
+            measured_at=[self.measured_at[position] for position in positions],
+            device_ids=[self.device_ids[position] for position in positions],
+            metadata=[self.metadata[position] for position in positions],
+            notes=[self.notes[position] for position in positions],
+        )
+
+    def to_rows(self, start: int = 0, stop: Optional[int] = None) -> list[dict[str, Any]]:
+        """
+        measurementsテーブルのカラム名をキーとする行データに変換する（INSERTのパラメータ用）
+
+        Args:
+            start: 開始位置
+            stop: 終了位置（含まない、省略時は末尾）
+
+        Returns:
+            行データのリスト
+        """
+        user_id, created_at = self.user_id, self.created_at
+        window = slice(start, stop)
+        return [
+            {
+                "id": row_id,
+                "user_id": user_id,
+                "metric_type": metric_type,
+                "value": value,
+                "unit": unit,
+                "measured_at": measured_at,
+                "device_id": device_id,
+                "metadata": metadata,
+                "notes": notes,
+                "created_at": created_at,
+            }
+            for row_id, metric_type, value, unit, measured_at, device_id, metadata, notes in zip(
+                self.ids[window], self.metric_types[window], self.values[window], self.units[window],
+                self.measured_at[window], self.device_ids[window], self.metadata[window], self.notes[window],
+                strict=True,
+            )
+        ]
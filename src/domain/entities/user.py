@@ -10,7 +10,8 @@ class UserInToken(BaseModel):
     """JWTトークンに含まれるユーザー情報"""
     model_config = ConfigDict(str_strip_whitespace=True)
     
-    user_id: str = Field(..., description="ユーザーID")
+    # 測定データなどのuser_idカラムの長さ（String(64)）に合わせる
+    user_id: str = Field(..., min_length=1, max_length=64, description="ユーザーID")
     email: Optional[EmailStr] = Field(None, description="メールアドレス")
     
     
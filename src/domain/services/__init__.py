@@ -0,0 +1 @@
+"""ドメインサービスパッケージ"""
@@ -0,0 +1,108 @@
+"""ゴールの達成判定のドメインサービス
+
+取り込んだバッチの行をゴール・期間ごとの合計と件数（差分）にまとめる。
+差分を期間ごとの累積値に加算して判定するため、判定のたびに過去の測定を読み直さない。
+"""
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+
+from core.timestamps import EPOCH, epoch_microseconds, to_epoch_microseconds
+from domain.entities.goal import Goal, GoalPeriod
+from domain.entities.measurement_batch import MeasurementBatch
+
+_MICROSECONDS_PER_DAY = 86_400_000_000
+# 1970-01-01は木曜日のため、月曜始まりの週番号はエポックからの日数に3を足して7で割る
+_WEEK_OFFSET_DAYS = 3
+
+
+@dataclass(frozen=True)
+class GoalDelta:
+    """1回の取り込みでゴールの1期間に加算する値
+
+    Attributes:
+        goal: 対象のゴール
+        period_start: 期間の開始（UTC）
+        value_sum: 加算する測定値の合計
+        sample_count: 加算する測定数
+    """
+
+    goal: Goal
+    period_start: datetime
+    value_sum: float
+    sample_count: int
+
+
+def period_start(moment: datetime, period: GoalPeriod) -> datetime:
+    """日時を含む期間の開始（UTCの0時、週は月曜日）を返す"""
+    start = moment.astimezone(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+    if period is GoalPeriod.WEEK:
+        start -= timedelta(days=start.weekday())
+    return start
+
+
+def previous_period_start(start: datetime, period: GoalPeriod) -> datetime:
+    """前の期間の開始を返す"""
+    return start - timedelta(days=7 if period is GoalPeriod.WEEK else 1)
+
+
+def _period_numbers(epoch_days: np.ndarray, period: GoalPeriod) -> np.ndarray:
+    if period is GoalPeriod.WEEK:
+        return (epoch_days + _WEEK_OFFSET_DAYS) // 7
+    return epoch_days
+
+
+def _period_number_start(number: int, period: GoalPeriod) -> datetime:
+    if period is GoalPeriod.WEEK:
+        return EPOCH + timedelta(days=number * 7 - _WEEK_OFFSET_DAYS)
+    return EPOCH + timedelta(days=number)
+
+
+def aggregate_goal_deltas(batch: MeasurementBatch, goals: Sequence[Goal]) -> list[GoalDelta]:
+    """
+    バッチの行をゴール・期間ごとの合計と件数にまとめる
+
+    各行の期間はNumPyで一括して求め、ゴールごとに対象の行を選んで期間ごとに集計する
+    （計算量はバッチの行数 × ゴール数、過去の測定は参照しない）。
+    ゴールと単位の異なる行と、ゴールを作成した期間より前に測定した行（過去データの取り込み）は
+    集計しない。
+
+    Args:
+        batch: 保存した測定データのバッチ
+        goals: バッチのユーザーのゴール
+
+    Returns:
+        加算する値（行が1件もないゴール・期間は含めない）
+    """
+    if not len(batch) or not goals:
+        return []
+    metric_types = np.asarray(batch.metric_types, dtype=object)
+    units = np.asarray(batch.units, dtype=object)
+    values = np.frombuffer(batch.values, dtype=np.float64)
+    measured_us = to_epoch_microseconds(batch.measured_at)
+    epoch_days = measured_us // _MICROSECONDS_PER_DAY
+
+    deltas: list[GoalDelta] = []
+    for goal in goals:
+        first_period = period_start(goal.created_at, goal.period)
+        mask = (metric_types == goal.metric_type.value) & (units == goal.unit)
+        mask &= measured_us >= epoch_microseconds(first_period)
+        if not mask.any():
+            continue
+        numbers, inverse = np.unique(_period_numbers(epoch_days[mask], goal.period), return_inverse=True)
+        sums = np.bincount(inverse, weights=values[mask], minlength=len(numbers))
+        counts = np.bincount(inverse, minlength=len(numbers))
+        deltas.extend(
+            GoalDelta(
+                goal=goal,
+                period_start=_period_number_start(number, goal.period),
+                value_sum=value_sum,
+                sample_count=count,
+            )
+            for number, value_sum, count in zip(
+                numbers.tolist(), sums.tolist(), counts.tolist(), strict=True
+            )
+        )
+    return deltas
@@ -0,0 +1,140 @@
+"""測定データの一覧取得条件とキーセットページネーション
+
+OFFSETは読み飛ばす行をすべて走査するため、深いページほど遅くなる。
+一覧は(measured_at, id)で並べ、前のページの最後の行の(measured_at, id)を
+カーソルとして次のページをその位置から読み始める。IDは時刻順のUUIDv7のため、
+同じ測定日時の行もIDで一意に並ぶ。
+"""
+import base64
+import binascii
+import json
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from domain.entities.measurement import MetricType
+from domain.entities.measurement_batch import MEASUREMENT_COLUMNS
+from domain.services.measurement_validation import ensure_utc
+
+# 一覧で選択できるフィールド（user_idは認証ユーザーで決まるため含めない）
+MEASUREMENT_FIELDS: tuple[str, ...] = tuple(
+    name for name in MEASUREMENT_COLUMNS if name != "user_id"
+)
+# カーソルの生成に必要なため常に取得するフィールド
+CURSOR_FIELDS: tuple[str, ...] = ("measured_at", "id")
+
+
+class SortOrder(str, Enum):
+    """測定日時の並び順"""
+    ASC = "asc"
+    DESC = "desc"
+
+
+@dataclass(frozen=True)
+class PageCursor:
+    """次のページの開始位置（前のページの最後の行の測定日時とID）"""
+
+    measured_at: datetime
+    id: str
+
+    def encode(self) -> str:
+        """URLに含められる不透明な文字列に変換する"""
+        payload = json.dumps([self.measured_at.isoformat(), self.id], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "PageCursor":
+        """
+        encodeで生成した文字列からカーソルを復元する
+
+        Args:
+            token: カーソル文字列
+
+        Returns:
+            カーソル
+
+        Raises:
+            ValueError: カーソルの形式が不正な場合（IDがUUIDでない場合を含む）
+        """
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            measured_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+            # IDはUUIDとして検索条件にバインドする（DB_BINARY_IDS=trueでは16バイトに変換する）
+            uuid.UUID(str(row_id))
+            return cls(measured_at=ensure_utc(datetime.fromisoformat(measured_at)), id=str(row_id))
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+            raise ValueError("Invalid cursor") from e
+
+
+def parse_fields(fields: Optional[str]) -> tuple[str, ...]:
+    """
+    カンマ区切りのフィールド指定を解釈する
+
+    Args:
+        fields: カンマ区切りのフィールド名（省略時はすべて）
+
+    Returns:
+        MEASUREMENT_FIELDSの順に並べたフィールド名
+
+    Raises:
+        ValueError: 未知のフィールドが含まれる場合
+    """
+    if not fields:
+        return MEASUREMENT_FIELDS
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(MEASUREMENT_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(name for name in MEASUREMENT_FIELDS if name in requested)
+
+
+@dataclass(frozen=True)
+class MeasurementQuery:
+    """測定データの一覧取得条件
+
+    Attributes:
+        user_id: ユーザーID
+        limit: 1ページの最大件数
+        metric_type: 絞り込むメトリックタイプ
+        device_id: 絞り込むデバイスID
+        start: 測定日時の下限（含む）
+        end: 測定日時の上限（含まない）
+        after: 前のページのカーソル（省略時は先頭ページ）
+        order: 測定日時の並び順
+        fields: 取得するフィールド
+    """
+
+    user_id: str
+    limit: int
+    metric_type: Optional[MetricType] = None
+    device_id: Optional[str] = None
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    after: Optional[PageCursor] = None
+    order: SortOrder = SortOrder.DESC
+    fields: tuple[str, ...] = MEASUREMENT_FIELDS
+
+    def __post_init__(self) -> None:
+        """
+        Raises:
+            ValueError: limitが正でない、または未知のフィールドが含まれる場合
+        """
+        if self.limit < 1:
+            raise ValueError(f"limit must be positive, got {self.limit}")
+        unknown = set(self.fields).difference(MEASUREMENT_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    @property
+    def selected_columns(self) -> tuple[str, ...]:
+        """SELECTするカラム（指定フィールドとカーソル用のフィールド）"""
+        return _merge_fields(self.fields, CURSOR_FIELDS)
+
+
+def _merge_fields(*groups: Iterable[str]) -> tuple[str, ...]:
+    """フィールドをMEASUREMENT_FIELDSの順に重複なく並べる"""
+    names = {name for group in groups for name in group}
+    return tuple(name for name in MEASUREMENT_FIELDS if name in names)
@@ -0,0 +1,195 @@
+"""測定データの時系列のダウンサンプリング
+
+グラフ表示用に、期間内の測定値を指定した点数以下に間引く。期間の長さや
+サンプリング密度によらずレスポンスの大きさと描画コストが一定になる。
+
+- lttb: Largest-Triangle-Three-Buckets。先頭・末尾の点を残し、残りを等分した
+  バケットごとに、前に選んだ点と次のバケットの平均点とで作る三角形の面積が
+  最大になる点を選ぶ（ピークなどの形状を保つ）
+- minmax: 期間を等幅の時間バケットに分け、バケットごとの件数・最小・最大・平均を返す
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import Enum
+
+import numpy as np
+import numpy.typing as npt
+
+from core.timestamps import epoch_microseconds, from_epoch_microseconds
+
+
+class SeriesMethod(str, Enum):
+    """ダウンサンプリングの方式"""
+    LTTB = "lttb"
+    MINMAX = "minmax"
+
+
+@dataclass(frozen=True)
+class SeriesPoint:
+    """時系列の1点"""
+
+    measured_at: datetime
+    value: float
+
+
+@dataclass(frozen=True)
+class SeriesBucket:
+    """時間バケットごとの集計値"""
+
+    bucket_start: datetime
+    count: int
+    minimum: float
+    maximum: float
+    mean: float
+
+
+def lttb_indices(
+    x: npt.NDArray[np.int64] | npt.NDArray[np.float64],
+    y: npt.NDArray[np.float64],
+    threshold: int,
+) -> npt.NDArray[np.intp]:
+    """LTTBで残す点の位置を求める
+
+    三角形の面積 |(ax - cx)(y - ay) - (ax - x)(cy - ay)| は、前に選んだ点(ax, ay)を
+    除いて ax*P + ay*Q + R の形に展開できる。P・Q・Rと次のバケットの平均点(cx, cy)は
+    全点について一括で計算し、逐次処理はバケットごとのargmaxだけにする。
+
+    Args:
+        x: 昇順に並んだx座標（測定日時のエポックマイクロ秒など）
+        y: y座標（測定値）
+        threshold: 残す点の数（3以上）
+
+    Returns:
+        昇順に並んだ残す点の位置（点数がthreshold以下の場合はすべて）
+
+    Raises:
+        ValueError: thresholdが3未満の場合
+    """
+    if threshold < 3:
+        raise ValueError(f"threshold must be at least 3, got {threshold}")
+    size = len(x)
+    if size <= threshold:
+        return np.arange(size, dtype=np.intp)
+
+    # 先頭からの相対値にして、エポックマイクロ秒の積で精度が落ちないようにする
+    xs = np.asarray(x, dtype=np.float64) - float(x[0])
+    ys = np.asarray(y, dtype=np.float64)
+
+    # 先頭・末尾を除く点をthreshold - 2個のバケットに分ける（各バケットは1点以上）
+    bucket_count = threshold - 2
+    edges = (np.arange(bucket_count + 1) * ((size - 2) / bucket_count)).astype(np.intp) + 1
+    counts = np.diff(edges)
+    means_x = np.add.reduceat(xs[:-1], edges[:-1]) / counts
+    means_y = np.add.reduceat(ys[:-1], edges[:-1]) / counts
+    # バケットiでは次のバケットの平均点（最後のバケットでは末尾の点）を使う
+    next_x = np.repeat(np.append(means_x[1:], xs[-1]), counts)
+    next_y = np.repeat(np.append(means_y[1:], ys[-1]), counts)
+    inner_x, inner_y = xs[1:-1], ys[1:-1]
+    p = inner_y - next_y
+    q = next_x - inner_x
+    r = inner_x * next_y - next_x * inner_y
+
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0], selected[-1] = 0, size - 1
+    offsets = (edges - 1).tolist()
+    previous = 0
+    for bucket in range(bucket_count):
+        lo, hi = offsets[bucket], offsets[bucket + 1]
+        ax, ay = xs[previous], ys[previous]
+        area = np.abs(ax * p[lo:hi] + ay * q[lo:hi] + r[lo:hi])
+        previous = lo + 1 + int(area.argmax())
+        selected[bucket + 1] = previous
+    return selected
+
+
+def downsample_lttb(
+    timestamps_us: npt.NDArray[np.int64],
+    values: npt.NDArray[np.float64],
+    threshold: int,
+) -> list[SeriesPoint]:
+    """
+    LTTBで時系列をthreshold点以下に間引く
+
+    Args:
+        timestamps_us: 昇順に並んだ測定日時（エポックマイクロ秒）
+        values: 測定値
+        threshold: 残す点の数（3以上）
+
+    Returns:
+        測定日時の昇順に並んだ点
+
+    Raises:
+        ValueError: thresholdが3未満の場合
+    """
+    indices = lttb_indices(timestamps_us, values, threshold)
+    return [
+        SeriesPoint(measured_at=from_epoch_microseconds(timestamp), value=value)
+        for timestamp, value in zip(
+            np.asarray(timestamps_us)[indices].tolist(),
+            np.asarray(values)[indices].tolist(),
+            strict=True,
+        )
+    ]
+
+
+def aggregate_series_buckets(
+    timestamps_us: npt.NDArray[np.int64],
+    values: npt.NDArray[np.float64],
+    start: datetime,
+    end: datetime,
+    bucket_count: int,
+) -> list[SeriesBucket]:
+    """期間を等幅の時間バケットに分けて集計する
+
+    Args:
+        timestamps_us: 昇順に並んだ測定日時（エポックマイクロ秒）
+        values: 測定値
+        start: 期間の開始（含む）
+        end: 期間の終了（含まない）
+        bucket_count: バケット数
+
+    Returns:
+        データのあるバケットの集計値（バケット開始時刻の昇順）
+
+    Raises:
+        ValueError: バケット数が正でない、または期間が空の場合
+    """
+    if bucket_count < 1:
+        raise ValueError(f"bucket_count must be positive, got {bucket_count}")
+    start_us = epoch_microseconds(start)
+    span_us = epoch_microseconds(end) - start_us
+    if span_us <= 0:
+        raise ValueError("end must be after start")
+    if len(values) == 0:
+        return []
+
+    width_us = -(-span_us // bucket_count)
+    buckets = (np.asarray(timestamps_us, dtype=np.int64) - start_us) // width_us
+    value_array = np.asarray(values, dtype=np.float64)
+    boundary = np.empty(len(buckets), dtype=np.bool_)
+    boundary[0] = True
+    boundary[1:] = buckets[1:] != buckets[:-1]
+    starts = np.flatnonzero(boundary)
+
+    counts = np.diff(np.append(starts, len(buckets)))
+    totals = np.add.reduceat(value_array, starts)
+    minimums = np.minimum.reduceat(value_array, starts)
+    maximums = np.maximum.reduceat(value_array, starts)
+
+    return [
+        SeriesBucket(
+            bucket_start=start + timedelta(microseconds=bucket * width_us),
+            count=count,
+            minimum=minimum,
+            maximum=maximum,
+            mean=total / count,
+        )
+        for bucket, count, total, minimum, maximum in zip(
+            buckets[starts].tolist(),
+            counts.tolist(),
+            totals.tolist(),
+            minimums.tolist(),
+            maximums.tolist(),
+            strict=True,
+        )
+    ]
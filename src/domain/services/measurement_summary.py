@@ -0,0 +1,250 @@
+"""測定データの時間バケット集計（ロールアップ）サービス
+
+取り込み時に時間・日単位のバケットへ件数・合計・最小・最大・二乗和を集計し、
+サマリー取得時はバケットを併合するだけで統計値を求める。
+同じメトリックタイプでも単位（kgとlbなど）が異なる値は別々に集計する。
+"""
+import math
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from enum import Enum
+
+import numpy as np
+
+from core.timestamps import from_epoch_microseconds, to_epoch_microseconds
+from domain.entities.measurement import MetricType
+from domain.services.measurement_validation import encode_metric_types
+
+_METRIC_TYPES: tuple[MetricType, ...] = tuple(MetricType)
+
+
+class SummaryPeriod(str, Enum):
+    """サマリーの集計期間"""
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class BucketGranularity(str, Enum):
+    """ロールアップのバケット粒度"""
+    HOUR = "hour"
+    DAY = "day"
+
+    @property
+    def width(self) -> timedelta:
+        """バケットの幅"""
+        return timedelta(hours=1) if self is BucketGranularity.HOUR else timedelta(days=1)
+
+
+# 集計期間ごとの (併合するバケット粒度, バケット数)
+_PERIOD_LAYOUT: dict[SummaryPeriod, tuple[BucketGranularity, int]] = {
+    SummaryPeriod.DAY: (BucketGranularity.HOUR, 24),
+    SummaryPeriod.WEEK: (BucketGranularity.DAY, 7),
+    SummaryPeriod.MONTH: (BucketGranularity.DAY, 30),
+}
+
+
+@dataclass(frozen=True)
+class SummaryWindow:
+    """サマリーの集計対象期間（バケット境界に揃えた半開区間 [start, end)）"""
+
+    granularity: BucketGranularity
+    start: datetime
+    end: datetime
+
+
+@dataclass(frozen=True)
+class BucketStatistics:
+    """併合可能な集計値（件数・合計・最小・最大・二乗和）"""
+
+    count: int
+    total: float
+    minimum: float
+    maximum: float
+    sum_of_squares: float
+
+    @property
+    def mean(self) -> float:
+        """平均値"""
+        return self.total / self.count
+
+    @property
+    def stddev(self) -> float:
+        """母標準偏差（丸め誤差で分散が負にならないよう0で下限を取る）"""
+        variance = self.sum_of_squares / self.count - self.mean ** 2
+        return math.sqrt(max(variance, 0.0))
+
+    @classmethod
+    def merge(cls, items: Iterable["BucketStatistics"]) -> "BucketStatistics":
+        """複数の集計値を1つに併合する"""
+        merged = list(items)
+        if not merged:
+            raise ValueError("Cannot merge an empty sequence of statistics")
+        return cls(
+            count=sum(item.count for item in merged),
+            total=sum(item.total for item in merged),
+            minimum=min(item.minimum for item in merged),
+            maximum=max(item.maximum for item in merged),
+            sum_of_squares=sum(item.sum_of_squares for item in merged),
+        )
+
+
+@dataclass(frozen=True)
+class BucketAggregate:
+    """1つの(メトリックタイプ, 単位, バケット)に対する集計値"""
+
+    metric_type: MetricType
+    unit: str
+    bucket_start: datetime
+    statistics: BucketStatistics
+
+
+def floor_to_bucket(moment: datetime, granularity: BucketGranularity) -> datetime:
+    """日時をUTC基準のバケット開始時刻に切り捨てる"""
+    moment = moment.astimezone(UTC)
+    if granularity is BucketGranularity.HOUR:
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def summary_window(period: SummaryPeriod, end: datetime) -> SummaryWindow:
+    """集計期間に対応するバケット境界に揃えた期間を求める
+
+    dayは直近24時間分の時間バケット、week/monthは直近7日/30日分の
+    日バケットを対象とし、いずれもendを含むバケットまでを含める。
+
+    Args:
+        period: 集計期間
+        end: 期間の終端となる日時
+
+    Returns:
+        集計対象期間
+    """
+    granularity, bucket_count = _PERIOD_LAYOUT[period]
+    window_end = floor_to_bucket(end, granularity) + granularity.width
+    return SummaryWindow(
+        granularity=granularity,
+        start=window_end - granularity.width * bucket_count,
+        end=window_end,
+    )
+
+
+def aggregate_into_buckets(
+    metric_types: Sequence[str],
+    units: Sequence[str],
+    values: Sequence[float],
+    measured_at: Sequence[datetime],
+    granularity: BucketGranularity,
+) -> list[BucketAggregate]:
+    """測定データを(メトリックタイプ, 単位, バケット)ごとに一括集計する
+
+    Args:
+        metric_types: メトリックタイプ（MetricTypeまたはその値）
+        units: 単位
+        values: 測定値
+        measured_at: タイムゾーン付きの測定日時
+        granularity: バケット粒度
+
+    Returns:
+        (メトリックタイプ, 単位, バケット開始時刻)の昇順に並んだ集計値
+    """
+    if len(values) == 0:
+        return []
+
+    bucket_us = granularity.width // timedelta(microseconds=1)
+    buckets = to_epoch_microseconds(measured_at) // bucket_us
+    codes = encode_metric_types(metric_types).astype(np.int64)
+    unique_units, unit_codes = np.unique(np.asarray(units, dtype=object), return_inverse=True)
+    unit_codes = unit_codes.reshape(-1)
+    value_array = np.asarray(values, dtype=np.float64)
+
+    # (メトリックコード, 単位, バケット)でソートし、グループ境界ごとにreduceatで集計
+    order = np.lexsort((buckets, unit_codes, codes))
+    sorted_codes = codes[order]
+    sorted_units = unit_codes[order]
+    sorted_buckets = buckets[order]
+    sorted_values = value_array[order]
+    boundary = np.empty(len(order), dtype=np.bool_)
+    boundary[0] = True
+    boundary[1:] = (
+        (sorted_codes[1:] != sorted_codes[:-1])
+        | (sorted_units[1:] != sorted_units[:-1])
+        | (sorted_buckets[1:] != sorted_buckets[:-1])
+    )
+    starts = np.flatnonzero(boundary)
+
+    counts = np.diff(np.append(starts, len(order)))
+    totals = np.add.reduceat(sorted_values, starts)
+    minimums = np.minimum.reduceat(sorted_values, starts)
+    maximums = np.maximum.reduceat(sorted_values, starts)
+    squares = np.add.reduceat(sorted_values * sorted_values, starts)
+
+    return [
+        BucketAggregate(
+            metric_type=_METRIC_TYPES[code],
+            unit=unique_units[unit],
+            bucket_start=from_epoch_microseconds(bucket * bucket_us),
+            statistics=BucketStatistics(
+                count=count,
+                total=total,
+                minimum=minimum,
+                maximum=maximum,
+                sum_of_squares=square,
+            ),
+        )
+        for code, unit, bucket, count, total, minimum, maximum, square in zip(
+            sorted_codes[starts].tolist(),
+            sorted_units[starts].tolist(),
+            sorted_buckets[starts].tolist(),
+            counts.tolist(),
+            totals.tolist(),
+            minimums.tolist(),
+            maximums.tolist(),
+            squares.tolist(),
+            strict=True,
+        )
+    ]
+
+
+@dataclass(frozen=True)
+class MetricSummary:
+    """1つの(メトリックタイプ, 単位)に対するサマリー"""
+
+    metric_type: MetricType
+    unit: str
+    statistics: BucketStatistics
+    buckets: list[BucketAggregate]
+
+
+def summarize_by_metric(aggregates: Iterable[BucketAggregate]) -> list[MetricSummary]:
+    """バケット集計値を(メトリックタイプ, 単位)ごとに併合する
+
+    単位の異なる値は併合しない（kgとlbの平均などは意味を持たないため）。
+
+    Args:
+        aggregates: バケット集計値
+
+    Returns:
+        MetricTypeの定義順、同じメトリックタイプ内では単位の昇順に並んだサマリー
+    """
+    buckets_by_key: dict[tuple[MetricType, str], list[BucketAggregate]] = {}
+    for aggregate in aggregates:
+        buckets_by_key.setdefault((aggregate.metric_type, aggregate.unit), []).append(aggregate)
+
+    metric_order = {metric_type: index for index, metric_type in enumerate(_METRIC_TYPES)}
+    return [
+        MetricSummary(
+            metric_type=metric_type,
+            unit=unit,
+            statistics=BucketStatistics.merge(
+                bucket.statistics for bucket in buckets_by_key[(metric_type, unit)]
+            ),
+            buckets=sorted(
+                buckets_by_key[(metric_type, unit)], key=lambda bucket: bucket.bucket_start
+            ),
+        )
+        for metric_type, unit in sorted(
+            buckets_by_key, key=lambda key: (metric_order[key[0]], key[1])
+        )
+    ]
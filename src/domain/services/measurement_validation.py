@@ -0,0 +1,181 @@
+"""測定データのバッチバリデーション（NumPyによる列指向処理）
+
+Measurementエンティティの各バリデータと同じルール・同じエラーメッセージを、
+行ごとのモデル生成を行わずに配列全体へ一括適用する。
+"""
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from core.timestamps import epoch_microseconds, to_epoch_microseconds
+from domain.entities.measurement import (
+    NON_NEGATIVE_METRIC_TYPES,
+    VALID_UNITS,
+    VALUE_RANGES,
+    MetricType,
+    format_invalid_unit_message,
+    format_non_positive_message,
+    format_out_of_range_message,
+)
+
+# Pydanticがバリデータ内のValueErrorに付与する接頭辞（単行バリデーションとの互換用）
+VALUE_ERROR_PREFIX = "Value error, "
+FUTURE_DATE_MESSAGE = "Measurement date cannot be in the future"
+
+_METRIC_TYPES: tuple[MetricType, ...] = tuple(MetricType)
+# Enumのハッシュは名前ベースのため、列挙子と値文字列の両方をキーに登録する
+_METRIC_CODES: dict[str, int] = {
+    **{metric.value: code for code, metric in enumerate(_METRIC_TYPES)},
+    **{metric: code for code, metric in enumerate(_METRIC_TYPES)},
+}
+
+_LOWER_BOUNDS = np.array(
+    [VALUE_RANGES.get(metric, (-np.inf, np.inf))[0] for metric in _METRIC_TYPES],
+    dtype=np.float64,
+)
+_UPPER_BOUNDS = np.array(
+    [VALUE_RANGES.get(metric, (-np.inf, np.inf))[1] for metric in _METRIC_TYPES],
+    dtype=np.float64,
+)
+_ZERO_ALLOWED = np.array(
+    [metric in NON_NEGATIVE_METRIC_TYPES for metric in _METRIC_TYPES], dtype=np.bool_
+)
+
+
+@dataclass(frozen=True)
+class BatchValidationResult:
+    """バッチバリデーションの結果
+
+    Attributes:
+        valid_mask: 各行がドメインルールを満たすかどうか
+        errors: エラー詳細（index/message/field）のリスト（index昇順）
+    """
+
+    valid_mask: npt.NDArray[np.bool_]
+    errors: list[dict[str, Any]]
+
+
+def ensure_utc(measured_at: datetime) -> datetime:
+    """タイムゾーンのない日時をUTCとして扱う（Measurementエンティティと同じ規則）"""
+    if measured_at.tzinfo is None:
+        return measured_at.replace(tzinfo=UTC)
+    return measured_at
+
+
+def encode_metric_types(metric_types: Sequence[str]) -> npt.NDArray[np.int8]:
+    """メトリックタイプの列を整数コードの配列に変換"""
+    return np.fromiter(
+        (_METRIC_CODES[metric] for metric in metric_types),
+        dtype=np.int8,
+        count=len(metric_types),
+    )
+
+
+def _valid_unit_mask(
+    metric_codes: npt.NDArray[np.int8], units: Sequence[str]
+) -> npt.NDArray[np.bool_]:
+    """(メトリックコード, 単位コード)の対応表を引いて単位の妥当性を判定"""
+    unique_units, unit_codes = np.unique(
+        np.asarray(units, dtype=object), return_inverse=True
+    )
+    lookup = np.array(
+        [
+            [
+                not VALID_UNITS.get(metric) or unit in VALID_UNITS[metric]
+                for unit in unique_units
+            ]
+            for metric in _METRIC_TYPES
+        ],
+        dtype=np.bool_,
+    ).reshape(len(_METRIC_TYPES), len(unique_units))
+    return lookup[metric_codes, unit_codes.reshape(-1)]
+
+
+def validate_measurement_columns(
+    metric_types: Sequence[str],
+    values: Sequence[float],
+    units: Sequence[str],
+    measured_at: Sequence[datetime],
+    indexes: Sequence[int] | None = None,
+    now: datetime | None = None,
+) -> BatchValidationResult:
+    """スキーマ検証済みの測定データ列にドメインルールを一括適用する
+
+    Measurementエンティティと同じ評価順序でエラーを報告する。
+    値の正値チェックと未来日時チェック（フィールドバリデータ）のいずれかが
+    失敗した行では、単位・範囲チェック（モデルバリデータ）は評価しない。
+    単位チェックが失敗した行では範囲チェックを評価しない。
+
+    Args:
+        metric_types: メトリックタイプ（MetricTypeまたはその値）
+        values: 測定値
+        units: 単位
+        measured_at: タイムゾーン付きの測定日時（ensure_utc適用済み）
+        indexes: エラーに記録する元データ上のインデックス（省略時は位置）
+        now: 未来日時判定の基準時刻（省略時は現在時刻）
+
+    Returns:
+        バッチバリデーションの結果
+    """
+    size = len(values)
+    if indexes is None:
+        indexes = range(size)
+    if size == 0:
+        return BatchValidationResult(valid_mask=np.ones(0, dtype=np.bool_), errors=[])
+
+    now_us = epoch_microseconds(now or datetime.now(UTC))
+
+    metric_codes = encode_metric_types(metric_types)
+    value_array = np.asarray(values, dtype=np.float64)
+    timestamps = to_epoch_microseconds(measured_at)
+
+    non_positive = (value_array <= 0) & ~_ZERO_ALLOWED[metric_codes]
+    in_future = timestamps > now_us
+    field_failed = non_positive | in_future
+
+    unit_valid = _valid_unit_mask(metric_codes, units)
+    invalid_unit = ~field_failed & ~unit_valid
+    in_range = (value_array >= _LOWER_BOUNDS[metric_codes]) & (
+        value_array <= _UPPER_BOUNDS[metric_codes]
+    )
+    out_of_range = ~field_failed & unit_valid & ~in_range
+
+    valid_mask = ~(field_failed | invalid_unit | out_of_range)
+
+    errors: list[dict[str, Any]] = []
+    for position in np.flatnonzero(~valid_mask).tolist():
+        index = indexes[position]
+        metric_type = _METRIC_TYPES[metric_codes[position]]
+        value = float(values[position])
+        if non_positive[position]:
+            errors.append({
+                "index": index,
+                "message": VALUE_ERROR_PREFIX + format_non_positive_message(value),
+                "field": "value",
+            })
+        if in_future[position]:
+            errors.append({
+                "index": index,
+                "message": VALUE_ERROR_PREFIX + FUTURE_DATE_MESSAGE,
+                "field": "measured_at",
+            })
+        if invalid_unit[position]:
+            errors.append({
+                "index": index,
+                "message": VALUE_ERROR_PREFIX
+                + format_invalid_unit_message(metric_type, units[position]),
+                "field": None,
+            })
+        elif out_of_range[position]:
+            errors.append({
+                "index": index,
+                "message": VALUE_ERROR_PREFIX
+                + format_out_of_range_message(metric_type, value),
+                "field": None,
+            })
+
+    return BatchValidationResult(valid_mask=valid_mask, errors=errors)
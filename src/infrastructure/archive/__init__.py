@@ -0,0 +1,14 @@
+"""測定データの生データアーカイブ関連パッケージ"""
+from .archiver import MeasurementArchiver
+from .formats import ARCHIVE_FORMATS, ArchiveFormat, get_archive_format
+from .storage import ArchiveStorage, LocalArchiveStorage, S3ArchiveStorage
+
+__all__ = [
+    "ARCHIVE_FORMATS",
+    "ArchiveFormat",
+    "ArchiveStorage",
+    "LocalArchiveStorage",
+    "MeasurementArchiver",
+    "S3ArchiveStorage",
+    "get_archive_format",
+]
@@ -0,0 +1,262 @@
+"""登録した測定データの生データアーカイブ
+
+取り込み処理が保存した行をユーザー・UTCの日ごとにメモリ上へためておき、
+行数または経過時間がしきい値を超えたバッファを、リクエストの処理とは別の
+バックグラウンドタスクで圧縮ファイルに書き出す。ファイルはGlue/Athenaの
+パーティションとして扱えるよう、日付とメトリックタイプで分けたキーに保存する。
+
+    date=2024-05-20/metric_type=heart_rate/part-<UUIDv7>.parquet
+
+書き出しに失敗したバッファは破棄せずに戻し、失敗が続くほど間隔を空けて（指数バックオフ）
+書き出し直す。保存先の障害が続いてもメモリを使い切らないよう、書き出し待ちの行数が
+max_buffered_rowsを超えた場合は古い行から破棄する。
+プロセスが異常終了した場合、未書き出しの行はアーカイブされない（データベースには保存済み）。
+"""
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, date
+from typing import Optional
+
+import structlog
+
+from core.ids import uuid7
+from core.metrics import ARCHIVE_DROPPED_ROWS, ARCHIVE_ROWS, ARCHIVE_WRITE_FAILURES
+from domain.entities.measurement_batch import MeasurementBatch
+
+from .formats import ARCHIVE_COLUMNS, ArchiveColumns, ArchiveFormat
+from .storage import ArchiveStorage
+
+logger = structlog.get_logger(__name__)
+
+
+def _empty_columns() -> ArchiveColumns:
+    return {name: [] for name in ARCHIVE_COLUMNS}
+
+
+@dataclass(slots=True)
+class _ArchiveBuffer:
+    """1ユーザー・1日分の書き出し待ちの行"""
+
+    started_at: float
+    columns: ArchiveColumns = field(default_factory=_empty_columns)
+
+    @property
+    def rows(self) -> int:
+        return len(self.columns["id"])
+
+    def extend(self, columns: ArchiveColumns) -> None:
+        for name in ARCHIVE_COLUMNS:
+            self.columns[name].extend(columns[name])
+
+    def drop_oldest(self, count: int) -> None:
+        """先頭（先に追加した）count行を破棄する"""
+        for name in ARCHIVE_COLUMNS:
+            del self.columns[name][:count]
+
+
+def _take_columns(columns: ArchiveColumns, positions: list[int]) -> ArchiveColumns:
+    """指定した位置の行だけの列データ"""
+    return {name: [values[i] for i in positions] for name, values in columns.items()}
+
+
+def _batch_columns(batch: MeasurementBatch, positions: list[int]) -> ArchiveColumns:
+    """バッチの指定した位置の行をアーカイブの列データに変換する"""
+    return {
+        "id": [batch.ids[i] for i in positions],
+        "user_id": [batch.user_id] * len(positions),
+        "metric_type": [batch.metric_types[i] for i in positions],
+        "value": [batch.values[i] for i in positions],
+        "unit": [batch.units[i] for i in positions],
+        "measured_at": [batch.measured_at[i].astimezone(UTC) for i in positions],
+        "device_id": [batch.device_ids[i] for i in positions],
+        "metadata": [batch.metadata[i] for i in positions],
+        "notes": [batch.notes[i] for i in positions],
+        "created_at": [batch.created_at.astimezone(UTC)] * len(positions),
+    }
+
+
+class MeasurementArchiver:
+    """登録した測定データをバッファし、圧縮ファイルとして書き出すアーカイバー"""
+
+    def __init__(
+        self,
+        storage: ArchiveStorage,
+        archive_format: ArchiveFormat,
+        max_rows: int = 50000,
+        max_age_seconds: float = 300.0,
+        flush_interval_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        max_buffered_rows: int = 1_000_000,
+        retry_max_backoff_seconds: float = 300.0,
+    ) -> None:
+        """
+        Args:
+            storage: アーカイブファイルの保存先
+            archive_format: アーカイブファイルの形式
+            max_rows: バッファの行数がこの値以上になったら書き出す
+            max_age_seconds: バッファに最初の行を追加してからこの秒数が経過したら書き出す
+            flush_interval_seconds: しきい値を確認する間隔（失敗後の再試行の間隔の基準）
+            clock: 現在時刻（秒）を返す関数
+            max_buffered_rows: 書き出し待ちの行数の上限（超えた分は古い行から破棄する）
+            retry_max_backoff_seconds: 失敗後に次の書き出しまで待つ最大秒数
+
+        Raises:
+            ValueError: max_rowsまたはmax_buffered_rowsが0以下の場合
+        """
+        if max_rows <= 0:
+            raise ValueError("max_rows must be positive")
+        if max_buffered_rows <= 0:
+            raise ValueError("max_buffered_rows must be positive")
+        self._storage = storage
+        self._format = archive_format
+        self._max_rows = max_rows
+        self._max_age_seconds = max_age_seconds
+        self._flush_interval_seconds = flush_interval_seconds
+        self._clock = clock
+        self._max_buffered_rows = max_buffered_rows
+        self._retry_max_backoff_seconds = retry_max_backoff_seconds
+        self._buffers: dict[tuple[str, date], _ArchiveBuffer] = {}
+        self._consecutive_failures = 0
+        self._retry_at = 0.0
+        self._stopping = False
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def add(self, batch: MeasurementBatch) -> None:
+        """
+        保存した行をバッファに追加する（書き出しは行わない）
+
+        Args:
+            batch: データベースに保存したバッチ
+        """
+        if not len(batch):
+            return
+        positions_by_day: dict[date, list[int]] = {}
+        for position, measured_at in enumerate(batch.measured_at):
+            positions_by_day.setdefault(measured_at.astimezone(UTC).date(), []).append(position)
+        now = self._clock()
+        for day, positions in positions_by_day.items():
+            self._buffer(batch.user_id, day, now).extend(_batch_columns(batch, positions))
+        self._drop_overflow()
+
+    def _buffer(self, user_id: str, day: date, started_at: float) -> _ArchiveBuffer:
+        buffer = self._buffers.get((user_id, day))
+        if buffer is None:
+            buffer = self._buffers[(user_id, day)] = _ArchiveBuffer(started_at)
+        return buffer
+
+    def buffered_rows(self) -> int:
+        """書き出し待ちの行数"""
+        return sum(buffer.rows for buffer in self._buffers.values())
+
+    def _drop_overflow(self) -> None:
+        """書き出し待ちの行数が上限を超えた分を、最初に追加した時刻の古いバッファから破棄する"""
+        overflow = self.buffered_rows() - self._max_buffered_rows
+        if overflow <= 0:
+            return
+        logger.warning("Archive buffer is full, dropping oldest rows", rows=overflow)
+        ARCHIVE_DROPPED_ROWS.inc(overflow)
+        for key in sorted(self._buffers, key=lambda key: self._buffers[key].started_at):
+            buffer = self._buffers[key]
+            if buffer.rows > overflow:
+                buffer.drop_oldest(overflow)
+                return
+            overflow -= buffer.rows
+            del self._buffers[key]
+
+    async def flush(self, force: bool = False) -> int:
+        """
+        しきい値を超えたバッファを書き出す
+
+        書き出しに失敗した場合は残りのバッファを書き出さずに次の確認に回し、
+        失敗が続くほど再試行までの間隔を空ける（forceの場合は間隔によらず書き出す）。
+
+        Args:
+            force: しきい値・再試行の間隔によらずすべてのバッファを書き出す
+
+        Returns:
+            書き出したファイル数
+        """
+        now = self._clock()
+        if not force and now < self._retry_at:
+            return 0
+        due = [
+            key for key, buffer in self._buffers.items()
+            if force
+            or buffer.rows >= self._max_rows
+            or now - buffer.started_at >= self._max_age_seconds
+        ]
+        files = 0
+        for key in due:
+            user_id, day = key
+            buffer = self._buffers.pop(key, None)
+            if buffer is None:
+                continue
+            written, remaining = await asyncio.to_thread(self._write, day, buffer.columns)
+            files += written
+            if remaining is None:
+                self._consecutive_failures = 0
+                continue
+            # 書き出せなかった行は最初に追加した時刻のまま戻し、再試行の間隔を空ける
+            self._buffer(user_id, day, buffer.started_at).extend(remaining)
+            self._drop_overflow()
+            self._consecutive_failures += 1
+            self._retry_at = self._clock() + self.retry_backoff_seconds()
+            if not force:
+                break
+        return files
+
+    def retry_backoff_seconds(self) -> float:
+        """連続した失敗の回数に応じた、次の書き出しまでの秒数"""
+        if not self._consecutive_failures:
+            return 0.0
+        backoff = self._flush_interval_seconds * 2 ** (self._consecutive_failures - 1)
+        return min(self._retry_max_backoff_seconds, backoff)
+
+    def _write(self, day: date, columns: ArchiveColumns) -> tuple[int, Optional[ArchiveColumns]]:
+        """
+        1ユーザー・1日分の行をメトリックタイプごとのファイルに書き出す
+
+        Returns:
+            書き出したファイル数と、失敗した場合は書き出せなかった行の列データ
+        """
+        positions_by_metric: dict[str, list[int]] = {}
+        for position, metric_type in enumerate(columns["metric_type"]):
+            positions_by_metric.setdefault(metric_type, []).append(position)
+        groups = list(positions_by_metric.items())
+        for written, (metric_type, positions) in enumerate(groups):
+            key = (
+                f"date={day.isoformat()}/metric_type={metric_type}/"
+                f"part-{uuid7()}.{self._format.extension}"
+            )
+            try:
+                body = self._format.encode(_take_columns(columns, positions))
+                self._storage.put(key, body, self._format.content_type)
+            except Exception:
+                logger.exception("Archive write failed", key=key, rows=len(positions))
+                ARCHIVE_WRITE_FAILURES.inc()
+                unwritten = [i for _, group in groups[written:] for i in group]
+                return written, _take_columns(columns, unwritten)
+            ARCHIVE_ROWS.inc(len(positions))
+        return len(groups), None
+
+    def start(self) -> None:
+        """バックグラウンドでしきい値の確認と書き出しを開始する"""
+        self._stopping = False
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """バックグラウンドの処理を止め、残りのバッファをすべて書き出す"""
+        self._stopping = True
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush(force=True)
+
+    async def run(self) -> None:
+        """停止を要求されるまで一定間隔でしきい値を確認して書き出す"""
+        while not self._stopping:
+            await asyncio.sleep(self._flush_interval_seconds)
+            await self.flush()
+
@@ -0,0 +1,144 @@
+"""アーカイブファイルの形式
+
+バッファした測定データ（列ごとのリスト）を圧縮したファイルのバイト列に変換する。
+
+- parquet: zstd圧縮のParquet（Athena/Glueで列を絞って読める、pyarrowが必要）
+- arrow: zstd圧縮のArrow IPC（Feather v2）ファイル（pyarrowが必要）
+- ndjson: gzip圧縮のJSON Lines（追加の依存なし、Athenaでも読める）
+"""
+import gzip
+import io
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pa_parquet
+except ImportError:  # pragma: no cover - pyarrowは任意の依存
+    pa = None
+    pa_ipc = None
+    pa_parquet = None
+
+# アーカイブするカラム（metadataはJSON文字列として保存する）
+ARCHIVE_COLUMNS: tuple[str, ...] = (
+    "id",
+    "user_id",
+    "metric_type",
+    "value",
+    "unit",
+    "measured_at",
+    "device_id",
+    "metadata",
+    "notes",
+    "created_at",
+)
+
+ArchiveColumns = dict[str, list[Any]]
+
+
+@dataclass(frozen=True)
+class ArchiveFormat:
+    """アーカイブファイルの形式
+
+    Attributes:
+        name: 形式名（設定値）
+        extension: ファイルの拡張子
+        content_type: 保存先に設定するContent-Type
+        encode: 列データを圧縮したファイルのバイト列に変換する関数
+    """
+
+    name: str
+    extension: str
+    content_type: str
+    encode: Callable[[ArchiveColumns], bytes]
+
+
+def _json_metadata(metadata: list[Any]) -> list[Any]:
+    return [
+        json.dumps(value, ensure_ascii=False, separators=(",", ":")) if value is not None else None
+        for value in metadata
+    ]
+
+
+def _arrow_table(columns: ArchiveColumns) -> Any:
+    """列データをArrowのテーブルに変換する（日時はUTCのマイクロ秒）"""
+    timestamp = pa.timestamp("us", tz="UTC")
+    schema = pa.schema([
+        ("id", pa.string()),
+        ("user_id", pa.string()),
+        ("metric_type", pa.string()),
+        ("value", pa.float64()),
+        ("unit", pa.string()),
+        ("measured_at", timestamp),
+        ("device_id", pa.string()),
+        ("metadata", pa.string()),
+        ("notes", pa.string()),
+        ("created_at", timestamp),
+    ])
+    data = dict(columns, metadata=_json_metadata(columns["metadata"]))
+    return pa.Table.from_pydict({name: data[name] for name in ARCHIVE_COLUMNS}, schema=schema)
+
+
+def encode_parquet(columns: ArchiveColumns) -> bytes:
+    """zstd圧縮のParquetに変換する"""
+    sink = io.BytesIO()
+    pa_parquet.write_table(_arrow_table(columns), sink, compression="zstd")
+    return sink.getvalue()
+
+
+def encode_arrow(columns: ArchiveColumns) -> bytes:
+    """zstd圧縮のArrow IPCファイルに変換する"""
+    table = _arrow_table(columns)
+    sink = io.BytesIO()
+    options = pa_ipc.IpcWriteOptions(compression="zstd")
+    with pa_ipc.new_file(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def encode_ndjson(columns: ArchiveColumns) -> bytes:
+    """gzip圧縮のJSON Linesに変換する（日時はISO 8601）"""
+    data = dict(columns, metadata=_json_metadata(columns["metadata"]))
+    rows = zip(*(data[name] for name in ARCHIVE_COLUMNS), strict=True)
+    lines = [
+        json.dumps(
+            {
+                name: value.isoformat() if isinstance(value, datetime) else value
+                for name, value in zip(ARCHIVE_COLUMNS, row, strict=True)
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        for row in rows
+    ]
+    # mtime=0で同じ内容からは同じバイト列を生成する
+    return gzip.compress(("\n".join(lines) + "\n").encode(), mtime=0)
+
+
+ARCHIVE_FORMATS: dict[str, ArchiveFormat] = {
+    "parquet": ArchiveFormat("parquet", "parquet", "application/vnd.apache.parquet", encode_parquet),
+    "arrow": ArchiveFormat("arrow", "arrow", "application/vnd.apache.arrow.file", encode_arrow),
+    "ndjson": ArchiveFormat("ndjson", "ndjson.gz", "application/x-ndjson", encode_ndjson),
+}
+
+
+def get_archive_format(name: str) -> ArchiveFormat:
+    """
+    形式名からアーカイブファイルの形式を取得する
+
+    Args:
+        name: parquet・arrow・ndjsonのいずれか
+
+    Raises:
+        ValueError: 未知の形式名の場合
+        RuntimeError: pyarrowが必要な形式でpyarrowがインストールされていない場合
+    """
+    if name not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unknown archive format: {name}")
+    if name in ("parquet", "arrow") and pa is None:
+        raise RuntimeError(f"The pyarrow package is required for ARCHIVE_FORMAT={name}")
+    return ARCHIVE_FORMATS[name]
@@ -0,0 +1,97 @@
+"""アーカイブファイルの保存先
+
+保存はフラッシュ処理のスレッドから呼ぶため、いずれも同期的なインターフェースとする。
+
+- LocalArchiveStorage: ローカルファイルシステム（開発・単一ホスト用）
+- S3ArchiveStorage: boto3互換のS3クライアント（Glue/Athenaから参照する）
+"""
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Optional, Protocol
+
+try:
+    import boto3
+except ImportError:  # pragma: no cover - boto3は任意の依存
+    boto3 = None
+
+
+class ArchiveStorage(Protocol):
+    """アーカイブファイルの保存先のインターフェース"""
+
+    def put(self, key: str, body: bytes, content_type: str) -> None:
+        """キー（/区切りの相対パス）にファイルを保存する"""
+        ...
+
+
+class LocalArchiveStorage:
+    """ローカルファイルシステムに保存するアーカイブ"""
+
+    def __init__(self, root: str | Path) -> None:
+        """
+        Args:
+            root: 保存先のディレクトリ（キーはこのディレクトリからの相対パス）
+        """
+        self._root = Path(root)
+
+    def put(self, key: str, body: bytes, content_type: str) -> None:
+        """一時ファイルに書き込んでから置き換える（読み取り側に書きかけのファイルを見せない）"""
+        path = self._root / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(body)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+class S3ArchiveStorage:
+    """S3に保存するアーカイブ"""
+
+    def __init__(self, client: Any, bucket: str, prefix: str = "") -> None:
+        """
+        Args:
+            client: put_objectを持つboto3互換のS3クライアント
+            bucket: バケット名
+            prefix: キーの接頭辞（末尾の/は不要）
+        """
+        self._client = client
+        self._bucket = bucket
+        self._prefix = prefix.strip("/")
+
+    @classmethod
+    def from_settings(
+        cls,
+        bucket: str,
+        prefix: str = "",
+        region: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+    ) -> "S3ArchiveStorage":
+        """
+        boto3のクライアントを生成して保存先を作る（認証情報はboto3の既定の方法で取得する）
+
+        Args:
+            bucket: バケット名
+            prefix: キーの接頭辞
+            region: リージョン
+            endpoint_url: S3互換のエンドポイント（LocalStackなど）
+
+        Raises:
+            RuntimeError: boto3パッケージがインストールされていない場合
+        """
+        if boto3 is None:
+            raise RuntimeError("The boto3 package is required for ARCHIVE_BACKEND=s3")
+        client = boto3.client("s3", region_name=region, endpoint_url=endpoint_url or None)
+        return cls(client, bucket, prefix)
+
+    def put(self, key: str, body: bytes, content_type: str) -> None:
+        """PutObjectで保存する"""
+        self._client.put_object(
+            Bucket=self._bucket,
+            Key=f"{self._prefix}/{key}" if self._prefix else key,
+            Body=body,
+            ContentType=content_type,
+        )
@@ -0,0 +1,12 @@
+"""レスポンスキャッシュ関連パッケージ"""
+from .backends import CacheBackend, InMemoryCacheBackend, RedisCacheBackend
+from .response_cache import CacheScope, ResponseCache, touched_days
+
+__all__ = [
+    "CacheBackend",
+    "CacheScope",
+    "InMemoryCacheBackend",
+    "RedisCacheBackend",
+    "ResponseCache",
+    "touched_days",
+]
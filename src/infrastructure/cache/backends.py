@@ -0,0 +1,206 @@
+"""レスポンスキャッシュの保存先
+
+エントリ（シリアライズ済みのレスポンスボディ）と、無効化に使うバージョンを保持する。
+バージョンはエントリより長く保持する必要があるため、エントリとは別に管理し、
+容量によるLRUの追い出しの対象にしない。
+
+- InMemoryCacheBackend: プロセス内のTTL付きLRU（書き込みを受けたプロセスでのみ無効化される）
+- RedisCacheBackend: redis.asyncio互換のクライアント（複数ワーカー・複数ホストで共有）
+"""
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from typing import Any, Optional, Protocol
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # pragma: no cover - redisは任意の依存
+    redis_asyncio = None
+
+
+class CacheBackend(Protocol):
+    """レスポンスキャッシュの保存先のインターフェース"""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """エントリを取得する（存在しない・失効した場合はNone）"""
+        ...
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        """エントリを保存する"""
+        ...
+
+    async def get_versions(self, keys: Sequence[str]) -> list[Optional[str]]:
+        """バージョンをまとめて取得する（存在しないキーはNone）"""
+        ...
+
+    async def set_versions(self, keys: Sequence[str], version: str, ttl_seconds: float) -> None:
+        """複数のキーに同じバージョンを設定する"""
+        ...
+
+    async def add_versions(self, keys: Sequence[str], version: str, ttl_seconds: float) -> None:
+        """バージョンが存在しないキーにだけ同じバージョンを設定する"""
+        ...
+
+
+class InMemoryCacheBackend:
+    """プロセス内のTTL付きLRUキャッシュ"""
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            max_entries: 保持する最大エントリ数（バージョンは含まない）
+            clock: 現在時刻（秒）を返す関数
+        """
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, tuple[float, bytes]]" = OrderedDict()
+        self._versions: dict[str, tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """エントリを取得する（存在しない・失効した場合はNone）"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        """エントリを保存する（最大数を超えた場合は最も古く参照されたエントリを削除）"""
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    async def get_versions(self, keys: Sequence[str]) -> list[Optional[str]]:
+        """バージョンをまとめて取得する（存在しない・失効したキーはNone）"""
+        now = self._clock()
+        with self._lock:
+            versions: list[Optional[str]] = []
+            for key in keys:
+                entry = self._versions.get(key)
+                if entry is not None and now >= entry[0]:
+                    del self._versions[key]
+                    entry = None
+                versions.append(entry[1] if entry is not None else None)
+            return versions
+
+    async def set_versions(self, keys: Sequence[str], version: str, ttl_seconds: float) -> None:
+        """複数のキーに同じバージョンを設定する（失効したバージョンもここで削除する）"""
+        now = self._clock()
+        with self._lock:
+            if len(self._versions) > 2 * self._max_entries:
+                self._versions = {
+                    key: entry for key, entry in self._versions.items() if entry[0] > now
+                }
+            expires_at = now + ttl_seconds
+            for key in keys:
+                self._versions[key] = (expires_at, version)
+
+    async def add_versions(self, keys: Sequence[str], version: str, ttl_seconds: float) -> None:
+        """バージョンが存在しない（失効した）キーにだけ同じバージョンを設定する"""
+        now = self._clock()
+        with self._lock:
+            expires_at = now + ttl_seconds
+            for key in keys:
+                entry = self._versions.get(key)
+                if entry is None or now >= entry[0]:
+                    self._versions[key] = (expires_at, version)
+
+    def clear(self) -> None:
+        """すべてのエントリとバージョンを削除する（テスト用）"""
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+    def stats(self) -> dict[str, int]:
+        """現在のエントリ数・バージョン数を返す"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "versions": len(self._versions),
+                "max_entries": self._max_entries,
+            }
+
+
+class RedisCacheBackend:
+    """redis.asyncio互換のクライアントを使うキャッシュ
+
+    エントリ・バージョンはいずれもTTL付きで保存する。maxmemory-policyにallkeys-*を
+    指定するとバージョンのキーが先に追い出され、キャッシュのミスが増えるため、
+    noevictionまたはvolatile-*とすること。
+    """
+
+    def __init__(self, client: Any) -> None:
+        """
+        Args:
+            client: get/set/mget/pipelineを持つredis.asyncio互換のクライアント
+        """
+        self._client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCacheBackend":
+        """
+        接続URLからバックエンドを生成する
+
+        Args:
+            url: Redisの接続URL（redis://host:6379/0 など）
+
+        Raises:
+            RuntimeError: redisパッケージがインストールされていない場合
+        """
+        if redis_asyncio is None:
+            raise RuntimeError("The redis package is required for CACHE_BACKEND=redis")
+        return cls(redis_asyncio.from_url(url))
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """エントリを取得する（存在しない・失効した場合はNone）"""
+        value = await self._client.get(key)
+        return bytes(value) if value is not None else None
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        """エントリをミリ秒単位のTTL付きで保存する"""
+        await self._client.set(key, value, px=max(1, int(ttl_seconds * 1000)))
+
+    async def get_versions(self, keys: Sequence[str]) -> list[Optional[str]]:
+        """MGETでバージョンをまとめて取得する"""
+        if not keys:
+            return []
+        values = await self._client.mget(list(keys))
+        return [
+            value.decode() if isinstance(value, bytes) else value
+            for value in values
+        ]
+
+    async def set_versions(self, keys: Sequence[str], version: str, ttl_seconds: float) -> None:
+        """パイプラインでまとめて設定する（1往復）"""
+        if not keys:
+            return
+        pipeline = self._client.pipeline(transaction=False)
+        ttl_ms = max(1, int(ttl_seconds * 1000))
+        for key in keys:
+            pipeline.set(key, version, px=ttl_ms)
+        await pipeline.execute()
+
+    async def add_versions(self, keys: Sequence[str], version: str, ttl_seconds: float) -> None:
+        """SET NXをパイプラインでまとめて実行する（1往復）"""
+        if not keys:
+            return
+        pipeline = self._client.pipeline(transaction=False)
+        ttl_ms = max(1, int(ttl_seconds * 1000))
+        for key in keys:
+            pipeline.set(key, version, px=ttl_ms, nx=True)
+        await pipeline.execute()
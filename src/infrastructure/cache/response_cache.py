@@ -0,0 +1,171 @@
+"""読み取りAPIのレスポンスキャッシュ
+
+レスポンスはユーザー・メトリックタイプ・UTCの日ごとのバージョンと、リクエストの
+条件から求めたタグで保存する。測定データを登録すると、登録した行の
+(ユーザー, メトリックタイプ, 日)のバージョンだけを新しい値に置き換えるため、
+その範囲を含むレスポンスのタグだけが変わり、他のレスポンスはキャッシュに残る。
+エントリを探して削除する必要はなく、古いタグのエントリはTTLで消える。
+
+タグはデータやレスポンスを読まずに求まるため、そのままETagとして使える。
+存在しない（失効した）バージョンは読み取り時に新しい値で初期化するため、
+バージョンが消えて以前のタグ（クライアントが保持するETag）に戻ることはない。
+"""
+import hashlib
+import json
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from core.ids import uuid7
+from core.timestamps import epoch_days
+from domain.entities.measurement import MetricType
+from domain.entities.measurement_batch import MeasurementBatch
+
+from .backends import CacheBackend
+
+# メトリックタイプを指定しない（すべてのメトリックタイプを含む）レスポンス用
+_ALL_METRICS = "*"
+# 期間を指定しない、または長い期間のレスポンス用
+_ALL_DAYS = "all"
+
+
+@dataclass(frozen=True)
+class CacheScope:
+    """レスポンスが依存するデータの範囲
+
+    Attributes:
+        user_id: ユーザーID
+        metric_type: メトリックタイプ（Noneはすべて）
+        start: 測定日時の下限（Noneは期間指定なし）
+        end: 測定日時の上限（含まない、Noneは期間指定なし）
+    """
+
+    user_id: str
+    metric_type: Optional[MetricType] = None
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+
+def touched_days(batch: MeasurementBatch) -> set[tuple[str, int]]:
+    """
+    バッチが含む(メトリックタイプの値, UTCの日の通し番号)の組
+
+    Args:
+        batch: 登録した測定データ
+
+    Returns:
+        重複を除いた組
+    """
+    return {
+        (MetricType(metric_type).value, epoch_days(measured_at))
+        for metric_type, measured_at in zip(
+            batch.metric_types, batch.measured_at, strict=True
+        )
+    }
+
+
+class ResponseCache:
+    """バージョンによる無効化付きのレスポンスキャッシュ"""
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl_seconds: float = 60.0,
+        namespace: str = "healthsync",
+        max_versioned_days: int = 93,
+    ) -> None:
+        """
+        Args:
+            backend: 保存先
+            ttl_seconds: エントリの保持秒数
+            namespace: キーの接頭辞
+            max_versioned_days: 日ごとのバージョンで判定する期間の最大日数
+                （より長い期間・期間指定なしのレスポンスはユーザー・メトリック単位で判定する）
+        """
+        self.backend = backend
+        self._ttl_seconds = ttl_seconds
+        self._namespace = namespace
+        self._max_versioned_days = max_versioned_days
+        # バージョンはそのバージョンで保存したエントリより長く保持する
+        self._version_ttl_seconds = ttl_seconds * 2
+
+    def _version_key(self, user_id: str, metric: str, day: int | str) -> str:
+        return f"{self._namespace}:ver:{user_id}:{metric}:{day}"
+
+    def _scope_version_keys(self, scope: CacheScope) -> list[str]:
+        """レスポンスが依存するバージョンのキー"""
+        metric = scope.metric_type.value if scope.metric_type is not None else _ALL_METRICS
+        if scope.start is not None and scope.end is not None:
+            first, last = epoch_days(scope.start), epoch_days(scope.end - timedelta(microseconds=1))
+            if 0 <= last - first < self._max_versioned_days:
+                return [
+                    self._version_key(scope.user_id, metric, day) for day in range(first, last + 1)
+                ]
+        return [self._version_key(scope.user_id, metric, _ALL_DAYS)]
+
+    async def tag(self, endpoint: str, scope: CacheScope, params: Mapping[str, Any]) -> str:
+        """
+        レスポンスのタグ（ETag）を求める
+
+        Args:
+            endpoint: エンドポイント名
+            scope: レスポンスが依存するデータの範囲
+            params: レスポンスを決めるリクエストの条件（JSONに変換できる値）
+
+        Returns:
+            エンドポイント・ユーザー・条件・バージョンが同じ間は変わらない文字列
+        """
+        keys = self._scope_version_keys(scope)
+        versions = await self.backend.get_versions(keys)
+        missing = [
+            key for key, version in zip(keys, versions, strict=True) if version is None
+        ]
+        if missing:
+            # 同時に初期化された場合も同じ値になるよう、設定後に読み直す
+            await self.backend.add_versions(missing, uuid7(), self._version_ttl_seconds)
+            versions = await self.backend.get_versions(keys)
+        material = json.dumps(
+            [endpoint, scope.user_id, sorted(params.items()), versions],
+            default=str,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(material.encode()).hexdigest()[:32]
+
+    def _entry_key(self, endpoint: str, tag: str) -> str:
+        return f"{self._namespace}:resp:{endpoint}:{tag}"
+
+    async def get(self, endpoint: str, tag: str) -> Optional[bytes]:
+        """タグに対応するレスポンスボディを取得する"""
+        return await self.backend.get(self._entry_key(endpoint, tag))
+
+    async def set(self, endpoint: str, tag: str, body: bytes) -> None:
+        """タグに対応するレスポンスボディを保存する"""
+        await self.backend.set(self._entry_key(endpoint, tag), body, self._ttl_seconds)
+
+    async def invalidate(self, user_id: str, days: Iterable[tuple[str, int]]) -> None:
+        """
+        登録した(メトリックタイプ, 日)に依存するレスポンスを無効化する
+
+        日ごと・期間全体のそれぞれについて、メトリックタイプ別とすべてのメトリックタイプの
+        バージョンを置き換える。
+
+        Args:
+            user_id: ユーザーID
+            days: (メトリックタイプの値, UTCの日の通し番号)の組
+        """
+        keys: set[str] = set()
+        for metric, day in days:
+            keys.update((
+                self._version_key(user_id, metric, day),
+                self._version_key(user_id, _ALL_METRICS, day),
+                self._version_key(user_id, metric, _ALL_DAYS),
+                self._version_key(user_id, _ALL_METRICS, _ALL_DAYS),
+            ))
+        if keys:
+            await self.backend.set_versions(sorted(keys), uuid7(), self._version_ttl_seconds)
+
+    async def invalidate_batch(self, batch: MeasurementBatch) -> None:
+        """登録したバッチに依存するレスポンスを無効化する"""
+        await self.invalidate(batch.user_id, touched_days(batch))
+
@@ -0,0 +1,20 @@
+"""データベース関連パッケージ"""
+from .models import (
+    Base,
+    IdempotencyKeyRecord,
+    MeasurementDailyRollup,
+    MeasurementHourlyRollup,
+    MeasurementRecord,
+)
+from .session import dispose_engine, get_engine, init_db
+
+__all__ = [
+    "Base",
+    "IdempotencyKeyRecord",
+    "MeasurementDailyRollup",
+    "MeasurementHourlyRollup",
+    "MeasurementRecord",
+    "dispose_engine",
+    "get_engine",
+    "init_db",
+]
@@ -0,0 +1,415 @@
+"""ゴールと期間ごとの進捗のリポジトリ"""
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import Select, Table, delete, insert, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from domain.entities.goal import (
+    Goal,
+    GoalAchievedEvent,
+    GoalAggregation,
+    GoalPeriod,
+    GoalProgress,
+)
+from domain.entities.measurement import MetricType
+from domain.entities.measurement_batch import MeasurementBatch
+from domain.services.goal_evaluation import aggregate_goal_deltas, previous_period_start
+
+from .models import GoalEventOutboxRecord, GoalProgressRecord, GoalRecord
+from .statements import insert_ignoring_duplicates
+
+_goal_table = GoalRecord.__table__
+_progress_table = GoalProgressRecord.__table__
+_outbox_table = GoalEventOutboxRecord.__table__
+
+
+def _progress_upsert(table: Table, dialect_name: str) -> Any:
+    """既存の期間の合計・件数に加算するUPSERT文を生成する
+
+    Args:
+        table: 進捗テーブル
+        dialect_name: 接続先のダイアレクト名
+
+    Returns:
+        executemany可能なUPSERT文
+    """
+    if dialect_name == "mysql":
+        mysql_stmt = mysql_insert(table)
+        incoming = mysql_stmt.inserted
+        return mysql_stmt.on_duplicate_key_update(
+            value_sum=table.c.value_sum + incoming.value_sum,
+            sample_count=table.c.sample_count + incoming.sample_count,
+        )
+    if dialect_name == "sqlite":
+        sqlite_stmt = sqlite_insert(table)
+        incoming = sqlite_stmt.excluded
+        return sqlite_stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.goal_id, table.c.period_start],
+            set_={
+                "value_sum": table.c.value_sum + incoming.value_sum,
+                "sample_count": table.c.sample_count + incoming.sample_count,
+            },
+        )
+    raise NotImplementedError(f"Goal progress upsert is not supported for {dialect_name}")
+
+
+def _progress_query(user_id: str, goal_id: str, period_start: datetime) -> Select[Any]:
+    """ゴールの1期間の進捗を取得するクエリ"""
+    table = _progress_table
+    return (
+        select(table)
+        .where(table.c.user_id == user_id)
+        .where(table.c.goal_id == goal_id)
+        .where(table.c.period_start == period_start)
+    )
+
+
+def _to_goal(row: Any) -> Goal:
+    return Goal(
+        goal_id=row.goal_id,
+        user_id=row.user_id,
+        metric_type=MetricType(row.metric_type),
+        target=row.target,
+        aggregation=GoalAggregation(row.aggregation),
+        period=GoalPeriod(row.period),
+        unit=row.unit,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+    )
+
+
+def _to_progress(row: Any) -> GoalProgress:
+    return GoalProgress(
+        period_start=row.period_start,
+        value_sum=row.value_sum,
+        sample_count=row.sample_count,
+        achieved_at=row.achieved_at,
+        streak=row.streak,
+    )
+
+
+def _to_event(row: Any) -> GoalAchievedEvent:
+    return GoalAchievedEvent(
+        user_id=row.user_id,
+        goal_id=row.goal_id,
+        metric_type=row.metric_type,
+        period=row.period,
+        period_start=row.period_start,
+        value=row.value,
+        target=row.target,
+        streak=row.streak,
+        achieved_at=row.achieved_at,
+    )
+
+
+class GoalRepository:
+    """ゴールの定義と期間ごとの進捗を保存するリポジトリ"""
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        """
+        Args:
+            engine: 非同期エンジン
+        """
+        self._engine = engine
+
+    async def put(self, goal: Goal) -> tuple[Goal, bool]:
+        """
+        ゴールを作成または置き換える
+
+        置き換える場合は作成日時を引き継ぐ。集計の対象・方法・期間が変わった場合は、
+        以前の定義で集計した進捗を削除する（目標値のみの変更では進捗を引き継ぐ）。
+
+        Args:
+            goal: 保存するゴール
+
+        Returns:
+            保存したゴールと、新しく作成したかどうか
+        """
+        values = {
+            "user_id": goal.user_id,
+            "goal_id": goal.goal_id,
+            "metric_type": goal.metric_type.value,
+            "target": goal.target,
+            "aggregation": goal.aggregation.value,
+            "period": goal.period.value,
+            "unit": goal.unit,
+            "created_at": goal.created_at,
+            "updated_at": goal.updated_at,
+        }
+        async with self._engine.begin() as conn:
+            statement = insert_ignoring_duplicates(_goal_table, conn.dialect.name)
+            if (await conn.execute(statement, values)).rowcount == 1:
+                return goal, True
+
+            existing = await self._get(conn, goal.user_id, goal.goal_id)
+            if existing is None:
+                # 同時に削除された場合は作成し直す
+                await conn.execute(statement, values)
+                return goal, True
+            stored = goal.model_copy(update={"created_at": existing.created_at})
+            table = _goal_table
+            await conn.execute(
+                update(table)
+                .where(table.c.user_id == goal.user_id)
+                .where(table.c.goal_id == goal.goal_id)
+                .values({**values, "created_at": existing.created_at})
+            )
+            if not existing.same_definition(goal):
+                await self._delete_progress(conn, goal.user_id, goal.goal_id)
+            return stored, False
+
+    async def get(self, user_id: str, goal_id: str) -> Optional[Goal]:
+        """
+        ゴールを取得する
+
+        Args:
+            user_id: ユーザーID
+            goal_id: ゴールID
+
+        Returns:
+            ゴール（存在しない場合はNone）
+        """
+        async with self._engine.connect() as conn:
+            return await self._get(conn, user_id, goal_id)
+
+    async def list_for_user(self, user_id: str) -> list[Goal]:
+        """
+        ユーザーのゴールをゴールID順に取得する
+
+        Args:
+            user_id: ユーザーID
+
+        Returns:
+            ゴールのリスト
+        """
+        async with self._engine.connect() as conn:
+            return await self._list_for_user(conn, user_id)
+
+    async def delete(self, user_id: str, goal_id: str) -> bool:
+        """
+        ゴールとその進捗を削除する
+
+        Args:
+            user_id: ユーザーID
+            goal_id: ゴールID
+
+        Returns:
+            削除したかどうか（存在しない場合はFalse）
+        """
+        table = _goal_table
+        async with self._engine.begin() as conn:
+            result = await conn.execute(
+                delete(table).where(table.c.user_id == user_id).where(table.c.goal_id == goal_id)
+            )
+            await self._delete_progress(conn, user_id, goal_id)
+            return bool(result.rowcount)
+
+    async def list_progress(
+        self,
+        user_id: str,
+        goal_id: str,
+        since: Optional[datetime] = None,
+        limit: int = 30,
+    ) -> list[GoalProgress]:
+        """
+        ゴールの進捗を新しい期間から順に取得する
+
+        Args:
+            user_id: ユーザーID
+            goal_id: ゴールID
+            since: 取得する期間の開始の下限（含む、省略時は制限なし）
+            limit: 最大件数
+
+        Returns:
+            期間ごとの進捗のリスト
+        """
+        table = _progress_table
+        statement = (
+            select(table)
+            .where(table.c.user_id == user_id)
+            .where(table.c.goal_id == goal_id)
+            .order_by(table.c.period_start.desc())
+            .limit(limit)
+        )
+        if since is not None:
+            statement = statement.where(table.c.period_start >= since)
+        async with self._engine.connect() as conn:
+            return [_to_progress(row) for row in await conn.execute(statement)]
+
+    async def record_progress(
+        self, conn: AsyncConnection, batch: MeasurementBatch, achieved_at: datetime
+    ) -> list[GoalAchievedEvent]:
+        """
+        保存したバッチの行をユーザーのゴールの期間ごとの合計・件数に加算する
+
+        測定データを保存するトランザクション内で呼び出し、測定の保存と進捗・達成イベントの
+        記録をまとめてコミットまたはロールバックする。加算はデータベース側で行うため、
+        同じ期間への同時の取り込みでも値を失わない。新たに目標に達した期間は未達成の場合のみ
+        達成済みに更新し、同じ期間のイベントを1回だけアウトボックスに保存する。
+
+        Args:
+            conn: 測定データを保存するトランザクションの接続
+            batch: 保存した測定データのバッチ
+            achieved_at: 達成日時
+
+        Returns:
+            新たに達成した期間のイベント（アウトボックスに保存したもの）
+        """
+        user_id = batch.user_id
+        deltas = aggregate_goal_deltas(batch, await self._list_for_user(conn, user_id))
+        if not deltas:
+            return []
+        params = [
+            {
+                "user_id": user_id,
+                "goal_id": delta.goal.goal_id,
+                "period_start": delta.period_start,
+                "value_sum": delta.value_sum,
+                "sample_count": delta.sample_count,
+                "achieved_at": None,
+                "streak": 0,
+            }
+            for delta in deltas
+        ]
+        table = _progress_table
+        await conn.execute(_progress_upsert(table, conn.dialect.name), params)
+
+        events = []
+        for delta in deltas:
+            goal = delta.goal
+            query = _progress_query(user_id, goal.goal_id, delta.period_start)
+            progress = _to_progress((await conn.execute(query)).one())
+            if progress.achieved_at is not None or not goal.is_achieved(
+                progress.value_sum, progress.sample_count
+            ):
+                continue
+            previous = (
+                await conn.execute(_progress_query(
+                    user_id, goal.goal_id, previous_period_start(delta.period_start, goal.period)
+                ))
+            ).first()
+            streak = previous.streak + 1 if previous is not None and previous.achieved_at else 1
+            result = await conn.execute(
+                update(table)
+                .where(table.c.user_id == user_id)
+                .where(table.c.goal_id == goal.goal_id)
+                .where(table.c.period_start == delta.period_start)
+                .where(table.c.achieved_at.is_(None))
+                .values(achieved_at=achieved_at, streak=streak)
+            )
+            if result.rowcount != 1:
+                # 他の取り込みが先に達成済みにした場合
+                continue
+            event = GoalAchievedEvent(
+                user_id=user_id,
+                goal_id=goal.goal_id,
+                metric_type=goal.metric_type.value,
+                period=goal.period.value,
+                period_start=delta.period_start,
+                value=progress.value(goal.aggregation),
+                target=goal.target,
+                streak=streak,
+                achieved_at=achieved_at,
+            )
+            await conn.execute(insert(_outbox_table), {
+                "user_id": event.user_id,
+                "goal_id": event.goal_id,
+                "period_start": event.period_start,
+                "metric_type": event.metric_type,
+                "period": event.period,
+                "value": event.value,
+                "target": event.target,
+                "streak": event.streak,
+                "achieved_at": event.achieved_at,
+            })
+            events.append(event)
+        return events
+
+    async def get_progress(
+        self, user_id: str, goal_id: str, period_start: datetime
+    ) -> Optional[GoalProgress]:
+        """
+        ゴールの1期間の進捗を取得する
+
+        Args:
+            user_id: ユーザーID
+            goal_id: ゴールID
+            period_start: 期間の開始
+
+        Returns:
+            進捗（その期間の測定がない場合はNone）
+        """
+        async with self._engine.connect() as conn:
+            row = (await conn.execute(_progress_query(user_id, goal_id, period_start))).first()
+            return _to_progress(row) if row is not None else None
+
+    async def list_pending_events(
+        self, achieved_before: datetime, limit: int = 100
+    ) -> list[GoalAchievedEvent]:
+        """
+        アウトボックスに残っている（通知していない）達成イベントを達成日時の古い順に取得する
+
+        Args:
+            achieved_before: 取得するイベントの達成日時の上限（含まない）
+            limit: 最大件数
+
+        Returns:
+            達成イベントのリスト
+        """
+        table = _outbox_table
+        async with self._engine.connect() as conn:
+            rows = await conn.execute(
+                select(table)
+                .where(table.c.achieved_at < achieved_before)
+                .order_by(table.c.achieved_at)
+                .limit(limit)
+            )
+            return [_to_event(row) for row in rows]
+
+    async def delete_events(self, events: Sequence[GoalAchievedEvent]) -> None:
+        """
+        通知した達成イベントをアウトボックスから削除する
+
+        Args:
+            events: 通知したイベント
+        """
+        if not events:
+            return
+        table = _outbox_table
+        async with self._engine.begin() as conn:
+            for event in events:
+                await conn.execute(
+                    delete(table)
+                    .where(table.c.user_id == event.user_id)
+                    .where(table.c.goal_id == event.goal_id)
+                    .where(table.c.period_start == event.period_start)
+                )
+
+    async def _get(self, conn: AsyncConnection, user_id: str, goal_id: str) -> Optional[Goal]:
+        """ゴールを取得する"""
+        table = _goal_table
+        row = (
+            await conn.execute(
+                select(table).where(table.c.user_id == user_id).where(table.c.goal_id == goal_id)
+            )
+        ).first()
+        return _to_goal(row) if row is not None else None
+
+    async def _list_for_user(self, conn: AsyncConnection, user_id: str) -> list[Goal]:
+        """ユーザーのゴールをゴールID順に取得する"""
+        table = _goal_table
+        rows = await conn.execute(
+            select(table).where(table.c.user_id == user_id).order_by(table.c.goal_id)
+        )
+        return [_to_goal(row) for row in rows]
+
+    async def _delete_progress(self, conn: AsyncConnection, user_id: str, goal_id: str) -> None:
+        """ゴールの進捗をすべて削除する"""
+        table = _progress_table
+        await conn.execute(
+            delete(table).where(table.c.user_id == user_id).where(table.c.goal_id == goal_id)
+        )
@@ -0,0 +1,180 @@
+"""Idempotency-Keyの処理結果リポジトリ"""
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from .models import IdempotencyKeyRecord
+from .statements import insert_ignoring_duplicates
+
+_idempotency_table = IdempotencyKeyRecord.__table__
+
+
+@dataclass(frozen=True)
+class IdempotencyRecord:
+    """Idempotency-Keyに対応する処理状況
+
+    Attributes:
+        request_hash: 最初のリクエストボディのハッシュ
+        status_code: 返したレスポンスのステータスコード（処理中はNone）
+        headers: 返したレスポンスのヘッダー
+        body: 返したレスポンスのボディ
+        created_at: キーを確保した日時
+    """
+
+    request_hash: str
+    status_code: Optional[int]
+    headers: dict[str, str]
+    body: Optional[bytes]
+    created_at: datetime
+
+    @property
+    def completed(self) -> bool:
+        """レスポンスが保存済みかどうか"""
+        return self.status_code is not None
+
+
+class IdempotencyRepository:
+    """Idempotency-Keyごとの処理状況とレスポンスを保存するリポジトリ"""
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        ttl: timedelta = timedelta(hours=24),
+        lock_timeout: timedelta = timedelta(minutes=1),
+    ) -> None:
+        """
+        Args:
+            engine: 非同期エンジン
+            ttl: 保存したレスポンスを再送に返す期間
+            lock_timeout: 処理中のキーを放棄されたとみなすまでの時間
+        """
+        self._engine = engine
+        self._ttl = ttl
+        self._lock_timeout = lock_timeout
+
+    async def claim(
+        self,
+        user_id: str,
+        key: str,
+        request_hash: str,
+        now: Optional[datetime] = None,
+    ) -> Optional[IdempotencyRecord]:
+        """キーを処理中として確保する
+
+        有効期限切れのキーと、lock_timeoutを過ぎても完了していないキーは
+        新しいリクエストで確保し直す。
+
+        Args:
+            user_id: ユーザーID
+            key: Idempotency-Keyヘッダーの値
+            request_hash: リクエストボディのハッシュ
+            now: 現在時刻（省略時は現在時刻）
+
+        Returns:
+            確保できた場合はNone、既に使われているキーの場合はその処理状況
+        """
+        now = now or datetime.now(UTC)
+        pending = {
+            "user_id": user_id,
+            "idempotency_key": key,
+            "request_hash": request_hash,
+            "status_code": None,
+            "response_headers": None,
+            "response_body": None,
+            "created_at": now,
+        }
+        async with self._engine.begin() as conn:
+            statement = insert_ignoring_duplicates(_idempotency_table, conn.dialect.name)
+            if (await conn.execute(statement, pending)).rowcount == 1:
+                return None
+
+            record = await self._get(conn, user_id, key)
+            if record is None or not self._is_reclaimable(record, now):
+                return record
+
+            # 他のリクエストが同時に確保し直していない場合のみ置き換える
+            table = _idempotency_table
+            result = await conn.execute(
+                update(table)
+                .where(table.c.user_id == user_id)
+                .where(table.c.idempotency_key == key)
+                .where(table.c.created_at == record.created_at)
+                .values(**pending)
+            )
+            if result.rowcount == 1:
+                return None
+            return await self._get(conn, user_id, key)
+
+    def _is_reclaimable(self, record: IdempotencyRecord, now: datetime) -> bool:
+        """有効期限切れ、または処理中のまま放棄されたキーかどうか"""
+        age = now - record.created_at
+        return age > self._ttl or (not record.completed and age > self._lock_timeout)
+
+    async def complete(
+        self,
+        user_id: str,
+        key: str,
+        status_code: int,
+        headers: dict[str, str],
+        body: bytes,
+    ) -> None:
+        """
+        処理中のキーにレスポンスを保存する
+
+        Args:
+            user_id: ユーザーID
+            key: Idempotency-Keyヘッダーの値
+            status_code: レスポンスのステータスコード
+            headers: レスポンスのヘッダー
+            body: レスポンスのボディ
+        """
+        table = _idempotency_table
+        async with self._engine.begin() as conn:
+            await conn.execute(
+                update(table)
+                .where(table.c.user_id == user_id)
+                .where(table.c.idempotency_key == key)
+                .values(status_code=status_code, response_headers=headers, response_body=body)
+            )
+
+    async def release(self, user_id: str, key: str) -> None:
+        """
+        処理が失敗したキーを解放する（同じキーで再試行できるようにする）
+
+        Args:
+            user_id: ユーザーID
+            key: Idempotency-Keyヘッダーの値
+        """
+        table = _idempotency_table
+        async with self._engine.begin() as conn:
+            await conn.execute(
+                delete(table)
+                .where(table.c.user_id == user_id)
+                .where(table.c.idempotency_key == key)
+                .where(table.c.status_code.is_(None))
+            )
+
+    async def _get(
+        self, conn: AsyncConnection, user_id: str, key: str
+    ) -> Optional[IdempotencyRecord]:
+        """キーの処理状況を取得する"""
+        table = _idempotency_table
+        row = (
+            await conn.execute(
+                select(table)
+                .where(table.c.user_id == user_id)
+                .where(table.c.idempotency_key == key)
+            )
+        ).first()
+        if row is None:
+            return None
+        return IdempotencyRecord(
+            request_hash=row.request_hash,
+            status_code=row.status_code,
+            headers=row.response_headers or {},
+            body=row.response_body,
+            created_at=row.created_at,
+        )
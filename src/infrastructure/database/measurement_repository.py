@@ -0,0 +1,431 @@
+"""測定データリポジトリ"""
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from typing import Any, Optional
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import Select, Table, and_, func, or_, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from domain.entities.measurement import MetricType
+from domain.entities.measurement_batch import MeasurementBatch
+from domain.services.measurement_query import MeasurementQuery, PageCursor, SortOrder
+from domain.services.measurement_summary import (
+    BucketAggregate,
+    BucketGranularity,
+    BucketStatistics,
+    aggregate_into_buckets,
+)
+
+from .models import MeasurementDailyRollup, MeasurementHourlyRollup, MeasurementRecord
+from .statements import (
+    epoch_microseconds,
+    epoch_microseconds_array,
+    insert_ignoring_duplicates,
+)
+
+_measurements_table = MeasurementRecord.__table__
+# 同じ測定とみなすカラム（uq_measurements_dedupと同じ）
+_DEDUP_COLUMNS = (
+    _measurements_table.c.user_id,
+    _measurements_table.c.metric_type,
+    _measurements_table.c.measured_at,
+    _measurements_table.c.device_key,
+)
+
+# 登録した行を同じトランザクション内で処理するフック（ゴールの進捗の加算など）
+StoredBatchHook = Callable[[AsyncConnection, MeasurementBatch], Awaitable[Any]]
+
+# バケット粒度ごとのロールアップテーブル
+ROLLUP_TABLES: dict[BucketGranularity, Table] = {
+    BucketGranularity.HOUR: MeasurementHourlyRollup.__table__,
+    BucketGranularity.DAY: MeasurementDailyRollup.__table__,
+}
+
+
+def _rollup_upsert(table: Table, dialect_name: str) -> Any:
+    """既存バケットに加算するUPSERT文を生成する
+
+    Args:
+        table: ロールアップテーブル
+        dialect_name: 接続先のダイアレクト名
+
+    Returns:
+        executemany可能なUPSERT文
+    """
+    if dialect_name == "mysql":
+        mysql_stmt = mysql_insert(table)
+        incoming = mysql_stmt.inserted
+        return mysql_stmt.on_duplicate_key_update(
+            sample_count=table.c.sample_count + incoming.sample_count,
+            value_sum=table.c.value_sum + incoming.value_sum,
+            value_min=func.least(table.c.value_min, incoming.value_min),
+            value_max=func.greatest(table.c.value_max, incoming.value_max),
+            value_sum_sq=table.c.value_sum_sq + incoming.value_sum_sq,
+        )
+    if dialect_name == "sqlite":
+        sqlite_stmt = sqlite_insert(table)
+        incoming = sqlite_stmt.excluded
+        return sqlite_stmt.on_conflict_do_update(
+            index_elements=[
+                table.c.user_id, table.c.metric_type, table.c.unit, table.c.bucket_start
+            ],
+            set_={
+                "sample_count": table.c.sample_count + incoming.sample_count,
+                "value_sum": table.c.value_sum + incoming.value_sum,
+                # SQLiteのスカラー関数min/maxは引数が2つ以上のとき最小・最大値を返す
+                "value_min": func.min(table.c.value_min, incoming.value_min),
+                "value_max": func.max(table.c.value_max, incoming.value_max),
+                "value_sum_sq": table.c.value_sum_sq + incoming.value_sum_sq,
+            },
+        )
+    raise NotImplementedError(f"Rollup upsert is not supported for {dialect_name}")
+
+
+def measurement_page_query(query: MeasurementQuery) -> Select[Any]:
+    """一覧の1ページを取得するSELECT文を生成する
+
+    (user_id[, metric_type], measured_at)の範囲を(measured_at, id)の順に読む形にし、
+    idx_measurements_user_date（メトリックタイプ指定時はidx_measurements_user_metric_date）
+    の範囲走査だけで並べ替えなしに取得できるようにする。カーソル条件は行値比較ではなく
+    measured_atの範囲条件を含む形に展開する（MySQLで範囲走査を使わせるため）。
+    次のページの有無を判定するため、limitより1件多く取得する。
+
+    Args:
+        query: 一覧取得条件
+
+    Returns:
+        SELECT文
+    """
+    table = _measurements_table
+    statement = (
+        select(*(table.c[name] for name in query.selected_columns))
+        .where(table.c.user_id == query.user_id)
+    )
+    if query.metric_type is not None:
+        statement = statement.where(table.c.metric_type == query.metric_type.value)
+    if query.device_id is not None:
+        statement = statement.where(table.c.device_id == query.device_id)
+    if query.start is not None:
+        statement = statement.where(table.c.measured_at >= query.start)
+    if query.end is not None:
+        statement = statement.where(table.c.measured_at < query.end)
+
+    descending = query.order is SortOrder.DESC
+    if query.after is not None:
+        measured_at, row_id = query.after.measured_at, query.after.id
+        if descending:
+            statement = statement.where(
+                table.c.measured_at <= measured_at,
+                or_(
+                    table.c.measured_at < measured_at,
+                    and_(table.c.measured_at == measured_at, table.c.id < row_id),
+                ),
+            )
+        else:
+            statement = statement.where(
+                table.c.measured_at >= measured_at,
+                or_(
+                    table.c.measured_at > measured_at,
+                    and_(table.c.measured_at == measured_at, table.c.id > row_id),
+                ),
+            )
+    if descending:
+        statement = statement.order_by(table.c.measured_at.desc(), table.c.id.desc())
+    else:
+        statement = statement.order_by(table.c.measured_at, table.c.id)
+    return statement.limit(query.limit + 1)
+
+
+def measurement_series_query(
+    user_id: str,
+    metric_type: MetricType,
+    start: datetime,
+    end: datetime,
+    dialect_name: str,
+) -> Select[Any]:
+    """時系列（測定日時と測定値）を取得するSELECT文を生成する
+
+    (user_id, metric_type, measured_at)の範囲を測定日時順に読むため、
+    idx_measurements_user_metric_dateだけで完結する（テーブルを参照しない）。
+    測定日時はdatetimeではなくepoch_microsecondsの形式で取得する。
+
+    Args:
+        user_id: ユーザーID
+        metric_type: メトリックタイプ
+        start: 期間の開始（含む）
+        end: 期間の終了（含まない）
+        dialect_name: 接続先のダイアレクト名
+
+    Returns:
+        SELECT文
+    """
+    table = _measurements_table
+    return (
+        select(epoch_microseconds(table.c.measured_at, dialect_name), table.c.value)
+        .where(table.c.user_id == user_id)
+        .where(table.c.metric_type == metric_type.value)
+        .where(table.c.measured_at >= start)
+        .where(table.c.measured_at < end)
+        .order_by(table.c.measured_at)
+    )
+
+
+def _drop_batch_duplicates(batch: MeasurementBatch) -> MeasurementBatch:
+    """バッチ内で同じ測定とみなす行のうち、最初の行だけを残したバッチを返す"""
+    # タイムゾーン付き日時は同じ時刻であればオフセットが異なっても等しい
+    seen: set[tuple[Any, ...]] = set()
+    positions = []
+    for position, key in enumerate(zip(
+        batch.metric_types, batch.measured_at,
+        (device_id or "" for device_id in batch.device_ids),
+        strict=True,
+    )):
+        if key not in seen:
+            seen.add(key)
+            positions.append(position)
+    if len(positions) == len(batch):
+        return batch
+    return batch.take(positions)
+
+
+class MeasurementRepository:
+    """測定データの永続化を担当するリポジトリ"""
+
+    def __init__(self, engine: AsyncEngine, chunk_size: int = 1000) -> None:
+        """
+        Args:
+            engine: 非同期エンジン
+            chunk_size: 1回のINSERT文にまとめる最大行数
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        self._engine = engine
+        self._chunk_size = chunk_size
+
+    async def bulk_insert(
+        self, batch: MeasurementBatch, on_stored: Optional[StoredBatchHook] = None
+    ) -> MeasurementBatch:
+        """測定データを1トランザクションでチャンク単位に一括登録する
+
+        (ユーザー, メトリックタイプ, 測定日時, デバイスID)が登録済みの行と
+        バッチ内で重複する行は登録しない。バッチ内の重複を除いたうえで、登録済みの行
+        （並行リクエストが登録した行を含む）は一意インデックスで読み飛ばし、登録件数が
+        一致しない場合のみバッチの行IDで実際に登録された行を確認する。登録済みの行を
+        期間で読み込まないため、長い期間にまたがるバックフィルでも読み込む行数はバッチの
+        行数までに収まる。ロールアップには実際に登録した行のみを加算する。
+
+        各チャンクはexecutemanyで実行する。aiomysql（PyMySQL）は
+        INSERT ... VALUES をマルチロウINSERTに書き換えて送信するため、
+        1行ずつのラウンドトリップは発生しない。
+
+        Args:
+            batch: 1ユーザー分の測定データのバッチ
+                （行データへの変換はチャンクごとに行う）
+            on_stored: 登録した行が1件以上ある場合に同じトランザクション内で呼び出すフック
+                （例外を送出した場合は登録ごとロールバックする）
+
+        Returns:
+            登録した行のバッチ（重複として除外した行を含まない）
+        """
+        if not len(batch):
+            return batch
+
+        async with self._engine.begin() as conn:
+            return await self._insert(conn, batch, on_stored)
+
+    async def bulk_insert_many(
+        self, batches: list[MeasurementBatch], on_stored: Optional[StoredBatchHook] = None
+    ) -> list[MeasurementBatch]:
+        """複数ユーザーのバッチを1トランザクションで一括登録する
+
+        非同期登録のワーカーが、キューに溜まった小さなバッチをまとめて書き込むために使う。
+        重複の扱いはbulk_insertと同じ。
+
+        Args:
+            batches: 測定データのバッチ（ユーザーごとに1つにまとめておくと効率がよい）
+            on_stored: 登録した行があるバッチごとに同じトランザクション内で呼び出すフック
+
+        Returns:
+            バッチごとの登録した行のバッチ（batchesと同じ順）
+        """
+        if not any(len(batch) for batch in batches):
+            return list(batches)
+
+        async with self._engine.begin() as conn:
+            return [
+                await self._insert(conn, batch, on_stored) if len(batch) else batch
+                for batch in batches
+            ]
+
+    async def _insert(
+        self,
+        conn: AsyncConnection,
+        batch: MeasurementBatch,
+        on_stored: Optional[StoredBatchHook] = None,
+    ) -> MeasurementBatch:
+        """トランザクション内でバッチを登録し、ロールアップに加算する"""
+        batch = _drop_batch_duplicates(batch)
+        statement = insert_ignoring_duplicates(
+            _measurements_table, conn.dialect.name, index_elements=_DEDUP_COLUMNS
+        )
+        inserted = 0
+        for start in range(0, len(batch), self._chunk_size):
+            result = await conn.execute(
+                statement, batch.to_rows(start, start + self._chunk_size)
+            )
+            inserted += result.rowcount
+        if inserted != len(batch):
+            # 登録済みの測定と重複する行があった場合
+            # （rowcountを取得できないドライバーでも-1となり件数が一致しない）
+            batch = await self._keep_inserted(conn, batch)
+        if len(batch):
+            await self._update_rollups(conn, batch)
+            if on_stored is not None:
+                await on_stored(conn, batch)
+        return batch
+
+    async def _keep_inserted(
+        self, conn: AsyncConnection, batch: MeasurementBatch
+    ) -> MeasurementBatch:
+        """バッチのうち実際に登録された行（IDが存在する行）のみを残す"""
+        table = _measurements_table
+        stored: set[str] = set()
+        for start in range(0, len(batch), self._chunk_size):
+            chunk_ids = batch.ids[start:start + self._chunk_size]
+            result = await conn.execute(select(table.c.id).where(table.c.id.in_(chunk_ids)))
+            stored.update(result.scalars())
+        return batch.take(
+            [position for position, row_id in enumerate(batch.ids) if row_id in stored]
+        )
+
+    async def _update_rollups(self, conn: AsyncConnection, batch: MeasurementBatch) -> None:
+        """登録した行をバッチの列のまま集計し、ロールアップテーブルに加算する"""
+        for granularity, table in ROLLUP_TABLES.items():
+            aggregates = aggregate_into_buckets(
+                metric_types=batch.metric_types,
+                units=batch.units,
+                values=batch.values,
+                measured_at=batch.measured_at,
+                granularity=granularity,
+            )
+            params = [
+                {
+                    "user_id": batch.user_id,
+                    "metric_type": aggregate.metric_type.value,
+                    "unit": aggregate.unit,
+                    "bucket_start": aggregate.bucket_start,
+                    "sample_count": aggregate.statistics.count,
+                    "value_sum": aggregate.statistics.total,
+                    "value_min": aggregate.statistics.minimum,
+                    "value_max": aggregate.statistics.maximum,
+                    "value_sum_sq": aggregate.statistics.sum_of_squares,
+                }
+                for aggregate in aggregates
+            ]
+            await conn.execute(_rollup_upsert(table, conn.dialect.name), params)
+
+    async def fetch_page(
+        self, query: MeasurementQuery
+    ) -> tuple[list[dict[str, Any]], Optional[PageCursor]]:
+        """測定データの一覧を1ページ取得する（キーセットページネーション）
+
+        Args:
+            query: 一覧取得条件
+
+        Returns:
+            指定フィールドのみを含む行データと、次のページのカーソル
+            （最後のページの場合はNone）
+        """
+        async with self._engine.connect() as conn:
+            result = await conn.execute(measurement_page_query(query))
+            rows = result.mappings().all()
+
+        next_cursor = None
+        if len(rows) > query.limit:
+            rows = rows[:query.limit]
+            last = rows[-1]
+            next_cursor = PageCursor(measured_at=last["measured_at"], id=last["id"])
+        fields = query.fields
+        return [{name: row[name] for name in fields} for row in rows], next_cursor
+
+    async def fetch_series(
+        self,
+        user_id: str,
+        metric_type: MetricType,
+        start: datetime,
+        end: datetime,
+    ) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.float64]]:
+        """期間内の測定日時と測定値を時系列の配列として取得する
+
+        Args:
+            user_id: ユーザーID
+            metric_type: メトリックタイプ
+            start: 期間の開始（含む）
+            end: 期間の終了（含まない）
+
+        Returns:
+            測定日時（エポックマイクロ秒、昇順）と測定値の配列
+        """
+        async with self._engine.connect() as conn:
+            query = measurement_series_query(
+                user_id, metric_type, start, end, conn.dialect.name
+            )
+            rows = (await conn.execute(query)).all()
+
+        if not rows:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        measured_at, values = zip(*rows, strict=True)
+        return epoch_microseconds_array(measured_at), np.array(values, dtype=np.float64)
+
+    async def fetch_rollups(
+        self,
+        user_id: str,
+        granularity: BucketGranularity,
+        start: datetime,
+        end: datetime,
+        metric_type: Optional[MetricType] = None,
+    ) -> list[BucketAggregate]:
+        """期間内のロールアップバケットを取得する（生データは参照しない）
+
+        Args:
+            user_id: ユーザーID
+            granularity: バケット粒度
+            start: 期間の開始（含む）
+            end: 期間の終了（含まない）
+            metric_type: 絞り込むメトリックタイプ（省略時はすべて）
+
+        Returns:
+            (メトリックタイプ, 単位, バケット開始時刻)の昇順に並んだ集計値
+        """
+        table = ROLLUP_TABLES[granularity]
+        query = (
+            select(table)
+            .where(table.c.user_id == user_id)
+            .where(table.c.bucket_start >= start)
+            .where(table.c.bucket_start < end)
+            .order_by(table.c.metric_type, table.c.unit, table.c.bucket_start)
+        )
+        if metric_type is not None:
+            query = query.where(table.c.metric_type == metric_type.value)
+
+        async with self._engine.connect() as conn:
+            result = await conn.execute(query)
+            return [
+                BucketAggregate(
+                    metric_type=MetricType(row.metric_type),
+                    unit=row.unit,
+                    bucket_start=row.bucket_start,
+                    statistics=BucketStatistics(
+                        count=row.sample_count,
+                        total=row.value_sum,
+                        minimum=row.value_min,
+                        maximum=row.value_max,
+                        sum_of_squares=row.value_sum_sq,
+                    ),
+                )
+                for row in result
+            ]
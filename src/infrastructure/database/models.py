@@ -0,0 +1,244 @@
+"""SQLAlchemyテーブル定義"""
+import uuid
+from datetime import UTC, datetime
+from typing import Any, Optional
+
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    DateTime,
+    Dialect,
+    Float,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+)
+from sqlalchemy.dialects import mysql
+from sqlalchemy.engine.default import DefaultExecutionContext
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.types import TypeDecorator
+
+from core.config import get_settings
+
+
+class UTCDateTime(TypeDecorator[datetime]):
+    """UTCのタイムゾーンなし日時として保存し、読み出し時にUTCを付与する型
+
+    MySQLのDATETIMEはタイムゾーンを保持しないため、保存時にUTCへ変換する。
+    """
+
+    impl = DateTime
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect: Dialect) -> Any:
+        """MySQLではマイクロ秒精度のDATETIMEを使用"""
+        if dialect.name == "mysql":
+            return dialect.type_descriptor(mysql.DATETIME(fsp=6))
+        return dialect.type_descriptor(DateTime())
+
+    def process_bind_param(
+        self, value: Optional[datetime], dialect: Dialect
+    ) -> Optional[datetime]:
+        """タイムゾーン付き日時をUTCのタイムゾーンなし日時に変換"""
+        if value is not None and value.tzinfo is not None:
+            return value.astimezone(UTC).replace(tzinfo=None)
+        return value
+
+    def process_result_value(
+        self, value: Optional[datetime], dialect: Dialect
+    ) -> Optional[datetime]:
+        """読み出した日時にUTCを付与"""
+        if value is not None and value.tzinfo is None:
+            return value.replace(tzinfo=UTC)
+        return value
+
+
+class UUIDString(TypeDecorator[str]):
+    """UUID文字列を文字列（36文字）またはバイナリ（16バイト）で保存する型
+
+    バイナリの場合はインデックスが半分以下になり、UUIDv7のバイト順は
+    生成順と一致するため主キーへの挿入は末尾への追記になる。
+    アプリケーションからは常にハイフン付きの文字列として扱う。
+    """
+
+    impl = String(36)
+    cache_ok = True
+
+    def __init__(self, binary: bool = False) -> None:
+        """
+        Args:
+            binary: BINARY(16)で保存するかどうか
+        """
+        super().__init__()
+        self.binary = binary
+
+    def load_dialect_impl(self, dialect: Dialect) -> Any:
+        """バイナリの場合、MySQLではBINARY(16)を使用"""
+        if not self.binary:
+            return dialect.type_descriptor(String(36))
+        if dialect.name == "mysql":
+            return dialect.type_descriptor(mysql.BINARY(16))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value: Optional[str], dialect: Dialect) -> Any:
+        """バイナリの場合はUUIDの16バイトに変換"""
+        if value is not None and self.binary:
+            return uuid.UUID(value).bytes
+        return value
+
+    def process_result_value(self, value: Any, dialect: Dialect) -> Optional[str]:
+        """バイナリの場合はハイフン付きの文字列に変換"""
+        if value is not None and self.binary:
+            return str(uuid.UUID(bytes=bytes(value)))
+        return value
+
+
+class Base(DeclarativeBase):
+    """テーブル定義の基底クラス"""
+
+
+def _device_key_default(context: DefaultExecutionContext) -> str:
+    """重複判定用のデバイスキー（device_idがNULLの行も一意制約の対象にする）"""
+    return context.get_current_parameters().get("device_id") or ""
+
+
+class MeasurementRecord(Base):
+    """測定データテーブル"""
+
+    __tablename__ = "measurements"
+    __table_args__ = (
+        # 期間検索・一覧のキーセットページネーション（measured_at, id）用の複合インデックス
+        # （SQLiteのインデックスは主キーを含まないため、idを明示的に含める）
+        Index("idx_measurements_user_date", "user_id", "measured_at", "id"),
+        # メトリックタイプで絞り込んだ一覧用
+        # （id・metric_type・measured_at・valueのみの取得ではテーブルを参照しないカバリングインデックス）
+        Index(
+            "idx_measurements_user_metric_date",
+            "user_id", "metric_type", "measured_at", "id", "value",
+        ),
+        # 同じ測定の再送を1件にまとめるための一意インデックス
+        Index(
+            "uq_measurements_dedup",
+            "user_id", "metric_type", "measured_at", "device_key",
+            unique=True,
+        ),
+    )
+
+    id: Mapped[str] = mapped_column(
+        UUIDString(binary=get_settings().db_binary_ids), primary_key=True
+    )
+    user_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    metric_type: Mapped[str] = mapped_column(String(32), nullable=False)
+    value: Mapped[float] = mapped_column(Float, nullable=False)
+    unit: Mapped[str] = mapped_column(String(16), nullable=False)
+    measured_at: Mapped[datetime] = mapped_column(UTCDateTime, nullable=False)
+    device_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    # NULLは一意制約で区別されないため、device_idを空文字に置き換えた値で重複を判定する
+    device_key: Mapped[str] = mapped_column(
+        String(255), nullable=False, default=_device_key_default
+    )
+    # DeclarativeBase.metadataと衝突するため属性名を変えてカラム名を合わせる
+    metadata_: Mapped[Optional[dict[str, Any]]] = mapped_column(
+        "metadata", JSON, nullable=True
+    )
+    notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime, nullable=False)
+
+
+class RollupColumnsMixin:
+    """ロールアップテーブル共通のカラム（ユーザー×メトリックタイプ×単位×バケット）"""
+
+    user_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    metric_type: Mapped[str] = mapped_column(String(32), primary_key=True)
+    unit: Mapped[str] = mapped_column(String(16), primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(UTCDateTime, primary_key=True)
+    sample_count: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    value_sum: Mapped[float] = mapped_column(Float, nullable=False)
+    value_min: Mapped[float] = mapped_column(Float, nullable=False)
+    value_max: Mapped[float] = mapped_column(Float, nullable=False)
+    value_sum_sq: Mapped[float] = mapped_column(Float, nullable=False)
+
+
+class MeasurementHourlyRollup(RollupColumnsMixin, Base):
+    """時間単位の測定データ集計テーブル"""
+
+    __tablename__ = "measurement_rollups_hourly"
+
+
+class MeasurementDailyRollup(RollupColumnsMixin, Base):
+    """日単位の測定データ集計テーブル"""
+
+    __tablename__ = "measurement_rollups_daily"
+
+
+class IdempotencyKeyRecord(Base):
+    """Idempotency-Keyごとの処理結果テーブル
+
+    処理中はstatus_codeがNULLで、完了後に返したレスポンスを保存する。
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    user_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    idempotency_key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    status_code: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    response_headers: Mapped[Optional[dict[str, str]]] = mapped_column(JSON, nullable=True)
+    response_body: Mapped[Optional[bytes]] = mapped_column(
+        LargeBinary().with_variant(mysql.LONGBLOB(), "mysql"), nullable=True
+    )
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime, nullable=False)
+
+
+class GoalRecord(Base):
+    """ゴールテーブル"""
+
+    __tablename__ = "goals"
+
+    user_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    goal_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    metric_type: Mapped[str] = mapped_column(String(32), nullable=False)
+    target: Mapped[float] = mapped_column(Float, nullable=False)
+    aggregation: Mapped[str] = mapped_column(String(16), nullable=False)
+    period: Mapped[str] = mapped_column(String(16), nullable=False)
+    unit: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(UTCDateTime, nullable=False)
+
+
+class GoalProgressRecord(Base):
+    """ゴールの期間ごとの進捗テーブル（取り込みごとに合計・件数を加算する）
+
+    achieved_atがNULLの行のみを達成済みに更新することで、達成イベントを期間ごとに1回だけ発行する。
+    """
+
+    __tablename__ = "goal_progress"
+
+    user_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    goal_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    period_start: Mapped[datetime] = mapped_column(UTCDateTime, primary_key=True)
+    value_sum: Mapped[float] = mapped_column(Float, nullable=False)
+    sample_count: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    achieved_at: Mapped[Optional[datetime]] = mapped_column(UTCDateTime, nullable=True)
+    streak: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class GoalEventOutboxRecord(Base):
+    """未通知のゴール達成イベントのテーブル（アウトボックス）
+
+    期間を達成済みにするのと同じトランザクションで保存し、通知に成功したら削除する。
+    """
+
+    __tablename__ = "goal_event_outbox"
+
+    user_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    goal_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    period_start: Mapped[datetime] = mapped_column(UTCDateTime, primary_key=True)
+    metric_type: Mapped[str] = mapped_column(String(32), nullable=False)
+    period: Mapped[str] = mapped_column(String(16), nullable=False)
+    value: Mapped[float] = mapped_column(Float, nullable=False)
+    target: Mapped[float] = mapped_column(Float, nullable=False)
+    streak: Mapped[int] = mapped_column(Integer, nullable=False)
+    achieved_at: Mapped[datetime] = mapped_column(UTCDateTime, nullable=False, index=True)
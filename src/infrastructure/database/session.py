@@ -0,0 +1,67 @@
+"""非同期データベースエンジンの管理"""
+from typing import Any, Optional
+
+from sqlalchemy import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool, StaticPool
+
+from core.config import Settings, get_settings
+
+from .models import Base
+
+_engine: Optional[AsyncEngine] = None
+
+
+def create_engine(settings: Settings) -> AsyncEngine:
+    """設定からプール付きの非同期エンジンを生成する
+
+    MySQLではDB_POOL_SIZE/DB_MAX_OVERFLOW/DB_POOL_TIMEOUTでプールを構成する。
+    SQLite（aiosqlite、ローカル・テスト用）ではプール設定を適用しない。
+
+    Args:
+        settings: アプリケーション設定
+
+    Returns:
+        非同期エンジン
+    """
+    url = make_url(settings.database_url)
+    engine_options: dict[str, Any]
+    if url.get_backend_name() == "sqlite":
+        in_memory = url.database in (None, "", ":memory:")
+        engine_options = {"poolclass": StaticPool if in_memory else NullPool}
+    else:
+        engine_options = {
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+            "pool_timeout": settings.db_pool_timeout,
+            "pool_pre_ping": True,
+            "pool_recycle": 3600,
+        }
+    return create_async_engine(url, echo=settings.db_echo, **engine_options)
+
+
+def get_engine() -> AsyncEngine:
+    """アプリケーション共有のエンジンを取得（初回呼び出し時に生成）"""
+    global _engine
+    if _engine is None:
+        _engine = create_engine(get_settings())
+    return _engine
+
+
+async def dispose_engine() -> None:
+    """共有エンジンのコネクションプールを解放する"""
+    global _engine
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+
+
+async def init_db(engine: Optional[AsyncEngine] = None) -> None:
+    """テーブルを作成する（ローカル開発・テスト用）
+
+    Args:
+        engine: 対象エンジン（省略時は共有エンジン）
+    """
+    target = engine or get_engine()
+    async with target.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
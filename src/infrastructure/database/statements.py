@@ -0,0 +1,92 @@
+"""ダイアレクトごとのSQL文の生成"""
+from collections.abc import Sequence
+from typing import Any, Optional
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    ColumnElement,
+    String,
+    Table,
+    func,
+    insert,
+    literal_column,
+    type_coerce,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+
+def insert_ignoring_duplicates(
+    table: Table,
+    dialect_name: str,
+    index_elements: Optional[Sequence[Column[Any]]] = None,
+) -> Any:
+    """一意制約に違反する行を登録せずに読み飛ばすINSERT文を生成する
+
+    実行結果のrowcountは実際に登録した行数になる。
+
+    Args:
+        table: 登録先のテーブル
+        dialect_name: 接続先のダイアレクト名
+        index_elements: SQLiteで競合を無視する一意制約のカラム
+            （省略時はすべての制約。MySQLのINSERT IGNOREは常にすべての制約が対象）
+
+    Returns:
+        executemany可能なINSERT文
+
+    Raises:
+        NotImplementedError: 未対応のダイアレクトの場合
+    """
+    if dialect_name == "mysql":
+        return insert(table).prefix_with("IGNORE")
+    if dialect_name == "sqlite":
+        return sqlite_insert(table).on_conflict_do_nothing(index_elements=index_elements)
+    raise NotImplementedError(f"Insert ignoring duplicates is not supported for {dialect_name}")
+
+
+def epoch_microseconds(column: ColumnElement[Any], dialect_name: str) -> ColumnElement[Any]:
+    """UTCDateTimeのカラムをエポックマイクロ秒に変換するための取得式を生成する
+
+    大量の行を読むときに、行ごとのdatetimeの生成（UTCDateTimeの変換）を避ける。
+    取得した値はepoch_microseconds_arrayでNumPyの配列に変換する。
+
+    - MySQL: TIMESTAMPDIFFでサーバー側で整数に変換する
+    - SQLite: 保存形式の文字列のまま取得する（NumPyが一括で解析する）
+
+    Args:
+        column: タイムゾーンなしのUTCで保存した日時のカラム
+        dialect_name: 接続先のダイアレクト名
+
+    Returns:
+        SELECT句に指定する式
+
+    Raises:
+        NotImplementedError: 未対応のダイアレクトの場合
+    """
+    if dialect_name == "mysql":
+        return type_coerce(
+            func.timestampdiff(
+                literal_column("MICROSECOND"), literal_column("'1970-01-01 00:00:00'"), column
+            ),
+            BigInteger,
+        )
+    if dialect_name == "sqlite":
+        return type_coerce(column, String)
+    raise NotImplementedError(f"Epoch microseconds are not supported for {dialect_name}")
+
+
+def epoch_microseconds_array(values: Sequence[Any]) -> npt.NDArray[np.int64]:
+    """
+    epoch_microsecondsで取得した値をエポックマイクロ秒の配列に変換する
+
+    Args:
+        values: 整数（MySQL）または日時の文字列（SQLite）の列
+
+    Returns:
+        エポックマイクロ秒の配列
+    """
+    if len(values) and isinstance(values[0], str):
+        return np.array(values, dtype="datetime64[us]").astype(np.int64)
+    return np.fromiter(values, dtype=np.int64, count=len(values))
@@ -0,0 +1,7 @@
+"""ドメインイベントの通知関連パッケージ"""
+from .publisher import GoalEventPublisher, LoggingGoalEventPublisher
+
+__all__ = [
+    "GoalEventPublisher",
+    "LoggingGoalEventPublisher",
+]
@@ -0,0 +1,45 @@
+"""ゴール達成イベントの通知先
+
+ゴールの評価はイベントを通知先に渡すのみで、通知の方法（ログ・Webhookなど）には依存しない。
+"""
+from collections.abc import Sequence
+from typing import Protocol
+
+import structlog
+
+from domain.entities.goal import GoalAchievedEvent
+
+logger = structlog.get_logger(__name__)
+
+
+class GoalEventPublisher(Protocol):
+    """ゴール達成イベントの通知先"""
+
+    async def publish(self, events: Sequence[GoalAchievedEvent]) -> None:
+        """
+        イベントを通知する
+
+        Args:
+            events: 1回の取り込みで発生したイベント
+        """
+        ...
+
+
+class LoggingGoalEventPublisher:
+    """イベントを構造化ログに出力する通知先"""
+
+    async def publish(self, events: Sequence[GoalAchievedEvent]) -> None:
+        """イベントを1件ずつログに出力する"""
+        for event in events:
+            logger.info(
+                "Goal achieved",
+                event_id=event.event_id,
+                user_id=event.user_id,
+                goal_id=event.goal_id,
+                metric_type=event.metric_type,
+                period=event.period,
+                period_start=event.period_start.isoformat(),
+                value=event.value,
+                target=event.target,
+                streak=event.streak,
+            )
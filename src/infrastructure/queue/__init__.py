@@ -0,0 +1,18 @@
+"""非同期一括登録のキュー関連パッケージ"""
+from .ingest_queue import (
+    InMemoryIngestQueue,
+    IngestJob,
+    IngestJobState,
+    IngestJobStatus,
+    IngestQueue,
+)
+from .sqlite_queue import SQLiteIngestQueue
+
+__all__ = [
+    "InMemoryIngestQueue",
+    "IngestJob",
+    "IngestJobState",
+    "IngestJobStatus",
+    "IngestQueue",
+    "SQLiteIngestQueue",
+]
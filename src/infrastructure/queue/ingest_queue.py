@@ -0,0 +1,220 @@
+"""非同期一括登録のキュー
+
+エンドポイントはスキーマ検証に通った行をジョブとしてキューに入れて202を返し、
+ワーカーがジョブを取り出してドメイン検証・保存を行う。ジョブの状態と結果もキューが保持し、
+状態確認のエンドポイントから参照する。
+
+- InMemoryIngestQueue: プロセス内のキュー（プロセスが終了すると未処理のジョブは失われる）
+- SQLiteIngestQueue: ローカルのSQLiteファイルに保存する永続キュー
+"""
+import asyncio
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field, replace
+from datetime import UTC, datetime
+from enum import Enum
+from typing import Any, Optional, Protocol
+
+
+class IngestJobStatus(str, Enum):
+    """非同期登録ジョブの状態"""
+    QUEUED = "queued"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class IngestJob:
+    """非同期登録ジョブ
+
+    Attributes:
+        batch_id: ジョブID（レスポンスで返し、状態確認に使う）
+        user_id: 認証済みユーザーID
+        rows: スキーマ検証に通った測定データの生データ
+        indexes: 各行のリクエスト全体でのインデックス
+        errors: 受付時のスキーマ検証のエラー詳細
+        total_count: リクエストの行数
+        enqueued_at: 受付日時
+    """
+
+    batch_id: str
+    user_id: str
+    rows: list[Any]
+    indexes: list[int]
+    errors: list[dict[str, Any]] = field(default_factory=list)
+    total_count: int = 0
+    enqueued_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+
+
+@dataclass(frozen=True)
+class IngestJobState:
+    """非同期登録ジョブの状態と結果
+
+    Attributes:
+        batch_id: ジョブID
+        user_id: ユーザーID
+        status: 状態
+        total_count: リクエストの行数
+        success_count: 登録した行数（完了後）
+        duplicate_count: 登録済みの測定と重複した行数（完了後）
+        ids: 登録した行のID（完了後）
+        errors: 受付時と処理時のエラー詳細（インデックス順）
+        message: 処理に失敗した場合の理由
+        updated_at: 状態を更新した日時
+    """
+
+    batch_id: str
+    user_id: str
+    status: IngestJobStatus
+    total_count: int
+    success_count: int = 0
+    duplicate_count: int = 0
+    ids: list[str] = field(default_factory=list)
+    errors: list[dict[str, Any]] = field(default_factory=list)
+    message: Optional[str] = None
+    updated_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+
+    @classmethod
+    def queued(cls, job: IngestJob) -> "IngestJobState":
+        """受付直後の状態"""
+        return cls(
+            batch_id=job.batch_id,
+            user_id=job.user_id,
+            status=IngestJobStatus.QUEUED,
+            total_count=job.total_count,
+            errors=list(job.errors),
+            updated_at=job.enqueued_at,
+        )
+
+
+class IngestQueue(Protocol):
+    """非同期登録キューのインターフェース"""
+
+    async def put(self, job: IngestJob) -> None:
+        """ジョブを追加する"""
+        ...
+
+    async def get_batch(self, max_rows: int, timeout_seconds: float) -> list[IngestJob]:
+        """
+        待機中のジョブを処理中にして取り出す
+
+        ジョブがなければtimeout_secondsまで待つ。1件目は行数によらず取り出し、
+        2件目以降は合計行数がmax_rowsを超えない範囲で受付順に取り出す。
+        """
+        ...
+
+    async def complete(self, state: IngestJobState) -> None:
+        """処理したジョブの結果を保存する"""
+        ...
+
+    async def status(self, batch_id: str) -> Optional[IngestJobState]:
+        """ジョブの状態を取得する（存在しない・保持期間を過ぎた場合はNone）"""
+        ...
+
+    async def pending_rows(self) -> int:
+        """待機中のジョブの合計行数"""
+        ...
+
+
+async def poll_jobs(
+    take: Callable[[], Awaitable[list[IngestJob]]],
+    timeout_seconds: float,
+    interval_seconds: float,
+) -> list[IngestJob]:
+    """
+    ジョブを取り出せるまで一定間隔で確認する
+
+    別プロセスが追加したジョブも検出でき、イベントループをまたいで使えるよう、
+    asyncio.Eventによる通知ではなく確認を繰り返す。
+
+    Args:
+        take: 待機中のジョブを取り出す関数（なければ空のリスト）
+        timeout_seconds: 待つ最大秒数（0以下の場合は1回だけ確認する）
+        interval_seconds: 確認間隔
+
+    Returns:
+        取り出したジョブ（タイムアウトした場合は空のリスト）
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_seconds
+    while True:
+        jobs = await take()
+        remaining = deadline - loop.time()
+        if jobs or remaining <= 0:
+            return jobs
+        await asyncio.sleep(min(interval_seconds, remaining))
+
+
+class InMemoryIngestQueue:
+    """プロセス内の非同期登録キュー"""
+
+    def __init__(
+        self,
+        max_results: int = 10000,
+        poll_interval_seconds: float = 0.05,
+        clock: Callable[[], datetime] = lambda: datetime.now(UTC),
+    ) -> None:
+        """
+        Args:
+            max_results: 保持する完了済みジョブの結果の最大数（古いものから削除）
+            poll_interval_seconds: ジョブを待つ間の確認間隔
+            clock: 現在日時を返す関数
+        """
+        self._max_results = max_results
+        self._poll_interval_seconds = poll_interval_seconds
+        self._clock = clock
+        self._jobs: deque[IngestJob] = deque()
+        self._states: dict[str, IngestJobState] = {}
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+        self._pending_rows = 0
+        self._lock = threading.Lock()
+
+    async def put(self, job: IngestJob) -> None:
+        """ジョブを追加する"""
+        with self._lock:
+            self._jobs.append(job)
+            self._states[job.batch_id] = IngestJobState.queued(job)
+            self._pending_rows += len(job.rows)
+
+    async def get_batch(self, max_rows: int, timeout_seconds: float) -> list[IngestJob]:
+        """待機中のジョブを処理中にして取り出す（ジョブがなければtimeout_secondsまで待つ）"""
+        async def take() -> list[IngestJob]:
+            return self._take(max_rows)
+
+        return await poll_jobs(take, timeout_seconds, self._poll_interval_seconds)
+
+    def _take(self, max_rows: int) -> list[IngestJob]:
+        with self._lock:
+            jobs: list[IngestJob] = []
+            rows = 0
+            while self._jobs and (not jobs or rows + len(self._jobs[0].rows) <= max_rows):
+                job = self._jobs.popleft()
+                jobs.append(job)
+                rows += len(job.rows)
+                self._states[job.batch_id] = replace(
+                    self._states[job.batch_id],
+                    status=IngestJobStatus.PROCESSING,
+                    updated_at=self._clock(),
+                )
+            self._pending_rows -= rows
+            return jobs
+
+    async def complete(self, state: IngestJobState) -> None:
+        """処理したジョブの結果を保存する"""
+        with self._lock:
+            self._states[state.batch_id] = state
+            self._finished[state.batch_id] = None
+            while len(self._finished) > self._max_results:
+                batch_id, _ = self._finished.popitem(last=False)
+                self._states.pop(batch_id, None)
+
+    async def status(self, batch_id: str) -> Optional[IngestJobState]:
+        """ジョブの状態を取得する"""
+        with self._lock:
+            return self._states.get(batch_id)
+
+    async def pending_rows(self) -> int:
+        """待機中のジョブの合計行数"""
+        return self._pending_rows
@@ -0,0 +1,210 @@
+"""SQLiteファイルに保存する非同期登録キュー
+
+受け付けたジョブをローカルのSQLiteファイルに保存するため、プロセスが再起動しても
+未処理のジョブは失われない。同じホストの複数のワーカープロセスで共有でき、
+ジョブの取り出しはBEGIN IMMEDIATEで直列化する。
+
+ジョブの状態の取得で行全体のペイロードを読まないよう、追加時に受付直後の状態
+（件数・受付時のエラー）を結果のカラムに保存し、完了時に処理結果で置き換える。
+
+処理中のままprocessing_timeout_secondsを過ぎたジョブ（ワーカーの異常終了など）は
+待機中に戻して再処理する。測定データの登録は重複を除外するため、再処理しても
+同じ行が二重に登録されることはない（先に登録済みの行は重複として数える）。
+"""
+import json
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Optional
+
+from ..sqlite_store import SQLiteStore
+from .ingest_queue import IngestJob, IngestJobState, IngestJobStatus, poll_jobs
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingest_jobs (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    batch_id TEXT NOT NULL UNIQUE,
+    user_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    row_count INTEGER NOT NULL,
+    payload TEXT,
+    result TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_ingest_jobs_status ON ingest_jobs (status, seq);
+"""
+# 1回の取り出しで確認する待機中のジョブの最大数
+_TAKE_SCAN_LIMIT = 1000
+
+
+def _job_payload(job: IngestJob) -> str:
+    """ジョブをJSONに変換する（batch_id・user_idはカラムに保存する）"""
+    return json.dumps({
+        "rows": job.rows,
+        "indexes": job.indexes,
+        "errors": job.errors,
+        "total_count": job.total_count,
+        "enqueued_at": job.enqueued_at.isoformat(),
+    })
+
+
+def _job_from_payload(batch_id: str, user_id: str, payload: str) -> IngestJob:
+    """_job_payloadで変換したJSONからジョブを復元する"""
+    data = json.loads(payload)
+    return IngestJob(
+        batch_id=batch_id,
+        user_id=user_id,
+        rows=data["rows"],
+        indexes=data["indexes"],
+        errors=data["errors"],
+        total_count=data["total_count"],
+        enqueued_at=datetime.fromisoformat(data["enqueued_at"]),
+    )
+
+
+def _state_result(state: IngestJobState) -> str:
+    """ジョブの結果をJSONに変換する"""
+    return json.dumps({
+        "total_count": state.total_count,
+        "success_count": state.success_count,
+        "duplicate_count": state.duplicate_count,
+        "ids": state.ids,
+        "errors": state.errors,
+        "message": state.message,
+        "updated_at": state.updated_at.isoformat(),
+    })
+
+
+class SQLiteIngestQueue(SQLiteStore):
+    """SQLiteファイルに保存する非同期登録キュー"""
+
+    def __init__(
+        self,
+        path: str,
+        result_ttl_seconds: float = 86400,
+        processing_timeout_seconds: float = 300,
+        poll_interval_seconds: float = 0.2,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Args:
+            path: SQLiteファイルのパス
+            result_ttl_seconds: 完了したジョブの結果を保持する秒数
+            processing_timeout_seconds: 処理中のジョブを放棄されたとみなすまでの秒数
+            poll_interval_seconds: ジョブを待つ間の確認間隔
+            clock: 現在時刻（エポック秒）を返す関数
+        """
+        self._result_ttl_seconds = result_ttl_seconds
+        self._processing_timeout_seconds = processing_timeout_seconds
+        self._poll_interval_seconds = poll_interval_seconds
+        self._clock = clock
+        super().__init__(path, _SCHEMA)
+
+    async def put(self, job: IngestJob) -> None:
+        """ジョブを追加する"""
+        await self._run(self._put, job)
+
+    def _put(self, job: IngestJob) -> None:
+        self._conn.execute(
+            "INSERT INTO ingest_jobs"
+            " (batch_id, user_id, status, row_count, payload, result, updated_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (job.batch_id, job.user_id, IngestJobStatus.QUEUED.value, len(job.rows),
+             _job_payload(job), _state_result(IngestJobState.queued(job)),
+             self._clock()),
+        )
+
+    async def get_batch(self, max_rows: int, timeout_seconds: float) -> list[IngestJob]:
+        """待機中のジョブを処理中にして取り出す（ジョブがなければtimeout_secondsまで待つ）"""
+        async def take() -> list[IngestJob]:
+            return await self._run(self._take, max_rows)
+
+        return await poll_jobs(take, timeout_seconds, self._poll_interval_seconds)
+
+    def _take(self, max_rows: int) -> list[IngestJob]:
+        now = self._clock()
+        with self._immediate():
+            self._conn.execute(
+                "UPDATE ingest_jobs SET status = ?, updated_at = ? WHERE status = ? AND updated_at < ?",
+                (IngestJobStatus.QUEUED.value, now, IngestJobStatus.PROCESSING.value,
+                 now - self._processing_timeout_seconds),
+            )
+            candidates = self._conn.execute(
+                "SELECT seq, batch_id, user_id, row_count, payload FROM ingest_jobs"
+                " WHERE status = ? ORDER BY seq LIMIT ?",
+                (IngestJobStatus.QUEUED.value, _TAKE_SCAN_LIMIT),
+            ).fetchall()
+            taken = []
+            rows = 0
+            for seq, batch_id, user_id, row_count, payload in candidates:
+                if taken and rows + row_count > max_rows:
+                    break
+                taken.append((seq, _job_from_payload(batch_id, user_id, payload)))
+                rows += row_count
+            if taken:
+                placeholders = ", ".join("?" * len(taken))
+                self._conn.execute(
+                    f"UPDATE ingest_jobs SET status = ?, updated_at = ? WHERE seq IN ({placeholders})",
+                    (IngestJobStatus.PROCESSING.value, now, *(seq for seq, _ in taken)),
+                )
+        return [job for _, job in taken]
+
+    async def complete(self, state: IngestJobState) -> None:
+        """処理したジョブの結果を保存し、保持期間を過ぎた結果を削除する"""
+        await self._run(self._complete, state)
+
+    def _complete(self, state: IngestJobState) -> None:
+        now = self._clock()
+        self._conn.execute(
+            "UPDATE ingest_jobs SET status = ?, payload = NULL, result = ?, updated_at = ?"
+            " WHERE batch_id = ?",
+            (state.status.value, _state_result(state), now, state.batch_id),
+        )
+        self._conn.execute(
+            "DELETE FROM ingest_jobs WHERE status IN (?, ?) AND updated_at < ?",
+            (IngestJobStatus.COMPLETED.value, IngestJobStatus.FAILED.value,
+             now - self._result_ttl_seconds),
+        )
+
+    async def status(self, batch_id: str) -> Optional[IngestJobState]:
+        """ジョブの状態を取得する"""
+        return await self._run(self._status, batch_id)
+
+    def _status(self, batch_id: str) -> Optional[IngestJobState]:
+        row = self._conn.execute(
+            "SELECT user_id, status, result, updated_at FROM ingest_jobs WHERE batch_id = ?",
+            (batch_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        user_id, status, result, updated_at = row
+        data = json.loads(result)
+        job_status = IngestJobStatus(status)
+        if job_status in (IngestJobStatus.QUEUED, IngestJobStatus.PROCESSING):
+            # 結果は受付直後の状態のため、更新時刻は状態が遷移した時刻を使う
+            state_updated_at = datetime.fromtimestamp(updated_at, UTC)
+        else:
+            state_updated_at = datetime.fromisoformat(data["updated_at"])
+        return IngestJobState(
+            batch_id=batch_id,
+            user_id=user_id,
+            status=job_status,
+            total_count=data["total_count"],
+            success_count=data["success_count"],
+            duplicate_count=data["duplicate_count"],
+            ids=data["ids"],
+            errors=data["errors"],
+            message=data["message"],
+            updated_at=state_updated_at,
+        )
+
+    async def pending_rows(self) -> int:
+        """待機中のジョブの合計行数"""
+        return await self._run(self._pending_rows)
+
+    def _pending_rows(self) -> int:
+        (rows,) = self._conn.execute(
+            "SELECT COALESCE(SUM(row_count), 0) FROM ingest_jobs WHERE status = ?",
+            (IngestJobStatus.QUEUED.value,),
+        ).fetchone()
+        return int(rows)
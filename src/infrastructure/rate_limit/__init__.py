@@ -0,0 +1,11 @@
+"""レート制限関連パッケージ"""
+from .backends import InMemoryRateLimitBackend, RateLimitBackend, RedisRateLimitBackend
+from .limiter import RateLimitDecision, RateLimiter
+
+__all__ = [
+    "InMemoryRateLimitBackend",
+    "RateLimitBackend",
+    "RateLimitDecision",
+    "RateLimiter",
+    "RedisRateLimitBackend",
+]
@@ -0,0 +1,158 @@
+"""レート制限の状態の保存先
+
+GCRA（Generic Cell Rate Algorithm）の理論到着時刻（TAT）をキーごとに1つだけ保持する。
+トークンバケットと同じ制限を、補充処理なしの定数時間の比較で判定できる。
+
+- InMemoryRateLimitBackend: プロセス内のLRU（ワーカーごとに別の上限となる）
+- RedisRateLimitBackend: redis.asyncio互換のクライアント（複数ワーカー・複数ホストで共有）
+"""
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any, Protocol
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # pragma: no cover - redisは任意の依存
+    redis_asyncio = None
+
+
+class RateLimitBackend(Protocol):
+    """レート制限の状態の保存先のインターフェース"""
+
+    async def update(self, key: str, cost_seconds: float, tolerance_seconds: float) -> tuple[bool, float]:
+        """
+        GCRAで1回分のコストを消費できるかを判定し、消費できる場合はTATを進める
+
+        Args:
+            key: 制限の単位（ユーザーごとのキー）
+            cost_seconds: 消費するコストを時間に換算した値（コスト × 放出間隔）
+            tolerance_seconds: 許容するバースト（上限いっぱいまで使える期間）
+
+        Returns:
+            (許可したかどうか, 判定後のTATまでの秒数)
+        """
+        ...
+
+
+# 放出間隔の積み上げによる浮動小数点の誤差で、上限ちょうどの消費を拒否しないための許容値
+_EPSILON_SECONDS = 1e-9
+
+
+def gcra_update(tat: float, now: float, cost_seconds: float, tolerance_seconds: float) -> tuple[bool, float]:
+    """
+    GCRAの判定を行う
+
+    Args:
+        tat: 保存されていたTAT（未保存の場合はnow以下の値）
+        now: 現在時刻（秒）
+
+    Returns:
+        (許可したかどうか, 判定後のTAT)
+    """
+    tat = max(tat, now)
+    new_tat = tat + cost_seconds
+    if new_tat - tolerance_seconds > now + _EPSILON_SECONDS:
+        return False, tat
+    return True, new_tat
+
+
+class InMemoryRateLimitBackend:
+    """プロセス内でTATを保持するバックエンド
+
+    TATが現在時刻以前のキーは上限まで回復しており、削除しても判定は変わらない。
+    キー数が上限を超えた場合は最も古く使われたキーから削除する。
+    """
+
+    def __init__(
+        self,
+        max_keys: int = 100000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            max_keys: 保持する最大キー数
+            clock: 現在時刻（秒）を返す関数
+        """
+        self._max_keys = max_keys
+        self._clock = clock
+        self._tats: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def update(self, key: str, cost_seconds: float, tolerance_seconds: float) -> tuple[bool, float]:
+        """TATを比較・更新する（O(1)）"""
+        now = self._clock()
+        with self._lock:
+            allowed, tat = gcra_update(self._tats.get(key, now), now, cost_seconds, tolerance_seconds)
+            if allowed:
+                self._tats[key] = tat
+                self._tats.move_to_end(key)
+                while len(self._tats) > self._max_keys:
+                    self._tats.popitem(last=False)
+            return allowed, tat - now
+
+    def stats(self) -> dict[str, int]:
+        """現在のキー数を返す"""
+        with self._lock:
+            return {"keys": len(self._tats), "max_keys": self._max_keys}
+
+
+# GCRAの判定と更新を1往復で原子的に行うスクリプト
+# 時刻はRedisサーバーの時計を使い、ワーカー間の時計のずれの影響を受けないようにする
+_GCRA_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local cost = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local new_tat = tat + cost
+if new_tat - tolerance > now + 1e-9 then
+    return {0, tostring(tat - now)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.max(1, math.ceil((new_tat - now) * 1000)))
+return {1, tostring(new_tat - now)}
+"""
+
+
+class RedisRateLimitBackend:
+    """redis.asyncio互換のクライアントでTATを共有するバックエンド
+
+    TATにはTATまでの時間をTTLとして設定するため、上限まで回復したキーは自動的に削除される。
+    """
+
+    def __init__(self, client: Any, prefix: str = "ratelimit:") -> None:
+        """
+        Args:
+            client: evalを持つredis.asyncio互換のクライアント
+            prefix: キーの接頭辞
+        """
+        self._client = client
+        self._prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisRateLimitBackend":
+        """
+        接続URLからバックエンドを生成する
+
+        Args:
+            url: Redisの接続URL（redis://host:6379/0 など）
+
+        Raises:
+            RuntimeError: redisパッケージがインストールされていない場合
+        """
+        if redis_asyncio is None:
+            raise RuntimeError("The redis package is required for RATE_LIMIT_BACKEND=redis")
+        return cls(redis_asyncio.from_url(url))
+
+    async def update(self, key: str, cost_seconds: float, tolerance_seconds: float) -> tuple[bool, float]:
+        """スクリプトでTATを比較・更新する（1往復）"""
+        allowed, tat_offset = await self._client.eval(
+            _GCRA_SCRIPT, 1, self._prefix + key, repr(cost_seconds), repr(tolerance_seconds)
+        )
+        if isinstance(tat_offset, bytes):
+            tat_offset = tat_offset.decode()
+        return bool(int(allowed)), float(tat_offset)
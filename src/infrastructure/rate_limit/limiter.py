@@ -0,0 +1,78 @@
+"""ユーザーごとのレート制限"""
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+from .backends import RateLimitBackend
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    """レート制限の判定結果
+
+    Attributes:
+        allowed: 許可したかどうか
+        limit: 期間あたりの上限
+        remaining: 判定後に続けて消費できる量
+        reset_seconds: 上限まで回復するまでの秒数
+        retry_after_seconds: 拒否した場合に再試行できるまでの秒数
+            （コストが上限を超えていて再試行しても許可されない場合はNone）
+    """
+
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_seconds: float
+    retry_after_seconds: Optional[float] = None
+
+
+class RateLimiter:
+    """期間あたりの上限をGCRAで適用するレート制限
+
+    上限いっぱいまでのバーストを許可し、その後は期間 / 上限の間隔で回復する
+    （容量と補充速度が上限・期間のトークンバケットと同じ）。
+    """
+
+    def __init__(self, backend: RateLimitBackend, limit: int, period_seconds: float, name: str) -> None:
+        """
+        Args:
+            backend: 状態の保存先
+            limit: 期間あたりの上限（リクエスト数・行数など）
+            period_seconds: 期間（秒）
+            name: 制限の名前（保存先のキーの接頭辞、他の制限とキーを分ける）
+        """
+        self.limit = limit
+        self.period_seconds = period_seconds
+        self.name = name
+        self._backend = backend
+        self._emission_interval = period_seconds / limit
+
+    async def acquire(self, key: str, cost: int = 1) -> RateLimitDecision:
+        """
+        コストを消費する
+
+        Args:
+            key: 制限の単位（ユーザーIDなど）
+            cost: 消費する量
+
+        Returns:
+            判定結果（拒否した場合は何も消費しない）
+        """
+        if cost > self.limit:
+            return RateLimitDecision(
+                allowed=False, limit=self.limit, remaining=0, reset_seconds=0.0
+            )
+        allowed, tat_offset = await self._backend.update(
+            f"{self.name}:{key}", cost * self._emission_interval, self.period_seconds
+        )
+        remaining = max(0, math.floor((self.period_seconds - tat_offset) / self._emission_interval + 1e-9))
+        retry_after = None if allowed else max(
+            0.0, tat_offset + cost * self._emission_interval - self.period_seconds
+        )
+        return RateLimitDecision(
+            allowed=allowed,
+            limit=self.limit,
+            remaining=remaining,
+            reset_seconds=tat_offset,
+            retry_after_seconds=retry_after,
+        )
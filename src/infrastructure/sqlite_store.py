@@ -0,0 +1,56 @@
+"""ローカルのSQLiteファイルに保存するストアの共通処理
+
+非同期登録キュー・Webhook通知のキューが使う。1つの接続を複数のスレッドから
+ロックで直列化して使い、操作はスレッドで実行してイベントループを止めない。
+同じファイルを共有する複数のプロセスの間は、BEGIN IMMEDIATEのトランザクションと
+busy_timeoutで直列化する。
+"""
+import asyncio
+import sqlite3
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+
+class SQLiteStore:
+    """SQLiteファイルの接続と、スレッドでの操作の実行を受け持つ基底クラス"""
+
+    def __init__(self, path: str, schema: str) -> None:
+        """
+        Args:
+            path: SQLiteファイルのパス
+            schema: 接続時に実行するテーブル・インデックスの作成文
+        """
+        self._lock = threading.Lock()
+        # 自動コミットにして、トランザクションはBEGIN IMMEDIATEで明示的に開始する
+        self._conn = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(schema)
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """SQLiteの操作をスレッドで実行する（イベントループを止めない）"""
+        return await asyncio.to_thread(self._locked, func, *args)
+
+    def _locked(self, func: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            return func(*args)
+
+    @contextmanager
+    def _immediate(self) -> Iterator[None]:
+        """書き込みロックを取ってトランザクションを開始し、例外の場合はロールバックする"""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def close(self) -> None:
+        """SQLiteファイルの接続を閉じる"""
+        with self._lock:
+            self._conn.close()
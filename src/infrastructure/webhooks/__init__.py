@@ -0,0 +1,11 @@
+"""Webhook通知関連パッケージ"""
+from .delivery_queue import WebhookDelivery, WebhookDeliveryQueue
+from .dispatcher import WEBHOOK_EVENT_TYPE, WebhookDispatcher, goal_event_payload
+
+__all__ = [
+    "WEBHOOK_EVENT_TYPE",
+    "WebhookDelivery",
+    "WebhookDeliveryQueue",
+    "WebhookDispatcher",
+    "goal_event_payload",
+]
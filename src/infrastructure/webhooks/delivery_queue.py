@@ -0,0 +1,180 @@
+"""Webhook通知の永続キュー
+
+通知するイベントを送信先ごとにローカルのSQLiteファイルに保存し、送信に成功するまで保持する。
+プロセスが再起動しても、未送信・再送待ちのイベントは失われない。
+
+送信先ごとに未送信のイベントをまとめて1回の配信とし、配信ごとにIdempotency-Keyとなる
+delivery_keyを採番する。再送は同じイベントの組み合わせ・同じdelivery_keyで行うため、
+受信側はキーで重複を判定できる。取り出した配信はリース期間を過ぎても完了・再送の
+記録がない場合（送信中の異常終了など）に再送の対象に戻る。
+"""
+import json
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from core.ids import uuid7
+
+from ..sqlite_store import SQLiteStore
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS webhook_events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    endpoint TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    delivery_key TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL,
+    created_at REAL NOT NULL,
+    UNIQUE (endpoint, event_id)
+);
+CREATE INDEX IF NOT EXISTS idx_webhook_events_due ON webhook_events (endpoint, next_attempt_at);
+CREATE INDEX IF NOT EXISTS idx_webhook_events_delivery ON webhook_events (delivery_key);
+"""
+
+
+@dataclass(frozen=True)
+class WebhookDelivery:
+    """1回の送信でまとめて通知するイベント
+
+    Attributes:
+        delivery_key: 配信の識別子（Idempotency-Keyとして送る、再送でも同じ値）
+        endpoint: 送信先のURL
+        payloads: 通知するイベント
+        attempts: これまでに失敗した送信の回数
+    """
+
+    delivery_key: str
+    endpoint: str
+    payloads: list[dict[str, Any]]
+    attempts: int
+
+
+class WebhookDeliveryQueue(SQLiteStore):
+    """送信先ごとの未送信・再送待ちのイベントをSQLiteファイルに保存するキュー"""
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time) -> None:
+        """
+        Args:
+            path: SQLiteファイルのパス
+            clock: 現在時刻（エポック秒）を返す関数
+        """
+        super().__init__(path, _SCHEMA)
+        self._clock = clock
+
+    async def put(self, endpoint: str, events: Sequence[tuple[str, dict[str, Any]]]) -> None:
+        """
+        イベントを送信先の未送信のイベントに追加する
+
+        Args:
+            endpoint: 送信先のURL
+            events: イベントIDと通知する内容（送信先に追加済みのイベントIDは無視する）
+        """
+        await self._run(self._put, endpoint, events)
+
+    def _put(self, endpoint: str, events: Sequence[tuple[str, dict[str, Any]]]) -> None:
+        now = self._clock()
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO webhook_events"
+            " (endpoint, event_id, payload, next_attempt_at, created_at) VALUES (?, ?, ?, ?, ?)",
+            [(endpoint, event_id, json.dumps(payload), now, now) for event_id, payload in events],
+        )
+
+    async def claim(
+        self, endpoint: str, max_events: int, lease_seconds: float
+    ) -> Optional[WebhookDelivery]:
+        """
+        送信先の送信時刻になった配信を1つ取り出す
+
+        再送時刻になった配信を優先し、なければ未送信のイベントを古い順にmax_events件まとめて
+        新しい配信とする。取り出した配信はlease_secondsの間、他の取り出しの対象にしない。
+
+        Args:
+            endpoint: 送信先のURL
+            max_events: 新しい配信にまとめる最大イベント数
+            lease_seconds: 取り出した配信を送信中とみなす秒数
+
+        Returns:
+            配信（送信時刻になったイベントがない場合はNone）
+        """
+        return await self._run(self._claim, endpoint, max_events, lease_seconds)
+
+    def _claim(self, endpoint: str, max_events: int, lease_seconds: float) -> Optional[WebhookDelivery]:
+        now = self._clock()
+        with self._immediate():
+            retry = self._conn.execute(
+                "SELECT delivery_key FROM webhook_events WHERE endpoint = ?"
+                " AND delivery_key IS NOT NULL AND next_attempt_at <= ?"
+                " ORDER BY next_attempt_at LIMIT 1",
+                (endpoint, now),
+            ).fetchone()
+            if retry is not None:
+                (delivery_key,) = retry
+                rows = self._conn.execute(
+                    "SELECT seq, payload, attempts FROM webhook_events WHERE delivery_key = ? ORDER BY seq",
+                    (delivery_key,),
+                ).fetchall()
+            else:
+                delivery_key = uuid7()
+                rows = self._conn.execute(
+                    "SELECT seq, payload, attempts FROM webhook_events WHERE endpoint = ?"
+                    " AND delivery_key IS NULL AND next_attempt_at <= ? ORDER BY seq LIMIT ?",
+                    (endpoint, now, max_events),
+                ).fetchall()
+            if rows:
+                placeholders = ", ".join("?" * len(rows))
+                self._conn.execute(
+                    "UPDATE webhook_events SET delivery_key = ?, next_attempt_at = ?"
+                    f" WHERE seq IN ({placeholders})",
+                    (delivery_key, now + lease_seconds, *(seq for seq, _, _ in rows)),
+                )
+        if not rows:
+            return None
+        return WebhookDelivery(
+            delivery_key=delivery_key,
+            endpoint=endpoint,
+            payloads=[json.loads(payload) for _, payload, _ in rows],
+            attempts=rows[0][2],
+        )
+
+    async def complete(self, delivery_key: str) -> None:
+        """送信に成功した配信のイベントを削除する"""
+        await self._run(self._complete, delivery_key)
+
+    def _complete(self, delivery_key: str) -> None:
+        self._conn.execute("DELETE FROM webhook_events WHERE delivery_key = ?", (delivery_key,))
+
+    async def retry(self, delivery_key: str, delay_seconds: float) -> None:
+        """
+        送信に失敗した配信をdelay_seconds後に同じdelivery_keyで再送する
+
+        Args:
+            delivery_key: 配信の識別子
+            delay_seconds: 再送までの秒数
+        """
+        await self._run(self._fail, delivery_key, self._clock() + delay_seconds)
+
+    async def dead_letter(self, delivery_key: str) -> None:
+        """再送しない配信として残す（送信時刻をNULLにする）"""
+        await self._run(self._fail, delivery_key, None)
+
+    def _fail(self, delivery_key: str, next_attempt_at: Optional[float]) -> None:
+        self._conn.execute(
+            "UPDATE webhook_events SET attempts = attempts + 1, next_attempt_at = ?"
+            " WHERE delivery_key = ?",
+            (next_attempt_at, delivery_key),
+        )
+
+    async def pending_events(self) -> int:
+        """未送信・再送待ちのイベント数"""
+        return await self._run(self._count, "next_attempt_at IS NOT NULL")
+
+    async def dead_letters(self) -> int:
+        """再送しないイベント数"""
+        return await self._run(self._count, "next_attempt_at IS NULL")
+
+    def _count(self, condition: str) -> int:
+        (count,) = self._conn.execute(f"SELECT COUNT(*) FROM webhook_events WHERE {condition}").fetchone()
+        return int(count)
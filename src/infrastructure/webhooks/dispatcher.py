@@ -0,0 +1,261 @@
+"""ゴール達成イベントのWebhook通知
+
+GoalEventPublisherとしてイベントを送信先ごとの永続キューに保存し、バックグラウンドで送信する。
+
+- 送信先ごとに未送信のイベントをまとめて1回のPOSTで送る
+- 共有のhttpx.AsyncClientで接続をプールし、ホストごとの同時送信数を制限する
+- 失敗した配信は指数バックオフ（フルジッター）の後に同じIdempotency-Keyで再送し、
+  retry_count回再送しても失敗した配信と再送しても成功しないレスポンス（4xx）は
+  再送しないイベントとしてキューに残す
+"""
+import asyncio
+import json
+import random
+import time
+from collections.abc import Callable, Sequence
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import structlog
+
+from core.metrics import (
+    WEBHOOK_DELIVERIES,
+    WEBHOOK_DELIVERY_DURATION,
+    WEBHOOK_DELIVERY_EVENTS,
+)
+from domain.entities.goal import GoalAchievedEvent
+
+from .delivery_queue import WebhookDelivery, WebhookDeliveryQueue
+
+logger = structlog.get_logger(__name__)
+
+WEBHOOK_EVENT_TYPE = "goal.achieved"
+# 再送すれば成功しうるレスポンス（それ以外の4xxは再送しない）
+_RETRYABLE_STATUS_CODES = frozenset({408, 425, 429})
+
+
+def goal_event_payload(event: GoalAchievedEvent) -> dict[str, Any]:
+    """イベントをWebhookで送る内容に変換する"""
+    return {
+        "event_id": event.event_id,
+        "user_id": event.user_id,
+        "goal_id": event.goal_id,
+        "metric_type": event.metric_type,
+        "period": event.period,
+        "period_start": event.period_start.isoformat(),
+        "value": event.value,
+        "target": event.target,
+        "streak": event.streak,
+        "achieved_at": event.achieved_at.isoformat(),
+    }
+
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Retry-Afterヘッダーの秒数（日時形式・不正な値はNone）"""
+    try:
+        return max(0.0, float(response.headers["retry-after"]))
+    except (KeyError, ValueError):
+        return None
+
+
+class WebhookDispatcher:
+    """ゴール達成イベントを送信先ごとにまとめて送るWebhookの送信処理"""
+
+    def __init__(
+        self,
+        queue: WebhookDeliveryQueue,
+        endpoints: Sequence[str],
+        client: Optional[httpx.AsyncClient] = None,
+        timeout_seconds: float = 30.0,
+        retry_count: int = 3,
+        batch_size: int = 100,
+        max_concurrency_per_host: int = 4,
+        backoff_base_seconds: float = 1.0,
+        backoff_max_seconds: float = 300.0,
+        poll_interval_seconds: float = 1.0,
+        jitter: Callable[[], float] = random.random,
+    ) -> None:
+        """
+        Args:
+            queue: 送信先ごとのイベントを保存する永続キュー
+            endpoints: 送信先のURL
+            client: 送信に使うクライアント（省略時は接続をプールするクライアントを作成し、
+                stopで閉じる）
+            timeout_seconds: 1回の送信のタイムアウト秒数
+            retry_count: 失敗した配信を再送する最大回数
+            batch_size: 1回の送信にまとめる最大イベント数
+            max_concurrency_per_host: ホストごとの同時送信数
+            backoff_base_seconds: 最初の再送までの最大秒数（再送ごとに2倍にする）
+            backoff_max_seconds: 再送までの最大秒数
+            poll_interval_seconds: 再送時刻を確認する間隔
+            jitter: 0以上1未満の乱数を返す関数（再送までの秒数に掛ける）
+
+        Raises:
+            ValueError: batch_size・max_concurrency_per_hostが0以下の場合
+        """
+        if batch_size <= 0 or max_concurrency_per_host <= 0:
+            raise ValueError("batch_size and max_concurrency_per_host must be positive")
+        self._queue = queue
+        self._endpoints = list(dict.fromkeys(endpoints))
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(
+            timeout=timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=max_concurrency_per_host * max(1, len(self._endpoints)),
+                max_keepalive_connections=max_concurrency_per_host * max(1, len(self._endpoints)),
+            ),
+        )
+        self._timeout_seconds = timeout_seconds
+        self._retry_count = retry_count
+        self._batch_size = batch_size
+        self._max_concurrency_per_host = max_concurrency_per_host
+        self._backoff_base_seconds = backoff_base_seconds
+        self._backoff_max_seconds = backoff_max_seconds
+        self._poll_interval_seconds = poll_interval_seconds
+        self._jitter = jitter
+        self._endpoints_by_host: dict[str, list[str]] = {}
+        for endpoint in self._endpoints:
+            self._endpoints_by_host.setdefault(urlsplit(endpoint).netloc, []).append(endpoint)
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task: Optional[asyncio.Task[None]] = None
+
+    async def publish(self, events: Sequence[GoalAchievedEvent]) -> None:
+        """
+        イベントを各送信先のキューに保存し、バックグラウンドの送信を起こす
+
+        Args:
+            events: 通知するイベント
+        """
+        if not events:
+            return
+        payloads = [(event.event_id, goal_event_payload(event)) for event in events]
+        for endpoint in self._endpoints:
+            await self._queue.put(endpoint, payloads)
+        self._wakeup.set()
+
+    async def run_once(self) -> int:
+        """
+        送信時刻になった配信をすべて送る
+
+        ホストごとにmax_concurrency_per_host個の送信処理を並行して動かし、
+        各送信処理はホストの送信先から順に配信を取り出して送る。
+
+        Returns:
+            送信した配信数（失敗を含む）
+        """
+        lanes = [
+            self._drain(endpoints)
+            for endpoints in self._endpoints_by_host.values()
+            for _ in range(self._max_concurrency_per_host)
+        ]
+        return sum(await asyncio.gather(*lanes))
+
+    async def _drain(self, endpoints: list[str]) -> int:
+        """送信先を順に巡り、どの送信先にも送信時刻になった配信がなくなるまで送る"""
+        sent = 0
+        idle = 0
+        position = 0
+        while idle < len(endpoints):
+            endpoint = endpoints[position % len(endpoints)]
+            position += 1
+            delivery = await self._queue.claim(
+                endpoint, self._batch_size, lease_seconds=self._timeout_seconds * 2
+            )
+            if delivery is None:
+                idle += 1
+                continue
+            idle = 0
+            await self._deliver(delivery)
+            sent += 1
+        return sent
+
+    async def _deliver(self, delivery: WebhookDelivery) -> None:
+        """配信を送り、結果に応じて完了・再送・再送しないイベントとして記録する"""
+        body = json.dumps({
+            "type": WEBHOOK_EVENT_TYPE,
+            "delivery_id": delivery.delivery_key,
+            "events": delivery.payloads,
+        }).encode()
+        headers = {
+            "Content-Type": "application/json",
+            "Idempotency-Key": delivery.delivery_key,
+        }
+        retry_after: Optional[float] = None
+        started = time.perf_counter()
+        try:
+            response = await self._client.post(
+                delivery.endpoint, content=body, headers=headers, timeout=self._timeout_seconds
+            )
+        except httpx.HTTPError as e:
+            retryable, status_code, error = True, None, f"{type(e).__name__}: {e}"
+        else:
+            status_code, error = response.status_code, None
+            retryable = status_code >= 500 or status_code in _RETRYABLE_STATUS_CODES
+            if retryable:
+                retry_after = _retry_after_seconds(response)
+        WEBHOOK_DELIVERY_DURATION.observe(time.perf_counter() - started)
+        WEBHOOK_DELIVERY_EVENTS.observe(len(delivery.payloads))
+
+        log = logger.bind(
+            endpoint=delivery.endpoint,
+            delivery_key=delivery.delivery_key,
+            event_count=len(delivery.payloads),
+            attempt=delivery.attempts + 1,
+            status_code=status_code,
+        )
+        if status_code is not None and 200 <= status_code < 300:
+            await self._queue.complete(delivery.delivery_key)
+            WEBHOOK_DELIVERIES.inc(labels=("delivered",))
+            log.info("Webhook delivered")
+        elif retryable and delivery.attempts < self._retry_count:
+            delay = self.backoff_seconds(delivery.attempts + 1)
+            if retry_after is not None:
+                delay = min(max(delay, retry_after), self._backoff_max_seconds)
+            await self._queue.retry(delivery.delivery_key, delay)
+            WEBHOOK_DELIVERIES.inc(labels=("retried",))
+            log.warning("Webhook delivery failed, will retry", retry_in_seconds=round(delay, 3), error=error)
+        else:
+            await self._queue.dead_letter(delivery.delivery_key)
+            WEBHOOK_DELIVERIES.inc(labels=("dead_lettered",))
+            log.error("Webhook delivery failed permanently", error=error)
+
+    def backoff_seconds(self, attempt: int) -> float:
+        """
+        attempt回目の失敗の後、再送するまでの秒数（フルジッター）
+
+        Args:
+            attempt: 失敗した送信の回数（1以上）
+        """
+        ceiling = min(self._backoff_max_seconds, self._backoff_base_seconds * 2 ** (attempt - 1))
+        return ceiling * self._jitter()
+
+    def start(self) -> None:
+        """バックグラウンドで送信を開始する"""
+        self._stopping = False
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """送信を止める（未送信のイベントはキューに残り、次の起動で送る）"""
+        self._stopping = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        if self._owns_client:
+            await self._client.aclose()
+
+    async def run(self) -> None:
+        """停止を要求されるまで、イベントの追加または一定間隔ごとに送信時刻になった配信を送る"""
+        while not self._stopping:
+            # 送信中に追加されたイベントは次の待機を起こす
+            self._wakeup.clear()
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Webhook dispatch failed")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._poll_interval_seconds)
+            except TimeoutError:
+                pass
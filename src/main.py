@@ -6,23 +6,95 @@ from typing import Dict, Any
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
-from api.v1.endpoints import measurements
-from core.logging import configure_logging, get_logger
+from api.ingest_worker import IngestWorker
+from api.middleware.compression import (
+    RequestDecompressionMiddleware,
+    ResponseCompressionMiddleware,
+)
+from api.middleware.metrics import MetricsMiddleware
+from api.middleware.profiling import ProfilingMiddleware
+from api.v1.dependencies.archive import get_measurement_archiver
+from api.v1.dependencies.auth import token_cache
+from api.v1.dependencies.cache import get_response_cache
+from api.v1.dependencies.database import get_measurement_repository
+from api.v1.dependencies.goals import get_goal_evaluator, get_goal_event_relay
+from api.v1.dependencies.queue import get_ingest_queue
+from api.v1.dependencies.rate_limit import get_rate_limit_backend
+from api.v1.dependencies.webhooks import get_webhook_dispatcher
+from api.v1.endpoints import goals, measurements
+from core.config import get_settings
+from core.logging import configure_logging, get_logger, get_logging_stats, shutdown_logging
+from core.metrics import CONTENT_TYPE_LATEST, REGISTRY, CallbackMetric
+from infrastructure.database.session import dispose_engine
+from infrastructure.rate_limit import InMemoryRateLimitBackend
 
 # 構造化ロギングを設定
-configure_logging()
+settings = get_settings()
+configure_logging(
+    log_level=settings.log_level,
+    async_mode=settings.log_async,
+    queue_size=settings.log_queue_size,
+    batch_size=settings.log_batch_size,
+    overflow_policy=settings.log_overflow_policy,
+    json_serializer=settings.log_json_serializer,
+)
 logger = get_logger(__name__)
 
 
+def _start_ingest_workers() -> list[IngestWorker]:
+    """非同期一括登録が有効な場合にワーカーを起動する"""
+    queue = get_ingest_queue()
+    if queue is None:
+        return []
+    workers = [
+        IngestWorker(
+            queue,
+            get_measurement_repository(),
+            cache=get_response_cache(),
+            batch_rows=settings.ingest_worker_batch_rows,
+            archiver=get_measurement_archiver(),
+            goal_evaluator=get_goal_evaluator(),
+        )
+        for _ in range(settings.ingest_worker_count)
+    ]
+    for worker in workers:
+        worker.start()
+    return workers
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """アプリケーションのライフサイクル管理"""
     # 起動時
     logger.info("HealthSync API starting up", version="0.1.0")
+    archiver = get_measurement_archiver()
+    if archiver is not None:
+        archiver.start()
+    webhook_dispatcher = get_webhook_dispatcher()
+    if webhook_dispatcher is not None:
+        webhook_dispatcher.start()
+    # 通知に失敗した、または前回の停止までに通知できなかった達成イベントを通知する
+    goal_event_relay = get_goal_event_relay()
+    if goal_event_relay is not None:
+        goal_event_relay.start()
+    workers = _start_ingest_workers()
     yield
-    # 終了時
+    # 終了時（ワーカーは待機中のジョブを保存し終えてから停止する）
+    for worker in workers:
+        await worker.stop()
+    if goal_event_relay is not None:
+        await goal_event_relay.stop()
+    # 未送信の通知はキューに残り、次の起動で送る
+    if webhook_dispatcher is not None:
+        await webhook_dispatcher.stop()
+    # ワーカーが保存した行も含め、アーカイブのバッファをすべて書き出す
+    if archiver is not None:
+        await archiver.stop()
+    await dispose_engine()
     logger.info("HealthSync API shutting down")
+    shutdown_logging()
 
 
 app = FastAPI(
@@ -41,8 +113,80 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Accept-Encodingに応じてレスポンスを圧縮し、圧縮されたリクエストボディを展開する
+# （メトリクスのリクエスト・レスポンスサイズは圧縮後の転送量になる）
+if settings.response_compression_enabled:
+    app.add_middleware(
+        ResponseCompressionMiddleware,
+        minimum_size=settings.response_compression_min_bytes,
+    )
+if settings.request_decompression_enabled:
+    app.add_middleware(
+        RequestDecompressionMiddleware,
+        max_decompressed_bytes=settings.request_max_decompressed_bytes,
+    )
+
+# オプトインしたリクエストの処理段階を計測（X-Profileヘッダーまたはサンプリング）
+if settings.profiling_header_enabled or settings.profiling_sample_rate > 0:
+    app.add_middleware(
+        ProfilingMiddleware,
+        header_enabled=settings.profiling_header_enabled,
+        sample_rate=settings.profiling_sample_rate,
+        server_timing=settings.profiling_server_timing,
+        dump_dir=settings.profiling_dump_dir,
+    )
+
+# リクエストのレイテンシ・サイズを記録（最外周で計測するため最後に追加）
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
 # ルーターを登録
 app.include_router(measurements.router)
+app.include_router(goals.router)
+
+# アプリケーション内部の状態をメトリクスとして公開
+REGISTRY.register(CallbackMetric(
+    "auth_token_cache_hits_total",
+    "Token verification cache hits",
+    lambda: token_cache.hits,
+    metric_type="counter",
+))
+REGISTRY.register(CallbackMetric(
+    "auth_token_cache_misses_total",
+    "Token verification cache misses",
+    lambda: token_cache.misses,
+    metric_type="counter",
+))
+REGISTRY.register(CallbackMetric(
+    "auth_token_cache_size",
+    "Entries in the token verification cache",
+    lambda: token_cache.stats()["size"],
+))
+REGISTRY.register(CallbackMetric(
+    "log_queue_records",
+    "Log records waiting in the async logging queue",
+    lambda: get_logging_stats()["queued"],
+))
+REGISTRY.register(CallbackMetric(
+    "log_records_dropped_total",
+    "Log records dropped because the async logging queue was full",
+    lambda: get_logging_stats()["dropped"],
+    metric_type="counter",
+))
+_archiver = get_measurement_archiver()
+if _archiver is not None:
+    REGISTRY.register(CallbackMetric(
+        "archive_buffered_rows",
+        "Stored rows waiting to be written to archive files",
+        _archiver.buffered_rows,
+    ))
+_rate_limit_backend = get_rate_limit_backend()
+if isinstance(_rate_limit_backend, InMemoryRateLimitBackend):
+    REGISTRY.register(CallbackMetric(
+        "rate_limit_keys",
+        "Users tracked by the in-process rate limiter",
+        lambda: _rate_limit_backend.stats()["keys"],
+    ))
 
 
 @app.get("/health")
@@ -57,3 +201,11 @@ async def health_check() -> Dict[str, Any]:
     logger.debug("Health check requested", response=response)
     return response
 
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """Prometheusテキスト形式のメトリクスエンドポイント"""
+    if not settings.metrics_enabled:
+        return PlainTextResponse("metrics are disabled\n", status_code=404)
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE_LATEST)
+
@@ -0,0 +1,18 @@
+"""ゴールリクエストスキーマ"""
+
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from domain.entities.goal import GoalAggregation, GoalPeriod
+from domain.entities.measurement import MetricType
+
+
+class GoalPutRequest(BaseModel):
+    """ゴール作成・置き換えリクエスト"""
+
+    metric_type: MetricType
+    target: float = Field(..., gt=0)
+    aggregation: GoalAggregation = GoalAggregation.SUM
+    period: GoalPeriod = GoalPeriod.DAY
+    unit: Optional[str] = None
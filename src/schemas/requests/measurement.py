@@ -3,10 +3,13 @@
 from datetime import datetime
 from typing import Any, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 from domain.entities.measurement import MetricType
 
+# measurements.device_idのカラム長（MySQLのINSERT IGNOREで切り詰められないよう上限を揃える）
+MAX_DEVICE_ID_LENGTH = 255
+
 
 class MeasurementCreateRequest(BaseModel):
     """測定データ作成リクエスト"""
@@ -17,7 +20,13 @@ class MeasurementCreateRequest(BaseModel):
     value: float
     unit: str
     measured_at: datetime
-    device_id: Optional[str] = None
+    device_id: Optional[str] = Field(None, max_length=MAX_DEVICE_ID_LENGTH)
     metadata: Optional[dict[str, Any]] = None
     notes: Optional[str] = None
-
+
+
+# 一括登録リクエストを1回の呼び出しでスキーマ検証するためのアダプター
+MeasurementCreateRequestList: TypeAdapter[list[MeasurementCreateRequest]] = TypeAdapter(
+    list[MeasurementCreateRequest]
+)
+
@@ -0,0 +1,226 @@
+"""測定データの列指向バイナリ形式（一括登録用）
+
+JSONの一括登録と同じ内容を、列ごとの配列と文字列の辞書で表すバイナリ形式。
+メトリックタイプ・単位・デバイスIDは辞書のコードで参照するため、同じ文字列が
+繰り返されるHealthKitのデータを小さく送れ、数値の列はコピーせずに配列として読める。
+
+レイアウト（数値はすべてリトルエンディアン）:
+
+    magic        4バイト  b"HSMC"
+    version      u8       1
+    reserved     3バイト  0
+    row_count    u32
+    metric_types 文字列辞書（u16の件数、各要素はu16のバイト長 + UTF-8）
+    units        文字列辞書
+    device_ids   文字列辞書
+    metric_codes u8[row_count]   metric_typesのインデックス
+    unit_codes   u16[row_count]  unitsのインデックス
+    device_codes u16[row_count]  device_idsのインデックス（0xFFFFはデバイスIDなし）
+    values       f64[row_count]
+    measured_at  i64[row_count]  UTCのエポックミリ秒
+    extras_size  u32
+    extras       UTF-8のJSON配列（extras_sizeが0の場合は省略）
+                 [{"index": 行番号, "metadata": {...}, "notes": "..."}, ...]
+
+metadata・notesを持つ行のみをextrasに記述する。
+"""
+import json
+import struct
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from core.timestamps import EPOCH, ONE_MILLISECOND, from_epoch_milliseconds
+
+COLUMNAR_MEDIA_TYPE = "application/vnd.healthsync.measurements+columnar"
+COLUMNAR_MAGIC = b"HSMC"
+COLUMNAR_VERSION = 1
+# デバイスIDなしを表すデバイスコード
+NO_DEVICE = 0xFFFF
+
+_HEADER = struct.Struct("<4sB3xI")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+
+# datetimeで表せるエポックミリ秒の範囲
+MIN_EPOCH_MS = (datetime(1, 1, 1, tzinfo=UTC) - EPOCH) // ONE_MILLISECOND
+MAX_EPOCH_MS = (
+    datetime(9999, 12, 31, 23, 59, 59, 999000, tzinfo=UTC) - EPOCH
+) // ONE_MILLISECOND
+
+
+class ColumnarFormatError(ValueError):
+    """列指向バイナリ形式として読めないボディ"""
+
+
+@dataclass(frozen=True)
+class ColumnarMeasurements:
+    """デコードした列指向の測定データ
+
+    各列の配列はリクエストボディのバッファを参照する（読み取り専用）。
+
+    Attributes:
+        metric_types: メトリックタイプの辞書（未知の値を含みうる）
+        units: 単位の辞書
+        device_ids: デバイスIDの辞書
+        metric_codes: 各行のメトリックタイプのコード
+        unit_codes: 各行の単位のコード
+        device_codes: 各行のデバイスIDのコード（NO_DEVICEはデバイスIDなし）
+        values: 各行の測定値
+        measured_at_ms: 各行の測定日時（UTCのエポックミリ秒）
+        extras: 行番号ごとのmetadata・notes
+    """
+
+    metric_types: tuple[str, ...]
+    units: tuple[str, ...]
+    device_ids: tuple[str, ...]
+    metric_codes: npt.NDArray[np.uint8]
+    unit_codes: npt.NDArray[np.uint16]
+    device_codes: npt.NDArray[np.uint16]
+    values: npt.NDArray[np.float64]
+    measured_at_ms: npt.NDArray[np.int64]
+    extras: dict[int, dict[str, Any]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def to_rows(self, positions: Sequence[int] | None = None) -> list[dict[str, Any]]:
+        """JSONの一括登録と同じ形式の行に変換する
+
+        測定日時はISO 8601文字列とする（datetimeで表せない値はエポックミリ秒のまま）。
+
+        Args:
+            positions: 変換する行番号（省略時はすべて）
+        """
+        if positions is None:
+            positions = range(len(self))
+        rows = []
+        for position in positions:
+            measured_at_ms = int(self.measured_at_ms[position])
+            device_code = int(self.device_codes[position])
+            row: dict[str, Any] = {
+                "metric_type": self.metric_types[self.metric_codes[position]],
+                "value": float(self.values[position]),
+                "unit": self.units[self.unit_codes[position]],
+                "measured_at": (
+                    from_epoch_milliseconds(measured_at_ms).isoformat()
+                    if MIN_EPOCH_MS <= measured_at_ms <= MAX_EPOCH_MS
+                    else measured_at_ms
+                ),
+            }
+            if device_code != NO_DEVICE:
+                row["device_id"] = self.device_ids[device_code]
+            row.update(self.extras.get(position, {}))
+            rows.append(row)
+        return rows
+
+
+class _Reader:
+    """ボディを先頭から読むカーソル"""
+
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+        self.offset = 0
+
+    def take(self, size: int) -> memoryview:
+        end = self.offset + size
+        if end > len(self.body):
+            raise ColumnarFormatError("Columnar body is truncated")
+        view = memoryview(self.body)[self.offset:end]
+        self.offset = end
+        return view
+
+    def unpack(self, fmt: struct.Struct) -> tuple[Any, ...]:
+        return fmt.unpack(self.take(fmt.size))
+
+    def array(self, dtype: str, count: int) -> npt.NDArray[Any]:
+        itemsize = np.dtype(dtype).itemsize
+        return np.frombuffer(self.take(itemsize * count), dtype=dtype)
+
+    def strings(self, name: str) -> tuple[str, ...]:
+        (count,) = self.unpack(_U16)
+        strings = []
+        for _ in range(count):
+            (size,) = self.unpack(_U16)
+            try:
+                strings.append(str(self.take(size), "utf-8"))
+            except UnicodeDecodeError as e:
+                raise ColumnarFormatError(f"Invalid UTF-8 in {name} table") from e
+        return tuple(strings)
+
+
+def _decode_extras(data: memoryview, row_count: int) -> dict[int, dict[str, Any]]:
+    """extras（行番号ごとのmetadata・notes）を読む（値の型はスキーマ検証で判定する）"""
+    try:
+        entries = json.loads(str(data, "utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ColumnarFormatError("Invalid extras JSON") from e
+    if not isinstance(entries, list):
+        raise ColumnarFormatError("Extras must be a JSON array")
+    extras: dict[int, dict[str, Any]] = {}
+    for entry in entries:
+        index = entry.get("index") if isinstance(entry, dict) else None
+        if type(index) is not int or not 0 <= index < row_count or index in extras:
+            raise ColumnarFormatError("Extras entries must have a unique row index")
+        extras[index] = {name: entry[name] for name in ("metadata", "notes") if name in entry}
+    return extras
+
+
+def decode_columnar_measurements(body: bytes) -> ColumnarMeasurements:
+    """
+    列指向バイナリ形式のボディをデコードする
+
+    辞書の範囲外を指すコードなど、形式として不正なボディはエラーとする。
+    辞書の値（未知のメトリックタイプなど）の妥当性はスキーマ検証で判定する。
+
+    Args:
+        body: リクエストボディ
+
+    Returns:
+        デコードした列指向の測定データ
+
+    Raises:
+        ColumnarFormatError: 形式として不正なボディの場合
+    """
+    reader = _Reader(body)
+    magic, version, row_count = reader.unpack(_HEADER)
+    if magic != COLUMNAR_MAGIC:
+        raise ColumnarFormatError("Not a columnar measurements body")
+    if version != COLUMNAR_VERSION:
+        raise ColumnarFormatError(f"Unsupported columnar format version: {version}")
+
+    metric_types = reader.strings("metric_types")
+    units = reader.strings("units")
+    device_ids = reader.strings("device_ids")
+    metric_codes = reader.array("<u1", row_count)
+    unit_codes = reader.array("<u2", row_count)
+    device_codes = reader.array("<u2", row_count)
+    values = reader.array("<f8", row_count)
+    measured_at_ms = reader.array("<i8", row_count)
+    (extras_size,) = reader.unpack(_U32)
+    extras = _decode_extras(reader.take(extras_size), row_count) if extras_size else {}
+    if reader.offset != len(body):
+        raise ColumnarFormatError("Unexpected data after columnar body")
+
+    if row_count and (
+        metric_codes.max() >= len(metric_types)
+        or unit_codes.max() >= len(units)
+        or ((device_codes >= len(device_ids)) & (device_codes != NO_DEVICE)).any()
+    ):
+        raise ColumnarFormatError("Column code refers outside its table")
+    return ColumnarMeasurements(
+        metric_types=metric_types,
+        units=units,
+        device_ids=device_ids,
+        metric_codes=metric_codes,
+        unit_codes=unit_codes,
+        device_codes=device_codes,
+        values=values,
+        measured_at_ms=measured_at_ms,
+        extras=extras,
+    )
+
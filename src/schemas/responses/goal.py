@@ -0,0 +1,43 @@
+"""ゴールレスポンススキーマ"""
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from domain.entities.goal import GoalAggregation, GoalPeriod
+from domain.entities.measurement import MetricType
+
+
+class GoalProgressResponse(BaseModel):
+    """ゴールの1期間の進捗"""
+
+    period_start: datetime
+    value: float
+    sample_count: int
+    achieved: bool
+    achieved_at: Optional[datetime] = None
+    streak: int
+
+
+class GoalResponse(BaseModel):
+    """ゴールレスポンス"""
+
+    model_config = ConfigDict(use_enum_values=True)
+
+    goal_id: str
+    metric_type: MetricType
+    target: float
+    aggregation: GoalAggregation
+    period: GoalPeriod
+    unit: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    current_progress: Optional[GoalProgressResponse] = None
+    history: Optional[list[GoalProgressResponse]] = None
+
+
+class GoalListResponse(BaseModel):
+    """ゴール一覧レスポンス"""
+
+    items: list[GoalResponse]
@@ -1,11 +1,16 @@
 """測定データレスポンススキーマ"""
 
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict
 
 from domain.entities.measurement import MetricType
+from domain.services.measurement_series import SeriesMethod
+from domain.services.measurement_summary import BucketGranularity, SummaryPeriod
+
+# 非同期一括登録ジョブの状態
+IngestStatus = Literal["queued", "processing", "completed", "failed"]
 
 
 class MeasurementResponse(BaseModel):
@@ -24,19 +29,153 @@ class MeasurementResponse(BaseModel):
     created_at: datetime
 
 
+class MeasurementPageItemResponse(BaseModel):
+    """測定データ一覧の1件（fields指定時は指定したフィールドのみを含む）"""
+
+    model_config = ConfigDict(use_enum_values=True)
+
+    id: Optional[str] = None
+    metric_type: Optional[MetricType] = None
+    value: Optional[float] = None
+    unit: Optional[str] = None
+    measured_at: Optional[datetime] = None
+    device_id: Optional[str] = None
+    metadata: Optional[dict[str, Any]] = None
+    notes: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class MeasurementPageResponse(BaseModel):
+    """測定データ一覧レスポンス"""
+
+    items: list[MeasurementPageItemResponse]
+    next_cursor: Optional[str] = None
+
+
 class MeasurementBulkCreateResponse(BaseModel):
     """測定データ一括作成レスポンス"""
 
     success_count: int
     failed_count: int
+    duplicate_count: int = 0
     measurements: list[MeasurementResponse]
     errors: Optional[list[dict[str, Any]]] = None
 
 
+class MeasurementBulkCreateMinimalResponse(BaseModel):
+    """測定データ一括作成の簡易レスポンス（登録データの代わりに採番したIDのみを返す）"""
+
+    success_count: int
+    failed_count: int
+    duplicate_count: int = 0
+    ids: list[str]
+    errors: Optional[list[dict[str, Any]]] = None
+
+
+class MeasurementBulkAcceptedResponse(BaseModel):
+    """測定データの非同期一括登録の受付レスポンス（保存前のためIDは含めない）"""
+
+    batch_id: str
+    status: IngestStatus
+    accepted_count: int
+    failed_count: int
+    errors: Optional[list[dict[str, Any]]] = None
+
+
+class MeasurementBulkStatusResponse(BaseModel):
+    """測定データの非同期一括登録の状態と結果
+
+    failed_countとerrorsは受付時のスキーマ検証と処理時のドメイン検証のエラーを含む。
+    idsは処理が完了した場合のみ返す。
+    """
+
+    batch_id: str
+    status: IngestStatus
+    total_count: int
+    success_count: int
+    failed_count: int
+    duplicate_count: int
+    ids: Optional[list[str]] = None
+    errors: Optional[list[dict[str, Any]]] = None
+    message: Optional[str] = None
+    updated_at: datetime
+
+
+class MeasurementStreamCreateResponse(BaseModel):
+    """測定データのストリーム一括登録レスポンス（登録データは含めない）"""
+
+    success_count: int
+    failed_count: int
+    duplicate_count: int = 0
+    errors: Optional[list[dict[str, Any]]] = None
+
+
+class SummaryBucketResponse(BaseModel):
+    """集計バケットのレスポンス"""
+
+    bucket_start: datetime
+    count: int
+    avg: float
+    min: float
+    max: float
+
+
+class SeriesPointResponse(BaseModel):
+    """ダウンサンプリング後の時系列の1点"""
+
+    measured_at: datetime
+    value: float
+
+
+class MeasurementSeriesResponse(BaseModel):
+    """ダウンサンプリングした時系列のレスポンス
+
+    methodがlttbの場合はpoints、minmaxの場合はbucketsを返す。
+    """
+
+    model_config = ConfigDict(use_enum_values=True)
+
+    metric_type: MetricType
+    method: SeriesMethod
+    start: datetime
+    end: datetime
+    source_count: int
+    points: Optional[list[SeriesPointResponse]] = None
+    buckets: Optional[list[SummaryBucketResponse]] = None
+
+
+class MetricSummaryResponse(BaseModel):
+    """(メトリックタイプ, 単位)ごとのサマリーレスポンス"""
+
+    model_config = ConfigDict(use_enum_values=True)
+
+    metric_type: MetricType
+    unit: str
+    count: int
+    sum: float
+    avg: float
+    min: float
+    max: float
+    stddev: float
+    buckets: list[SummaryBucketResponse]
+
+
+class MeasurementSummaryResponse(BaseModel):
+    """測定データサマリーレスポンス"""
+
+    model_config = ConfigDict(use_enum_values=True)
+
+    period: SummaryPeriod
+    granularity: BucketGranularity
+    start: datetime
+    end: datetime
+    metrics: list[MetricSummaryResponse]
+
+
 class MeasurementErrorDetail(BaseModel):
     """測定データエラー詳細"""
 
     index: int
     message: str
     field: Optional[str] = None
-
+
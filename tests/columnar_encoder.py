@@ -0,0 +1,91 @@
+"""測定データの列指向バイナリ形式のエンコーダー（テスト・ベンチマーク用）
+
+サーバーはデコードのみを行うため、エンコーダーはクライアント側の実装として
+テストとベンチマークに置く。形式の定義はschemas.requests.measurement_columnarを参照。
+"""
+import json
+import struct
+from collections.abc import Mapping, Sequence
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import numpy as np
+
+from schemas.requests.measurement_columnar import (
+    COLUMNAR_MAGIC,
+    COLUMNAR_VERSION,
+    NO_DEVICE,
+)
+
+_HEADER = struct.Struct("<4sB3xI")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_MAX_METRIC_TYPES = 0xFF
+_MAX_TABLE_SIZE = 0xFFFF
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def _epoch_ms(measured_at: datetime | str | int) -> int:
+    if isinstance(measured_at, int):
+        return measured_at
+    if isinstance(measured_at, str):
+        measured_at = datetime.fromisoformat(measured_at)
+    if measured_at.tzinfo is None:
+        measured_at = measured_at.replace(tzinfo=UTC)
+    return (measured_at - _EPOCH) // timedelta(milliseconds=1)
+
+
+def _encode_strings(strings: Sequence[str]) -> bytes:
+    parts = [_U16.pack(len(strings))]
+    for value in strings:
+        encoded = value.encode()
+        parts.append(_U16.pack(len(encoded)) + encoded)
+    return b"".join(parts)
+
+
+def encode_columnar_measurements(rows: Sequence[Mapping[str, Any]]) -> bytes:
+    """
+    JSONの一括登録と同じ形式の行を列指向バイナリ形式にエンコードする
+
+    測定日時はミリ秒未満を切り捨てる。
+
+    Args:
+        rows: metric_type・value・unit・measured_at（datetime、ISO 8601文字列、
+            またはエポックミリ秒）と任意のdevice_id・metadata・notesを持つ行
+
+    Raises:
+        ValueError: 辞書の要素数が形式の上限を超える場合
+    """
+    tables: dict[str, dict[str, int]] = {"metric_type": {}, "unit": {}, "device_id": {}}
+
+    def code(name: str, value: str) -> int:
+        return tables[name].setdefault(value, len(tables[name]))
+
+    metric_codes = [code("metric_type", row["metric_type"]) for row in rows]
+    unit_codes = [code("unit", row["unit"]) for row in rows]
+    device_codes = [
+        NO_DEVICE if row.get("device_id") is None else code("device_id", row["device_id"])
+        for row in rows
+    ]
+    if len(tables["metric_type"]) > _MAX_METRIC_TYPES or any(
+        len(table) >= _MAX_TABLE_SIZE for table in tables.values()
+    ):
+        raise ValueError("Too many distinct values for a columnar table")
+
+    extras = [
+        {"index": index, **{name: row[name] for name in ("metadata", "notes") if row.get(name) is not None}}
+        for index, row in enumerate(rows)
+        if row.get("metadata") is not None or row.get("notes") is not None
+    ]
+    extras_body = json.dumps(extras, ensure_ascii=False, separators=(",", ":")).encode() if extras else b""
+    return b"".join([
+        _HEADER.pack(COLUMNAR_MAGIC, COLUMNAR_VERSION, len(rows)),
+        *(_encode_strings(list(table)) for table in tables.values()),
+        np.asarray(metric_codes, dtype="<u1").tobytes(),
+        np.asarray(unit_codes, dtype="<u2").tobytes(),
+        np.asarray(device_codes, dtype="<u2").tobytes(),
+        np.asarray([row["value"] for row in rows], dtype="<f8").tobytes(),
+        np.asarray([_epoch_ms(row["measured_at"]) for row in rows], dtype="<i8").tobytes(),
+        _U32.pack(len(extras_body)),
+        extras_body,
+    ])
@@ -0,0 +1,77 @@
+"""pytest共通設定"""
+import asyncio
+import os
+import shutil
+import tempfile
+from collections.abc import Iterator
+
+import pytest
+
+# アプリケーションの設定が読み込まれる前に、テスト用のSQLiteデータベースを指定する
+_TEST_DB_DIR = tempfile.mkdtemp(prefix="healthsync-test-")
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite+aiosqlite:///{_TEST_DB_DIR}/healthsync.db"
+)
+# 同じユーザーで多数のリクエストを送るテストがあるため、レート制限は個別のテストでのみ有効にする
+os.environ.setdefault("RATE_LIMIT_BACKEND", "none")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database() -> Iterator[None]:
+    """テスト用データベースのテーブルを作成し、終了時に削除する"""
+    from infrastructure.database.session import dispose_engine, init_db
+
+    async def setup() -> None:
+        await init_db()
+        await dispose_engine()
+
+    asyncio.run(setup())
+    yield
+    shutil.rmtree(_TEST_DB_DIR, ignore_errors=True)
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """カバレッジ計測中は実行時間を検証するテストをスキップする
+
+    計測のオーバーヘッドで目標時間を超えるため、パフォーマンステストは
+    `make test-performance`（--no-cov）で実行する。
+    """
+    coverage_enabled = bool(config.getoption("cov_source", default=None)) and not config.getoption(
+        "no_cov", default=False
+    )
+    if not coverage_enabled:
+        return
+    skip_performance = pytest.mark.skip(reason="timing assertions are skipped under coverage")
+    for item in items:
+        if "performance" in item.keywords:
+            item.add_marker(skip_performance)
+
+
+class FakeClock:
+    """手動で進めるテスト用の時計（nowを書き換えて時刻を進める）"""
+
+    def __init__(self, now: float = 1_700_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def auth_headers(user_id: str, **extra: str) -> dict[str, str]:
+    """ユーザーの認証用のヘッダーを取得（extraは追加するヘッダー）"""
+    from api.v1.dependencies.auth import create_access_token
+
+    token = create_access_token(data={"sub": user_id, "email": f"{user_id}@example.com"})
+    return {"Authorization": f"Bearer {token}", **extra}
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache() -> Iterator[None]:
+    """テストごとにプロセス内のレスポンスキャッシュを空にする"""
+    from api.v1.dependencies.cache import get_response_cache
+    from infrastructure.cache import InMemoryCacheBackend
+
+    cache = get_response_cache()
+    if cache is not None and isinstance(cache.backend, InMemoryCacheBackend):
+        cache.backend.clear()
+    yield
@@ -0,0 +1,272 @@
+"""ゴールの評価とゴールリポジトリの統合テスト（SQLite/aiosqliteをローカル代替として使用）"""
+import asyncio
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from api.goal_evaluation import GoalEvaluator, GoalEventRelay
+from core.config import Settings
+from domain.entities.goal import Goal, GoalAchievedEvent, GoalAggregation, GoalPeriod
+from domain.entities.measurement import MetricType
+from domain.entities.measurement_batch import MeasurementBatch
+from infrastructure.database.goal_repository import GoalRepository
+from infrastructure.database.measurement_repository import MeasurementRepository
+from infrastructure.database.session import create_engine, init_db
+
+CREATED_AT = datetime(2024, 5, 1, tzinfo=UTC)
+DAY = datetime(2024, 5, 20, tzinfo=UTC)
+
+
+class RecordingPublisher:
+    """通知したイベントを保持する通知先"""
+
+    def __init__(self) -> None:
+        self.events: list[GoalAchievedEvent] = []
+
+    async def publish(self, events: Sequence[GoalAchievedEvent]) -> None:
+        self.events.extend(events)
+
+
+class FailingPublisher:
+    """常に失敗する通知先"""
+
+    async def publish(self, events: Sequence[GoalAchievedEvent]) -> None:
+        raise ConnectionError("publisher is down")
+
+
+def make_goal(goal_id: str = "steps", **fields) -> Goal:
+    """1日10,000歩のゴール"""
+    values = {
+        "goal_id": goal_id,
+        "user_id": "user",
+        "metric_type": MetricType.STEPS,
+        "target": 10_000,
+        "created_at": CREATED_AT,
+        "updated_at": CREATED_AT,
+    }
+    return Goal(**{**values, **fields})
+
+
+def steps_batch(*rows: tuple[float, datetime]) -> MeasurementBatch:
+    """(歩数, 測定日時)の行からバッチを生成"""
+    return MeasurementBatch.from_columns(
+        user_id="user",
+        created_at=DAY,
+        metric_types=["steps"] * len(rows),
+        values=[row[0] for row in rows],
+        units=["steps"] * len(rows),
+        measured_at=[row[1] for row in rows],
+    )
+
+
+async def ingest(
+    engine, evaluator: GoalEvaluator, batch: MeasurementBatch
+) -> list[GoalAchievedEvent]:
+    """一括登録と同じく、測定データと進捗を1トランザクションで保存してから通知する"""
+    achieved: list[GoalAchievedEvent] = []
+    await MeasurementRepository(engine).bulk_insert(batch, on_stored=evaluator.recorder(achieved))
+    await evaluator.publish(achieved)
+    return achieved
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    """テストごとに独立したSQLiteデータベースのエンジン"""
+    settings = Settings(database_url=f"sqlite+aiosqlite:///{tmp_path}/goals.db")
+    engine = create_engine(settings)
+    await init_db(engine)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def repository(engine) -> GoalRepository:
+    return GoalRepository(engine)
+
+
+@pytest.fixture
+def publisher() -> RecordingPublisher:
+    return RecordingPublisher()
+
+
+@pytest.fixture
+def evaluator(repository, publisher) -> GoalEvaluator:
+    return GoalEvaluator(repository, publisher)
+
+
+class TestGoalEvaluator:
+    """GoalEvaluatorのテスト"""
+
+    async def test_event_is_emitted_once_per_period(
+        self, engine, repository, publisher, evaluator
+    ):
+        """目標に達したバッチでイベントを1回発行し、同じ期間の以降のバッチでは発行しない"""
+        # Arrange
+        await repository.put(make_goal())
+
+        # Act
+        first = await ingest(engine, evaluator, steps_batch((6000, DAY + timedelta(hours=9))))
+        second = await ingest(engine, evaluator, steps_batch((4500, DAY + timedelta(hours=18))))
+        third = await ingest(engine, evaluator, steps_batch((2000, DAY + timedelta(hours=21))))
+
+        # Assert
+        assert first == [] and third == []
+        assert [(e.goal_id, e.period_start, e.value, e.streak) for e in second] == [
+            ("steps", DAY, 10_500.0, 1),
+        ]
+        assert publisher.events == second
+        progress = await repository.get_progress("user", "steps", DAY)
+        assert (progress.value_sum, progress.sample_count) == (12_500.0, 3)
+        assert await repository.list_pending_events(DAY + timedelta(days=365)) == []
+
+    async def test_concurrent_batches_emit_a_single_event(
+        self, engine, repository, publisher, evaluator
+    ):
+        """同じ期間を同時に達成させるバッチがあってもイベントは1回だけ発行する"""
+        # Arrange
+        await repository.put(make_goal())
+        batches = [steps_batch((10_000, DAY + timedelta(hours=hour))) for hour in range(5)]
+
+        # Act
+        results = await asyncio.gather(*(ingest(engine, evaluator, batch) for batch in batches))
+
+        # Assert
+        assert sum(len(events) for events in results) == 1
+        assert len(publisher.events) == 1
+
+    async def test_streak_counts_consecutive_achieved_periods(self, engine, repository, evaluator):
+        """前の期間を達成していれば連続達成期間数を1つ増やし、途切れたら1に戻す"""
+        # Arrange
+        await repository.put(make_goal())
+
+        # Act
+        streaks = []
+        for offset in (0, 1, 2, 4):
+            events = await ingest(
+                engine, evaluator, steps_batch((10_000, DAY + timedelta(days=offset, hours=12)))
+            )
+            streaks.append(events[0].streak)
+
+        # Assert
+        assert streaks == [1, 2, 3, 1]
+
+    async def test_average_goal_uses_running_mean(self, engine, repository, evaluator):
+        """平均のゴールは期間内のすべての測定の平均で判定する"""
+        # Arrange
+        await repository.put(make_goal(
+            "average_hr",
+            metric_type=MetricType.HEART_RATE,
+            target=55,
+            aggregation=GoalAggregation.AVERAGE,
+            period=GoalPeriod.WEEK,
+            unit="bpm",
+        ))
+
+        def heart_rate(value: float, measured_at: datetime) -> MeasurementBatch:
+            return MeasurementBatch.from_columns(
+                user_id="user",
+                created_at=DAY,
+                metric_types=["heart_rate"],
+                values=[value],
+                units=["bpm"],
+                measured_at=[measured_at],
+            )
+
+        # Act
+        first = await ingest(engine, evaluator, heart_rate(50.0, DAY))
+        second = await ingest(engine, evaluator, heart_rate(65.0, DAY + timedelta(days=2)))
+
+        # Assert
+        assert first == []
+        assert [(e.period, e.period_start, e.value) for e in second] == [("week", DAY, 57.5)]
+
+    async def test_progress_is_rolled_back_with_measurements(self, engine, repository, evaluator):
+        """測定データの保存が失敗した場合は進捗と達成イベントも記録しない"""
+        # Arrange
+        await repository.put(make_goal())
+        batch = steps_batch((10_000, DAY))
+
+        async def record_then_fail(conn, stored: MeasurementBatch) -> None:
+            await evaluator.record(conn, stored, now=DAY)
+            raise RuntimeError("database is unavailable")
+
+        # Act
+        with pytest.raises(RuntimeError):
+            await MeasurementRepository(engine).bulk_insert(batch, on_stored=record_then_fail)
+
+        # Assert
+        assert await repository.get_progress("user", "steps", DAY) is None
+        assert await repository.list_pending_events(DAY + timedelta(days=1)) == []
+        assert len(await ingest(engine, evaluator, batch)) == 1
+
+    async def test_failed_publish_is_relayed_from_outbox(self, engine, repository, publisher):
+        """通知に失敗したイベントはアウトボックスに残り、猶予の経過後にリレーが通知する"""
+        # Arrange
+        await repository.put(make_goal())
+        achieved: list[GoalAchievedEvent] = []
+        await MeasurementRepository(engine).bulk_insert(
+            steps_batch((10_000, DAY)),
+            on_stored=GoalEvaluator(repository, FailingPublisher()).recorder(achieved),
+        )
+        failed = await GoalEvaluator(repository, FailingPublisher()).publish(achieved)
+        relay = GoalEventRelay(GoalEvaluator(repository, publisher), grace_seconds=60)
+        achieved_at = achieved[0].achieved_at
+
+        # Act
+        within_grace = await relay.run_once(now=achieved_at + timedelta(seconds=30))
+        relayed = await relay.run_once(now=achieved_at + timedelta(seconds=90))
+
+        # Assert
+        assert failed is False
+        assert (within_grace, relayed) == (0, 1)
+        assert publisher.events == achieved
+        assert await repository.list_pending_events(achieved_at + timedelta(days=1)) == []
+
+
+class TestGoalRepository:
+    """GoalRepositoryのテスト"""
+
+    async def test_put_creates_then_replaces_keeping_created_at(self, repository):
+        """2回目のputは置き換えとなり、作成日時を引き継ぐ"""
+        # Act
+        _, created = await repository.put(make_goal())
+        stored, replaced = await repository.put(
+            make_goal(target=8000, created_at=DAY, updated_at=DAY)
+        )
+
+        # Assert
+        assert created and not replaced
+        assert (stored.target, stored.created_at, stored.updated_at) == (8000, CREATED_AT, DAY)
+        assert await repository.get("user", "steps") == stored
+
+    async def test_definition_change_resets_progress(self, engine, repository, evaluator):
+        """目標値の変更では進捗を引き継ぎ、集計方法の変更では進捗を削除する"""
+        # Arrange
+        await repository.put(make_goal())
+        await ingest(engine, evaluator, steps_batch((5000, DAY)))
+
+        # Act
+        await repository.put(make_goal(target=8000))
+        kept = await repository.list_progress("user", "steps")
+        await repository.put(make_goal(aggregation=GoalAggregation.AVERAGE))
+        reset = await repository.list_progress("user", "steps")
+
+        # Assert
+        assert [progress.value_sum for progress in kept] == [5000.0]
+        assert reset == []
+
+    async def test_delete_removes_goal_and_progress(self, engine, repository, evaluator):
+        """削除したゴールは取得できず、進捗も削除する"""
+        # Arrange
+        await repository.put(make_goal())
+        await ingest(engine, evaluator, steps_batch((5000, DAY)))
+
+        # Act
+        deleted = await repository.delete("user", "steps")
+        missing = await repository.delete("user", "steps")
+
+        # Assert
+        assert deleted and not missing
+        assert await repository.get("user", "steps") is None
+        assert await repository.list_progress("user", "steps") == []
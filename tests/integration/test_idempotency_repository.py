@@ -0,0 +1,100 @@
+"""Idempotency-Keyリポジトリの統合テスト（SQLite/aiosqliteをローカル代替として使用）"""
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from core.config import Settings
+from infrastructure.database.idempotency_repository import IdempotencyRepository
+from infrastructure.database.session import create_engine, init_db
+
+NOW = datetime(2024, 1, 1, 12, 0, tzinfo=UTC)
+
+
+@pytest.fixture
+async def repository(tmp_path):
+    """テストごとに独立したSQLiteデータベースのリポジトリ"""
+    settings = Settings(database_url=f"sqlite+aiosqlite:///{tmp_path}/idempotency.db")
+    engine = create_engine(settings)
+    await init_db(engine)
+    yield IdempotencyRepository(engine, ttl=timedelta(hours=24), lock_timeout=timedelta(minutes=1))
+    await engine.dispose()
+
+
+class TestIdempotencyRepository:
+    """IdempotencyRepositoryのテスト"""
+
+    async def test_first_claim_succeeds_and_second_sees_pending(self, repository):
+        """最初のリクエストがキーを確保し、処理中の再送には処理中の状態を返す"""
+        # Act
+        first = await repository.claim("user", "key-1", "hash", now=NOW)
+        second = await repository.claim("user", "key-1", "hash", now=NOW + timedelta(seconds=1))
+
+        # Assert
+        assert first is None
+        assert second is not None
+        assert not second.completed
+        assert second.request_hash == "hash"
+
+    async def test_completed_response_is_returned_to_retries(self, repository):
+        """完了したキーの再送には保存したレスポンスを返す"""
+        # Arrange
+        await repository.claim("user", "key-1", "hash", now=NOW)
+        await repository.complete(
+            "user", "key-1", status_code=201, headers={"content-type": "application/json"}, body=b"{}"
+        )
+
+        # Act
+        record = await repository.claim("user", "key-1", "hash", now=NOW + timedelta(hours=1))
+
+        # Assert
+        assert record is not None
+        assert record.completed
+        assert (record.status_code, record.headers, record.body) == (
+            201, {"content-type": "application/json"}, b"{}"
+        )
+        assert record.created_at == NOW
+
+    async def test_keys_are_scoped_per_user(self, repository):
+        """同じキーでもユーザーが異なれば別のキーとして扱う"""
+        # Act
+        await repository.claim("user", "key-1", "hash", now=NOW)
+
+        # Assert
+        assert await repository.claim("other", "key-1", "hash", now=NOW) is None
+
+    @pytest.mark.parametrize("completed, elapsed", [
+        (True, timedelta(hours=25)),
+        (False, timedelta(minutes=2)),
+    ], ids=["expired", "abandoned"])
+    async def test_expired_or_abandoned_keys_are_reclaimed(self, repository, completed, elapsed):
+        """有効期限切れのキーと放棄された処理中のキーは確保し直せる"""
+        # Arrange
+        await repository.claim("user", "key-1", "old", now=NOW)
+        if completed:
+            await repository.complete("user", "key-1", status_code=201, headers={}, body=b"{}")
+
+        # Act
+        reclaimed = await repository.claim("user", "key-1", "new", now=NOW + elapsed)
+        record = await repository.claim("user", "key-1", "new", now=NOW + elapsed)
+
+        # Assert
+        assert reclaimed is None
+        assert record is not None
+        assert record.request_hash == "new"
+        assert not record.completed
+
+    async def test_release_allows_retry_with_same_key(self, repository):
+        """解放した処理中のキーは同じキーで再試行できるが、完了したキーは解放されない"""
+        # Arrange
+        await repository.claim("user", "failed", "hash", now=NOW)
+        await repository.claim("user", "done", "hash", now=NOW)
+        await repository.complete("user", "done", status_code=201, headers={}, body=b"{}")
+
+        # Act
+        await repository.release("user", "failed")
+        await repository.release("user", "done")
+
+        # Assert
+        assert await repository.claim("user", "failed", "hash", now=NOW) is None
+        done = await repository.claim("user", "done", "hash", now=NOW)
+        assert done is not None and done.completed
@@ -0,0 +1,155 @@
+"""
+インプロセスのベンチマークハーネス
+
+ベンチマークごとに複数回計測した結果を集計し、コミット間で比較できるよう
+JSONに保存する（asv・pytest-benchmarkの最小限のサブセット）。
+"""
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Optional
+
+
+@dataclass
+class BenchmarkResult:
+    """1つのベンチマークの計測結果"""
+
+    name: str
+    params: dict[str, Any]
+    timings: list[float] = field(default_factory=list)
+    info: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        """ベンチマークを識別するキー（例: bulk_handler[rows=1000,invalid_ratio=0.05]）"""
+        params = ",".join(f"{name}={value}" for name, value in self.params.items())
+        return f"{self.name}[{params}]" if params else self.name
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.timings)
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON出力用の辞書"""
+        result: dict[str, Any] = {
+            "name": self.name,
+            "key": self.key,
+            "params": self.params,
+            "rounds": len(self.timings),
+            "min": min(self.timings),
+            "max": max(self.timings),
+            "mean": statistics.fmean(self.timings),
+            "median": self.median,
+            "stddev": statistics.pstdev(self.timings),
+        }
+        rows = self.params.get("rows") or self.params.get("iterations")
+        if rows:
+            result["ops_per_second"] = rows / self.median
+        if self.info:
+            result["info"] = self.info
+        return result
+
+
+def run_benchmark(
+    name: str,
+    func: Callable[[], Any],
+    params: Optional[dict[str, Any]] = None,
+    rounds: int = 5,
+    warmup: int = 1,
+) -> BenchmarkResult:
+    """
+    関数の実行時間を計測する
+
+    Args:
+        name: ベンチマーク名
+        func: 計測する関数（引数なし）
+        params: 結果に記録するパラメータ
+        rounds: 計測回数
+        warmup: 計測前に実行する回数
+
+    Returns:
+        計測結果
+    """
+    result = BenchmarkResult(name=name, params=dict(params or {}))
+    for _ in range(warmup):
+        func()
+    for _ in range(max(1, rounds)):
+        started = time.perf_counter()
+        func()
+        result.timings.append(time.perf_counter() - started)
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(results: list[BenchmarkResult], **metadata: Any) -> dict[str, Any]:
+    """
+    計測結果と実行環境をまとめたレポートを作成する
+
+    Args:
+        results: 計測結果
+        **metadata: レポートに含める追加情報（データ生成の条件など）
+    """
+    return {
+        "metadata": {
+            "created_at": datetime.now(UTC).isoformat(),
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            **metadata,
+        },
+        "benchmarks": [result.to_dict() for result in results],
+    }
+
+
+def write_report(report: dict[str, Any], path: Path) -> None:
+    """レポートをJSONファイルに保存する"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def compare_reports(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    threshold: float = 0.1,
+) -> list[dict[str, Any]]:
+    """
+    2つのレポートの中央値を比較する
+
+    Args:
+        baseline: 比較元のレポート
+        current: 比較先のレポート
+        threshold: 劣化とみなす中央値の増加率
+
+    Returns:
+        両方に存在するベンチマークごとの比較結果（ratioは current / baseline）
+    """
+    baseline_medians = {entry["key"]: entry["median"] for entry in baseline["benchmarks"]}
+    comparisons = []
+    for entry in current["benchmarks"]:
+        before = baseline_medians.get(entry["key"])
+        if before is None or before <= 0:
+            continue
+        ratio = entry["median"] / before
+        comparisons.append({
+            "key": entry["key"],
+            "baseline": before,
+            "current": entry["median"],
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold,
+        })
+    return comparisons
@@ -0,0 +1,90 @@
+"""
+ベンチマーク用の合成データ
+
+HealthKitから送られてくる測定データに近い分布の一括登録リクエストを生成する。
+"""
+import random
+from datetime import UTC, datetime, timedelta
+from typing import Any, Optional
+
+# (メトリックタイプ, 単位, 最小値, 最大値, 出現比率) — 心拍数・歩数が大半を占める
+HEALTHKIT_PROFILE: list[tuple[str, str, float, float, int]] = [
+    ("heart_rate", "bpm", 45.0, 180.0, 50),
+    ("steps", "steps", 0.0, 2000.0, 20),
+    ("distance", "m", 0.0, 1500.0, 8),
+    ("calories_burned", "kcal", 0.0, 150.0, 8),
+    ("oxygen_saturation", "%", 90.0, 100.0, 5),
+    ("blood_pressure_systolic", "mmHg", 95.0, 150.0, 2),
+    ("blood_pressure_diastolic", "mmHg", 60.0, 95.0, 2),
+    ("body_weight", "kg", 45.0, 110.0, 2),
+    ("body_temperature", "°C", 35.8, 37.8, 2),
+    ("blood_glucose", "mg/dL", 70.0, 180.0, 1),
+]
+
+DEVICES = ["Apple Watch Series 8", "Apple Watch Ultra", "iPhone 14 Pro", None]
+
+INVALID_KINDS = ["out_of_range", "invalid_unit", "future", "non_positive", "missing_field", "unknown_metric"]
+
+
+def _valid_row(rng: random.Random, now: datetime) -> dict[str, Any]:
+    metric_type, unit, low, high, _ = rng.choices(
+        HEALTHKIT_PROFILE, weights=[profile[4] for profile in HEALTHKIT_PROFILE]
+    )[0]
+    value = round(rng.uniform(low, high), 1)
+    if value <= 0 and metric_type not in ("steps", "calories_burned"):
+        value = high
+    row: dict[str, Any] = {
+        "metric_type": metric_type,
+        "value": value,
+        "unit": unit,
+        "measured_at": (now - timedelta(seconds=rng.randint(60, 7 * 24 * 3600))).isoformat(),
+    }
+    device_id = rng.choice(DEVICES)
+    if device_id is not None:
+        row["device_id"] = device_id
+    if rng.random() < 0.3:
+        row["metadata"] = {"source": "HealthKit", "context": rng.choice(["resting", "active", "workout"])}
+    return row
+
+
+def _invalidate(row: dict[str, Any], kind: str, now: datetime) -> dict[str, Any]:
+    if kind == "out_of_range":
+        row.update(metric_type="heart_rate", unit="bpm", value=900.0)
+    elif kind == "invalid_unit":
+        row.update(metric_type="body_weight", unit="stone")
+    elif kind == "future":
+        row["measured_at"] = (now + timedelta(days=1)).isoformat()
+    elif kind == "non_positive":
+        row.update(metric_type="heart_rate", unit="bpm", value=-1.0)
+    elif kind == "missing_field":
+        del row["value"]
+    else:
+        row["metric_type"] = "stress_level"
+    return row
+
+
+def make_healthkit_batch(
+    size: int,
+    invalid_ratio: float = 0.0,
+    seed: int = 42,
+    now: Optional[datetime] = None,
+) -> list[dict[str, Any]]:
+    """
+    HealthKit風の一括登録リクエストを生成する
+
+    Args:
+        size: 行数
+        invalid_ratio: 不正な行の割合（0〜1、不正の種類は均等に分散）
+        seed: 乱数シード（同じシードなら同じデータ）
+        now: 測定日時の基準時刻（省略時は現在時刻）
+
+    Returns:
+        リクエストボディの測定データ配列
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now(UTC)
+    rows = [_valid_row(rng, now) for _ in range(size)]
+    invalid_count = round(size * invalid_ratio)
+    for n, position in enumerate(rng.sample(range(size), invalid_count)):
+        _invalidate(rows[position], INVALID_KINDS[n % len(INVALID_KINDS)], now)
+    return rows
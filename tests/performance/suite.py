@@ -0,0 +1,304 @@
+"""
+測定データ取り込み経路のベンチマークスイート
+
+- measurement_construction: Measurementエンティティの生成（行ごとのドメインバリデーション）
+- request_parsing: MeasurementCreateRequestの一括スキーマ検証
+- ingest_decoding: 一括登録ボディのデコードとバリデーション（JSONと列指向バイナリ形式の比較）
+- bulk_handler: ASGIクライアント経由のPOST /v1/measurements/bulk（通常・簡易レスポンス）
+- jwt_verify: JWTの検証（バックエンドごと）
+- response_serialization: 一括登録レスポンスのJSONシリアライズ
+- storage_insert: リポジトリによる一括INSERT（主キーをUUIDv4とUUIDv7で比較）
+
+実行前にDATABASE_URLを設定し、テーブルを作成しておくこと（scripts/performance_test.py参照）。
+"""
+import asyncio
+import json
+import uuid
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime
+from typing import Any, Optional
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
+
+from tests.performance.benchmark import BenchmarkResult, run_benchmark
+from tests.performance.datasets import make_healthkit_batch
+
+DEFAULT_SIZES = (10, 1_000, 10_000, 100_000)
+JWT_ITERATIONS = 1_000
+
+BENCHMARK_NAMES = (
+    "measurement_construction",
+    "request_parsing",
+    "ingest_decoding",
+    "bulk_handler",
+    "jwt_verify",
+    "response_serialization",
+    "storage_insert",
+)
+ID_SCHEMES = ("uuid4", "uuid7")
+
+
+def rounds_for(size: int, rounds: int) -> int:
+    """大きなデータセットでは計測回数を減らす（1回あたりの行数×回数を10万行程度に抑える）"""
+    return max(1, min(rounds, 100_000 // max(size, 1)))
+
+
+def bench_measurement_construction(batch: list[dict[str, Any]]) -> Callable[[], Any]:
+    from domain.entities.measurement import Measurement
+
+    def run() -> int:
+        valid = 0
+        for row in batch:
+            try:
+                Measurement(**row)
+                valid += 1
+            except (ValidationError, TypeError):
+                pass
+        return valid
+
+    return run
+
+
+def bench_request_parsing(batch: list[dict[str, Any]]) -> Callable[[], Any]:
+    from schemas.requests.measurement import MeasurementCreateRequestList
+
+    def run() -> int:
+        try:
+            return len(MeasurementCreateRequestList.validate_python(batch))
+        except ValidationError as e:
+            return e.error_count()
+
+    return run
+
+
+def bench_ingest_decoding(
+    batch: list[dict[str, Any]],
+    body_format: str,
+    info: Optional[dict[str, Any]] = None,
+) -> Callable[[], Any]:
+    from api.ingest import validate_columnar_measurements, validate_measurements
+    from schemas.requests.measurement_columnar import decode_columnar_measurements
+    from tests.columnar_encoder import encode_columnar_measurements
+
+    if body_format == "columnar":
+        body = encode_columnar_measurements(batch)
+
+        def run() -> int:
+            columns = decode_columnar_measurements(body)
+            measurements, _ = validate_columnar_measurements(columns, "benchmark_user")
+            return len(measurements)
+    else:
+        body = json.dumps(batch).encode()
+
+        def run() -> int:
+            measurements, _ = validate_measurements(json.loads(body), "benchmark_user")
+            return len(measurements)
+
+    if info is not None:
+        info["body_bytes"] = len(body)
+    return run
+
+
+def bench_bulk_handler(
+    batch: list[dict[str, Any]],
+    loop: asyncio.AbstractEventLoop,
+    response_mode: str = "full",
+    info: Optional[dict[str, Any]] = None,
+) -> Callable[[], Any]:
+    import httpx
+
+    from api.v1.dependencies.auth import create_access_token
+    from main import app
+
+    body = json.dumps(batch).encode()
+
+    async def post() -> int:
+        # 同じ測定の再送は重複として登録されないため、リクエストごとに別ユーザーで登録する
+        user_id = f"benchmark_user_{uuid.uuid4().hex}"
+        token = create_access_token(data={"sub": user_id, "email": "bench@example.com"})
+        headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            response = await client.post(
+                "/v1/measurements/bulk", params={"response": response_mode}, content=body, headers=headers
+            )
+        if response.status_code not in (201, 207, 422):
+            raise RuntimeError(f"unexpected status {response.status_code}: {response.text[:200]}")
+        if info is not None:
+            info["response_bytes"] = len(response.content)
+        return response.status_code
+
+    return lambda: loop.run_until_complete(post())
+
+
+def bench_storage_insert(
+    batch: list[dict[str, Any]],
+    loop: asyncio.AbstractEventLoop,
+    id_scheme: str,
+) -> Callable[[], Any]:
+    from api.v1.dependencies.database import get_measurement_repository
+    from core.ids import uuid7_batch
+    from domain.entities.measurement_batch import MeasurementBatch
+
+    id_generators: dict[str, Callable[[int], list[str]]] = {
+        "uuid4": lambda count: [str(uuid.uuid4()) for _ in range(count)],
+        "uuid7": uuid7_batch,
+    }
+    repository = get_measurement_repository()
+    measured_at = [datetime.fromisoformat(row["measured_at"]) for row in batch]
+
+    async def insert() -> int:
+        # 呼び出しごとに別ユーザーで登録し、重複として読み飛ばされないようにする
+        measurement_batch = MeasurementBatch.from_columns(
+            user_id=f"benchmark_user_{uuid.uuid4().hex}",
+            created_at=datetime.now(UTC),
+            metric_types=[row["metric_type"] for row in batch],
+            values=[row["value"] for row in batch],
+            units=[row["unit"] for row in batch],
+            measured_at=measured_at,
+            id_generator=id_generators[id_scheme],
+        )
+        return len(await repository.bulk_insert(measurement_batch))
+
+    return lambda: loop.run_until_complete(insert())
+
+
+def bench_jwt_verify(backend_name: str) -> Callable[[], Any]:
+    from core.jwt_backends import create_jwt_backend
+    from core.security import ALGORITHM, SECRET_KEY
+
+    backend = create_jwt_backend(backend_name, SECRET_KEY, ALGORITHM)
+    token = backend.encode({"sub": "benchmark_user", "exp": int(datetime.now(UTC).timestamp()) + 3600})
+
+    def run() -> None:
+        for _ in range(JWT_ITERATIONS):
+            backend.decode(token)
+
+    return run
+
+
+def bench_response_serialization(batch: list[dict[str, Any]], method: str) -> Callable[[], Any]:
+    from schemas.responses.measurement import MeasurementBulkCreateResponse, MeasurementResponse
+
+    created_at = datetime.now(UTC)
+    measurements = [
+        MeasurementResponse(
+            id=str(uuid.uuid4()),
+            metric_type=row["metric_type"],
+            value=row["value"],
+            unit=row["unit"],
+            measured_at=row["measured_at"],
+            device_id=row.get("device_id"),
+            metadata=row.get("metadata"),
+            created_at=created_at,
+        )
+        for row in batch
+    ]
+    response = MeasurementBulkCreateResponse(
+        success_count=len(measurements), failed_count=0, measurements=measurements
+    )
+    if method == "jsonable_encoder":
+        # FastAPIのデフォルトのレスポンス生成（jsonable_encoder + json.dumps）
+        return lambda: json.dumps(jsonable_encoder(response)).encode()
+    if method == "model_json_response":
+        # 測定データエンドポイントのレスポンス生成（モデルから直接バイト列へ）
+        from api.responses import ModelJSONResponse
+
+        return lambda: ModelJSONResponse(response).body
+    return lambda: response.model_dump_json().encode()
+
+
+def run_suite(
+    sizes: Iterable[int] = DEFAULT_SIZES,
+    invalid_ratio: float = 0.05,
+    rounds: int = 5,
+    only: Optional[Iterable[str]] = None,
+    seed: int = 42,
+) -> list[BenchmarkResult]:
+    """
+    ベンチマークスイートを実行する
+
+    Args:
+        sizes: 1リクエストあたりの行数
+        invalid_ratio: 不正な行の割合
+        rounds: 各ベンチマークの最大計測回数
+        only: 実行するベンチマーク名（省略時はすべて）
+        seed: データ生成の乱数シード
+
+    Returns:
+        計測結果
+    """
+    selected = set(only or BENCHMARK_NAMES)
+    unknown = selected - set(BENCHMARK_NAMES)
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    results: list[BenchmarkResult] = []
+    loop = asyncio.new_event_loop()
+    try:
+        if "jwt_verify" in selected:
+            from core.jwt_backends import JWT_BACKENDS
+
+            for backend_name in sorted(JWT_BACKENDS):
+                results.append(run_benchmark(
+                    "jwt_verify",
+                    bench_jwt_verify(backend_name),
+                    params={"backend": backend_name, "iterations": JWT_ITERATIONS},
+                    rounds=rounds,
+                ))
+
+        for size in sizes:
+            batch = make_healthkit_batch(size, invalid_ratio=invalid_ratio, seed=seed)
+            valid_batch = make_healthkit_batch(size, invalid_ratio=0.0, seed=seed)
+            params = {"rows": size, "invalid_ratio": invalid_ratio}
+            size_rounds = rounds_for(size, rounds)
+
+            if "measurement_construction" in selected:
+                results.append(run_benchmark(
+                    "measurement_construction", bench_measurement_construction(batch),
+                    params=params, rounds=size_rounds,
+                ))
+            if "request_parsing" in selected:
+                results.append(run_benchmark(
+                    "request_parsing", bench_request_parsing(batch),
+                    params=params, rounds=size_rounds,
+                ))
+            if "ingest_decoding" in selected:
+                # 列指向バイナリ形式は必須フィールドの欠けた行を表せないため、有効な行で比較する
+                for body_format in ("json", "columnar"):
+                    decoding_info: dict[str, Any] = {}
+                    result = run_benchmark(
+                        "ingest_decoding", bench_ingest_decoding(valid_batch, body_format, decoding_info),
+                        params={"rows": size, "format": body_format}, rounds=size_rounds,
+                    )
+                    result.info.update(decoding_info)
+                    results.append(result)
+            if "bulk_handler" in selected:
+                for response_mode in ("full", "minimal"):
+                    info: dict[str, Any] = {}
+                    result = run_benchmark(
+                        "bulk_handler", bench_bulk_handler(batch, loop, response_mode, info),
+                        params={**params, "response": response_mode}, rounds=size_rounds,
+                    )
+                    result.info.update(info)
+                    results.append(result)
+            if "response_serialization" in selected:
+                for method in ("jsonable_encoder", "model_dump_json", "model_json_response"):
+                    results.append(run_benchmark(
+                        "response_serialization",
+                        bench_response_serialization(valid_batch, method),
+                        params={"rows": size, "method": method},
+                        rounds=size_rounds,
+                    ))
+            if "storage_insert" in selected:
+                for id_scheme in ID_SCHEMES:
+                    results.append(run_benchmark(
+                        "storage_insert",
+                        bench_storage_insert(valid_batch, loop, id_scheme),
+                        params={"rows": size, "id": id_scheme},
+                        rounds=size_rounds,
+                    ))
+    finally:
+        loop.close()
+    return results
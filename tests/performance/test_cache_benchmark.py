@@ -0,0 +1,69 @@
+"""
+レスポンスキャッシュのベンチマーク
+
+約2週間分の心拍数（10万点）の時系列で、キャッシュからの応答とIf-None-Matchによる
+304が、データベースを読んで生成する応答より十分に速いことを確認する。
+"""
+import time
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.v1.dependencies.database import get_measurement_repository
+from core.config import Settings
+from infrastructure.database.measurement_repository import MeasurementRepository
+from infrastructure.database.session import create_engine, init_db
+from src.api.v1.dependencies.auth import create_access_token
+from src.main import app
+from tests.performance.test_mysql_queries import fill_measurements
+
+pytestmark = pytest.mark.performance
+
+END = datetime(2024, 6, 1, tzinfo=UTC)
+
+
+def timed_get(client: TestClient, params: dict[str, str], headers: dict[str, str] | None = None):
+    """時系列APIを呼び出し、レスポンスと所要時間（ミリ秒）を返す"""
+    started = time.perf_counter()
+    response = client.get("/v1/measurements/series", params=params, headers=headers)
+    return response, (time.perf_counter() - started) * 1000
+
+
+@pytest.mark.slow
+async def test_cached_series_is_faster_than_miss(tmp_path):
+    """キャッシュからの応答と304は、生成する応答の1/5以下の時間で返る"""
+    # Arrange: 6秒間隔で心拍数と歩数を交互に20万件
+    path = f"{tmp_path}/cache.db"
+    engine = create_engine(Settings(database_url=f"sqlite+aiosqlite:///{path}"))
+    await init_db(engine)
+    fill_measurements(path, 200_000, END, user_id="cache_perf_user")
+    repository = MeasurementRepository(engine)
+    app.dependency_overrides[get_measurement_repository] = lambda: repository
+    token = create_access_token(data={"sub": "cache_perf_user", "email": "perf@example.com"})
+    client = TestClient(app, headers={"Authorization": f"Bearer {token}"})
+    params = {
+        "metric_type": "heart_rate",
+        "start": (END - timedelta(days=30)).isoformat(),
+        "end": END.isoformat(),
+        "points": "1000",
+    }
+
+    # Act
+    try:
+        miss, miss_ms = timed_get(client, params)
+        hits = [timed_get(client, params) for _ in range(5)]
+        not_modified = [timed_get(client, params, {"If-None-Match": miss.headers["etag"]}) for _ in range(5)]
+    finally:
+        app.dependency_overrides.pop(get_measurement_repository, None)
+        await engine.dispose()
+
+    # Assert
+    hit_ms = min(elapsed for _, elapsed in hits)
+    not_modified_ms = min(elapsed for _, elapsed in not_modified)
+    print(f"\nseries cache: miss={miss_ms:.1f}ms hit={hit_ms:.1f}ms not_modified={not_modified_ms:.1f}ms")
+    assert miss.json()["source_count"] == 100_000
+    assert all(response.content == miss.content for response, _ in hits)
+    assert all(response.status_code == 304 for response, _ in not_modified)
+    assert hit_ms < miss_ms / 5
+    assert not_modified_ms < miss_ms / 5
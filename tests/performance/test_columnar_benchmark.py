@@ -0,0 +1,49 @@
+"""
+列指向バイナリ形式の一括登録のベンチマーク
+
+HealthKitに近い分布の1万件を、JSONと列指向バイナリ形式でそれぞれデコード・バリデーションし、
+ボディのサイズと所要時間を比較する。
+"""
+import time
+
+import pytest
+
+from tests.performance.datasets import make_healthkit_batch
+from tests.performance.suite import bench_ingest_decoding
+
+pytestmark = pytest.mark.performance
+
+
+def best_of(run, rounds: int = 5) -> float:
+    """所要時間の最小値（ミリ秒）"""
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+@pytest.mark.slow
+def test_columnar_body_is_smaller_and_faster_than_json():
+    """列指向バイナリ形式はJSONより小さく、デコード・バリデーションが速い"""
+    # Arrange
+    batch = make_healthkit_batch(10_000, invalid_ratio=0.0, seed=42)
+    info: dict[str, dict] = {"json": {}, "columnar": {}}
+    runs = {body_format: bench_ingest_decoding(batch, body_format, info[body_format]) for body_format in info}
+
+    # Act
+    counts = {body_format: run() for body_format, run in runs.items()}
+    timings = {body_format: best_of(run) for body_format, run in runs.items()}
+
+    # Assert
+    print(
+        "\ningest 10k rows: "
+        + " ".join(
+            f"{body_format}={info[body_format]['body_bytes'] / 1024:.0f}KiB/{timings[body_format]:.1f}ms"
+            for body_format in runs
+        )
+    )
+    assert counts["columnar"] == counts["json"] == 10_000
+    assert info["columnar"]["body_bytes"] < info["json"]["body_bytes"] / 2
+    assert timings["columnar"] < timings["json"]
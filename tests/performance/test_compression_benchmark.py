@@ -0,0 +1,89 @@
+"""
+リクエストボディの圧縮のベンチマーク
+
+iOSからの一括登録と同じく、メトリックタイプ・単位・デバイスIDが繰り返される1万件のJSONを
+gzip・zstdで圧縮した場合の転送量と、ミドルウェアで展開する時間を計測する。
+"""
+import gzip
+import json
+import time
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from api.middleware.compression import RequestDecompressionMiddleware
+
+pytestmark = pytest.mark.performance
+
+zstandard = pytest.importorskip("zstandard")
+
+BASE = datetime(2024, 5, 20, tzinfo=UTC)
+
+
+def make_payload(count: int) -> bytes:
+    """1万件の心拍数データのJSON"""
+    return json.dumps([
+        {
+            "metric_type": "heart_rate",
+            "value": 60.0 + i % 40,
+            "unit": "bpm",
+            "measured_at": (BASE + timedelta(seconds=5 * i)).isoformat(),
+            "device_id": "apple_watch_001",
+            "metadata": {"source": "healthkit"},
+        }
+        for i in range(count)
+    ]).encode()
+
+
+def make_client() -> TestClient:
+    """ボディを読み切ってバイト数を返すアプリのクライアント"""
+    app = FastAPI()
+
+    @app.post("/echo")
+    async def echo(request: Request) -> dict[str, int]:
+        return {"size": len(await request.body())}
+
+    app.add_middleware(RequestDecompressionMiddleware)
+    return TestClient(app)
+
+
+def timed_post(client: TestClient, body: bytes, encoding: str | None) -> float:
+    """5回送信した所要時間の最小値（ミリ秒）"""
+    headers = {"Content-Encoding": encoding} if encoding else {}
+    timings = []
+    for _ in range(5):
+        started = time.perf_counter()
+        client.post("/echo", content=body, headers=headers)
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+@pytest.mark.slow
+def test_compressed_upload_is_small_and_cheap_to_decompress():
+    """圧縮したボディは元の1/10以下で、展開による増加は20ms以内に収まる"""
+    # Arrange
+    raw = make_payload(10_000)
+    bodies = {
+        None: raw,
+        "gzip": gzip.compress(raw, compresslevel=6),
+        "zstd": zstandard.ZstdCompressor(level=3).compress(raw),
+    }
+    client = make_client()
+
+    # Act
+    timings = {encoding: timed_post(client, body, encoding) for encoding, body in bodies.items()}
+
+    # Assert
+    print(
+        "\nupload 10k rows: "
+        + " ".join(
+            f"{encoding or 'identity'}={len(body) / 1024:.0f}KiB/{timings[encoding]:.1f}ms"
+            for encoding, body in bodies.items()
+        )
+    )
+    assert len(bodies["gzip"]) < len(raw) / 10
+    assert len(bodies["zstd"]) < len(raw) / 10
+    assert timings["gzip"] - timings[None] < 20
+    assert timings["zstd"] - timings[None] < 20
@@ -0,0 +1,85 @@
+"""
+測定データIDの方式による挿入スループットのベンチマーク
+
+ランダムなUUIDv4は主キーのB-tree全体に挿入が分散するため、テーブルが大きくなると
+ページの読み込みと分割が増える。時刻順のUUIDv7は末尾への追記になるため、
+既存行があるテーブルへの挿入でスループットの差を確認する。
+"""
+import time
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from core.config import Settings
+from core.ids import uuid7_batch
+from domain.entities.measurement_batch import MeasurementBatch
+from infrastructure.database.measurement_repository import MeasurementRepository
+from infrastructure.database.session import create_engine, init_db
+
+pytestmark = pytest.mark.performance
+
+PREFILL_ROWS = 50_000
+BATCH_ROWS = 1_000
+BATCHES = 20
+END = datetime(2024, 6, 1, tzinfo=UTC)
+
+
+def uuid4_batch(count: int) -> list[str]:
+    """従来のランダムなUUIDv4"""
+    return [str(uuid.uuid4()) for _ in range(count)]
+
+
+async def measure_insert_throughput(tmp_path, name: str, id_generator: Callable[[int], list[str]]) -> float:
+    """
+    既存行のあるテーブルへの挿入スループットを計測
+
+    Returns:
+        1秒あたりの挿入行数
+    """
+    engine = create_engine(Settings(database_url=f"sqlite+aiosqlite:///{tmp_path}/{name}.db"))
+    await init_db(engine)
+    repository = MeasurementRepository(engine, chunk_size=5_000)
+    offset = 0
+
+    def make_batch(count: int) -> MeasurementBatch:
+        nonlocal offset
+        batch = MeasurementBatch.from_columns(
+            user_id="perf_user",
+            created_at=END,
+            metric_types=["heart_rate"] * count,
+            values=[60.0 + i % 40 for i in range(count)],
+            units=["bpm"] * count,
+            measured_at=[END - timedelta(seconds=offset + i) for i in range(count)],
+            id_generator=id_generator,
+        )
+        offset += count
+        return batch
+
+    try:
+        for _ in range(PREFILL_ROWS // 5_000):
+            await repository.bulk_insert(make_batch(5_000))
+        batches = [make_batch(BATCH_ROWS) for _ in range(BATCHES)]
+        started = time.perf_counter()
+        for batch in batches:
+            await repository.bulk_insert(batch)
+        elapsed = time.perf_counter() - started
+    finally:
+        await engine.dispose()
+    return BATCHES * BATCH_ROWS / elapsed
+
+
+async def test_uuid7_inserts_faster_than_uuid4(tmp_path):
+    """既存行のあるテーブルでは、UUIDv7の挿入スループットがUUIDv4より高い"""
+    # Act
+    uuid4_rate = await measure_insert_throughput(tmp_path, "uuid4", uuid4_batch)
+    uuid7_rate = await measure_insert_throughput(tmp_path, "uuid7", uuid7_batch)
+
+    # Assert
+    print(
+        f"\ninsert throughput after {PREFILL_ROWS} rows: "
+        f"uuid4={uuid4_rate:,.0f} rows/s uuid7={uuid7_rate:,.0f} rows/s "
+        f"({uuid7_rate / uuid4_rate:.2f}x)"
+    )
+    assert uuid7_rate > uuid4_rate * 1.1
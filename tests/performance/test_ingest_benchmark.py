@@ -0,0 +1,71 @@
+"""
+測定データ取り込み経路のベンチマークスイートのテスト
+
+小さなデータセットでスイートを実行し、結果のJSONと比較機能を確認する。
+"""
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from src.domain.entities.measurement import Measurement
+from tests.performance.benchmark import build_report, compare_reports, write_report
+from tests.performance.datasets import make_healthkit_batch
+from tests.performance.suite import BENCHMARK_NAMES, run_suite
+
+pytestmark = pytest.mark.performance
+
+
+def count_invalid(batch: list[dict]) -> int:
+    """Measurementとして不正な行の数"""
+    invalid = 0
+    for row in batch:
+        try:
+            Measurement(**row)
+        except (ValidationError, TypeError):
+            invalid += 1
+    return invalid
+
+
+def test_synthetic_batch_has_requested_invalid_ratio() -> None:
+    """合成データは指定した割合の不正な行を含み、シードが同じなら同一になる"""
+    # Act
+    batch = make_healthkit_batch(1000, invalid_ratio=0.1, seed=7)
+
+    # Assert
+    assert count_invalid(batch) == 100
+    assert [row["metric_type"] for row in make_healthkit_batch(1000, invalid_ratio=0.1, seed=7)] == [
+        row["metric_type"] for row in batch
+    ]
+
+
+def test_suite_writes_json_report(tmp_path) -> None:
+    """スイートの全ベンチマークの結果がJSONに保存される"""
+    # Act
+    results = run_suite(sizes=[10, 1000], invalid_ratio=0.05, rounds=2)
+    report = build_report(results, sizes=[10, 1000])
+    path = tmp_path / "results.json"
+    write_report(report, path)
+    saved = json.loads(path.read_text(encoding="utf-8"))
+
+    # Assert
+    assert {entry["name"] for entry in saved["benchmarks"]} == set(BENCHMARK_NAMES)
+    bulk = {entry["key"]: entry for entry in saved["benchmarks"] if entry["name"] == "bulk_handler"}
+    full = bulk["bulk_handler[rows=1000,invalid_ratio=0.05,response=full]"]
+    minimal = bulk["bulk_handler[rows=1000,invalid_ratio=0.05,response=minimal]"]
+    assert minimal["info"]["response_bytes"] * 3 < full["info"]["response_bytes"]
+    assert all(entry["median"] > 0 for entry in saved["benchmarks"])
+    assert saved["metadata"]["sizes"] == [10, 1000]
+
+
+def test_compare_reports_flags_regressions() -> None:
+    """比較元より閾値を超えて遅くなったベンチマークを劣化として検出する"""
+    # Arrange
+    baseline = {"benchmarks": [{"key": "a", "median": 1.0}, {"key": "b", "median": 1.0}]}
+    current = {"benchmarks": [{"key": "a", "median": 1.05}, {"key": "b", "median": 1.5}, {"key": "c", "median": 1.0}]}
+
+    # Act
+    comparisons = compare_reports(baseline, current, threshold=0.1)
+
+    # Assert
+    assert [(c["key"], c["regression"]) for c in comparisons] == [("a", False), ("b", True)]
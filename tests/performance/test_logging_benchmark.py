@@ -0,0 +1,78 @@
+"""
+ロギングのベンチマーク
+
+標準出力が詰まっている状況を模擬し、同期モードと非同期（キュー）モードで
+イベントループの遅延（スケジュールしたタイマーの実行遅れ）を比較する。
+"""
+import asyncio
+import time
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+import structlog
+
+from src.core.logging import configure_logging, get_logger, shutdown_logging
+
+pytestmark = pytest.mark.performance
+
+WRITE_DELAY_SECONDS = 0.001
+REQUESTS = 30
+LOGS_PER_REQUEST = 20
+
+
+class SlowStream(StringIO):
+    """書き込みごとに待ちが発生する出力先（標準出力のバックプレッシャーを模擬）"""
+
+    def write(self, text: str) -> int:
+        time.sleep(WRITE_DELAY_SECONDS)
+        return super().write(text)
+
+
+async def measure_max_loop_lag_ms() -> float:
+    """ログを出力するリクエストを処理しながら、イベントループの最大遅延（ミリ秒）を計測"""
+    logger = get_logger("benchmark")
+    lags: list[float] = []
+    done = asyncio.Event()
+
+    async def monitor() -> None:
+        interval = 0.001
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append(time.perf_counter() - started - interval)
+
+    async def handle_requests() -> None:
+        for request_no in range(REQUESTS):
+            for i in range(LOGS_PER_REQUEST):
+                logger.info("measurement processed", request=request_no, seq=i)
+            await asyncio.sleep(0)
+        done.set()
+
+    await asyncio.gather(monitor(), handle_requests())
+    return max(lags) * 1000
+
+
+def run_with_logging(async_mode: bool) -> float:
+    """指定したモードでロギングを設定して最大遅延を計測"""
+    structlog.reset_defaults()
+    stream = SlowStream()
+    with patch("sys.stdout", stream):
+        configure_logging(async_mode=async_mode, queue_size=REQUESTS * LOGS_PER_REQUEST)
+        lag_ms = asyncio.run(measure_max_loop_lag_ms())
+        shutdown_logging()
+    assert len(stream.getvalue().splitlines()) == REQUESTS * LOGS_PER_REQUEST
+    return lag_ms
+
+
+def test_async_logging_reduces_event_loop_lag() -> None:
+    """非同期モードでは出力の詰まりがイベントループの遅延にならない"""
+    # Act
+    sync_lag_ms = run_with_logging(async_mode=False)
+    async_lag_ms = run_with_logging(async_mode=True)
+    structlog.reset_defaults()
+    configure_logging()
+    print(f"\nmax event loop lag: sync={sync_lag_ms:.1f}ms async={async_lag_ms:.1f}ms")
+
+    # Assert
+    assert async_lag_ms * 4 < sync_lag_ms
@@ -0,0 +1,151 @@
+"""
+測定データの内部表現のベンチマーク
+
+1行あたりのメモリ使用量と生成時間を、従来の表現（行ごとの辞書、
+Pydanticモデル）とMeasurementBatch・MeasurementRowで比較する。
+"""
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import pytest
+
+from domain.entities.measurement import Measurement
+from domain.entities.measurement_batch import MeasurementBatch, MeasurementRow
+
+pytestmark = pytest.mark.performance
+
+ROWS = 10_000
+CREATED_AT = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def make_columns(count: int = ROWS) -> dict[str, list[Any]]:
+    """検証済みの列データ（文字列は行ごとに別オブジェクトとし、リクエスト解析後に近づける）"""
+    return {
+        "ids": [str(uuid.uuid4()) for _ in range(count)],
+        "metric_types": ["heart_rate"] * count,
+        "values": [60.0 + i % 40 + 0.5 for i in range(count)],
+        "units": ["".join(["bp", "m"]) for _ in range(count)],
+        "measured_at": [CREATED_AT - timedelta(seconds=i) for i in range(count)],
+        "device_ids": [f"watch-{i % 3}" for i in range(count)],
+    }
+
+
+def build_dict_rows(columns: dict[str, list[Any]]) -> list[dict[str, Any]]:
+    """従来の行データ（1行1辞書）"""
+    return [
+        {
+            "id": row_id,
+            "user_id": "perf_user",
+            "metric_type": metric_type,
+            "value": value,
+            "unit": unit,
+            "measured_at": measured_at,
+            "device_id": device_id,
+            "metadata": None,
+            "notes": None,
+            "created_at": CREATED_AT,
+        }
+        for row_id, metric_type, value, unit, measured_at, device_id in zip(
+            columns["ids"], columns["metric_types"], columns["values"],
+            columns["units"], columns["measured_at"], columns["device_ids"],
+            strict=True,
+        )
+    ]
+
+
+def build_models(columns: dict[str, list[Any]]) -> list[Measurement]:
+    """Pydanticのドメインエンティティ（バリデータを含む）"""
+    return [
+        Measurement(metric_type=metric_type, value=value, unit=unit, measured_at=measured_at, device_id=device_id)
+        for metric_type, value, unit, measured_at, device_id in zip(
+            columns["metric_types"], columns["values"], columns["units"],
+            columns["measured_at"], columns["device_ids"],
+            strict=True,
+        )
+    ]
+
+
+def build_slot_rows(columns: dict[str, list[Any]]) -> list[MeasurementRow]:
+    """__slots__付きの行"""
+    return [
+        MeasurementRow(row_id, "perf_user", metric_type, value, unit, measured_at, device_id, None, None, CREATED_AT)
+        for row_id, metric_type, value, unit, measured_at, device_id in zip(
+            columns["ids"], columns["metric_types"], columns["values"],
+            columns["units"], columns["measured_at"], columns["device_ids"],
+            strict=True,
+        )
+    ]
+
+
+def build_batch(columns: dict[str, list[Any]]) -> MeasurementBatch:
+    """列指向のバッチ"""
+    return MeasurementBatch.from_columns(
+        user_id="perf_user",
+        created_at=CREATED_AT,
+        metric_types=columns["metric_types"],
+        values=columns["values"],
+        units=columns["units"],
+        measured_at=columns["measured_at"],
+        device_ids=columns["device_ids"],
+        ids=columns["ids"],
+    )
+
+
+def bytes_per_row(build: Callable[[dict[str, list[Any]]], Any]) -> float:
+    """入力の列データ以外に確保されたメモリ（1行あたりのバイト数）"""
+    columns = make_columns()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        built = build(columns)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del built
+    return (after - before) / ROWS
+
+
+def construction_us_per_row(build: Callable[[dict[str, list[Any]]], Any]) -> float:
+    """1行あたりの生成時間（マイクロ秒、3回中の最短）"""
+    columns = make_columns()
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        build(columns)
+        best = min(best, time.perf_counter() - started)
+    return best / ROWS * 1_000_000
+
+
+BUILDERS = {
+    "pydantic": build_models,
+    "dict": build_dict_rows,
+    "slots": build_slot_rows,
+    "batch": build_batch,
+}
+
+
+def test_batch_uses_less_memory_per_row() -> None:
+    """バッチの1行あたりのメモリは行ごとの辞書の1/3未満、Pydanticモデルの1/10未満"""
+    # Act
+    memory = {name: bytes_per_row(build) for name, build in BUILDERS.items()}
+    print("\nbytes per row: " + ", ".join(f"{name}={value:.0f}" for name, value in memory.items()))
+
+    # Assert
+    assert memory["slots"] < memory["dict"]
+    assert memory["batch"] * 3 < memory["dict"]
+    assert memory["batch"] * 10 < memory["pydantic"]
+
+
+def test_batch_construction_is_faster_than_models() -> None:
+    """バッチの生成は行ごとの辞書の3倍以上、Pydanticモデルの10倍以上速い"""
+    # Act
+    timings = {name: construction_us_per_row(build) for name, build in BUILDERS.items()}
+    print("\nconstruction us per row: " + ", ".join(f"{name}={value:.3f}" for name, value in timings.items()))
+
+    # Assert
+    assert timings["batch"] * 3 < timings["dict"]
+    assert timings["batch"] * 10 < timings["pydantic"]
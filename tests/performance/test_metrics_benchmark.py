@@ -0,0 +1,62 @@
+"""
+メトリクス記録のベンチマーク
+
+MetricsMiddlewareが1リクエストあたりに追加する処理時間を計測する。
+"""
+import asyncio
+import time
+
+import pytest
+
+from api.middleware.metrics import MetricsMiddleware
+
+pytestmark = pytest.mark.performance
+
+ITERATIONS = 20000
+
+
+class Route:
+    path = "/v1/measurements/bulk"
+
+
+async def plain_app(scope, receive, send) -> None:
+    """ルーティング済みの最小限のASGIアプリ"""
+    scope["route"] = Route
+    await receive()
+    await send({"type": "http.response.start", "status": 201, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"[]", "more_body": False}
+
+
+async def send(message) -> None:
+    return None
+
+
+def measure_per_request_us(app) -> float:
+    """ASGIアプリの1リクエストあたりの平均処理時間（マイクロ秒）を3回計測した最良値"""
+
+    async def run() -> float:
+        best = float("inf")
+        for _ in range(3):
+            started = time.perf_counter()
+            for _ in range(ITERATIONS):
+                await app({"type": "http", "method": "POST"}, receive, send)
+            best = min(best, time.perf_counter() - started)
+        return best / ITERATIONS * 1_000_000
+
+    return asyncio.run(run())
+
+
+def test_metrics_middleware_overhead_is_negligible() -> None:
+    """ミドルウェアの追加処理は1リクエストあたり数十マイクロ秒未満"""
+    # Act
+    plain_us = measure_per_request_us(plain_app)
+    instrumented_us = measure_per_request_us(MetricsMiddleware(plain_app))
+    overhead_us = instrumented_us - plain_us
+    print(f"\nmetrics middleware overhead: {overhead_us:.2f}us per request")
+
+    # Assert
+    assert overhead_us < 20
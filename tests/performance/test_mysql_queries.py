@@ -0,0 +1,153 @@
+"""ストレージ層のパフォーマンステスト（SQLite/aiosqliteをローカル代替として使用）
+
+設計書のMySQLパフォーマンス基準を計測する。
+- バルクINSERT（1000件）: < 50ms
+- 集計クエリ（1週間分、10万レコード）: < 100ms
+- 一覧の1ページ（100件、1ユーザー100万レコード）: < 50ms
+"""
+import sqlite3
+import time
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from core.config import Settings
+from core.ids import uuid7_batch
+from domain.entities.measurement import MetricType
+from domain.entities.measurement_batch import MeasurementBatch
+from domain.services.measurement_query import MeasurementQuery, PageCursor
+from domain.services.measurement_summary import (
+    SummaryPeriod,
+    summarize_by_metric,
+    summary_window,
+)
+from infrastructure.database.measurement_repository import MeasurementRepository
+from infrastructure.database.session import create_engine, init_db
+
+pytestmark = pytest.mark.performance
+
+
+def make_batch(count: int, end: datetime, user_id: str = "perf_user") -> MeasurementBatch:
+    """心拍数と歩数を交互に含むテスト用のバッチを生成"""
+    return MeasurementBatch.from_columns(
+        user_id=user_id,
+        created_at=datetime.now(UTC),
+        metric_types=[("heart_rate", "steps")[i % 2] for i in range(count)],
+        values=[60.0 + i % 40 for i in range(count)],
+        units=[("bpm", "steps")[i % 2] for i in range(count)],
+        measured_at=[end - timedelta(seconds=6 * i + 1) for i in range(count)],
+        device_ids=["apple_watch_001"] * count,
+        metadata=[{"source": "healthkit"} for _ in range(count)],
+    )
+
+
+@pytest.fixture
+async def repository(tmp_path):
+    """テストごとに独立したSQLiteデータベースのリポジトリ"""
+    settings = Settings(database_url=f"sqlite+aiosqlite:///{tmp_path}/perf.db")
+    engine = create_engine(settings)
+    await init_db(engine)
+    yield MeasurementRepository(engine, chunk_size=5000)
+    await engine.dispose()
+
+
+async def test_bulk_insert_1000_rows(repository):
+    """1000件のバルクINSERT（ロールアップ更新を含む）が50ms以内に完了する（3回中の最短）"""
+    # Arrange
+    end = datetime(2024, 6, 1, tzinfo=UTC)
+    await repository.bulk_insert(make_batch(10, end, user_id="warmup"))
+
+    # Act
+    timings_ms = []
+    for _ in range(3):
+        batch = make_batch(1000, end)
+        started = time.perf_counter()
+        await repository.bulk_insert(batch)
+        timings_ms.append((time.perf_counter() - started) * 1000)
+
+    # Assert
+    assert min(timings_ms) < 50, f"bulk insert took {min(timings_ms):.1f}ms"
+
+
+@pytest.mark.slow
+async def test_week_summary_over_100k_rows(repository):
+    """1週間分・10万件のデータのサマリーを100ms以内に取得できる（3回中の最短）"""
+    # Arrange
+    end = datetime(2024, 6, 1, tzinfo=UTC)
+    await repository.bulk_insert(make_batch(100_000, end))
+    window = summary_window(SummaryPeriod.WEEK, end - timedelta(microseconds=1))
+
+    # Act
+    timings_ms = []
+    for _ in range(3):
+        started = time.perf_counter()
+        aggregates = await repository.fetch_rollups(
+            "perf_user", window.granularity, window.start, window.end
+        )
+        summaries = summarize_by_metric(aggregates)
+        timings_ms.append((time.perf_counter() - started) * 1000)
+
+    # Assert
+    assert sum(summary.statistics.count for summary in summaries) == 100_000
+    assert min(timings_ms) < 100, f"summary took {min(timings_ms):.1f}ms"
+
+
+def fill_measurements(path: str, count: int, end: datetime, user_id: str = "perf_user") -> None:
+    """一覧の計測用に行を直接INSERTする（ロールアップは更新しない）"""
+    ids = uuid7_batch(count)
+    naive_end = end.replace(tzinfo=None)
+    with sqlite3.connect(path) as conn:
+        conn.executemany(
+            "INSERT INTO measurements (id, user_id, metric_type, value, unit, measured_at,"
+            " device_id, device_key, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    ids[i], user_id, ("heart_rate", "steps")[i % 2], 60.0 + i % 40,
+                    ("bpm", "steps")[i % 2],
+                    # UTCDateTimeと同じ、タイムゾーンなしのUTC（マイクロ秒まで）で保存する
+                    (naive_end - timedelta(seconds=6 * i + 1)).isoformat(" ", "microseconds"),
+                    "apple_watch_001", "apple_watch_001", naive_end.isoformat(" ", "microseconds"),
+                )
+                for i in range(count)
+            ),
+        )
+
+
+@pytest.mark.slow
+async def test_list_pages_over_1m_rows(tmp_path):
+    """1ユーザー100万件でも、先頭・絞り込み・深い位置のページを50ms以内に取得できる（3回中の最短）"""
+    # Arrange
+    path = f"{tmp_path}/list.db"
+    engine = create_engine(Settings(database_url=f"sqlite+aiosqlite:///{path}"))
+    await init_db(engine)
+    end = datetime(2024, 6, 1, tzinfo=UTC)
+    fill_measurements(path, 1_000_000, end)
+    repository = MeasurementRepository(engine)
+    # 50万件目付近（約35日前）から読み始めるカーソル
+    deep_cursor = PageCursor(measured_at=end - timedelta(seconds=3_000_000), id="f" * 36)
+    queries = {
+        "first_page": MeasurementQuery(user_id="perf_user", limit=100),
+        "metric_values": MeasurementQuery(
+            user_id="perf_user", limit=100, metric_type=MetricType.STEPS,
+            fields=("measured_at", "value"),
+        ),
+        "deep_page": MeasurementQuery(user_id="perf_user", limit=100, after=deep_cursor),
+    }
+
+    # Act
+    timings_ms: dict[str, float] = {}
+    try:
+        for name, query in queries.items():
+            samples = []
+            for _ in range(3):
+                started = time.perf_counter()
+                rows, next_cursor = await repository.fetch_page(query)
+                samples.append((time.perf_counter() - started) * 1000)
+                assert len(rows) == 100 and next_cursor is not None
+            timings_ms[name] = min(samples)
+    finally:
+        await engine.dispose()
+
+    # Assert
+    print(f"\nlist page latency over 1M rows: {timings_ms}")
+    assert all(timing < 50 for timing in timings_ms.values()), timings_ms
@@ -0,0 +1,94 @@
+"""
+時系列ダウンサンプリングのベンチマーク
+
+数か月分の心拍数（数十万点）を間引く処理時間と、期間を伸ばしても
+レスポンスの大きさが変わらないことを確認する。
+"""
+import time
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from api.v1.dependencies.database import get_measurement_repository
+from core.config import Settings
+from domain.services.measurement_series import aggregate_series_buckets, downsample_lttb
+from infrastructure.database.measurement_repository import MeasurementRepository
+from infrastructure.database.session import create_engine, init_db
+from src.api.v1.dependencies.auth import create_access_token
+from src.main import app
+from tests.performance.test_mysql_queries import fill_measurements
+
+pytestmark = pytest.mark.performance
+
+POINTS = 500_000
+END = datetime(2024, 6, 1, tzinfo=UTC)
+
+
+def best_of(repeat: int, func) -> float:
+    """repeat回実行した最短時間（ミリ秒）"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def test_downsampling_500k_points():
+    """50万点をLTTBで1000点に100ms以内、minmaxで1000バケットに50ms以内で間引ける"""
+    # Arrange
+    rng = np.random.default_rng(0)
+    start = END - timedelta(days=35)
+    timestamps = int(start.timestamp()) * 1_000_000 + np.arange(POINTS, dtype=np.int64) * 6_000_000
+    values = 70 + np.cumsum(rng.normal(0, 0.5, POINTS))
+
+    # Act
+    lttb_ms = best_of(3, lambda: downsample_lttb(timestamps, values, 1000))
+    minmax_ms = best_of(3, lambda: aggregate_series_buckets(timestamps, values, start, END, 1000))
+
+    # Assert
+    print(f"\ndownsample {POINTS} points: lttb={lttb_ms:.1f}ms minmax={minmax_ms:.1f}ms")
+    assert lttb_ms < 100
+    assert minmax_ms < 50
+
+
+@pytest.mark.slow
+async def test_series_payload_is_constant_over_range(tmp_path):
+    """期間を1週間から約2か月に伸ばしても、レスポンスの大きさは変わらない"""
+    # Arrange: 6秒間隔で心拍数と歩数を交互に100万件（心拍数は約70日分で50万件）
+    path = f"{tmp_path}/series.db"
+    engine = create_engine(Settings(database_url=f"sqlite+aiosqlite:///{path}"))
+    await init_db(engine)
+    fill_measurements(path, 2 * POINTS, END)
+    repository = MeasurementRepository(engine)
+    app.dependency_overrides[get_measurement_repository] = lambda: repository
+    token = create_access_token(data={"sub": "perf_user", "email": "perf@example.com"})
+    client = TestClient(app, headers={"Authorization": f"Bearer {token}"})
+
+    # Act
+    results = {}
+    try:
+        for days in (7, 30, 70):
+            params = {
+                "metric_type": "heart_rate",
+                "start": (END - timedelta(days=days)).isoformat(),
+                "end": END.isoformat(),
+                "points": 1000,
+            }
+            started = time.perf_counter()
+            response = client.get("/v1/measurements/series", params=params)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            assert response.status_code == 200
+            results[days] = (response.json()["source_count"], len(response.content), elapsed_ms)
+    finally:
+        app.dependency_overrides.pop(get_measurement_repository, None)
+        await engine.dispose()
+
+    # Assert
+    print(f"\nseries by range (days: source_count, bytes, ms): {results}")
+    sizes = [size for _, size, _ in results.values()]
+    assert results[70][0] == POINTS
+    assert max(sizes) < min(sizes) * 1.05
+    assert results[70][2] < 2000
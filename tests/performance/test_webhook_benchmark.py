@@ -0,0 +1,82 @@
+"""
+Webhook通知のベンチマーク
+
+ローカルの受信スタブ（応答まで2ms）に対して、達成イベントを少しずつ追加しながら
+バックグラウンドで送り、スループット（イベント/秒）と追加から受信までのレイテンシを
+1イベントずつ送る場合とまとめて送る場合で比較する。
+"""
+import asyncio
+import statistics
+import time
+
+import pytest
+
+from domain.entities.goal import GoalAchievedEvent
+from infrastructure.webhooks import WebhookDeliveryQueue, WebhookDispatcher
+from tests.unit.infrastructure.test_webhook_dispatcher import make_events
+from tests.webhook_stub import WebhookStubServer
+
+pytestmark = pytest.mark.performance
+
+EVENT_COUNT = 1000
+CHUNK_SIZE = 10
+
+
+async def dispatch_events(path: str, events: list[GoalAchievedEvent], batch_size: int) -> dict[str, float]:
+    """イベントをCHUNK_SIZE件ずつ追加し、すべて受信されるまでのスループットとレイテンシを計測する"""
+    published: dict[str, float] = {}
+    with WebhookStubServer(delay_seconds=0.002) as stub:
+        queue = WebhookDeliveryQueue(path)
+        dispatcher = WebhookDispatcher(
+            queue, [stub.url()], batch_size=batch_size, max_concurrency_per_host=4,
+            poll_interval_seconds=0.05, jitter=lambda: 0.0,
+        )
+        dispatcher.start()
+        started = time.perf_counter()
+        for offset in range(0, len(events), CHUNK_SIZE):
+            chunk = events[offset:offset + CHUNK_SIZE]
+            now = time.perf_counter()
+            published.update((event.event_id, now) for event in chunk)
+            await dispatcher.publish(chunk)
+        while sum(len(request.body["events"]) for request in stub.requests) < len(events):
+            await asyncio.sleep(0.005)
+        elapsed = time.perf_counter() - started
+        await dispatcher.stop()
+        queue.close()
+
+    latencies = sorted(
+        (request.received_at - published[event["event_id"]]) * 1000
+        for request in stub.requests
+        for event in request.body["events"]
+    )
+    return {
+        "events_per_second": len(events) / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "requests": len(stub.requests),
+    }
+
+
+@pytest.mark.slow
+async def test_batched_webhooks_have_higher_throughput(tmp_path):
+    """まとめて送るとリクエスト数が減り、スループットが上がってレイテンシも下がる"""
+    # Arrange
+    events = make_events(EVENT_COUNT)
+
+    # Act
+    single = await dispatch_events(str(tmp_path / "single.db"), events, batch_size=1)
+    batched = await dispatch_events(str(tmp_path / "batched.db"), events, batch_size=100)
+
+    # Assert
+    print(
+        f"\nwebhooks {EVENT_COUNT} events: "
+        + " ".join(
+            f"batch_size={size}: {result['events_per_second']:.0f}events/s "
+            f"p50={result['p50_ms']:.1f}ms p95={result['p95_ms']:.1f}ms requests={result['requests']:.0f}"
+            for size, result in ((1, single), (100, batched))
+        )
+    )
+    assert single["requests"] == EVENT_COUNT
+    assert batched["requests"] < EVENT_COUNT / 5
+    assert batched["events_per_second"] > single["events_per_second"] * 2
+    assert batched["p95_ms"] < single["p95_ms"]
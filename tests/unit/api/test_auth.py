@@ -9,7 +9,8 @@ from jose import jwt, JWTError
 from src.api.v1.dependencies.auth import (
     create_access_token,
     verify_token,
-    get_user_from_token
+    get_user_from_token,
+    token_cache,
 )
 from src.core.security import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
 from src.domain.entities.user import UserInToken
@@ -130,6 +131,38 @@ class TestJWTAuthentication:
         assert exc_info.value.status_code == 401
         assert exc_info.value.detail == "Could not validate credentials"
 
+    @pytest.mark.asyncio
+    async def test_get_current_user_uses_token_cache(self) -> None:
+        """同じトークンの2回目以降はキャッシュから同じユーザー情報が返る"""
+        # Arrange
+        token_cache.clear()
+        token = create_access_token(data={"sub": "cached_user", "email": "cached@example.com"})
+        
+        # Act
+        first = await get_user_from_token(token)
+        second = await get_user_from_token(token)
+        
+        # Assert
+        assert second is first
+        assert token_cache.stats()["hits"] == 1
+        assert token_cache.stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalid_token_is_not_cached(self) -> None:
+        """検証に失敗したトークンはキャッシュされない"""
+        # Arrange
+        token_cache.clear()
+        from fastapi import HTTPException
+        
+        # Act
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                await get_user_from_token("invalid.token")
+        
+        # Assert
+        assert token_cache.stats()["size"] == 0
+        assert token_cache.stats()["hits"] == 0
+
     @pytest.mark.asyncio  
     async def test_get_current_user_with_missing_sub(self) -> None:
         """subフィールドがないトークンで認証エラーが発生する"""
@@ -145,6 +178,19 @@ class TestJWTAuthentication:
         
         assert exc_info.value.status_code == 401
 
+    @pytest.mark.asyncio
+    async def test_get_current_user_with_too_long_sub(self) -> None:
+        """user_idカラムの長さを超えるsubのトークンは401（切り詰めて保存しない）"""
+        # Arrange
+        token = create_access_token(data={"sub": "u" * 65})
+
+        # Act & Assert
+        from fastapi import HTTPException
+        with pytest.raises(HTTPException) as exc_info:
+            await get_user_from_token(token)
+
+        assert exc_info.value.status_code == 401
+
     def test_token_expiry_default(self) -> None:
         """デフォルトの有効期限が正しく設定される"""
         # Arrange
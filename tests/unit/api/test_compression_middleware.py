@@ -0,0 +1,337 @@
+"""
+リクエストボディの展開・レスポンスの圧縮のテスト
+
+- RequestDecompressionMiddleware: gzip・zstdのボディの一括登録・ストリーム登録、
+  展開後のサイズの上限（413）、不正・途中で切れたボディ（400）、未対応のコーディング（415）
+- ResponseCompressionMiddleware: Accept-Encodingによるコーディングの選択、最小サイズ、
+  ストリームのレスポンス、ETagとIf-None-Match
+"""
+import gzip
+import json
+import os
+import uuid
+import zlib
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from api.middleware.compression import (
+    RequestDecompressionMiddleware,
+    ResponseCompressionMiddleware,
+    negotiate_encoding,
+)
+from src.main import app
+from tests.conftest import auth_headers
+
+zstandard = pytest.importorskip("zstandard")
+
+client = TestClient(app)
+
+BASE = datetime(2024, 5, 20, 12, 0, tzinfo=UTC)
+
+
+def make_measurements(count: int) -> list[dict]:
+    """同じメトリックタイプ・単位・デバイスIDが繰り返される心拍数データ"""
+    return [
+        {
+            "metric_type": "heart_rate",
+            "value": 60.0 + i % 40,
+            "unit": "bpm",
+            "measured_at": (BASE + timedelta(seconds=i)).isoformat(),
+            "device_id": "apple_watch_001",
+        }
+        for i in range(count)
+    ]
+
+
+def make_echo_client(**options) -> TestClient:
+    """受け取ったボディのバイト数を返すアプリのクライアント"""
+    echo_app = FastAPI()
+
+    @echo_app.post("/echo")
+    async def echo(request: Request) -> dict[str, int]:
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+        return {"size": size}
+
+    echo_app.add_middleware(RequestDecompressionMiddleware, **options)
+    return TestClient(echo_app)
+
+
+@pytest.fixture
+def user_id() -> str:
+    """テストごとに別のユーザー"""
+    return f"compression_user_{uuid.uuid4().hex}"
+
+
+class TestRequestDecompression:
+    """RequestDecompressionMiddlewareのテスト"""
+
+    @pytest.mark.parametrize("encoding", ["gzip", "zstd"])
+    def test_compressed_bulk_upload_is_ingested(self, user_id, encoding):
+        """圧縮したJSONのボディを展開して一括登録する"""
+        # Arrange
+        raw = json.dumps(make_measurements(500)).encode()
+        body = gzip.compress(raw) if encoding == "gzip" else zstandard.ZstdCompressor().compress(raw)
+
+        # Act
+        response = client.post(
+            "/v1/measurements/bulk",
+            content=body,
+            headers={
+                **auth_headers(user_id),
+                "Content-Type": "application/json",
+                "Content-Encoding": encoding,
+                "Prefer": "return=minimal",
+            },
+        )
+
+        # Assert
+        assert response.status_code == 201
+        assert response.json()["success_count"] == 500
+        assert len(body) < len(raw) / 5
+
+    def test_compressed_ndjson_stream_is_ingested(self, user_id):
+        """zstdで圧縮したNDJSONをストリームで展開しながら登録する"""
+        # Arrange
+        raw = "".join(json.dumps(row) + "\n" for row in make_measurements(300)).encode()
+        compressor = zstandard.ZstdCompressor()
+        # 複数のフレームを連結したボディも1つのボディとして扱う
+        body = compressor.compress(raw[:1000]) + compressor.compress(raw[1000:])
+
+        # Act
+        response = client.post(
+            "/v1/measurements/bulk/stream",
+            content=body,
+            headers={
+                **auth_headers(user_id),
+                "Content-Type": "application/x-ndjson",
+                "Content-Encoding": "zstd",
+            },
+        )
+
+        # Assert
+        assert response.status_code == 201
+        assert response.json()["success_count"] == 300
+
+    def test_body_is_passed_in_chunks(self):
+        """展開後のボディを一定サイズずつアプリケーションに渡す"""
+        # Arrange
+        chunks: list[int] = []
+        chunk_app = FastAPI()
+
+        @chunk_app.post("/echo")
+        async def echo(request: Request) -> dict[str, int]:
+            async for chunk in request.stream():
+                chunks.append(len(chunk))
+            return {"size": sum(chunks)}
+
+        chunk_app.add_middleware(RequestDecompressionMiddleware, chunk_size=1000)
+        body = gzip.compress(b"x" * 10_500)
+
+        # Act
+        response = TestClient(chunk_app).post("/echo", content=body, headers={"Content-Encoding": "gzip"})
+
+        # Assert
+        assert response.json() == {"size": 10_500}
+        assert max(chunks) <= 1000
+
+    @pytest.mark.parametrize("encoding", ["gzip", "zstd"])
+    def test_decompressed_size_limit_rejects_zip_bomb(self, encoding):
+        """展開後のサイズが上限を超えたら、展開しきる前に413を返す"""
+        # Arrange
+        raw = b"\0" * (50 * 1024 * 1024)
+        body = gzip.compress(raw) if encoding == "gzip" else zstandard.ZstdCompressor().compress(raw)
+        echo_client = make_echo_client(max_decompressed_bytes=1024 * 1024)
+
+        # Act
+        response = echo_client.post("/echo", content=body, headers={"Content-Encoding": encoding})
+
+        # Assert
+        assert response.status_code == 413
+        assert len(body) < 100 * 1024
+
+    def test_body_within_limit_is_accepted(self):
+        """上限ちょうどのボディは受け付ける"""
+        echo_client = make_echo_client(max_decompressed_bytes=4096)
+
+        response = echo_client.post(
+            "/echo", content=gzip.compress(b"a" * 4096), headers={"Content-Encoding": "gzip"}
+        )
+
+        assert response.json() == {"size": 4096}
+
+    @pytest.mark.parametrize("encoding", ["gzip", "zstd"])
+    def test_incompressible_body_larger_than_chunk_is_decompressed(self, encoding):
+        """圧縮率の低いボディも、展開後がchunk_sizeを何度も超える場合に最後まで展開する"""
+        # Arrange
+        raw = os.urandom(512 * 1024).hex().encode()
+        body = gzip.compress(raw) if encoding == "gzip" else zstandard.ZstdCompressor().compress(raw)
+        echo_client = make_echo_client(chunk_size=16 * 1024)
+
+        # Act
+        response = echo_client.post("/echo", content=body, headers={"Content-Encoding": encoding})
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == {"size": len(raw)}
+
+    def test_concatenated_gzip_members_are_joined(self):
+        """連結されたgzipのメンバーを順に展開する"""
+        body = gzip.compress(b"a" * 100) + gzip.compress(b"b" * 50)
+
+        response = make_echo_client().post("/echo", content=body, headers={"Content-Encoding": "gzip"})
+
+        assert response.json() == {"size": 150}
+
+    @pytest.mark.parametrize(
+        "body",
+        [b"not gzip at all", gzip.compress(b"a" * 1000)[:-12]],
+        ids=["invalid", "truncated"],
+    )
+    def test_invalid_or_truncated_body_returns_400(self, body):
+        """不正な・途中で切れた圧縮データは400"""
+        response = make_echo_client().post("/echo", content=body, headers={"Content-Encoding": "gzip"})
+
+        assert response.status_code == 400
+
+    def test_unsupported_encoding_returns_415(self):
+        """未対応のContent-Encodingは415とし、対応するコーディングを返す"""
+        response = make_echo_client().post("/echo", content=b"data", headers={"Content-Encoding": "br"})
+
+        assert response.status_code == 415
+        assert response.headers["accept-encoding"] == "gzip, x-gzip, zstd"
+
+    def test_identity_body_is_passed_through(self):
+        """Content-Encodingなし・identityのボディはそのまま渡す"""
+        echo_client = make_echo_client()
+
+        plain = echo_client.post("/echo", content=b"abc")
+        identity = echo_client.post("/echo", content=b"abc", headers={"Content-Encoding": "identity"})
+
+        assert plain.json() == identity.json() == {"size": 3}
+
+
+def make_response_client(minimum_size: int = 100) -> TestClient:
+    """固定のレスポンスを返すアプリのクライアント"""
+    response_app = FastAPI()
+
+    @response_app.get("/text")
+    async def text(size: int = 1000) -> PlainTextResponse:
+        return PlainTextResponse("x" * size, headers={"ETag": '"v1"'})
+
+    @response_app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def lines() -> AsyncIterator[bytes]:
+            for i in range(100):
+                yield json.dumps({"line": i}).encode() + b"\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    @response_app.get("/binary")
+    async def binary() -> PlainTextResponse:
+        return PlainTextResponse("x" * 1000, media_type="application/octet-stream")
+
+    response_app.add_middleware(ResponseCompressionMiddleware, minimum_size=minimum_size)
+    return TestClient(response_app)
+
+
+class TestResponseCompression:
+    """ResponseCompressionMiddlewareのテスト"""
+
+    @pytest.mark.parametrize(
+        ("accept_encoding", "expected"),
+        [
+            ("gzip", "gzip"),
+            ("gzip, zstd", "zstd"),
+            ("zstd;q=0.5, gzip", "gzip"),
+            ("zstd;q=0, gzip;q=0.1", "gzip"),
+            ("*", "zstd"),
+            ("br", None),
+            ("identity", None),
+            ("", None),
+        ],
+    )
+    def test_negotiate_encoding(self, accept_encoding, expected):
+        """q値が最大の対応するコーディングを選び、同じ場合はzstdを優先する"""
+        assert negotiate_encoding(accept_encoding, ("zstd", "gzip")) == expected
+
+    @pytest.mark.parametrize("encoding", ["gzip", "zstd"])
+    def test_large_response_is_compressed(self, encoding):
+        """最小サイズ以上のレスポンスを圧縮し、Varyと圧縮後のContent-Lengthを付ける"""
+        # Act
+        response = make_response_client().get("/text", headers={"Accept-Encoding": encoding})
+
+        # Assert
+        assert response.headers["content-encoding"] == encoding
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) < 1000
+        assert response.text == "x" * 1000
+
+    def test_small_response_is_not_compressed(self):
+        """最小サイズ未満のレスポンスは圧縮しない"""
+        response = make_response_client().get("/text", params={"size": 10}, headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.text == "x" * 10
+
+    def test_identity_client_gets_plain_response_with_vary(self):
+        """圧縮を受け入れないクライアントには圧縮せず、Varyのみ付ける"""
+        response = make_response_client().get("/text", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"] == '"v1"'
+
+    def test_non_text_response_is_not_compressed(self):
+        """JSON・テキスト以外のレスポンスは圧縮しない"""
+        response = make_response_client().get("/binary", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+
+    def test_compressed_response_has_weak_etag(self):
+        """圧縮したレスポンスのETagは弱いETagにする"""
+        response = make_response_client().get("/text", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["etag"] == 'W/"v1"'
+
+    @pytest.mark.parametrize("encoding", ["gzip", "zstd"])
+    def test_streaming_response_is_compressed_in_chunks(self, encoding):
+        """ストリームのレスポンスはチャンクごとに圧縮し、Content-Lengthを付けない"""
+        # Act
+        with make_response_client().stream("GET", "/stream", headers={"Accept-Encoding": encoding}) as response:
+            raw = b"".join(response.iter_raw())
+
+        # Assert
+        assert response.headers["content-encoding"] == encoding
+        assert "content-length" not in response.headers
+        decoded = (
+            zlib.decompress(raw, 16 + zlib.MAX_WBITS)
+            if encoding == "gzip"
+            else zstandard.ZstdDecompressor().decompressobj().decompress(raw)
+        )
+        assert decoded.count(b"\n") == 100
+
+    def test_cached_list_response_revalidates_with_weak_etag(self, user_id):
+        """圧縮した一覧のレスポンスのETagをIf-None-Matchに指定すると304を返す"""
+        # Arrange
+        headers = {**auth_headers(user_id), "Accept-Encoding": "zstd"}
+        client.post("/v1/measurements/bulk", json=make_measurements(200), headers=headers)
+        params = {"start": BASE.isoformat(), "end": (BASE + timedelta(days=1)).isoformat(), "limit": 200}
+        first = client.get("/v1/measurements", params=params, headers=headers)
+
+        # Act
+        second = client.get(
+            "/v1/measurements", params=params, headers={**headers, "If-None-Match": first.headers["etag"]}
+        )
+
+        # Assert
+        assert first.headers["content-encoding"] == "zstd"
+        assert first.headers["etag"].startswith('W/"')
+        assert len(first.json()["items"]) == 200
+        assert second.status_code == 304
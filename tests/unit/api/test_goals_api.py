@@ -0,0 +1,218 @@
+"""
+ゴールAPIと一括登録時のゴールの評価のテスト
+
+- PUT/GET/DELETE /v1/goals/{goal_id}、GET /v1/goals
+- 一括登録（JSON・列指向バイナリ）で保存した行による進捗の加算と達成イベントの発行
+  （同じ期間のイベントは1回だけ）
+- ユーザーごとの分離
+"""
+import uuid
+from collections.abc import Iterator, Sequence
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from api.goal_evaluation import GoalEvaluator
+from api.v1.dependencies.database import get_goal_repository
+from api.v1.dependencies.goals import get_goal_evaluator
+from domain.entities.goal import GoalAchievedEvent, GoalPeriod
+from domain.services.goal_evaluation import period_start
+from fastapi.testclient import TestClient
+from schemas.requests.measurement_columnar import COLUMNAR_MEDIA_TYPE
+from src.main import app
+from tests.columnar_encoder import encode_columnar_measurements
+from tests.conftest import auth_headers
+
+client = TestClient(app)
+
+
+class RecordingPublisher:
+    """通知したイベントを保持する通知先"""
+
+    def __init__(self) -> None:
+        self.events: list[GoalAchievedEvent] = []
+
+    async def publish(self, events: Sequence[GoalAchievedEvent]) -> None:
+        self.events.extend(events)
+
+
+def steps(*values: float) -> list[dict]:
+    """今日（UTC）の歩数データ（ゴールを作成した期間の測定とするため、直近の時刻にする）"""
+    now = datetime.now(UTC)
+    anchor = max(period_start(now, GoalPeriod.DAY), now - timedelta(hours=1))
+    return [
+        {
+            "metric_type": "steps",
+            "value": value,
+            "unit": "steps",
+            "measured_at": (anchor + timedelta(milliseconds=i)).isoformat(),
+            "device_id": f"iphone_{uuid.uuid4().hex[:8]}",
+        }
+        for i, value in enumerate(values)
+    ]
+
+
+@pytest.fixture
+def user_id() -> str:
+    """テストごとに別のユーザー"""
+    return f"goal_user_{uuid.uuid4().hex}"
+
+
+@pytest.fixture
+def publisher() -> Iterator[RecordingPublisher]:
+    """達成イベントをテスト用の通知先に記録する"""
+    recording = RecordingPublisher()
+    app.dependency_overrides[get_goal_evaluator] = lambda: GoalEvaluator(get_goal_repository(), recording)
+    yield recording
+    app.dependency_overrides.pop(get_goal_evaluator, None)
+
+
+def put_steps_goal(user_id: str, goal_id: str = "daily_steps", target: float = 10_000):
+    """1日の歩数のゴールを作成する"""
+    return client.put(
+        f"/v1/goals/{goal_id}",
+        json={"metric_type": "steps", "target": target},
+        headers=auth_headers(user_id),
+    )
+
+
+class TestGoalCrud:
+    """ゴールの作成・取得・削除のテスト"""
+
+    def test_put_creates_then_replaces(self, user_id):
+        """最初のPUTは201、同じゴールIDへのPUTは置き換えて200"""
+        # Act
+        created = put_steps_goal(user_id)
+        replaced = put_steps_goal(user_id, target=8000)
+
+        # Assert
+        assert created.status_code == 201
+        assert created.json()["aggregation"] == "sum"
+        assert created.json()["period"] == "day"
+        assert replaced.status_code == 200
+        assert replaced.json()["target"] == 8000
+        assert replaced.json()["created_at"] == created.json()["created_at"]
+
+    def test_get_list_and_delete(self, user_id):
+        """作成したゴールを取得・一覧でき、削除後は404"""
+        # Arrange
+        put_steps_goal(user_id, "a_steps")
+        put_steps_goal(user_id, "b_steps")
+        headers = auth_headers(user_id)
+
+        # Act
+        listed = client.get("/v1/goals", headers=headers)
+        fetched = client.get("/v1/goals/a_steps", headers=headers)
+        deleted = client.delete("/v1/goals/a_steps", headers=headers)
+        after = client.get("/v1/goals/a_steps", headers=headers)
+        deleted_again = client.delete("/v1/goals/a_steps", headers=headers)
+
+        # Assert
+        assert [item["goal_id"] for item in listed.json()["items"]] == ["a_steps", "b_steps"]
+        assert fetched.json()["history"] == []
+        assert deleted.status_code == 204
+        assert after.status_code == 404
+        assert deleted_again.status_code == 404
+
+    @pytest.mark.parametrize("goal_id, body", [
+        ("bad id!", {"metric_type": "steps", "target": 10_000}),
+        ("steps", {"metric_type": "steps", "target": 0}),
+        ("steps", {"metric_type": "steps", "target": 10_000, "period": "month"}),
+        ("steps", {"metric_type": "steps", "target": 10_000, "unit": "kg"}),
+        ("weight", {"metric_type": "body_weight", "target": 60}),
+    ])
+    def test_invalid_goal_returns_422(self, user_id, goal_id, body):
+        """不正なゴールID・目標値・期間・単位と、単位が複数あるメトリックタイプの単位の省略は422"""
+        response = client.put(f"/v1/goals/{goal_id}", json=body, headers=auth_headers(user_id))
+
+        assert response.status_code == 422
+
+    def test_goals_are_scoped_per_user(self, user_id):
+        """他のユーザーのゴールは取得・削除できない"""
+        # Arrange
+        put_steps_goal(user_id)
+        other = auth_headers(f"goal_other_{uuid.uuid4().hex}")
+
+        # Act & Assert
+        assert client.get("/v1/goals/daily_steps", headers=other).status_code == 404
+        assert client.delete("/v1/goals/daily_steps", headers=other).status_code == 404
+        assert client.get("/v1/goals", headers=other).json() == {"items": []}
+
+    def test_authentication_is_required(self):
+        """認証なしは401"""
+        assert client.get("/v1/goals").status_code == 401
+
+
+class TestGoalEvaluationOnIngest:
+    """一括登録時のゴールの評価のテスト"""
+
+    def test_bulk_ingest_emits_achievement_once(self, user_id, publisher):
+        """目標に達した一括登録でイベントを1回発行し、同じ日の以降の登録では発行しない"""
+        # Arrange
+        put_steps_goal(user_id)
+        headers = auth_headers(user_id)
+
+        # Act
+        client.post("/v1/measurements/bulk", json=steps(4000), headers=headers)
+        client.post("/v1/measurements/bulk", json=steps(3000, 3500), headers=headers)
+        client.post("/v1/measurements/bulk", json=steps(2000), headers=headers)
+        goal = client.get("/v1/goals/daily_steps", headers=headers).json()
+
+        # Assert
+        assert [(e.user_id, e.goal_id, e.value, e.streak) for e in publisher.events] == [
+            (user_id, "daily_steps", 10_500.0, 1),
+        ]
+        assert goal["current_progress"]["value"] == 12_500.0
+        assert goal["current_progress"]["sample_count"] == 4
+        assert goal["current_progress"]["achieved"] is True
+        assert goal["current_progress"]["streak"] == 1
+
+    def test_columnar_ingest_updates_progress(self, user_id, publisher):
+        """列指向バイナリ形式の一括登録でも進捗を加算する"""
+        # Arrange
+        put_steps_goal(user_id)
+        headers = auth_headers(user_id)
+
+        # Act
+        response = client.post(
+            "/v1/measurements/bulk/columnar",
+            content=encode_columnar_measurements(steps(6000, 6000)),
+            headers={**headers, "Content-Type": COLUMNAR_MEDIA_TYPE},
+        )
+        listed = client.get("/v1/goals", headers=headers).json()
+
+        # Assert
+        assert response.status_code == 201
+        assert len(publisher.events) == 1
+        assert listed["items"][0]["current_progress"]["value"] == 12_000.0
+
+    def test_duplicate_rows_are_not_counted_twice(self, user_id, publisher):
+        """登録済みの測定と重複した行は進捗に加算しない"""
+        # Arrange
+        put_steps_goal(user_id)
+        headers = auth_headers(user_id)
+        rows = steps(6000)
+
+        # Act
+        client.post("/v1/measurements/bulk", json=rows, headers=headers)
+        client.post("/v1/measurements/bulk", json=rows, headers=headers)
+        goal = client.get("/v1/goals/daily_steps", headers=headers).json()
+
+        # Assert
+        assert goal["current_progress"]["value"] == 6000.0
+        assert publisher.events == []
+
+    def test_other_users_measurements_do_not_count(self, user_id, publisher):
+        """他のユーザーの測定はゴールの進捗に加算しない"""
+        # Arrange
+        put_steps_goal(user_id)
+
+        # Act
+        client.post(
+            "/v1/measurements/bulk", json=steps(20_000),
+            headers=auth_headers(f"goal_other_{uuid.uuid4().hex}"),
+        )
+        goal = client.get("/v1/goals/daily_steps", headers=auth_headers(user_id)).json()
+
+        # Assert
+        assert goal["current_progress"] is None
+        assert publisher.events == []
@@ -0,0 +1,242 @@
+"""
+非同期一括登録のワーカーのユニットテスト
+
+- ユーザーごとに連結したバッチを1回の書き込みで保存する
+- まとめた書き込みが失敗した場合は1件ずつ処理し直し、失敗したジョブだけを失敗とする
+- 停止時は待機中のジョブを処理し終えてから停止する
+- 保存した行を生データアーカイバーに渡す
+- 保存した行でユーザーのゴールを評価する
+- 保存した後の処理・結果の記録が失敗しても書き込みを処理し直さない
+"""
+from datetime import UTC, datetime, timedelta
+
+from api.ingest_worker import IngestWorker
+from domain.entities.measurement_batch import MeasurementBatch
+from infrastructure.archive import ARCHIVE_FORMATS, MeasurementArchiver
+from infrastructure.queue import (
+    InMemoryIngestQueue,
+    IngestJob,
+    IngestJobState,
+    IngestJobStatus,
+)
+
+BASE = datetime(2024, 5, 20, 12, 0, tzinfo=UTC)
+
+
+class FakeRepository:
+    """bulk_insert_manyの呼び出しを記録し、指定したユーザーを含む書き込みを失敗させるリポジトリ"""
+
+    def __init__(self, failing_user: str | None = None) -> None:
+        self.failing_user = failing_user
+        self.calls: list[list[MeasurementBatch]] = []
+
+    async def bulk_insert_many(
+        self, batches: list[MeasurementBatch], on_stored=None
+    ) -> list[MeasurementBatch]:
+        self.calls.append(batches)
+        if any(batch.user_id == self.failing_user for batch in batches):
+            raise RuntimeError("database is unavailable")
+        if on_stored is not None:
+            for batch in batches:
+                await on_stored(None, batch)
+        return batches
+
+
+class FakeGoalEvaluator:
+    """保存と同じトランザクションで記録したバッチと、コミット後に通知した回数を記録するゴールの評価"""
+
+    def __init__(self) -> None:
+        self.batches: list[MeasurementBatch] = []
+        self.published = 0
+
+    def recorder(self, events: list):
+        async def record(conn, batch: MeasurementBatch) -> None:
+            self.batches.append(batch)
+
+        return record
+
+    async def publish(self, events: list) -> bool:
+        self.published += 1
+        return True
+
+
+class FailingCache:
+    """無効化が常に失敗するレスポンスキャッシュ"""
+
+    async def invalidate_batch(self, batch: MeasurementBatch) -> None:
+        raise ConnectionError("cache is down")
+
+
+class FailingCompleteQueue(InMemoryIngestQueue):
+    """指定したジョブの結果の記録が失敗するキュー"""
+
+    def __init__(self, failing_batch_id: str) -> None:
+        super().__init__()
+        self.failing_batch_id = failing_batch_id
+
+    async def complete(self, state: IngestJobState) -> None:
+        if state.batch_id == self.failing_batch_id:
+            raise OSError("queue is unavailable")
+        await super().complete(state)
+
+
+def make_job(batch_id: str, user_id: str, count: int) -> IngestJob:
+    """1分間隔の歩数データのジョブ"""
+    return IngestJob(
+        batch_id=batch_id,
+        user_id=user_id,
+        rows=[
+            {"metric_type": "steps", "value": 100.0, "unit": "steps",
+             "measured_at": (BASE + timedelta(minutes=i)).isoformat()}
+            for i in range(count)
+        ],
+        indexes=list(range(count)),
+        total_count=count,
+    )
+
+
+async def enqueue(queue: InMemoryIngestQueue, *jobs: IngestJob) -> None:
+    """ジョブをキューに追加する"""
+    for job in jobs:
+        await queue.put(job)
+
+
+class TestIngestWorker:
+    """IngestWorkerのテスト"""
+
+    async def test_coalesces_jobs_per_user(self) -> None:
+        """同じユーザーのジョブは1つのバッチに連結し、1回の書き込みで保存する"""
+        # Arrange
+        queue = InMemoryIngestQueue()
+        repository = FakeRepository()
+        await enqueue(queue, make_job("a", "alice", 2), make_job("b", "alice", 3), make_job("c", "bob", 1))
+        worker = IngestWorker(queue, repository)
+
+        # Act
+        processed = await worker.run_once()
+
+        # Assert
+        assert processed == 3
+        assert len(repository.calls) == 1
+        assert [(batch.user_id, len(batch)) for batch in repository.calls[0]] == [("alice", 5), ("bob", 1)]
+        states = [await queue.status(batch_id) for batch_id in "abc"]
+        assert [state.success_count for state in states] == [2, 3, 1]
+        assert all(state.status is IngestJobStatus.COMPLETED for state in states)
+
+    async def test_batch_rows_limits_coalescing(self) -> None:
+        """1回の書き込みはbatch_rowsを超えない範囲でまとめる"""
+        # Arrange
+        queue = InMemoryIngestQueue()
+        repository = FakeRepository()
+        await enqueue(queue, make_job("a", "alice", 3), make_job("b", "alice", 3))
+        worker = IngestWorker(queue, repository, batch_rows=4)
+
+        # Act
+        first = await worker.run_once()
+        second = await worker.run_once()
+
+        # Assert
+        assert (first, second) == (1, 1)
+        assert len(repository.calls) == 2
+
+    async def test_failed_job_does_not_fail_others(self) -> None:
+        """まとめた書き込みが失敗した場合は1件ずつ保存し、失敗したジョブだけを失敗とする"""
+        # Arrange
+        queue = InMemoryIngestQueue()
+        repository = FakeRepository(failing_user="mallory")
+        await enqueue(queue, make_job("a", "alice", 2), make_job("m", "mallory", 2))
+        worker = IngestWorker(queue, repository)
+
+        # Act
+        await worker.run_once()
+
+        # Assert
+        alice, mallory = await queue.status("a"), await queue.status("m")
+        assert alice.status is IngestJobStatus.COMPLETED
+        assert alice.success_count == 2
+        assert mallory.status is IngestJobStatus.FAILED
+        assert mallory.message == "Failed to store measurements"
+        assert len(repository.calls) == 3
+
+    async def test_stop_drains_queue(self) -> None:
+        """停止時は待機中のジョブを処理し終えてから停止する"""
+        # Arrange
+        queue = InMemoryIngestQueue(poll_interval_seconds=0.01)
+        repository = FakeRepository()
+        worker = IngestWorker(queue, repository, batch_rows=1, poll_timeout_seconds=0.05)
+        worker.start()
+        await enqueue(queue, make_job("a", "alice", 1), make_job("b", "alice", 1))
+
+        # Act
+        await worker.stop()
+
+        # Assert
+        assert await queue.pending_rows() == 0
+        assert (await queue.status("b")).status is IngestJobStatus.COMPLETED
+
+    async def test_stored_rows_are_archived(self) -> None:
+        """保存した行をアーカイバーのバッファに追加する"""
+        # Arrange
+        queue = InMemoryIngestQueue()
+        archiver = MeasurementArchiver(object(), ARCHIVE_FORMATS["ndjson"])  # type: ignore[arg-type]
+        await enqueue(queue, make_job("a", "alice", 2), make_job("c", "bob", 1))
+        worker = IngestWorker(queue, FakeRepository(), archiver=archiver)
+
+        # Act
+        await worker.run_once()
+
+        # Assert
+        assert archiver.buffered_rows() == 3
+
+    async def test_stored_batches_are_evaluated_against_goals(self) -> None:
+        """ユーザーごとに保存したバッチをゴールの評価に渡す"""
+        # Arrange
+        queue = InMemoryIngestQueue()
+        evaluator = FakeGoalEvaluator()
+        await enqueue(queue, make_job("a", "alice", 2), make_job("b", "alice", 1), make_job("c", "bob", 1))
+        worker = IngestWorker(queue, FakeRepository(), goal_evaluator=evaluator)  # type: ignore[arg-type]
+
+        # Act
+        await worker.run_once()
+
+        # Assert
+        assert sorted((batch.user_id, len(batch)) for batch in evaluator.batches) == [
+            ("alice", 3), ("bob", 1),
+        ]
+        assert evaluator.published == 1
+
+    async def test_failure_after_commit_does_not_replay_write(self) -> None:
+        """保存した後のキャッシュの無効化が失敗しても、ジョブを処理し直さず完了とする"""
+        # Arrange
+        queue = InMemoryIngestQueue()
+        repository = FakeRepository()
+        archiver = MeasurementArchiver(object(), ARCHIVE_FORMATS["ndjson"])  # type: ignore[arg-type]
+        await enqueue(queue, make_job("a", "alice", 2), make_job("c", "bob", 1))
+        worker = IngestWorker(queue, repository, cache=FailingCache(), archiver=archiver)  # type: ignore[arg-type]
+
+        # Act
+        await worker.run_once()
+
+        # Assert
+        assert len(repository.calls) == 1
+        states = [await queue.status(batch_id) for batch_id in "ac"]
+        assert [(state.status, state.success_count) for state in states] == [
+            (IngestJobStatus.COMPLETED, 2), (IngestJobStatus.COMPLETED, 1),
+        ]
+        assert archiver.buffered_rows() == 3
+
+    async def test_complete_failure_does_not_replay_write(self) -> None:
+        """保存した後に結果の記録が失敗しても、書き込みを処理し直さず他のジョブを完了とする"""
+        # Arrange
+        queue = FailingCompleteQueue(failing_batch_id="a")
+        repository = FakeRepository()
+        await enqueue(queue, make_job("a", "alice", 2), make_job("c", "bob", 1))
+        worker = IngestWorker(queue, repository)
+
+        # Act
+        await worker.run_once()
+
+        # Assert
+        assert len(repository.calls) == 1
+        assert (await queue.status("a")).status is IngestJobStatus.PROCESSING
+        assert (await queue.status("c")).status is IngestJobStatus.COMPLETED
@@ -8,13 +8,19 @@ POST /v1/measurements/bulk のテスト
 - 認証：JWT認証の統合（MVP6）
 """
 
+import asyncio
 from datetime import UTC, datetime, timedelta
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import select
 from src.api.v1.dependencies.auth import create_access_token
 from src.main import app
 
+from core.config import get_settings
+from infrastructure.database.models import MeasurementRecord
+from infrastructure.database.session import create_engine
+
 client = TestClient(app)
 
 
@@ -182,6 +188,38 @@ class TestMeasurementsBulkAPI:
         assert data["failed_count"] == 0
         assert len(data["measurements"]) == 100
 
+    def test_bulk_create_persists_valid_rows(self):
+        """有効な行のみがユーザーIDとともにデータベースに保存される"""
+        # Arrange
+        token = create_access_token(data={"sub": "persist_user", "email": "persist@example.com"})
+        headers = {"Authorization": f"Bearer {token}"}
+        now = datetime.now(UTC)
+        measurements_data = [
+            {"metric_type": "heart_rate", "value": 72.0, "unit": "bpm", "measured_at": now.isoformat()},
+            {"metric_type": "heart_rate", "value": 300.0, "unit": "bpm", "measured_at": now.isoformat()},
+        ]
+
+        # Act
+        response = client.post("/v1/measurements/bulk", json=measurements_data, headers=headers)
+
+        # Assert
+        assert response.status_code == 207
+        created_id = response.json()["measurements"][0]["id"]
+
+        async def fetch_rows():
+            engine = create_engine(get_settings())
+            async with engine.connect() as conn:
+                result = await conn.execute(
+                    select(MeasurementRecord.id, MeasurementRecord.value)
+                    .where(MeasurementRecord.user_id == "persist_user")
+                )
+                rows = result.all()
+            await engine.dispose()
+            return rows
+
+        rows = asyncio.run(fetch_rows())
+        assert [(row.id, row.value) for row in rows] == [(created_id, 72.0)]
+
     def test_bulk_create_with_future_date(self):
         """異常系：未来の日時でバリデーションエラー"""
         # Arrange
@@ -234,6 +272,29 @@ class TestMeasurementsBulkAPI:
         # 両方のエラーが報告される
         assert len(data["detail"]) >= 2
 
+    def test_bulk_create_errors_are_ordered_by_index(self):
+        """スキーマエラーとドメインエラーが混在してもインデックス順に報告される"""
+        # Arrange
+        now = datetime.now(UTC).isoformat()
+        mixed_data = [
+            {"metric_type": "heart_rate", "value": 300.0, "unit": "bpm", "measured_at": now},
+            {"metric_type": "invalid_type", "value": 1.0, "unit": "bpm", "measured_at": now},
+            {"metric_type": "body_weight", "value": 70.0, "unit": "kg", "measured_at": now},
+            {"metric_type": "body_weight", "value": 70.0, "unit": "bpm", "measured_at": now},
+        ]
+
+        # Act
+        response = client.post("/v1/measurements/bulk", json=mixed_data, headers=self.get_auth_headers())
+
+        # Assert
+        assert response.status_code == 207
+        data = response.json()
+        assert data["success_count"] == 1
+        assert [error["index"] for error in data["errors"]] == [0, 1, 3]
+        assert data["errors"][1]["field"] == "metric_type"
+        assert data["errors"][2]["field"] is None
+        assert "Invalid unit 'bpm'" in data["errors"][2]["message"]
+
 
 class TestMeasurementsBulkAPIWithAuth:
     """測定データ一括登録APIの認証テスト（MVP6）"""
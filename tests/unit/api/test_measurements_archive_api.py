@@ -0,0 +1,109 @@
+"""
+測定データ登録時の生データアーカイブのテスト
+
+- 一括登録・ストリーム登録で保存した行をアーカイバーのバッファに追加する
+- 登録済みの測定と重複した行はアーカイブしない
+- 書き出しはリクエストの処理中には行わない
+"""
+
+import json
+import uuid
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from api.v1.dependencies.archive import get_measurement_archiver
+from fastapi.testclient import TestClient
+from infrastructure.archive import ARCHIVE_FORMATS, MeasurementArchiver
+from src.main import app
+from tests.conftest import auth_headers
+
+client = TestClient(app)
+
+BASE = datetime(2024, 5, 20, 12, 0, tzinfo=UTC)
+
+
+class MemoryStorage:
+    """保存したファイルを辞書に保持する保存先"""
+
+    def __init__(self) -> None:
+        self.files: dict[str, bytes] = {}
+
+    def put(self, key: str, body: bytes, content_type: str) -> None:
+        self.files[key] = body
+
+
+def make_measurements(count: int) -> list[dict]:
+    """1分間隔の心拍数データ"""
+    return [
+        {
+            "metric_type": "heart_rate",
+            "value": 70.0 + i % 50,
+            "unit": "bpm",
+            "measured_at": (BASE + timedelta(minutes=i)).isoformat(),
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def storage() -> Iterator[MemoryStorage]:
+    """アーカイブを有効にし、テスト用の保存先を使う"""
+    archive_storage = MemoryStorage()
+    archiver = MeasurementArchiver(archive_storage, ARCHIVE_FORMATS["ndjson"], max_rows=1)
+    app.dependency_overrides[get_measurement_archiver] = lambda: archiver
+    yield archive_storage
+    app.dependency_overrides.pop(get_measurement_archiver, None)
+
+
+def archiver() -> MeasurementArchiver:
+    """テスト用に差し替えたアーカイバー"""
+    return app.dependency_overrides[get_measurement_archiver]()
+
+
+class TestMeasurementArchive:
+    """登録時のアーカイブのテスト"""
+
+    def test_bulk_ingest_buffers_stored_rows(self, storage):
+        """保存した行をバッファに追加し、レスポンスを返すまでに書き出さない"""
+        # Arrange
+        user_id = f"archive_user_{uuid.uuid4().hex}"
+
+        # Act
+        response = client.post(
+            "/v1/measurements/bulk", json=make_measurements(3), headers=auth_headers(user_id)
+        )
+
+        # Assert
+        assert response.status_code == 201
+        assert archiver().buffered_rows() == 3
+        assert storage.files == {}
+
+    def test_resent_rows_are_not_archived_twice(self, storage):
+        """登録済みの測定と重複した行はアーカイブしない"""
+        # Arrange
+        user_id = f"archive_user_{uuid.uuid4().hex}"
+        client.post("/v1/measurements/bulk", json=make_measurements(2), headers=auth_headers(user_id))
+
+        # Act
+        client.post("/v1/measurements/bulk", json=make_measurements(3), headers=auth_headers(user_id))
+
+        # Assert
+        assert archiver().buffered_rows() == 3
+
+    def test_stream_ingest_buffers_stored_rows(self, storage):
+        """ストリーム登録で保存した行もバッファに追加する"""
+        # Arrange
+        user_id = f"archive_user_{uuid.uuid4().hex}"
+        body = "".join(json.dumps(row) + "\n" for row in make_measurements(4))
+
+        # Act
+        response = client.post(
+            "/v1/measurements/bulk/stream",
+            content=body,
+            headers={**auth_headers(user_id), "Content-Type": "application/x-ndjson"},
+        )
+
+        # Assert
+        assert response.status_code == 201
+        assert archiver().buffered_rows() == 4
@@ -0,0 +1,218 @@
+"""
+測定データの非同期一括登録APIのテスト
+
+POST /v1/measurements/bulk（Prefer: respond-async）と GET /v1/measurements/bulk/{batch_id} のテスト
+- 正常系：202で受け付け、ワーカーの処理後に結果を取得できる、複数のリクエストをまとめて保存する
+- 異常系：スキーマ・ドメインルールのエラー、キューの上限（503）、他のユーザーのbatch_id（404）
+- 非同期登録が無効な場合はrespond-asyncを無視して同期的に登録する
+"""
+
+import asyncio
+import uuid
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from api.ingest_worker import IngestWorker
+from api.v1.dependencies.cache import get_response_cache
+from api.v1.dependencies.database import get_measurement_repository
+from api.v1.dependencies.queue import get_ingest_queue
+from core.config import get_settings
+from fastapi.testclient import TestClient
+from infrastructure.queue import InMemoryIngestQueue
+from src.main import app
+from tests.conftest import auth_headers
+
+client = TestClient(app)
+
+ASYNC_HEADERS = {"Prefer": "respond-async"}
+BASE = datetime(2024, 5, 20, 12, 0, tzinfo=UTC)
+
+
+def make_measurements(count: int, start: int = 0) -> list[dict]:
+    """1分間隔の心拍数データ"""
+    return [
+        {
+            "metric_type": "heart_rate",
+            "value": 70.0 + i % 50,
+            "unit": "bpm",
+            "measured_at": (BASE + timedelta(minutes=i)).isoformat(),
+        }
+        for i in range(start, start + count)
+    ]
+
+
+@pytest.fixture
+def user_id() -> str:
+    """テストごとに別のユーザー"""
+    return f"async_user_{uuid.uuid4().hex}"
+
+
+@pytest.fixture
+def queue() -> Iterator[InMemoryIngestQueue]:
+    """非同期登録を有効にし、テスト用のキューを使う"""
+    ingest_queue = InMemoryIngestQueue()
+    app.dependency_overrides[get_ingest_queue] = lambda: ingest_queue
+    yield ingest_queue
+    app.dependency_overrides.pop(get_ingest_queue, None)
+
+
+def run_worker(queue: InMemoryIngestQueue) -> int:
+    """待機中のジョブを1回分まとめて処理する"""
+    worker = IngestWorker(queue, get_measurement_repository(), cache=get_response_cache())
+    return asyncio.run(worker.run_once())
+
+
+def post_async(user_id: str, measurements: list[dict]):
+    """respond-asyncで一括登録する"""
+    return client.post(
+        "/v1/measurements/bulk",
+        json=measurements,
+        headers={**auth_headers(user_id), **ASYNC_HEADERS},
+    )
+
+
+def get_status(user_id: str, batch_id: str):
+    """非同期一括登録の状態を取得する"""
+    return client.get(f"/v1/measurements/bulk/{batch_id}", headers=auth_headers(user_id))
+
+
+class TestMeasurementsAsyncAPI:
+    """非同期一括登録APIのテスト"""
+
+    def test_accepts_and_stores_after_worker_runs(self, queue, user_id):
+        """202で受け付け、ワーカーの処理後に結果と登録データを取得できる"""
+        # Act
+        response = post_async(user_id, make_measurements(3))
+        batch_id = response.json()["batch_id"]
+        queued = get_status(user_id, batch_id)
+        processed = run_worker(queue)
+        done = get_status(user_id, batch_id)
+        listed = client.get("/v1/measurements", headers=auth_headers(user_id))
+
+        # Assert
+        assert response.status_code == 202
+        assert response.headers["location"] == f"/v1/measurements/bulk/{batch_id}"
+        assert response.headers["preference-applied"] == "respond-async"
+        assert response.json() == {
+            "batch_id": batch_id,
+            "status": "queued",
+            "accepted_count": 3,
+            "failed_count": 0,
+            "errors": None,
+        }
+        assert queued.json()["status"] == "queued"
+        assert queued.json()["ids"] is None
+        assert processed == 1
+        data = done.json()
+        assert data["status"] == "completed"
+        assert data["success_count"] == 3
+        assert data["failed_count"] == 0
+        assert sorted(data["ids"]) == sorted(item["id"] for item in listed.json()["items"])
+
+    def test_reports_schema_and_domain_errors(self, queue, user_id):
+        """スキーマのエラーは受付時に、ドメインルールのエラーは処理後に報告する"""
+        # Arrange
+        measurements = make_measurements(3)
+        del measurements[0]["value"]
+        measurements[2]["value"] = 300.0
+
+        # Act
+        response = post_async(user_id, measurements)
+        run_worker(queue)
+        data = get_status(user_id, response.json()["batch_id"]).json()
+
+        # Assert
+        assert response.status_code == 202
+        assert response.json()["accepted_count"] == 2
+        assert response.json()["errors"][0]["index"] == 0
+        assert data["success_count"] == 1
+        assert data["failed_count"] == 2
+        assert [error["index"] for error in data["errors"]] == [0, 2]
+        assert "out of range" in data["errors"][1]["message"]
+
+    def test_all_rows_invalid_returns_422(self, queue, user_id):
+        """すべての行がスキーマ検証に失敗した場合はキューに入れずに422を返す"""
+        # Act
+        response = post_async(user_id, [{"metric_type": "heart_rate"}])
+
+        # Assert
+        assert response.status_code == 422
+        assert asyncio.run(queue.pending_rows()) == 0
+
+    def test_worker_coalesces_requests(self, queue, user_id):
+        """複数のユーザー・リクエストをまとめて処理し、リクエスト間の重複を数える"""
+        # Arrange
+        other_user = f"{user_id}_other"
+        first = post_async(user_id, make_measurements(5))
+        second = post_async(user_id, make_measurements(5, start=3))
+        third = post_async(other_user, make_measurements(4))
+
+        # Act
+        processed = run_worker(queue)
+
+        # Assert
+        assert processed == 3
+        results = [
+            get_status(owner, response.json()["batch_id"]).json()
+            for owner, response in ((user_id, first), (user_id, second), (other_user, third))
+        ]
+        assert [(r["success_count"], r["duplicate_count"]) for r in results] == [(5, 0), (3, 2), (4, 0)]
+
+    def test_full_queue_returns_503(self, queue, user_id, monkeypatch):
+        """待機中の行数が上限に達している場合は503とRetry-Afterを返す"""
+        # Arrange
+        monkeypatch.setattr(get_settings(), "ingest_queue_max_rows", 5)
+        post_async(user_id, make_measurements(5))
+
+        # Act
+        response = post_async(user_id, make_measurements(1, start=10))
+
+        # Assert
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "5"
+        assert asyncio.run(queue.pending_rows()) == 5
+
+    def test_other_users_batch_is_not_found(self, queue, user_id):
+        """他のユーザーのbatch_id、存在しないbatch_idは404を返す"""
+        # Arrange
+        batch_id = post_async(user_id, make_measurements(1)).json()["batch_id"]
+
+        # Act
+        other = get_status(f"{user_id}_other", batch_id)
+        missing = get_status(user_id, "missing")
+
+        # Assert
+        assert other.status_code == 404
+        assert missing.status_code == 404
+
+    def test_idempotent_retry_returns_same_batch(self, queue, user_id):
+        """Idempotency-Keyを指定した再送には同じbatch_idを返し、キューに入れ直さない"""
+        # Arrange
+        headers = {**auth_headers(user_id), **ASYNC_HEADERS, "Idempotency-Key": "async-retry"}
+        measurements = make_measurements(2)
+
+        # Act
+        first = client.post("/v1/measurements/bulk", json=measurements, headers=headers)
+        retry = client.post("/v1/measurements/bulk", json=measurements, headers=headers)
+
+        # Assert
+        assert retry.status_code == 202
+        assert retry.headers["idempotent-replayed"] == "true"
+        assert retry.json()["batch_id"] == first.json()["batch_id"]
+        assert asyncio.run(queue.pending_rows()) == 2
+
+
+class TestMeasurementsAsyncDisabled:
+    """非同期登録が無効な場合のテスト"""
+
+    def test_respond_async_is_ignored(self, user_id):
+        """respond-asyncを指定しても同期的に登録し、状態確認は404を返す"""
+        # Act
+        response = post_async(user_id, make_measurements(1))
+        status = get_status(user_id, "any")
+
+        # Assert
+        assert response.status_code == 201
+        assert "preference-applied" not in response.headers
+        assert status.status_code == 404
@@ -0,0 +1,261 @@
+"""
+読み取りAPIのレスポンスキャッシュのテスト
+
+GET /v1/measurements/summary・/v1/measurements・/v1/measurements/series のテスト
+- 正常系：ETagの付与、If-None-Matchによる304、キャッシュからの応答
+- 無効化：同じメトリックタイプ・日の登録でETagと内容が変わり、他のメトリックタイプ・日の登録では変わらない
+- CACHE_BACKEND=none：ETagを付与しない
+- キャッシュの障害：登録・読み取りともにキャッシュを使わずに応答する
+"""
+
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from api.v1.dependencies.cache import get_response_cache
+from fastapi.testclient import TestClient
+from src.main import app
+from tests.conftest import auth_headers
+
+client = TestClient(app)
+
+END = datetime(2024, 5, 20, 12, 30, tzinfo=UTC)
+
+
+def post_measurements(user_id: str, rows: list[tuple[str, float, datetime]]) -> None:
+    """(メトリックタイプ, 値, 測定日時)の行を一括登録する"""
+    units = {"heart_rate": "bpm", "steps": "steps"}
+    response = client.post(
+        "/v1/measurements/bulk",
+        json=[
+            {"metric_type": metric_type, "value": value, "unit": units[metric_type],
+             "measured_at": measured_at.isoformat()}
+            for metric_type, value, measured_at in rows
+        ],
+        headers=auth_headers(user_id),
+    )
+    assert response.status_code == 201
+
+
+def cache_requests(endpoint: str, result: str) -> float:
+    """メトリクス出力からレスポンスキャッシュの結果ごとのリクエスト数を取得（存在しない場合は0）"""
+    sample = f'response_cache_requests_total{{endpoint="{endpoint}",result="{result}"}}'
+    for line in client.get("/metrics").text.splitlines():
+        if line.startswith(sample + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+class TestMeasurementsCacheAPI:
+    """読み取りAPIのレスポンスキャッシュのテスト"""
+
+    @pytest.fixture
+    def user_id(self) -> str:
+        """心拍数を登録したユーザー"""
+        user_id = f"cache_user_{datetime.now(UTC).timestamp()}"
+        post_measurements(user_id, [("heart_rate", 60.0, END - timedelta(minutes=10))])
+        return user_id
+
+    def get_summary(self, user_id: str, headers: dict[str, str] | None = None, **params: str):
+        """サマリーAPIを呼び出す"""
+        return client.get(
+            "/v1/measurements/summary",
+            params={"end": END.isoformat(), **params},
+            headers={**auth_headers(user_id), **(headers or {})},
+        )
+
+    def test_second_request_is_served_from_cache(self, user_id):
+        """同じ条件の2回目のリクエストは同じETag・内容をキャッシュから返す"""
+        # Arrange
+        hits = cache_requests("summary", "hit")
+
+        # Act
+        first = self.get_summary(user_id, period="day")
+        second = self.get_summary(user_id, period="day")
+
+        # Assert
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert first.headers["etag"] == second.headers["etag"]
+        assert first.headers["cache-control"] == "private, no-cache"
+        assert second.headers["content-type"] == "application/json"
+        assert second.json() == first.json()
+        assert cache_requests("summary", "hit") == hits + 1
+
+    def test_if_none_match_returns_304(self, user_id):
+        """ETagが一致するIf-None-Matchには本文なしの304を返す"""
+        # Arrange
+        etag = self.get_summary(user_id, period="day").headers["etag"]
+
+        # Act
+        response = self.get_summary(user_id, {"If-None-Match": f'W/"other", {etag}'}, period="day")
+
+        # Assert
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+
+    def test_write_to_same_metric_day_changes_etag_and_summary(self, user_id):
+        """同じメトリックタイプ・日の登録後は、ETagが変わり新しい集計を返す"""
+        # Arrange
+        before = self.get_summary(user_id, period="day", metric_type="heart_rate")
+
+        # Act
+        post_measurements(user_id, [("heart_rate", 80.0, END - timedelta(minutes=20))])
+        stale = self.get_summary(
+            user_id, {"If-None-Match": before.headers["etag"]}, period="day", metric_type="heart_rate"
+        )
+
+        # Assert
+        assert before.json()["metrics"][0]["count"] == 1
+        assert stale.status_code == 200
+        assert stale.headers["etag"] != before.headers["etag"]
+        assert stale.json()["metrics"][0]["count"] == 2
+
+    def test_write_to_other_metric_or_day_keeps_etag(self, user_id):
+        """他のメトリックタイプ・範囲外の日の登録では、メトリックタイプで絞り込んだETagは変わらない"""
+        # Arrange
+        before = self.get_summary(user_id, period="day", metric_type="heart_rate")
+        unfiltered = self.get_summary(user_id, period="day")
+
+        # Act
+        post_measurements(user_id, [
+            ("steps", 1000.0, END - timedelta(minutes=30)),
+            ("heart_rate", 70.0, END - timedelta(days=10)),
+        ])
+        after = self.get_summary(user_id, period="day", metric_type="heart_rate")
+        unfiltered_after = self.get_summary(user_id, period="day")
+
+        # Assert
+        assert after.headers["etag"] == before.headers["etag"]
+        assert unfiltered_after.headers["etag"] != unfiltered.headers["etag"]
+        assert {metric["metric_type"] for metric in unfiltered_after.json()["metrics"]} == {
+            "heart_rate", "steps"
+        }
+
+    def test_stream_write_invalidates_list(self, user_id):
+        """NDJSONストリームでの登録後は一覧のETagが変わり、登録した行を返す"""
+        # Arrange
+        params = {"metric_type": "heart_rate"}
+        before = client.get("/v1/measurements", params=params, headers=auth_headers(user_id))
+
+        # Act
+        response = client.post(
+            "/v1/measurements/bulk/stream",
+            content=(
+                '{"metric_type": "heart_rate", "value": 90.0, "unit": "bpm", '
+                f'"measured_at": "{(END - timedelta(hours=1)).isoformat()}"}}\n'
+            ),
+            headers={**auth_headers(user_id), "Content-Type": "application/x-ndjson"},
+        )
+        after = client.get("/v1/measurements", params=params, headers=auth_headers(user_id))
+
+        # Assert
+        assert response.status_code == 201
+        assert after.headers["etag"] != before.headers["etag"]
+        assert len(before.json()["items"]) == 1
+        assert len(after.json()["items"]) == 2
+
+    def test_series_without_end_is_not_cached(self, user_id):
+        """endを省略した時系列は期間が毎回変わるためETagを付与しない"""
+        # Arrange
+        params = {"metric_type": "heart_rate", "start": (END - timedelta(days=1)).isoformat()}
+
+        # Act
+        open_ended = client.get("/v1/measurements/series", params=params, headers=auth_headers(user_id))
+        bounded = client.get(
+            "/v1/measurements/series",
+            params={**params, "end": END.isoformat()},
+            headers=auth_headers(user_id),
+        )
+
+        # Assert
+        assert open_ended.status_code == 200
+        assert "etag" not in open_ended.headers
+        assert bounded.status_code == 200
+        assert "etag" in bounded.headers
+
+    def test_errors_are_not_cached(self, user_id):
+        """エラーレスポンスはキャッシュしない"""
+        # Act
+        response = client.get(
+            "/v1/measurements", params={"cursor": "invalid"}, headers=auth_headers(user_id)
+        )
+
+        # Assert
+        assert response.status_code == 400
+        assert "etag" not in response.headers
+
+
+class TestMeasurementsCacheDisabled:
+    """CACHE_BACKEND=noneのテスト"""
+
+    @pytest.fixture(autouse=True)
+    def disable_cache(self) -> Iterator[None]:
+        """レスポンスキャッシュを無効にする"""
+        app.dependency_overrides[get_response_cache] = lambda: None
+        yield
+        app.dependency_overrides.pop(get_response_cache, None)
+
+    def test_responses_have_no_etag(self):
+        """キャッシュを無効にした場合はETagを付与せず、毎回集計する"""
+        # Arrange
+        user_id = f"cache_off_user_{datetime.now(UTC).timestamp()}"
+        post_measurements(user_id, [("heart_rate", 60.0, END)])
+
+        # Act
+        response = client.get(
+            "/v1/measurements/summary",
+            params={"period": "day", "end": END.isoformat()},
+            headers=auth_headers(user_id),
+        )
+
+        # Assert
+        assert response.status_code == 200
+        assert "etag" not in response.headers
+        assert response.json()["metrics"][0]["count"] == 1
+
+
+class FailingCache:
+    """すべての操作が失敗するレスポンスキャッシュ（Redisの障害を想定）"""
+
+    async def tag(self, *args, **kwargs) -> str:
+        raise ConnectionError("cache is down")
+
+    async def get(self, *args, **kwargs) -> bytes | None:
+        raise ConnectionError("cache is down")
+
+    async def set(self, *args, **kwargs) -> None:
+        raise ConnectionError("cache is down")
+
+    async def invalidate_batch(self, *args, **kwargs) -> None:
+        raise ConnectionError("cache is down")
+
+
+class TestMeasurementsCacheFailure:
+    """キャッシュのバックエンドが失敗する場合のテスト"""
+
+    @pytest.fixture(autouse=True)
+    def failing_cache(self) -> Iterator[None]:
+        """レスポンスキャッシュを常に失敗させる"""
+        app.dependency_overrides[get_response_cache] = FailingCache
+        yield
+        app.dependency_overrides.pop(get_response_cache, None)
+
+    def test_ingest_and_reads_succeed_without_cache(self):
+        """登録は保存した結果を返し、読み取りはキャッシュを使わずに集計する"""
+        # Arrange
+        user_id = f"cache_down_user_{datetime.now(UTC).timestamp()}"
+
+        # Act
+        post_measurements(user_id, [("heart_rate", 60.0, END)])
+        response = client.get(
+            "/v1/measurements/summary",
+            params={"period": "day", "end": END.isoformat()},
+            headers=auth_headers(user_id),
+        )
+
+        # Assert
+        assert response.status_code == 200
+        assert "etag" not in response.headers
+        assert response.json()["metrics"][0]["count"] == 1
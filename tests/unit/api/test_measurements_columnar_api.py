@@ -0,0 +1,323 @@
+"""
+測定データの列指向バイナリ形式による一括登録のテスト
+
+POST /v1/measurements/bulk/columnar と schemas.requests.measurement_columnar のテスト
+- 形式: エンコード・デコードの往復、形式として不正なボディ（ColumnarFormatError）
+- 正常系: JSONの一括登録と同じ登録結果・エラー詳細、簡易レスポンス、圧縮したボディ、
+  Idempotency-Key、respond-async
+- 異常系: Content-Type（415）、不正なボディ（400）、空のボディ（400）
+"""
+import asyncio
+import gzip
+import struct
+import uuid
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from api.ingest_worker import IngestWorker
+from api.v1.dependencies.cache import get_response_cache
+from api.v1.dependencies.database import get_measurement_repository
+from api.v1.dependencies.queue import get_ingest_queue
+from fastapi.testclient import TestClient
+from infrastructure.queue import InMemoryIngestQueue
+from schemas.requests.measurement_columnar import (
+    COLUMNAR_MEDIA_TYPE,
+    ColumnarFormatError,
+    decode_columnar_measurements,
+)
+from src.main import app
+from tests.columnar_encoder import encode_columnar_measurements
+from tests.conftest import auth_headers
+
+client = TestClient(app)
+
+BASE = datetime(2024, 5, 20, 12, 0, tzinfo=UTC)
+COLUMNAR_PATH = "/v1/measurements/bulk/columnar"
+
+
+def make_measurements() -> list[dict]:
+    """有効な行とスキーマ・ドメインルールに違反する行を含む測定データ"""
+    return [
+        {"metric_type": "heart_rate", "value": 72.0, "unit": "bpm",
+         "measured_at": BASE.isoformat(), "device_id": "apple_watch_001"},
+        {"metric_type": "heart_rat", "value": 72.0, "unit": "bpm",
+         "measured_at": (BASE + timedelta(seconds=1)).isoformat()},
+        {"metric_type": "heart_rate", "value": 900.0, "unit": "bpm",
+         "measured_at": (BASE + timedelta(seconds=2)).isoformat()},
+        {"metric_type": "body_weight", "value": 70.5, "unit": "stone",
+         "measured_at": (BASE + timedelta(seconds=3)).isoformat(), "notes": "after breakfast"},
+        {"metric_type": "heart_rate", "value": 61.0, "unit": "bpm",
+         "measured_at": (BASE + timedelta(seconds=4)).isoformat(), "metadata": ["not", "an", "object"]},
+        {"metric_type": "steps", "value": 0.0, "unit": "steps",
+         "measured_at": (BASE + timedelta(seconds=5)).isoformat(), "device_id": "iphone_14",
+         "metadata": {"source": "HealthKit"}, "notes": "walk"},
+        {"metric_type": "heart_rate", "value": -5.0, "unit": "bpm",
+         "measured_at": (datetime.now(UTC) + timedelta(days=1)).isoformat()},
+    ]
+
+
+def post_columnar(user_id: str, body: bytes, **headers: str):
+    """列指向バイナリ形式で一括登録する"""
+    return client.post(
+        COLUMNAR_PATH,
+        content=body,
+        headers={**auth_headers(user_id), "Content-Type": COLUMNAR_MEDIA_TYPE, **headers},
+    )
+
+
+def without_generated_fields(measurements: list[dict]) -> list[dict]:
+    """採番したID・登録日時を除いた登録データ"""
+    return [
+        {name: value for name, value in measurement.items() if name not in ("id", "created_at")}
+        for measurement in measurements
+    ]
+
+
+@pytest.fixture
+def user_id() -> str:
+    """テストごとに別のユーザー"""
+    return f"columnar_user_{uuid.uuid4().hex}"
+
+
+class TestColumnarFormat:
+    """列指向バイナリ形式のエンコード・デコードのテスト"""
+
+    def test_round_trip_restores_rows(self):
+        """エンコードしたボディをデコードすると、JSONと同じ形式の行に戻る"""
+        # Arrange
+        rows = make_measurements()[:-1]
+
+        # Act
+        columns = decode_columnar_measurements(encode_columnar_measurements(rows))
+
+        # Assert
+        assert len(columns) == len(rows)
+        assert columns.metric_types == ("heart_rate", "heart_rat", "body_weight", "steps")
+        assert columns.device_ids == ("apple_watch_001", "iphone_14")
+        assert columns.to_rows() == rows
+
+    def test_columns_are_read_without_copy(self):
+        """数値の列はボディのバッファを参照する"""
+        columns = decode_columnar_measurements(encode_columnar_measurements(make_measurements()))
+
+        assert not columns.values.flags.owndata
+        assert columns.values.tolist()[:3] == [72.0, 72.0, 900.0]
+
+    def test_timestamp_outside_datetime_range_is_kept_as_epoch_ms(self):
+        """datetimeで表せない測定日時はエポックミリ秒のまま行に戻す"""
+        body = encode_columnar_measurements(
+            [{"metric_type": "heart_rate", "value": 70.0, "unit": "bpm", "measured_at": 10**16}]
+        )
+
+        assert decode_columnar_measurements(body).to_rows()[0]["measured_at"] == 10**16
+
+    @pytest.mark.parametrize(
+        ("mutate", "message"),
+        [
+            (lambda body: b"XXXX" + body[4:], "Not a columnar measurements body"),
+            (lambda body: body[:4] + b"\x02" + body[5:], "Unsupported columnar format version"),
+            (lambda body: body[:-3], "truncated"),
+            (lambda body: body + b"\0", "Unexpected data"),
+            # メトリックコード（辞書は1件）を範囲外にする。末尾はu8・u16・u16・f64・i64の列とextrasの長さ
+            (lambda body: body[:-25] + b"\x05" + body[-24:], "refers outside"),
+        ],
+        ids=["magic", "version", "truncated", "trailing", "code"],
+    )
+    def test_malformed_body_raises_format_error(self, mutate, message):
+        """形式として不正なボディはColumnarFormatErrorとする"""
+        # Arrange
+        row = {"metric_type": "heart_rate", "value": 70.0, "unit": "bpm", "measured_at": BASE}
+        body = encode_columnar_measurements([row])
+
+        # Act / Assert
+        with pytest.raises(ColumnarFormatError, match=message):
+            decode_columnar_measurements(mutate(body))
+
+    def test_extras_must_reference_rows(self):
+        """extrasの行番号は行の範囲内で重複しないこと"""
+        # Arrange
+        body = encode_columnar_measurements([
+            {"metric_type": "heart_rate", "value": 70.0, "unit": "bpm", "measured_at": BASE, "notes": "a"}
+        ])
+        extras = b'[{"index":1,"notes":"a"}]'
+        corrupted = body[:-struct.calcsize("<I") - len(b'[{"index":0,"notes":"a"}]')] + struct.pack(
+            "<I", len(extras)
+        ) + extras
+
+        # Act / Assert
+        with pytest.raises(ColumnarFormatError, match="unique row index"):
+            decode_columnar_measurements(corrupted)
+
+
+class TestColumnarBulkCreate:
+    """POST /v1/measurements/bulk/columnar のテスト"""
+
+    def test_result_matches_json_bulk_create(self, user_id):
+        """JSONの一括登録と同じ登録データ・エラー詳細を返す"""
+        # Arrange
+        rows = make_measurements()
+
+        # Act
+        json_response = client.post(
+            "/v1/measurements/bulk", json=rows, headers=auth_headers(f"{user_id}_json")
+        )
+        columnar_response = post_columnar(user_id, encode_columnar_measurements(rows))
+
+        # Assert
+        assert columnar_response.status_code == json_response.status_code == 207
+        json_data = json_response.json()
+        columnar_data = columnar_response.json()
+        assert columnar_data["errors"] == json_data["errors"]
+        assert [error["index"] for error in columnar_data["errors"]] == [1, 2, 3, 4, 6, 6]
+        assert columnar_data["success_count"] == json_data["success_count"] == 2
+        assert without_generated_fields(columnar_data["measurements"]) == without_generated_fields(
+            json_data["measurements"]
+        )
+
+    def test_too_long_device_id_is_reported_as_schema_error(self, user_id):
+        """カラム長を超えるデバイスIDはJSONの一括登録と同じくdevice_idのスキーマエラーとする"""
+        # Arrange
+        rows = [
+            {"metric_type": "heart_rate", "value": 70.0, "unit": "bpm", "measured_at": BASE.isoformat(),
+             "device_id": "watch"},
+            {"metric_type": "heart_rate", "value": 71.0, "unit": "bpm", "measured_at": BASE.isoformat(),
+             "device_id": "d" * 256},
+        ]
+
+        # Act
+        json_response = client.post(
+            "/v1/measurements/bulk", json=rows, headers=auth_headers(f"{user_id}_json")
+        )
+        columnar_response = post_columnar(user_id, encode_columnar_measurements(rows))
+
+        # Assert
+        assert columnar_response.status_code == json_response.status_code == 207
+        errors = columnar_response.json()["errors"]
+        assert errors == json_response.json()["errors"]
+        assert [(error["index"], error["field"]) for error in errors] == [(1, "device_id")]
+
+    def test_timestamp_outside_datetime_range_is_reported_as_schema_error(self, user_id):
+        """datetimeで表せない測定日時はmeasured_atのスキーマエラーとする"""
+        # Arrange
+        body = encode_columnar_measurements([
+            {"metric_type": "heart_rate", "value": 70.0, "unit": "bpm", "measured_at": BASE},
+            {"metric_type": "heart_rate", "value": 70.0, "unit": "bpm", "measured_at": 10**16},
+        ])
+
+        # Act
+        response = post_columnar(user_id, body)
+
+        # Assert
+        assert response.status_code == 207
+        assert [(error["index"], error["field"]) for error in response.json()["errors"]] == [
+            (1, "measured_at")
+        ]
+
+    def test_minimal_response_returns_ids(self, user_id):
+        """Prefer: return=minimal では採番したIDのみを返す"""
+        rows = make_measurements()[:1]
+
+        response = post_columnar(user_id, encode_columnar_measurements(rows), Prefer="return=minimal")
+
+        assert response.status_code == 201
+        assert response.headers["preference-applied"] == "return=minimal"
+        assert len(response.json()["ids"]) == 1
+
+    def test_all_invalid_rows_return_422(self, user_id):
+        """すべての行が失敗した場合は422"""
+        rows = make_measurements()[1:3]
+
+        response = post_columnar(user_id, encode_columnar_measurements(rows))
+
+        assert response.status_code == 422
+        assert [error["index"] for error in response.json()["detail"]] == [0, 1]
+
+    def test_compressed_body_is_ingested(self, user_id):
+        """gzipで圧縮した列指向のボディも展開して登録する"""
+        rows = [
+            {"metric_type": "heart_rate", "value": 60.0 + i % 40, "unit": "bpm",
+             "measured_at": BASE + timedelta(seconds=i), "device_id": "apple_watch_001"}
+            for i in range(500)
+        ]
+
+        response = post_columnar(
+            user_id, gzip.compress(encode_columnar_measurements(rows)), **{"Content-Encoding": "gzip"}
+        )
+
+        assert response.status_code == 201
+        assert response.json()["success_count"] == 500
+
+    def test_idempotency_key_replays_first_response(self, user_id):
+        """同じIdempotency-Keyの再送には最初のレスポンスを返す"""
+        # Arrange
+        body = encode_columnar_measurements(make_measurements()[:1])
+        first = post_columnar(user_id, body, **{"Idempotency-Key": "columnar-1"})
+
+        # Act
+        second = post_columnar(user_id, body, **{"Idempotency-Key": "columnar-1"})
+
+        # Assert
+        assert second.headers["idempotent-replayed"] == "true"
+        assert second.content == first.content
+
+    def test_wrong_content_type_returns_415(self, user_id):
+        """列指向のメディアタイプ以外は415"""
+        response = client.post(
+            COLUMNAR_PATH,
+            content=encode_columnar_measurements(make_measurements()),
+            headers={**auth_headers(user_id), "Content-Type": "application/octet-stream"},
+        )
+
+        assert response.status_code == 415
+
+    def test_malformed_body_returns_400(self, user_id):
+        """形式として不正なボディは400"""
+        response = post_columnar(user_id, b"HSMC\x01")
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Columnar body is truncated"
+
+    def test_empty_body_returns_400(self, user_id):
+        """行のないボディは400"""
+        response = post_columnar(user_id, encode_columnar_measurements([]))
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Measurements array cannot be empty"
+
+    def test_unauthenticated_request_returns_401(self):
+        """認証がない場合は401"""
+        response = client.post(
+            COLUMNAR_PATH,
+            content=encode_columnar_measurements(make_measurements()),
+            headers={"Content-Type": COLUMNAR_MEDIA_TYPE},
+        )
+
+        assert response.status_code == 401
+
+
+@pytest.fixture
+def queue() -> Iterator[InMemoryIngestQueue]:
+    """非同期登録を有効にし、テスト用のキューを使う"""
+    ingest_queue = InMemoryIngestQueue()
+    app.dependency_overrides[get_ingest_queue] = lambda: ingest_queue
+    yield ingest_queue
+    app.dependency_overrides.pop(get_ingest_queue, None)
+
+
+def test_respond_async_enqueues_rows(user_id, queue):
+    """respond-asyncの場合はJSONと同じ形式の行としてキューに入れ、ワーカーが保存する"""
+    # Arrange
+    rows = make_measurements()[:2]
+
+    # Act
+    response = post_columnar(user_id, encode_columnar_measurements(rows), Prefer="respond-async")
+    worker = IngestWorker(queue, get_measurement_repository(), cache=get_response_cache())
+    asyncio.run(worker.run_once())
+    status = client.get(response.headers["location"], headers=auth_headers(user_id))
+
+    # Assert
+    assert response.status_code == 202
+    assert response.json()["accepted_count"] == 1
+    assert status.json()["status"] == "completed"
+    assert status.json()["success_count"] == 1
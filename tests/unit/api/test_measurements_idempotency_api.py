@@ -0,0 +1,162 @@
+"""
+測定データ一括登録APIの冪等性のテスト
+
+POST /v1/measurements/bulk の再送に関するテスト
+- Idempotency-Keyを指定した再送には最初のレスポンスをそのまま返す
+- 登録済みの測定と重複する行は保存せず、duplicate_countとして報告する
+"""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from src.main import app
+from tests.conftest import auth_headers
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def headers() -> dict[str, str]:
+    """テストごとに別ユーザーの認証ヘッダー（登録済みの測定が重ならないようにする）"""
+    return auth_headers(f"idempotency_user_{uuid.uuid4().hex}")
+
+
+def make_measurements(count: int, start: int = 0) -> list[dict]:
+    """1分間隔の心拍数データ"""
+    base = datetime(2024, 1, 1, 12, 0, tzinfo=UTC)
+    return [
+        {
+            "metric_type": "heart_rate",
+            "value": 70.0 + i,
+            "unit": "bpm",
+            "measured_at": (base + timedelta(minutes=i)).isoformat(),
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def summary_count(headers: dict[str, str]) -> int:
+    """2024-01-01の日次サマリーの件数"""
+    response = client.get(
+        "/v1/measurements/summary",
+        params={"period": "day", "end": "2024-01-01T23:59:59Z"},
+        headers=headers,
+    )
+    return sum(metric["count"] for metric in response.json()["metrics"])
+
+
+class TestIdempotencyKey:
+    """Idempotency-Keyのテスト"""
+
+    def test_retry_replays_first_response(self, headers):
+        """同じキーの再送には最初のレスポンスをそのまま返し、再登録しない"""
+        # Arrange
+        body = make_measurements(3)
+        key_headers = {**headers, "Idempotency-Key": "upload-1"}
+
+        # Act
+        first = client.post("/v1/measurements/bulk", json=body, headers=key_headers)
+        retry = client.post("/v1/measurements/bulk", json=body, headers=key_headers)
+
+        # Assert
+        assert first.status_code == retry.status_code == 201
+        assert retry.content == first.content
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        assert "Idempotent-Replayed" not in first.headers
+        assert summary_count(headers) == 3
+
+    def test_replay_keeps_status_and_preference_header(self, headers):
+        """部分失敗（207）とPreference-Appliedも最初のレスポンスのまま返す"""
+        # Arrange
+        body = make_measurements(2) + [{"metric_type": "heart_rate", "value": 999.0, "unit": "bpm",
+                                        "measured_at": "2024-01-01T13:00:00Z"}]
+        key_headers = {**headers, "Idempotency-Key": "upload-2", "Prefer": "return=minimal"}
+
+        # Act
+        first = client.post("/v1/measurements/bulk", json=body, headers=key_headers)
+        retry = client.post("/v1/measurements/bulk", json=body, headers=key_headers)
+
+        # Assert
+        assert first.status_code == retry.status_code == 207
+        assert retry.json() == first.json()
+        assert retry.headers["Preference-Applied"] == "return=minimal"
+
+    def test_key_reused_with_different_body_is_rejected(self, headers):
+        """同じキーを異なるリクエストボディで使った場合は422"""
+        # Arrange
+        key_headers = {**headers, "Idempotency-Key": "upload-3"}
+        client.post("/v1/measurements/bulk", json=make_measurements(2), headers=key_headers)
+
+        # Act
+        response = client.post("/v1/measurements/bulk", json=make_measurements(3), headers=key_headers)
+
+        # Assert
+        assert response.status_code == 422
+        assert "different request body" in response.json()["detail"]
+
+    def test_failed_request_does_not_consume_key(self, headers):
+        """すべて失敗したリクエストのキーは保存されず、修正したリクエストで再利用できる"""
+        # Arrange
+        key_headers = {**headers, "Idempotency-Key": "upload-4"}
+        invalid = [{"metric_type": "heart_rate", "value": 999.0, "unit": "bpm",
+                    "measured_at": "2024-01-01T13:00:00Z"}]
+
+        # Act
+        failed = client.post("/v1/measurements/bulk", json=invalid, headers=key_headers)
+        fixed = client.post("/v1/measurements/bulk", json=make_measurements(1), headers=key_headers)
+
+        # Assert
+        assert failed.status_code == 422
+        assert fixed.status_code == 201
+
+    def test_too_long_key_is_rejected(self, headers):
+        """255文字を超えるキーは422"""
+        # Act
+        response = client.post(
+            "/v1/measurements/bulk", json=make_measurements(1),
+            headers={**headers, "Idempotency-Key": "k" * 256},
+        )
+
+        # Assert
+        assert response.status_code == 422
+
+
+class TestMeasurementDeduplication:
+    """登録済みの測定との重複排除のテスト"""
+
+    def test_overlapping_resend_stores_only_new_rows(self, headers):
+        """期間が重なる再送では新しい行のみを登録し、サマリーにも二重計上しない"""
+        # Arrange
+        client.post("/v1/measurements/bulk", json=make_measurements(3), headers=headers)
+
+        # Act
+        response = client.post("/v1/measurements/bulk", json=make_measurements(4, start=1), headers=headers)
+
+        # Assert
+        assert response.status_code == 201
+        data = response.json()
+        assert (data["success_count"], data["duplicate_count"], data["failed_count"]) == (2, 2, 0)
+        assert [m["measured_at"] for m in data["measurements"]] == [
+            "2024-01-01T12:03:00Z", "2024-01-01T12:04:00Z"
+        ]
+        assert summary_count(headers) == 5
+
+    def test_resend_of_stored_rows_is_not_an_error(self, headers):
+        """すべて登録済みの再送は失敗ではなく201で、何も登録しない"""
+        # Arrange
+        client.post("/v1/measurements/bulk", json=make_measurements(2), headers=headers)
+
+        # Act
+        response = client.post(
+            "/v1/measurements/bulk", params={"response": "minimal"},
+            json=make_measurements(2), headers=headers,
+        )
+
+        # Assert
+        assert response.status_code == 201
+        assert response.json() == {
+            "success_count": 0, "failed_count": 0, "duplicate_count": 2, "ids": [], "errors": None
+        }
+        assert summary_count(headers) == 2
@@ -0,0 +1,153 @@
+"""
+測定データ一覧APIのテスト
+
+GET /v1/measurements のテスト
+- 正常系：キーセットページネーション、絞り込み、フィールド選択、並び順
+- 異常系：不正なカーソル・フィールド、認証なし
+"""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from src.main import app
+from tests.conftest import auth_headers
+
+client = TestClient(app)
+
+
+class TestMeasurementsListAPI:
+    """測定データ一覧APIのテスト"""
+
+    @pytest.fixture
+    def seeded_user(self) -> tuple[str, datetime]:
+        """心拍数5件（2台のデバイス）と歩数2件を登録したユーザー"""
+        user_id = f"list_user_{uuid.uuid4().hex}"
+        end = datetime(2024, 5, 20, 12, 0, tzinfo=UTC)
+        measurements_data = [
+            {"metric_type": "heart_rate", "value": 60.0 + i, "unit": "bpm",
+             "measured_at": (end - timedelta(minutes=i)).isoformat(), "device_id": f"watch_{i % 2}"}
+            for i in range(5)
+        ] + [
+            {"metric_type": "steps", "value": 1000.0 * (i + 1), "unit": "steps",
+             "measured_at": (end - timedelta(hours=i + 1)).isoformat()}
+            for i in range(2)
+        ]
+        response = client.post("/v1/measurements/bulk", json=measurements_data, headers=auth_headers(user_id))
+        assert response.status_code == 201
+        return user_id, end
+
+    def list_measurements(self, user_id: str, **params: str | int):
+        """一覧APIを呼び出す"""
+        return client.get("/v1/measurements", params=params, headers=auth_headers(user_id))
+
+    def test_pages_follow_cursor_without_gaps(self, seeded_user):
+        """next_cursorをたどると全件を新しい順に重複なく取得できる"""
+        # Arrange
+        user_id, _ = seeded_user
+        items: list[dict] = []
+        cursors = []
+        params: dict[str, str | int] = {"limit": 3}
+
+        # Act
+        while True:
+            response = self.list_measurements(user_id, **params)
+            assert response.status_code == 200
+            data = response.json()
+            items.extend(data["items"])
+            cursors.append(data["next_cursor"])
+            if data["next_cursor"] is None:
+                break
+            params["cursor"] = data["next_cursor"]
+
+        # Assert
+        assert len(cursors) == 3
+        assert len({item["id"] for item in items}) == 7
+        measured_at = [item["measured_at"] for item in items]
+        assert measured_at == sorted(measured_at, reverse=True)
+        assert set(items[0]) == {
+            "id", "metric_type", "value", "unit", "measured_at",
+            "device_id", "metadata", "notes", "created_at",
+        }
+
+    def test_filters_by_metric_type_device_and_range(self, seeded_user):
+        """メトリックタイプ・デバイスID・期間で絞り込める"""
+        # Arrange
+        user_id, end = seeded_user
+
+        # Act
+        response = self.list_measurements(
+            user_id,
+            metric_type="heart_rate",
+            device_id="watch_0",
+            start=(end - timedelta(minutes=3)).isoformat(),
+            end=end.isoformat(),
+        )
+
+        # Assert
+        assert response.status_code == 200
+        # 終端は含まないため、endちょうどの1件（watch_0）は除かれる
+        assert [item["value"] for item in response.json()["items"]] == [62.0]
+
+    def test_fields_limit_returned_keys(self, seeded_user):
+        """fieldsで指定したフィールドのみを返す"""
+        # Arrange
+        user_id, _ = seeded_user
+
+        # Act
+        response = self.list_measurements(user_id, fields="value, measured_at", metric_type="steps")
+
+        # Assert
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert items == [
+            {"value": 1000.0, "measured_at": "2024-05-20T11:00:00Z"},
+            {"value": 2000.0, "measured_at": "2024-05-20T10:00:00Z"},
+        ]
+
+    def test_ascending_order(self, seeded_user):
+        """order=ascで古い順に取得でき、カーソルも同じ向きに進む"""
+        # Arrange
+        user_id, _ = seeded_user
+        first = self.list_measurements(user_id, order="asc", limit=2, fields="value").json()
+
+        # Act
+        second = self.list_measurements(
+            user_id, order="asc", limit=2, fields="value", cursor=first["next_cursor"]
+        ).json()
+
+        # Assert
+        assert [item["value"] for item in first["items"]] == [2000.0, 1000.0]
+        assert [item["value"] for item in second["items"]] == [64.0, 63.0]
+
+    def test_other_users_data_is_not_returned(self, seeded_user):
+        """他のユーザーのデータは返らない"""
+        response = self.list_measurements(f"list_other_{uuid.uuid4().hex}")
+
+        assert response.status_code == 200
+        assert response.json() == {"items": [], "next_cursor": None}
+
+    @pytest.mark.parametrize("params", [
+        {"cursor": "not-a-cursor"},
+        # IDがUUIDでないカーソル（["2024-01-01T00:00:00Z","not-a-uuid"]）
+        {"cursor": "WyIyMDI0LTAxLTAxVDAwOjAwOjAwWiIsIm5vdC1hLXV1aWQiXQ"},
+        {"fields": "value,password"},
+    ])
+    def test_invalid_cursor_or_fields_returns_400(self, params):
+        """不正なカーソル・未知のフィールドで400エラーが返る"""
+        response = self.list_measurements("list_user", **params)
+
+        assert response.status_code == 400
+
+    def test_limit_out_of_range_returns_422(self):
+        """上限を超えるlimitで422エラーが返る"""
+        response = self.list_measurements("list_user", limit=1001)
+
+        assert response.status_code == 422
+
+    def test_list_without_auth_returns_401(self):
+        """認証なしでアクセスすると401エラーが返る"""
+        response = client.get("/v1/measurements")
+
+        assert response.status_code == 401
@@ -0,0 +1,93 @@
+"""
+測定データ一括登録APIの簡易レスポンスのテスト
+
+POST /v1/measurements/bulk?response=minimal / Prefer: return=minimal のテスト
+- 登録データの代わりに件数・エラー・採番したIDのみを返す
+- クエリパラメータがPreferヘッダーより優先される
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from src.main import app
+from tests.conftest import auth_headers
+
+client = TestClient(app)
+USER_ID = "minimal_user"
+
+
+def make_measurements(invalid: bool = False) -> list[dict]:
+    """有効な2件（invalid=Trueの場合は範囲外の1件を間に追加）"""
+    measured_at = (datetime.now(UTC) - timedelta(minutes=5)).isoformat()
+    rows = [
+        {"metric_type": "heart_rate", "value": 72.0, "unit": "bpm", "measured_at": measured_at},
+        {"metric_type": "steps", "value": 1200.0, "unit": "steps", "measured_at": measured_at},
+    ]
+    if invalid:
+        rows.insert(1, {"metric_type": "heart_rate", "value": 300.0, "unit": "bpm", "measured_at": measured_at})
+    return rows
+
+
+class TestMeasurementsBulkMinimalResponse:
+    """一括登録の簡易レスポンスのテスト"""
+
+    def test_query_parameter_returns_ids_instead_of_measurements(self):
+        """?response=minimal では登録データを返さず、採番したIDを返す"""
+        # Act
+        response = client.post(
+            "/v1/measurements/bulk", params={"response": "minimal"},
+            json=make_measurements(), headers=auth_headers(USER_ID),
+        )
+
+        # Assert
+        assert response.status_code == 201
+        data = response.json()
+        assert set(data) == {"success_count", "failed_count", "duplicate_count", "ids", "errors"}
+        assert data["success_count"] == 2
+        assert data["failed_count"] == 0
+        assert len(data["ids"]) == 2
+        assert len(set(data["ids"])) == 2
+        assert data["errors"] is None
+
+    def test_prefer_header_returns_minimal_response(self):
+        """Prefer: return=minimal で簡易レスポンスを返し、Preference-Appliedを付与する"""
+        # Act
+        response = client.post(
+            "/v1/measurements/bulk", json=make_measurements(invalid=True),
+            headers=auth_headers(USER_ID, Prefer="respond-async, return=minimal"),
+        )
+
+        # Assert
+        assert response.status_code == 207
+        assert response.headers["preference-applied"] == "return=minimal"
+        data = response.json()
+        assert "measurements" not in data
+        assert len(data["ids"]) == 2
+        assert data["failed_count"] == 1
+        assert data["errors"][0]["index"] == 1
+
+    def test_query_parameter_overrides_prefer_header(self):
+        """?response=full はPreferヘッダーより優先される"""
+        # Act
+        response = client.post(
+            "/v1/measurements/bulk", params={"response": "full"},
+            json=make_measurements(), headers=auth_headers(USER_ID, Prefer="return=minimal"),
+        )
+
+        # Assert
+        assert response.status_code == 201
+        assert "preference-applied" not in response.headers
+        assert len(response.json()["measurements"]) == 2
+
+    @pytest.mark.parametrize("mode", ["compact", ""])
+    def test_unknown_response_mode_returns_422(self, mode):
+        """未知のレスポンス形式は422を返す"""
+        # Act
+        response = client.post(
+            "/v1/measurements/bulk", params={"response": mode},
+            json=make_measurements(), headers=auth_headers(USER_ID),
+        )
+
+        # Assert
+        assert response.status_code == 422
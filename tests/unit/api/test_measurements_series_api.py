@@ -0,0 +1,114 @@
+"""
+測定データ時系列APIのテスト
+
+GET /v1/measurements/series のテスト
+- 正常系：LTTBによる間引き、min/max/avgバケット、点数がpoints以下の場合
+- 異常系：不正な期間・点数、認証なし
+"""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from src.main import app
+from tests.conftest import auth_headers
+
+client = TestClient(app)
+
+START = datetime(2024, 5, 1, tzinfo=UTC)
+
+
+class TestMeasurementsSeriesAPI:
+    """測定データ時系列APIのテスト"""
+
+    @pytest.fixture
+    def seeded_user(self) -> str:
+        """1日分（1分ごと）の心拍数と歩数1件を登録したユーザー"""
+        user_id = f"series_user_{uuid.uuid4().hex}"
+        measurements_data = [
+            {"metric_type": "heart_rate", "value": 150.0 if i == 700 else 60.0 + i % 20, "unit": "bpm",
+             "measured_at": (START + timedelta(minutes=i)).isoformat()}
+            for i in range(1440)
+        ] + [
+            {"metric_type": "steps", "value": 5000.0, "unit": "steps", "measured_at": START.isoformat()},
+        ]
+        response = client.post("/v1/measurements/bulk", json=measurements_data, headers=auth_headers(user_id))
+        assert response.status_code == 201
+        return user_id
+
+    def get_series(self, user_id: str, **params: str | int):
+        """時系列APIを呼び出す"""
+        params.setdefault("start", START.isoformat())
+        params.setdefault("end", (START + timedelta(days=1)).isoformat())
+        return client.get("/v1/measurements/series", params=params, headers=auth_headers(user_id))
+
+    def test_lttb_downsamples_to_point_budget(self, seeded_user):
+        """LTTBでpoints点に間引き、先頭・末尾とピークを残す"""
+        # Act
+        response = self.get_series(seeded_user, metric_type="heart_rate", points=100)
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["metric_type"] == "heart_rate"
+        assert data["method"] == "lttb"
+        assert data["source_count"] == 1440
+        assert "buckets" not in data
+        points = data["points"]
+        assert len(points) == 100
+        assert points[0] == {"measured_at": "2024-05-01T00:00:00Z", "value": 60.0}
+        assert points[-1]["measured_at"] == "2024-05-01T23:59:00Z"
+        assert {"measured_at": "2024-05-01T11:40:00Z", "value": 150.0} in points
+
+    def test_minmax_returns_time_buckets(self, seeded_user):
+        """minmaxでは等幅の時間バケットごとの件数・最小・最大・平均を返す"""
+        # Act
+        response = self.get_series(seeded_user, metric_type="heart_rate", method="minmax", points=24)
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert "points" not in data
+        buckets = data["buckets"]
+        assert len(buckets) == 24
+        assert buckets[0] == {
+            "bucket_start": "2024-05-01T00:00:00Z", "count": 60, "avg": 69.5, "min": 60.0, "max": 79.0,
+        }
+        assert buckets[11]["max"] == 150.0
+        assert sum(bucket["count"] for bucket in buckets) == 1440
+
+    def test_small_series_is_returned_as_is(self, seeded_user):
+        """点数がpoints以下の場合はすべての点を返す"""
+        # Act
+        response = self.get_series(seeded_user, metric_type="steps")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["points"] == [{"measured_at": "2024-05-01T00:00:00Z", "value": 5000.0}]
+
+    def test_start_after_end_returns_400(self, seeded_user):
+        """開始が終了以降の場合は400エラーが返る"""
+        response = self.get_series(
+            seeded_user, metric_type="heart_rate", end=START.isoformat()
+        )
+
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize("params", [{"points": 2}, {"points": 5001}, {"method": "median"}, {}])
+    def test_invalid_parameters_return_422(self, params):
+        """点数・方式が範囲外、またはメトリックタイプがない場合は422エラーが返る"""
+        if params:
+            params["metric_type"] = "heart_rate"
+
+        response = self.get_series("series_user", **params)
+
+        assert response.status_code == 422
+
+    def test_series_without_auth_returns_401(self):
+        """認証なしでアクセスすると401エラーが返る"""
+        response = client.get(
+            "/v1/measurements/series", params={"metric_type": "heart_rate", "start": START.isoformat()}
+        )
+
+        assert response.status_code == 401
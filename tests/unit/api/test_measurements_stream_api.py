@@ -0,0 +1,146 @@
+"""
+測定データのストリーム一括登録APIのテスト
+
+POST /v1/measurements/bulk/stream のテスト（NDJSON）
+- 正常系：固定行数ごとのバッチ処理
+- 異常系：不正なJSON行、バリデーションエラー、Content-Type
+- エッジケース：空のストリーム、長すぎる行
+"""
+
+import json
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from src.main import app
+
+from core.config import get_settings
+from infrastructure.database.measurement_repository import MeasurementRepository
+from tests.conftest import auth_headers
+
+client = TestClient(app)
+
+NDJSON_HEADERS = {"Content-Type": "application/x-ndjson"}
+
+
+def stream_headers() -> dict[str, str]:
+    """NDJSONのストリーム登録用のヘッダー"""
+    return auth_headers("stream_user", **NDJSON_HEADERS)
+
+
+def to_ndjson(rows: list) -> bytes:
+    """行データをNDJSONに変換"""
+    return b"".join(json.dumps(row).encode() + b"\n" for row in rows)
+
+
+def heart_rate(value: float = 72.0) -> dict:
+    """心拍数の測定データ"""
+    return {
+        "metric_type": "heart_rate",
+        "value": value,
+        "unit": "bpm",
+        "measured_at": (datetime.now(UTC) - timedelta(minutes=1)).isoformat(),
+    }
+
+
+class TestMeasurementsBulkStreamAPI:
+    """ストリーム一括登録APIのテスト"""
+
+    @pytest.fixture
+    def batch_sizes(self, monkeypatch) -> list[int]:
+        """バッチサイズを3行にし、保存されたバッチの行数を記録する"""
+        monkeypatch.setattr(get_settings(), "bulk_stream_batch_size", 3)
+        sizes: list[int] = []
+        original = MeasurementRepository.bulk_insert
+
+        async def recording_bulk_insert(self, batch, on_stored=None):
+            sizes.append(len(batch))
+            return await original(self, batch, on_stored)
+
+        monkeypatch.setattr(MeasurementRepository, "bulk_insert", recording_bulk_insert)
+        return sizes
+
+    def test_stream_is_ingested_in_fixed_size_batches(self, batch_sizes):
+        """正常系：固定行数ごとにバリデーション・保存される"""
+        # Arrange
+        body = to_ndjson([heart_rate() for _ in range(7)])
+
+        # Act
+        response = client.post("/v1/measurements/bulk/stream", content=body, headers=stream_headers())
+
+        # Assert
+        assert response.status_code == 201
+        assert response.json() == {"success_count": 7, "failed_count": 0, "duplicate_count": 0, "errors": None}
+        assert batch_sizes == [3, 3, 1]
+
+    def test_stream_reports_errors_with_global_indexes(self, batch_sizes):
+        """一部無効な行がある場合、ストリーム全体でのインデックスで報告される"""
+        # Arrange
+        body = b"".join([
+            to_ndjson([heart_rate(), heart_rate(), heart_rate()]),
+            b"{not json}\n",
+            b"\n",  # 空行は無視される
+            to_ndjson([heart_rate(), heart_rate(300.0), {"metric_type": "steps"}]),
+        ])
+
+        # Act
+        response = client.post("/v1/measurements/bulk/stream", content=body, headers=stream_headers())
+
+        # Assert
+        assert response.status_code == 207
+        data = response.json()
+        assert data["success_count"] == 4
+        assert [error["index"] for error in data["errors"]] == [3, 5, 6, 6, 6]
+        assert data["errors"][0]["message"].startswith("Invalid JSON")
+        assert "Heart rate value 300.0 is out of range" in data["errors"][1]["message"]
+        assert data["failed_count"] == len(data["errors"])
+
+    def test_stream_without_trailing_newline(self):
+        """最終行に改行がなくても処理される"""
+        body = to_ndjson([heart_rate()]) + json.dumps(heart_rate()).encode()
+
+        response = client.post("/v1/measurements/bulk/stream", content=body, headers=stream_headers())
+
+        assert response.status_code == 201
+        assert response.json()["success_count"] == 2
+
+    def test_stream_with_all_invalid_rows_returns_422(self):
+        """すべての行が無効な場合は422エラー"""
+        body = to_ndjson([heart_rate(-1.0), "not an object"])
+
+        response = client.post("/v1/measurements/bulk/stream", content=body, headers=stream_headers())
+
+        assert response.status_code == 422
+        assert [error["index"] for error in response.json()["detail"]] == [0, 1]
+
+    def test_empty_stream_returns_400(self):
+        """空のストリームは400エラー"""
+        response = client.post("/v1/measurements/bulk/stream", content=b"\n\n", headers=stream_headers())
+
+        assert response.status_code == 400
+        assert "empty" in response.json()["detail"].lower()
+
+    def test_unsupported_content_type_returns_415(self):
+        """NDJSON以外のContent-Typeは415エラー"""
+        headers = {**stream_headers(), "Content-Type": "application/json"}
+
+        response = client.post("/v1/measurements/bulk/stream", content=b"[]", headers=headers)
+
+        assert response.status_code == 415
+
+    def test_too_long_line_returns_413(self, monkeypatch):
+        """最大長を超える行は413エラー（メモリ使用量の上限）"""
+        monkeypatch.setattr(get_settings(), "bulk_stream_max_line_bytes", 100)
+        body = json.dumps({**heart_rate(), "notes": "x" * 200}).encode()
+
+        response = client.post("/v1/measurements/bulk/stream", content=body, headers=stream_headers())
+
+        assert response.status_code == 413
+
+    def test_stream_without_auth_returns_401(self):
+        """認証なしでアクセスすると401エラー"""
+        response = client.post(
+            "/v1/measurements/bulk/stream", content=to_ndjson([heart_rate()]), headers=NDJSON_HEADERS
+        )
+
+        assert response.status_code == 401
@@ -0,0 +1,147 @@
+"""
+測定データサマリーAPIのテスト
+
+GET /v1/measurements/summary のテスト
+- 正常系：期間ごとの集計（day: 時間バケット, week/month: 日バケット）
+- 異常系：不正な期間指定、認証なし
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from src.main import app
+from tests.conftest import auth_headers
+
+client = TestClient(app)
+
+
+class TestMeasurementsSummaryAPI:
+    """測定データサマリーAPIのテスト"""
+
+    @pytest.fixture
+    def seeded_user(self) -> tuple[str, datetime]:
+        """心拍数と歩数を登録したユーザー"""
+        user_id = f"summary_user_{datetime.now(UTC).timestamp()}"
+        end = datetime(2024, 5, 20, 12, 30, tzinfo=UTC)
+        measurements_data = [
+            # 当日（同じ時間帯に2件）
+            {"metric_type": "heart_rate", "value": 60.0, "unit": "bpm",
+             "measured_at": (end - timedelta(minutes=10)).isoformat()},
+            {"metric_type": "heart_rate", "value": 80.0, "unit": "bpm",
+             "measured_at": (end - timedelta(minutes=20)).isoformat()},
+            # 3時間前
+            {"metric_type": "heart_rate", "value": 100.0, "unit": "bpm",
+             "measured_at": (end - timedelta(hours=3)).isoformat()},
+            # 3日前
+            {"metric_type": "heart_rate", "value": 120.0, "unit": "bpm",
+             "measured_at": (end - timedelta(days=3)).isoformat()},
+            {"metric_type": "steps", "value": 5000.0, "unit": "steps",
+             "measured_at": (end - timedelta(days=3)).isoformat()},
+            # 20日前
+            {"metric_type": "steps", "value": 8000.0, "unit": "steps",
+             "measured_at": (end - timedelta(days=20)).isoformat()},
+        ]
+        response = client.post("/v1/measurements/bulk", json=measurements_data, headers=auth_headers(user_id))
+        assert response.status_code == 201
+        return user_id, end
+
+    def get_summary(self, user_id: str, **params: str):
+        """サマリーAPIを呼び出す"""
+        return client.get("/v1/measurements/summary", params=params, headers=auth_headers(user_id))
+
+    def test_day_summary_merges_hour_buckets(self, seeded_user):
+        """dayは直近24時間の時間バケットを併合する"""
+        # Arrange
+        user_id, end = seeded_user
+
+        # Act
+        response = self.get_summary(user_id, period="day", end=end.isoformat())
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["granularity"] == "hour"
+        assert [metric["metric_type"] for metric in data["metrics"]] == ["heart_rate"]
+        heart_rate = data["metrics"][0]
+        assert heart_rate["count"] == 3
+        assert heart_rate["sum"] == 240.0
+        assert heart_rate["avg"] == 80.0
+        assert heart_rate["min"] == 60.0
+        assert heart_rate["max"] == 100.0
+        assert heart_rate["stddev"] == pytest.approx(16.3299, rel=1e-4)
+        assert [bucket["count"] for bucket in heart_rate["buckets"]] == [1, 2]
+
+    def test_week_summary_merges_day_buckets(self, seeded_user):
+        """weekは直近7日の日バケットを併合する"""
+        # Arrange
+        user_id, end = seeded_user
+
+        # Act
+        response = self.get_summary(user_id, period="week", end=end.isoformat())
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["granularity"] == "day"
+        metrics = {metric["metric_type"]: metric for metric in data["metrics"]}
+        assert metrics["heart_rate"]["count"] == 4
+        assert len(metrics["heart_rate"]["buckets"]) == 2
+        assert metrics["steps"]["count"] == 1
+
+    def test_month_summary_with_metric_filter(self, seeded_user):
+        """monthは直近30日を対象とし、メトリックタイプで絞り込める"""
+        # Arrange
+        user_id, end = seeded_user
+
+        # Act
+        response = self.get_summary(user_id, period="month", metric_type="steps", end=end.isoformat())
+
+        # Assert
+        assert response.status_code == 200
+        metrics = response.json()["metrics"]
+        assert len(metrics) == 1
+        assert metrics[0]["count"] == 2
+        assert metrics[0]["sum"] == 13000.0
+
+    def test_summary_separates_units(self):
+        """同じメトリックタイプでも単位が異なる値は混ぜずに単位ごとに集計する"""
+        # Arrange
+        user_id = f"summary_unit_user_{datetime.now(UTC).timestamp()}"
+        end = datetime(2024, 5, 20, 12, 30, tzinfo=UTC)
+        measurements_data = [
+            {"metric_type": "body_weight", "value": value, "unit": unit,
+             "measured_at": (end - timedelta(minutes=minutes)).isoformat()}
+            for value, unit, minutes in [(70.0, "kg", 5), (72.0, "kg", 15), (160.0, "lb", 25)]
+        ]
+        client.post("/v1/measurements/bulk", json=measurements_data, headers=auth_headers(user_id))
+
+        # Act
+        response = self.get_summary(user_id, period="day", end=end.isoformat())
+
+        # Assert
+        assert response.status_code == 200
+        metrics = response.json()["metrics"]
+        assert [(metric["unit"], metric["count"], metric["avg"]) for metric in metrics] == [
+            ("kg", 2, 71.0),
+            ("lb", 1, 160.0),
+        ]
+
+    def test_summary_without_data_returns_empty_metrics(self):
+        """データがないユーザーは空のサマリーを返す"""
+        response = self.get_summary("summary_empty_user", period="week")
+
+        assert response.status_code == 200
+        assert response.json()["metrics"] == []
+
+    def test_summary_with_invalid_period_returns_422(self):
+        """不正な期間指定で422エラーが返る"""
+        response = self.get_summary("summary_user", period="year")
+
+        assert response.status_code == 422
+
+    def test_summary_without_auth_returns_401(self):
+        """認証なしでアクセスすると401エラーが返る"""
+        response = client.get("/v1/measurements/summary", params={"period": "day"})
+
+        assert response.status_code == 401
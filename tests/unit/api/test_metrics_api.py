@@ -0,0 +1,81 @@
+"""
+メトリクスAPIのテスト
+
+GET /metrics のテスト
+- リクエストのレイテンシ・サイズがルートのテンプレートごとに記録される
+- 一括登録の行数・処理時間・失敗率が記録される
+"""
+
+from datetime import UTC, datetime, timedelta
+
+from fastapi.testclient import TestClient
+from src.main import app
+from tests.conftest import auth_headers
+
+client = TestClient(app)
+
+
+def sample_value(text: str, sample: str) -> float:
+    """メトリクス出力から指定したサンプルの値を取得（存在しない場合は0）"""
+    for line in text.splitlines():
+        if line.startswith(sample + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+class TestMetricsAPI:
+    """メトリクスAPIのテスト"""
+
+    def test_metrics_endpoint_returns_prometheus_text(self) -> None:
+        """Prometheusのテキスト形式で返す"""
+        # Act
+        response = client.get("/metrics")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE http_request_duration_seconds histogram" in response.text
+        assert "# TYPE auth_token_cache_hits_total counter" in response.text
+
+    def test_request_latency_is_recorded_per_route_and_status(self) -> None:
+        """レイテンシはパスではなくルートのテンプレートとステータスコードごとに記録される"""
+        # Arrange
+        sample = 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}'
+        before = sample_value(client.get("/metrics").text, sample)
+
+        # Act
+        client.get("/health")
+        client.get("/does-not-exist")
+        text = client.get("/metrics").text
+
+        # Assert
+        assert sample_value(text, sample) == before + 1
+        assert 'route="<unmatched>",status="404"' in text
+
+    def test_bulk_histograms_are_recorded(self) -> None:
+        """一括登録の行数・処理時間・失敗率が記録される"""
+        # Arrange
+        measured_at = (datetime.now(UTC) - timedelta(hours=1)).isoformat()
+        measurements_data = [
+            {"metric_type": "heart_rate", "value": 72.0, "unit": "bpm", "measured_at": measured_at},
+            {"metric_type": "heart_rate", "value": 900.0, "unit": "bpm", "measured_at": measured_at},
+        ]
+        text = client.get("/metrics").text
+        rows_before = sample_value(text, 'bulk_ingest_rows_sum{endpoint="bulk"}')
+        half_failed_before = sample_value(
+            text, 'bulk_ingest_failed_row_ratio_bucket{endpoint="bulk",le="0.5"}'
+        )
+
+        # Act
+        response = client.post("/v1/measurements/bulk", json=measurements_data, headers=auth_headers("metrics_user"))
+        text = client.get("/metrics").text
+
+        # Assert
+        assert response.status_code == 207
+        assert sample_value(text, 'bulk_ingest_rows_sum{endpoint="bulk"}') == rows_before + 2
+        assert sample_value(
+            text, 'bulk_ingest_failed_row_ratio_bucket{endpoint="bulk",le="0.5"}'
+        ) == half_failed_before + 1
+        assert 'bulk_ingest_validation_duration_seconds_count{endpoint="bulk"}' in text
+        assert 'bulk_ingest_persistence_duration_seconds_count{endpoint="bulk"}' in text
+        assert 'http_request_size_bytes_count{method="POST",route="/v1/measurements/bulk"}' in text
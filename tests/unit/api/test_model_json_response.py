@@ -0,0 +1,171 @@
+"""
+ModelJSONResponseのテスト
+
+モデルを直接シリアライズした結果が、FastAPIのデフォルト
+（response_modelによる変換とJSONResponse）とバイト単位で一致することを確認する。
+"""
+
+from datetime import UTC, datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from api.responses import ModelJSONResponse
+from domain.services.measurement_summary import BucketGranularity, SummaryPeriod
+from schemas.responses.measurement import (
+    MeasurementBulkCreateMinimalResponse,
+    MeasurementBulkCreateResponse,
+    MeasurementPageItemResponse,
+    MeasurementPageResponse,
+    MeasurementResponse,
+    MeasurementSummaryResponse,
+    MetricSummaryResponse,
+    SummaryBucketResponse,
+)
+
+JST = timezone(timedelta(hours=9))
+
+
+def make_bulk_response() -> MeasurementBulkCreateResponse:
+    """エンドポイントと同じくmodel_constructで組み立てた一括登録レスポンス"""
+    rows = [
+        {
+            "id": "a1",
+            "metric_type": "heart_rate",
+            "value": 72.0,
+            "unit": "bpm",
+            "measured_at": datetime(2024, 1, 1, 12, 0, tzinfo=UTC),
+            "device_id": "apple_watch",
+            "metadata": {"source": "HealthKit", "nested": {"values": [1, 2.5, None, True]}},
+            "notes": "安静時 ✓",
+            "created_at": datetime(2024, 1, 1, 12, 0, 0, 123456, tzinfo=UTC),
+        },
+        {
+            "id": "a2",
+            "metric_type": "steps",
+            "value": 1200.5,
+            "unit": "steps",
+            "measured_at": datetime(2024, 1, 1, 21, 30, tzinfo=JST),
+            "device_id": None,
+            "metadata": None,
+            "notes": 'quote " and \\ backslash\nnewline',
+            "created_at": datetime(2024, 1, 1, 12, 0, 1, tzinfo=UTC),
+        },
+    ]
+    return MeasurementBulkCreateResponse(
+        success_count=2,
+        failed_count=1,
+        measurements=[MeasurementResponse.model_construct(**row) for row in rows],
+        errors=[{"index": 1, "message": "値が範囲外です", "field": "value"}],
+    )
+
+
+def make_summary_response() -> MeasurementSummaryResponse:
+    """バケットと統計値を含むサマリーレスポンス"""
+    return MeasurementSummaryResponse(
+        period=SummaryPeriod.DAY,
+        granularity=BucketGranularity.HOUR,
+        start=datetime(2024, 1, 1, tzinfo=UTC),
+        end=datetime(2024, 1, 2, tzinfo=UTC),
+        metrics=[
+            MetricSummaryResponse(
+                metric_type="heart_rate",
+                unit="bpm",
+                count=3,
+                sum=216.0,
+                avg=72.0,
+                min=70.0,
+                max=74.0,
+                stddev=1.632993161855452,
+                buckets=[
+                    SummaryBucketResponse(
+                        bucket_start=datetime(2024, 1, 1, 12, tzinfo=UTC),
+                        count=3,
+                        avg=72.0,
+                        min=70.0,
+                        max=74.0,
+                    )
+                ],
+            )
+        ],
+    )
+
+
+RESPONSES: dict[str, BaseModel] = {
+    "bulk": make_bulk_response(),
+    "minimal": MeasurementBulkCreateMinimalResponse(
+        success_count=2, failed_count=0, ids=["a1", "a2"], errors=None
+    ),
+    "summary": make_summary_response(),
+}
+
+
+def build_client() -> TestClient:
+    """同じモデルをデフォルトのレスポンスとModelJSONResponseで返すアプリ"""
+    app = FastAPI()
+
+    for name, model in RESPONSES.items():
+        def default_endpoint(model: BaseModel = model) -> Any:
+            return model
+
+        def fast_endpoint(model: BaseModel = model) -> ModelJSONResponse:
+            return ModelJSONResponse(model)
+
+        app.get(f"/default/{name}", response_model=type(model))(default_endpoint)
+        app.get(f"/fast/{name}", response_model=type(model))(fast_endpoint)
+    return TestClient(app)
+
+
+client = build_client()
+
+
+class TestModelJSONResponse:
+    """ModelJSONResponseのテスト"""
+
+    @pytest.mark.parametrize("name", sorted(RESPONSES))
+    def test_body_matches_default_serialization(self, name: str):
+        """レスポンスボディがFastAPIのデフォルトとバイト単位で一致する"""
+        # Act
+        expected = client.get(f"/default/{name}")
+        actual = client.get(f"/fast/{name}")
+
+        # Assert
+        assert actual.status_code == expected.status_code == 200
+        assert actual.headers["content-type"] == expected.headers["content-type"]
+        assert actual.content == expected.content
+
+    def test_datetime_keeps_offset_and_uses_z_for_utc(self):
+        """UTCの日時はZ、それ以外はオフセット付きで出力される"""
+        # Act
+        body = ModelJSONResponse(RESPONSES["bulk"]).body
+
+        # Assert
+        assert b'"measured_at":"2024-01-01T12:00:00Z"' in body
+        assert b'"measured_at":"2024-01-01T21:30:00+09:00"' in body
+        assert b'"created_at":"2024-01-01T12:00:00.123456Z"' in body
+        assert "安静時 ✓".encode() in body
+
+    def test_renders_plain_content(self):
+        """モデル以外の値もJSONに変換できる"""
+        # Act
+        body = ModelJSONResponse({"detail": [{"index": 0, "message": "エラー"}]}).body
+
+        # Assert
+        assert body == '{"detail":[{"index":0,"message":"エラー"}]}'.encode()
+
+    def test_exclude_unset_omits_fields_not_constructed(self):
+        """exclude_unsetでは、入れ子のモデルも含めて設定したフィールドのみを出力する"""
+        # Arrange
+        page = MeasurementPageResponse(
+            items=[MeasurementPageItemResponse.model_construct({"value"}, value=72.0)],
+            next_cursor=None,
+        )
+
+        # Act
+        body = ModelJSONResponse(page, exclude_unset=True).body
+
+        # Assert
+        assert body == b'{"items":[{"value":72.0}],"next_cursor":null}'
@@ -0,0 +1,168 @@
+"""
+プロファイリングミドルウェアのテスト
+
+POST /v1/measurements/bulk の処理段階の計測
+- X-Profileヘッダー・サンプリングによるオプトイン
+- Server-Timingヘッダーと完了ログへの出力
+- cProfileの結果の保存
+"""
+import asyncio
+import pstats
+from datetime import UTC, datetime, timedelta
+
+import httpx
+import pytest
+import structlog
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from structlog.testing import LogCapture
+
+from api.middleware.profiling import ProfilingMiddleware
+from api.v1.endpoints import measurements
+from src.api.v1.dependencies.auth import create_access_token
+
+BULK_STAGES = [
+    "request_parsing",
+    "schema_validation",
+    "domain_validation",
+    "row_construction",
+    "persistence",
+    "goal_evaluation",
+    "response_construction",
+    "response_serialization",
+    "total",
+]
+
+
+def make_client(**options) -> TestClient:
+    """プロファイリングミドルウェアを組み込んだアプリのクライアント"""
+    app = FastAPI()
+    app.include_router(measurements.router)
+    app.add_middleware(ProfilingMiddleware, **options)
+    return TestClient(app)
+
+
+def post_bulk(client: TestClient, headers: dict[str, str] | None = None):
+    """測定データを1件一括登録する"""
+    token = create_access_token(data={"sub": "profiling_user", "email": "profile@example.com"})
+    measured_at = (datetime.now(UTC) - timedelta(hours=1)).isoformat()
+    return client.post(
+        "/v1/measurements/bulk",
+        json=[{"metric_type": "heart_rate", "value": 72.0, "unit": "bpm", "measured_at": measured_at}],
+        headers={"Authorization": f"Bearer {token}", **(headers or {})},
+    )
+
+
+def stage_names(server_timing: str) -> list[str]:
+    """Server-Timingヘッダーから段階名を取り出す"""
+    return [entry.split(";")[0] for entry in server_timing.split(", ")]
+
+
+class TestProfilingMiddleware:
+    """ProfilingMiddlewareのテスト"""
+
+    def test_profile_header_adds_server_timing_for_each_stage(self) -> None:
+        """X-Profileヘッダー付きのリクエストは各段階の所要時間をServer-Timingで返す"""
+        # Arrange
+        client = make_client(header_enabled=True)
+
+        # Act
+        response = post_bulk(client, {"X-Profile": "1"})
+
+        # Assert
+        assert response.status_code == 201
+        assert stage_names(response.headers["server-timing"]) == BULK_STAGES
+
+    @pytest.mark.parametrize(
+        "options, headers",
+        [
+            ({"header_enabled": True}, {}),
+            ({"header_enabled": False}, {"X-Profile": "1"}),
+            ({"header_enabled": True}, {"X-Profile": "0"}),
+        ],
+        ids=["no-header", "header-disabled", "header-off"],
+    )
+    def test_requests_are_not_profiled_without_opt_in(self, options, headers) -> None:
+        """オプトインしていないリクエストは計測しない"""
+        # Arrange
+        client = make_client(**options)
+
+        # Act
+        response = post_bulk(client, headers)
+
+        # Assert
+        assert response.status_code == 201
+        assert "server-timing" not in response.headers
+
+    def test_sampled_requests_are_profiled(self) -> None:
+        """サンプリングで選ばれたリクエストはヘッダーなしでも計測する"""
+        # Arrange
+        draws = iter([0.05, 0.5])
+        client = make_client(sample_rate=0.1, random_func=lambda: next(draws))
+
+        # Act
+        sampled = post_bulk(client)
+        skipped = post_bulk(client)
+
+        # Assert
+        assert "server-timing" in sampled.headers
+        assert "server-timing" not in skipped.headers
+
+    def test_completion_log_includes_stage_timings(self, monkeypatch) -> None:
+        """完了ログに段階ごとの所要時間（ミリ秒）が含まれる"""
+        # Arrange
+        capture = LogCapture()
+        monkeypatch.setattr(measurements, "logger", structlog.wrap_logger(None, processors=[capture]))
+        client = make_client(header_enabled=True, server_timing=False)
+
+        # Act
+        response = post_bulk(client, {"X-Profile": "1"})
+
+        # Assert
+        assert "server-timing" not in response.headers
+        completed = [e for e in capture.entries if e["event"] == "Bulk measurement creation completed"]
+        assert list(completed[0]["timings_ms"]) == BULK_STAGES[:-2]
+
+    def test_cprofile_dump_is_written(self, tmp_path) -> None:
+        """dump_dirを指定するとcProfileの結果が保存される"""
+        # Arrange
+        client = make_client(header_enabled=True, dump_dir=str(tmp_path / "profiles"))
+
+        # Act
+        post_bulk(client, {"X-Profile": "1"})
+
+        # Assert
+        dumps = list((tmp_path / "profiles").glob("*-POST-v1_measurements_bulk.prof"))
+        assert len(dumps) == 1
+        assert pstats.Stats(str(dumps[0])).total_calls > 0
+
+    async def test_overlapping_profiled_requests_do_not_fail(self, tmp_path) -> None:
+        """同時に処理中の計測対象リクエストがあっても失敗せず、cProfileは1つだけ動く"""
+        # Arrange
+        app = FastAPI()
+        release = asyncio.Event()
+
+        @app.get("/slow")
+        async def slow() -> dict[str, bool]:
+            await release.wait()
+            return {"ok": True}
+
+        app.add_middleware(
+            ProfilingMiddleware, header_enabled=True, dump_dir=str(tmp_path / "profiles")
+        )
+        transport = httpx.ASGITransport(app=app)
+
+        # Act
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            requests = [
+                asyncio.create_task(client.get("/slow", headers={"X-Profile": "1"}))
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0.05)
+            release.set()
+            responses = await asyncio.gather(*requests)
+
+        # Assert
+        assert [response.status_code for response in responses] == [200, 200]
+        assert all("server-timing" in response.headers for response in responses)
+        assert len(list((tmp_path / "profiles").glob("*.prof"))) == 1
@@ -0,0 +1,191 @@
+"""
+ユーザーごとのレート制限のテスト
+
+測定データAPIのリクエスト数と一括登録の行数の制限
+- 上限を超えたリクエストは429（Retry-After・RateLimit-*ヘッダー付き）
+- ユーザーごとに独立して制限する
+- 一括登録（JSON・列指向・ストリーム）は行数を消費し、1リクエストで上限を超える行数は413
+- Idempotency-Keyによる再送の応答は行数を消費しない
+"""
+import json
+import uuid
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from api.v1.dependencies.rate_limit import get_request_rate_limiter, get_row_rate_limiter
+from core.config import get_settings
+from fastapi.testclient import TestClient
+from infrastructure.rate_limit import InMemoryRateLimitBackend, RateLimiter
+from schemas.requests.measurement_columnar import COLUMNAR_MEDIA_TYPE
+from src.main import app
+from tests.columnar_encoder import encode_columnar_measurements
+from tests.conftest import auth_headers
+
+client = TestClient(app)
+
+BASE = datetime(2024, 5, 20, 12, 0, tzinfo=UTC)
+REQUEST_LIMIT = 3
+ROW_LIMIT = 10
+
+
+def make_measurements(count: int, start: int = 0) -> list[dict]:
+    """1分間隔の心拍数データ"""
+    return [
+        {
+            "metric_type": "heart_rate",
+            "value": 70.0,
+            "unit": "bpm",
+            "measured_at": (BASE + timedelta(minutes=i)).isoformat(),
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def sample_value(text: str, sample: str) -> float:
+    """メトリクス出力から指定したサンプルの値を取得（存在しない場合は0）"""
+    for line in text.splitlines():
+        if line.startswith(sample + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+@pytest.fixture(autouse=True)
+def limiters() -> Iterator[None]:
+    """テスト用の小さな上限でレート制限を有効にする"""
+    backend = InMemoryRateLimitBackend()
+    app.dependency_overrides[get_request_rate_limiter] = lambda: RateLimiter(
+        backend, REQUEST_LIMIT, 60, "requests"
+    )
+    app.dependency_overrides[get_row_rate_limiter] = lambda: RateLimiter(backend, ROW_LIMIT, 60, "rows")
+    yield
+    app.dependency_overrides.pop(get_request_rate_limiter, None)
+    app.dependency_overrides.pop(get_row_rate_limiter, None)
+
+
+@pytest.fixture
+def user_id() -> str:
+    """テストごとに別のユーザー"""
+    return f"rate_limit_user_{uuid.uuid4().hex}"
+
+
+class TestRequestRateLimit:
+    """リクエスト数の制限のテスト"""
+
+    def test_request_over_limit_returns_429(self, user_id):
+        """上限を超えたリクエストは429とし、再試行までの秒数を返す"""
+        # Arrange
+        headers = auth_headers(user_id)
+        params = {"start": BASE.isoformat()}
+        before = sample_value(client.get("/metrics").text, 'rate_limited_requests_total{limit="requests"}')
+
+        # Act
+        responses = [client.get("/v1/measurements", params=params, headers=headers) for _ in range(4)]
+
+        # Assert
+        assert [response.status_code for response in responses] == [200, 200, 200, 429]
+        limited = responses[-1]
+        assert limited.headers["retry-after"] == "20"
+        assert limited.headers["ratelimit-limit"] == "3"
+        assert limited.headers["ratelimit-remaining"] == "0"
+        assert limited.headers["ratelimit-reset"] == "60"
+        after = sample_value(client.get("/metrics").text, 'rate_limited_requests_total{limit="requests"}')
+        assert after == before + 1
+
+    def test_users_are_limited_independently(self, user_id):
+        """他のユーザーのリクエストは上限に数えない"""
+        # Arrange
+        params = {"start": BASE.isoformat()}
+        for _ in range(REQUEST_LIMIT):
+            client.get("/v1/measurements", params=params, headers=auth_headers(user_id))
+
+        # Act
+        response = client.get("/v1/measurements", params=params, headers=auth_headers(f"{user_id}_other"))
+
+        # Assert
+        assert response.status_code == 200
+
+    def test_unauthenticated_request_returns_401(self):
+        """認証がない場合はレート制限より先に401とする"""
+        response = client.get("/v1/measurements")
+
+        assert response.status_code == 401
+
+
+class TestRowRateLimit:
+    """一括登録の行数の制限のテスト"""
+
+    def test_rows_over_limit_return_429(self, user_id):
+        """期間あたりの行数の上限を超える一括登録は429とし、保存しない"""
+        # Arrange
+        headers = auth_headers(user_id)
+        client.post("/v1/measurements/bulk", json=make_measurements(6), headers=headers)
+
+        # Act
+        response = client.post("/v1/measurements/bulk", json=make_measurements(5, start=6), headers=headers)
+
+        # Assert
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "6"
+        assert response.headers["ratelimit-remaining"] == "4"
+
+    def test_request_with_more_rows_than_limit_returns_413(self, user_id):
+        """1リクエストで行数の上限を超える場合は、再試行しても受け付けられないため413"""
+        response = client.post(
+            "/v1/measurements/bulk", json=make_measurements(ROW_LIMIT + 1), headers=auth_headers(user_id)
+        )
+
+        assert response.status_code == 413
+
+    def test_columnar_body_consumes_rows(self, user_id):
+        """列指向バイナリ形式の一括登録も行数を消費する"""
+        # Arrange
+        headers = {**auth_headers(user_id), "Content-Type": COLUMNAR_MEDIA_TYPE}
+
+        # Act
+        first = client.post(
+            "/v1/measurements/bulk/columnar",
+            content=encode_columnar_measurements(make_measurements(8)), headers=headers,
+        )
+        second = client.post(
+            "/v1/measurements/bulk/columnar",
+            content=encode_columnar_measurements(make_measurements(8, start=8)), headers=headers,
+        )
+
+        # Assert
+        assert first.status_code == 201
+        assert second.status_code == 429
+
+    def test_stream_stops_at_row_limit(self, user_id, monkeypatch):
+        """ストリーム登録はバッチごとに消費し、上限に達したバッチで429とする"""
+        # Arrange
+        monkeypatch.setattr(get_settings(), "bulk_stream_batch_size", 4)
+        body = "".join(json.dumps(row) + "\n" for row in make_measurements(12))
+
+        # Act
+        response = client.post(
+            "/v1/measurements/bulk/stream",
+            content=body,
+            headers={**auth_headers(user_id), "Content-Type": "application/x-ndjson"},
+        )
+        stored = client.get(
+            "/v1/measurements", params={"start": BASE.isoformat()}, headers=auth_headers(user_id)
+        )
+
+        # Assert
+        assert response.status_code == 429
+        assert len(stored.json()["items"]) == 8
+
+    def test_idempotent_replay_does_not_consume_rows(self, user_id):
+        """Idempotency-Keyによる再送の応答は行数を消費しない"""
+        # Arrange
+        headers = {**auth_headers(user_id), "Idempotency-Key": "rate-limit-1"}
+        first = client.post("/v1/measurements/bulk", json=make_measurements(8), headers=headers)
+
+        # Act
+        replay = client.post("/v1/measurements/bulk", json=make_measurements(8), headers=headers)
+
+        # Assert
+        assert first.status_code == 201
+        assert replay.status_code == 201
+        assert replay.headers["idempotent-replayed"] == "true"
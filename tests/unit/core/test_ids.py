@@ -0,0 +1,129 @@
+"""UUIDv7生成のユニットテスト"""
+import threading
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+
+from core.ids import UUIDv7Generator, uuid7, uuid7_batch, uuid7_datetime
+
+
+class FixedClock:
+    """手動で進める時計（ミリ秒）"""
+
+    def __init__(self, now_ms: int) -> None:
+        self.now_ms = now_ms
+
+    def __call__(self) -> int:
+        return self.now_ms
+
+
+class TestUUIDv7Generator:
+    """UUIDv7Generatorのテスト"""
+
+    def test_ids_are_rfc9562_version_7(self):
+        """バージョン7・RFCバリアントのUUIDで、先頭48ビットが生成時刻"""
+        # Arrange
+        generator = UUIDv7Generator(clock=FixedClock(1_700_000_000_123))
+
+        # Act
+        value = uuid.UUID(generator.generate())
+
+        # Assert
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+        assert value.int >> 80 == 1_700_000_000_123
+
+    def test_ids_are_monotonic_within_same_millisecond(self):
+        """同じミリ秒内でも単調増加する"""
+        # Arrange
+        generator = UUIDv7Generator(clock=FixedClock(1_700_000_000_000))
+
+        # Act
+        ids = [generator.generate() for _ in range(100)] + generator.generate_batch(100)
+
+        # Assert
+        assert ids == sorted(ids)
+        assert len(set(ids)) == 200
+
+    def test_ids_stay_monotonic_when_clock_goes_backwards(self):
+        """時計が戻っても前回より大きい値を生成する"""
+        # Arrange
+        clock = FixedClock(1_700_000_000_500)
+        generator = UUIDv7Generator(clock=clock)
+        before = generator.generate()
+
+        # Act
+        clock.now_ms -= 1000
+        after = generator.generate()
+
+        # Assert
+        assert after > before
+        assert uuid.UUID(after).int >> 80 == 1_700_000_000_500
+
+    def test_counter_overflow_advances_timestamp(self):
+        """カウンターが上限に達した場合は時刻を1ミリ秒進める"""
+        # Arrange
+        generator = UUIDv7Generator(clock=FixedClock(1_000), random_bytes=lambda n: b"\xff" * n)
+        first = generator.generate()
+
+        # Act: 残りのカウンター（2**73個）を超える数を確保してから生成する
+        generator._reserve(2 ** 73)
+        after = generator.generate()
+
+        # Assert
+        assert uuid.UUID(after).int >> 80 == 1_001
+        assert after > first
+
+    def test_batch_is_sorted_and_unique_across_threads(self):
+        """複数スレッドから生成しても重複しない"""
+        # Arrange
+        generator = UUIDv7Generator()
+        results: list[list[str]] = []
+
+        def worker() -> None:
+            results.append(generator.generate_batch(1000))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+
+        # Act
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        assert all(batch == sorted(batch) for batch in results)
+        assert len({value for batch in results for value in batch}) == 8000
+
+    def test_empty_batch(self):
+        """0個を指定した場合は空のリスト"""
+        assert UUIDv7Generator().generate_batch(0) == []
+
+
+class TestModuleFunctions:
+    """モジュール関数のテスト"""
+
+    def test_shared_generator_is_monotonic(self):
+        """uuid7とuuid7_batchは同じ生成器を共有し、呼び出し順に増加する"""
+        # Act
+        ids = [uuid7()] + uuid7_batch(10) + [uuid7()]
+
+        # Assert
+        assert ids == sorted(ids)
+
+    def test_uuid7_datetime_returns_generation_time(self):
+        """生成時刻をミリ秒精度で取り出せる"""
+        # Arrange
+        generator = UUIDv7Generator(clock=FixedClock(1_700_000_000_123))
+
+        # Act
+        generated_at = uuid7_datetime(generator.generate())
+
+        # Assert
+        assert generated_at == datetime(2023, 11, 14, 22, 13, 20, 123000, tzinfo=UTC)
+
+    def test_uuid7_datetime_rejects_other_versions(self):
+        """UUIDv7以外はエラー"""
+        with pytest.raises(ValueError, match="UUIDv7"):
+            uuid7_datetime(str(uuid.uuid4()))
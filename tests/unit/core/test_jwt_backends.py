@@ -0,0 +1,188 @@
+"""
+JWTバックエンドのユニットテスト
+
+すべてのバックエンドが同じトークンを受理・拒否すること（適合性）を確認する。
+"""
+import base64
+import hashlib
+import hmac
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Union
+
+import pytest
+from jose import jwt
+from jose.exceptions import JWTError
+
+from src.core.jwt_backends import (
+    JWT_BACKENDS,
+    HMACJWTBackend,
+    JoseJWTBackend,
+    create_jwt_backend,
+)
+
+SECRET = "conformance-secret"
+
+
+def b64(data: bytes) -> str:
+    """パディングなしのbase64urlエンコード"""
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def forge_token(
+    payload: Union[bytes, Dict[str, Any]],
+    header: Optional[Union[bytes, Dict[str, Any]]] = None,
+    secret: str = SECRET,
+    digestmod: Any = hashlib.sha256,
+) -> str:
+    """任意のヘッダー・ペイロードに署名したトークンを作る"""
+    if header is None:
+        header = {"alg": "HS256", "typ": "JWT"}
+    header_bytes = header if isinstance(header, bytes) else json.dumps(header).encode()
+    payload_bytes = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+    signing_input = f"{b64(header_bytes)}.{b64(payload_bytes)}"
+    signature = hmac.new(secret.encode(), signing_input.encode(), digestmod).digest()
+    return f"{signing_input}.{b64(signature)}"
+
+
+def future(seconds: int = 600) -> int:
+    """現在から指定秒数後のエポック秒"""
+    return int(time.time()) + seconds
+
+
+VALID = {"sub": "user123", "exp": future()}
+
+# (説明, トークン) — 受理されるものと拒否されるものを混在させる
+CONFORMANCE_CASES = [
+    ("valid", forge_token(VALID)),
+    ("valid without exp", forge_token({"sub": "user123"})),
+    ("valid with numeric string exp", forge_token({"sub": "user123", "exp": str(future())})),
+    ("valid with float exp", forge_token({"sub": "user123", "exp": future() + 0.5})),
+    ("valid with iat and nbf", forge_token({**VALID, "iat": future(-60), "nbf": future(-60)})),
+    ("valid with string jti", forge_token({**VALID, "jti": "abc"})),
+    ("valid with unicode claim", forge_token({**VALID, "name": "健康 太郎"})),
+    ("padded header segment", forge_token(VALID).replace(".", "==.", 1)),
+    ("expired", forge_token({"sub": "user123", "exp": future(-60)})),
+    ("exp not integer", forge_token({"sub": "user123", "exp": "tomorrow"})),
+    ("iat not integer", forge_token({**VALID, "iat": "yesterday"})),
+    ("nbf in future", forge_token({**VALID, "nbf": future(300)})),
+    ("nbf not integer", forge_token({**VALID, "nbf": "later"})),
+    ("aud present", forge_token({**VALID, "aud": "healthsync"})),
+    ("aud list", forge_token({**VALID, "aud": ["healthsync"]})),
+    ("aud malformed", forge_token({**VALID, "aud": 1})),
+    ("sub not string", forge_token({"sub": 123, "exp": future()})),
+    ("jti not string", forge_token({**VALID, "jti": 1})),
+    ("at_hash present", forge_token({**VALID, "at_hash": "abc"})),
+    ("wrong secret", forge_token(VALID, secret="other-secret")),
+    ("tampered payload", forge_token(VALID).replace(b64(json.dumps(VALID).encode()), b64(b'{"sub":"admin"}'))),
+    ("HS512", forge_token(VALID, header={"alg": "HS512", "typ": "JWT"}, digestmod=hashlib.sha512)),
+    ("alg none", b64(b'{"alg":"none"}') + "." + b64(json.dumps(VALID).encode()) + "."),
+    ("alg missing", forge_token(VALID, header={"typ": "JWT"})),
+    ("header not object", forge_token(VALID, header=b"[1]")),
+    ("header not json", forge_token(VALID, header=b"not json")),
+    ("payload not json", forge_token(b"not json")),
+    ("payload not object", forge_token(b"[1, 2]")),
+    ("payload not utf-8", forge_token(b"\xff\xfe")),
+    ("two segments", "abc.def"),
+    ("one segment", "abcdef"),
+    ("empty", ""),
+    ("bad padding", forge_token(VALID) + "a"),
+    ("random string", "not_a_valid_jwt_token"),
+]
+
+
+def outcome(backend: Any, token: str) -> Any:
+    """デコード結果（受理時はペイロード、拒否時は例外クラス）を返す"""
+    try:
+        return backend.decode(token)
+    except JWTError as e:
+        return type(e)
+
+
+class TestBackendConformance:
+    """バックエンド間の適合性テスト"""
+
+    @pytest.mark.parametrize(
+        "token", [case[1] for case in CONFORMANCE_CASES], ids=[case[0] for case in CONFORMANCE_CASES]
+    )
+    def test_backends_accept_and_reject_same_tokens(self, token: str) -> None:
+        """すべてのバックエンドが同じトークンを受理・拒否し、同じ結果を返す"""
+        # Arrange
+        backends = [backend_class(SECRET) for backend_class in JWT_BACKENDS.values()]
+
+        # Act
+        outcomes = [outcome(backend, token) for backend in backends]
+
+        # Assert
+        assert all(result == outcomes[0] for result in outcomes[1:])
+
+    def test_conformance_cases_cover_accept_and_reject(self) -> None:
+        """適合性ケースに受理されるトークンと各種の拒否が含まれている"""
+        # Arrange
+        backend = JoseJWTBackend(SECRET)
+
+        # Act
+        results = {name: outcome(backend, token) for name, token in CONFORMANCE_CASES}
+
+        # Assert
+        assert isinstance(results["valid"], dict)
+        assert results["expired"].__name__ == "ExpiredSignatureError"
+        assert results["aud present"].__name__ == "JWTClaimsError"
+        assert results["wrong secret"] is JWTError
+
+    @pytest.mark.parametrize("backend_name", sorted(JWT_BACKENDS))
+    def test_encode_matches_jose_byte_for_byte(self, backend_name: str) -> None:
+        """エンコード結果がpython-joseと一致し、datetimeのexpは整数に変換される"""
+        # Arrange
+        backend = create_jwt_backend(backend_name, SECRET)
+        expire = datetime.now(timezone.utc) + timedelta(minutes=30)
+        claims = {"sub": "user123", "email": "test@example.com", "exp": expire}
+
+        # Act
+        token = backend.encode(claims)
+
+        # Assert
+        assert token == jwt.encode(dict(claims), SECRET, algorithm="HS256")
+        assert claims["exp"] is expire
+        assert backend.decode(token)["exp"] == int(expire.timestamp())
+
+    @pytest.mark.parametrize("backend_name", sorted(JWT_BACKENDS))
+    def test_round_trip_through_other_backend(self, backend_name: str) -> None:
+        """どのバックエンドで発行したトークンも他のバックエンドで検証できる"""
+        # Arrange
+        issuer = create_jwt_backend(backend_name, SECRET)
+        verifiers = [backend_class(SECRET) for backend_class in JWT_BACKENDS.values()]
+
+        # Act
+        token = issuer.encode({"sub": "user123", "exp": future()})
+
+        # Assert
+        assert all(verifier.decode(token)["sub"] == "user123" for verifier in verifiers)
+
+
+class TestHMACJWTBackend:
+    """HMACJWTBackend固有のテスト"""
+
+    def test_expiry_uses_injected_clock(self) -> None:
+        """有効期限の判定に指定した時計を使う"""
+        # Arrange
+        backend = HMACJWTBackend(SECRET, clock=lambda: 2_000_000_000.0)
+        token = backend.encode({"sub": "user123", "exp": 1_999_999_999})
+
+        # Act / Assert
+        with pytest.raises(JWTError, match="expired"):
+            backend.decode(token)
+
+    def test_rejects_unsupported_algorithm(self) -> None:
+        """HS256以外のアルゴリズムは指定できない"""
+        # Act / Assert
+        with pytest.raises(ValueError, match="HS256"):
+            HMACJWTBackend(SECRET, algorithm="HS512")
+
+
+def test_create_jwt_backend_rejects_unknown_name() -> None:
+    """未知のバックエンド名はValueErrorになる"""
+    # Act / Assert
+    with pytest.raises(ValueError, match="Unknown JWT backend"):
+        create_jwt_backend("pyjwt", SECRET)
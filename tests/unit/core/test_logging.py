@@ -1,12 +1,25 @@
 """構造化ロギングのユニットテスト"""
 import json
+import logging
+import queue
+from datetime import UTC, datetime, timedelta
 from io import StringIO
 from unittest.mock import patch
 
+import pytest
 import structlog
 from freezegun import freeze_time
 
-from core.logging import configure_logging, get_logger
+from core.logging import (
+    BoundedQueueHandler,
+    CachedTimestamper,
+    add_timestamp,
+    configure_logging,
+    get_json_serializer,
+    get_logger,
+    get_logging_stats,
+    shutdown_logging,
+)
 
 
 class TestStructuredLogging:
@@ -131,3 +144,157 @@ class TestStructuredLogging:
 
         log_data = json.loads(output.getvalue().strip())
         assert log_data["logger"] == "test.module"
+
+
+def epoch_ns(moment: str) -> int:
+    """ISO形式のUTC日時をエポックからの整数ナノ秒に変換する
+
+    freezegunのtime.time_nsは浮動小数点の時刻から求めるためマイクロ秒未満の誤差があり、
+    CachedTimestamperのテストではtime.time_nsを正確な値に固定する。
+    """
+    delta = datetime.fromisoformat(moment).replace(tzinfo=UTC) - datetime(1970, 1, 1, tzinfo=UTC)
+    return delta // timedelta(microseconds=1) * 1_000
+
+
+class TestCachedTimestamper:
+    """CachedTimestamperのテスト"""
+
+    @pytest.mark.parametrize("moment", ["2024-01-01 12:00:00.250000", "2024-01-01 12:00:00.000001"])
+    def test_matches_add_timestamp_format(self, monkeypatch, moment):
+        """add_timestampと同じ形式・同じマイクロ秒のタイムスタンプを追加することを確認"""
+        timestamper = CachedTimestamper()
+        monkeypatch.setattr("core.logging.time.time_ns", lambda: epoch_ns(moment))
+
+        cached = timestamper(None, "info", {})
+        with freeze_time(moment):
+            expected = add_timestamp(None, "info", {})
+
+        assert cached["timestamp"] == expected["timestamp"]
+        assert cached["timestamp"] == moment.replace(" ", "T") + "Z"
+
+    def test_reuses_prefix_within_same_second(self, monkeypatch):
+        """同じ秒のイベントでは書式化済みのプレフィックスを再利用することを確認"""
+        timestamper = CachedTimestamper()
+        moments = iter(["2024-01-01 12:00:00", "2024-01-01 12:00:00.5", "2024-01-01 12:00:01.5"])
+        monkeypatch.setattr("core.logging.time.time_ns", lambda: epoch_ns(next(moments)))
+
+        first = timestamper(None, "info", {})["timestamp"]
+        second = timestamper(None, "info", {})["timestamp"]
+        third = timestamper(None, "info", {})["timestamp"]
+
+        assert first == "2024-01-01T12:00:00Z"
+        assert second == "2024-01-01T12:00:00.500000Z"
+        assert third == "2024-01-01T12:00:01.500000Z"
+
+
+class TestJSONSerializer:
+    """JSONシリアライザ選択のテスト"""
+
+    def test_json_serializer_is_stdlib_by_default(self):
+        """デフォルトは標準ライブラリのjson.dumpsであることを確認"""
+        assert get_json_serializer() is json.dumps
+
+    def test_unknown_serializer_raises(self):
+        """未知のシリアライザ名はValueErrorになることを確認"""
+        with pytest.raises(ValueError, match="Unknown JSON serializer"):
+            get_json_serializer("yaml")
+
+    def test_orjson_serializer_renders_same_json(self):
+        """orjsonシリアライザでも同じ内容のJSONを出力することを確認"""
+        pytest.importorskip("orjson")
+        output = StringIO()
+
+        with patch("sys.stdout", output):
+            configure_logging(json_serializer="orjson")
+            get_logger().info("fast", count=1, nested={"a": [1, 2]})
+
+        log_data = json.loads(output.getvalue().strip())
+        assert log_data["event"] == "fast"
+        assert log_data["nested"] == {"a": [1, 2]}
+
+
+class TestAsyncLogging:
+    """キュー経由の非同期ロギングのテスト"""
+
+    def setup_method(self):
+        """各テストの前にロガーをリセット"""
+        structlog.reset_defaults()
+
+    def teardown_method(self):
+        """非同期リスナーを停止し、同期モードに戻す"""
+        shutdown_logging()
+        configure_logging()
+
+    def test_async_mode_writes_all_records_after_shutdown(self):
+        """非同期モードでも停止時にすべてのログが順序どおり出力されることを確認"""
+        output = StringIO()
+
+        with patch("sys.stdout", output):
+            configure_logging(async_mode=True, batch_size=10)
+            logger = get_logger()
+            for i in range(50):
+                logger.info("queued", seq=i)
+            shutdown_logging()
+
+        lines = output.getvalue().strip().split("\n")
+        assert [json.loads(line)["seq"] for line in lines] == list(range(50))
+
+    def test_async_mode_preserves_exception_rendering(self):
+        """非同期モードでも例外情報がJSONに含まれることを確認"""
+        output = StringIO()
+
+        with patch("sys.stdout", output):
+            configure_logging(async_mode=True)
+            try:
+                raise ValueError("Async exception")
+            except ValueError:
+                get_logger().exception("Error occurred")
+            shutdown_logging()
+
+        log_data = json.loads(output.getvalue().strip())
+        assert "ValueError: Async exception" in log_data["exception"]
+
+    def test_get_logging_stats_reports_queue_state(self):
+        """非同期モードのキュー状態を取得できることを確認"""
+        configure_logging()
+        assert get_logging_stats() == {"queued": 0, "dropped": 0}
+
+        with patch("sys.stdout", StringIO()):
+            configure_logging(async_mode=True)
+            stats = get_logging_stats()
+
+        assert stats == {"queued": 0, "dropped": 0}
+
+
+class TestBoundedQueueHandler:
+    """BoundedQueueHandlerのオーバーフロー処理のテスト"""
+
+    def make_record(self, message: str) -> logging.LogRecord:
+        return logging.LogRecord("test", logging.INFO, __file__, 1, message, None, None)
+
+    def enqueue_messages(self, policy: str, messages: list[str]) -> tuple[list[str], int]:
+        log_queue: queue.Queue = queue.Queue(maxsize=2)
+        handler = BoundedQueueHandler(log_queue, overflow_policy=policy)
+        for message in messages:
+            handler.emit(self.make_record(message))
+        queued = [log_queue.get_nowait().msg for _ in range(log_queue.qsize())]
+        return queued, handler.dropped
+
+    def test_drop_newest_discards_incoming_records(self):
+        """drop_newestではキューが満杯のとき新しいレコードを破棄することを確認"""
+        queued, dropped = self.enqueue_messages("drop_newest", ["a", "b", "c", "d"])
+
+        assert queued == ["a", "b"]
+        assert dropped == 2
+
+    def test_drop_oldest_discards_queued_records(self):
+        """drop_oldestではキューが満杯のとき古いレコードを破棄することを確認"""
+        queued, dropped = self.enqueue_messages("drop_oldest", ["a", "b", "c", "d"])
+
+        assert queued == ["c", "d"]
+        assert dropped == 2
+
+    def test_unknown_policy_raises(self):
+        """未知のポリシーはValueErrorになることを確認"""
+        with pytest.raises(ValueError, match="Unknown overflow policy"):
+            BoundedQueueHandler(queue.Queue(), overflow_policy="drop_all")
@@ -0,0 +1,88 @@
+"""
+メトリクスのユニットテスト
+"""
+import threading
+
+import pytest
+
+from core.metrics import CallbackMetric, Counter, Histogram, MetricsRegistry
+
+
+class TestHistogram:
+    """Histogramのテスト"""
+
+    def test_render_outputs_cumulative_buckets(self) -> None:
+        """バケットは累積件数で出力され、+Inf・sum・countが含まれる"""
+        # Arrange
+        histogram = Histogram("latency_seconds", "Latency", (0.1, 0.5), ("route",))
+
+        # Act
+        for value in (0.05, 0.1, 0.3, 2.0):
+            histogram.observe(value, ("/a",))
+        text = histogram.render()
+
+        # Assert
+        assert text.splitlines() == [
+            "# HELP latency_seconds Latency",
+            "# TYPE latency_seconds histogram",
+            'latency_seconds_bucket{route="/a",le="0.1"} 2',
+            'latency_seconds_bucket{route="/a",le="0.5"} 3',
+            'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+            'latency_seconds_sum{route="/a"} 2.45',
+            'latency_seconds_count{route="/a"} 4',
+        ]
+
+    def test_observations_from_threads_are_merged(self) -> None:
+        """複数スレッドで記録した値がラベルごとに合算される"""
+        # Arrange
+        histogram = Histogram("rows", "Rows", (10,), ("endpoint",))
+
+        def observe_many() -> None:
+            for _ in range(1000):
+                histogram.observe(1, ("bulk",))
+
+        threads = [threading.Thread(target=observe_many) for _ in range(4)]
+
+        # Act
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        assert 'rows_count{endpoint="bulk"} 4000' in histogram.render()
+
+    def test_label_count_mismatch_raises(self) -> None:
+        """ラベルの数が定義と異なる場合はValueErrorになる"""
+        # Arrange
+        histogram = Histogram("rows", "Rows", (10,), ("endpoint",))
+
+        # Act / Assert
+        with pytest.raises(ValueError, match="expects labels"):
+            histogram.observe(1, ("bulk", "extra"))
+
+    def test_unsorted_buckets_raise(self) -> None:
+        """昇順でないバケットはValueErrorになる"""
+        # Act / Assert
+        with pytest.raises(ValueError, match="sorted"):
+            Histogram("rows", "Rows", (10, 1))
+
+
+class TestRegistry:
+    """Counter・CallbackMetric・MetricsRegistryのテスト"""
+
+    def test_render_includes_all_metrics_with_escaped_labels(self) -> None:
+        """登録したメトリクスをすべて出力し、ラベル値はエスケープされる"""
+        # Arrange
+        registry = MetricsRegistry()
+        counter = registry.register(Counter("events_total", "Events", ("name",)))
+        registry.register(CallbackMetric("queue_size", "Queue size", lambda: 3))
+
+        # Act
+        counter.inc(labels=('say "hi"',))
+        counter.inc(2, labels=('say "hi"',))
+        text = registry.render()
+
+        # Assert
+        assert 'events_total{name="say \\"hi\\""} 3' in text
+        assert "# TYPE queue_size gauge\nqueue_size 3\n" in text
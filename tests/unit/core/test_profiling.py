@@ -0,0 +1,56 @@
+"""
+処理段階の計測のユニットテスト
+"""
+from core.profiling import (
+    RequestProfile,
+    current_profile,
+    profile_stage,
+    start_profile,
+    stop_profile,
+)
+
+
+class TestProfileStage:
+    """profile_stageとRequestProfileのテスト"""
+
+    def test_profile_stage_is_noop_without_profile(self) -> None:
+        """プロファイリング対象外ではprofile_stageは何も記録しない"""
+        # Act
+        with profile_stage("schema_validation"):
+            pass
+
+        # Assert
+        assert current_profile() is None
+
+    def test_profile_stage_accumulates_into_current_profile(self) -> None:
+        """プロファイリング中は同名の段階の所要時間が加算される"""
+        # Arrange
+        profile, token = start_profile()
+
+        # Act
+        try:
+            with profile_stage("persistence"):
+                pass
+            first = profile.stages["persistence"]
+            with profile_stage("persistence"):
+                pass
+        finally:
+            stop_profile(token)
+
+        # Assert
+        assert profile.stages["persistence"] >= first
+        assert list(profile.stages) == ["persistence"]
+        assert current_profile() is None
+
+    def test_server_timing_lists_stages_in_milliseconds(self) -> None:
+        """Server-Timingヘッダーには段階ごとの所要時間がミリ秒で記録順に並ぶ"""
+        # Arrange
+        profile = RequestProfile()
+
+        # Act
+        profile.record("schema_validation", 0.0015)
+        profile.record("persistence", 0.25)
+
+        # Assert
+        assert profile.timings_ms() == {"schema_validation": 1.5, "persistence": 250.0}
+        assert profile.server_timing() == "schema_validation;dur=1.500, persistence;dur=250.000"
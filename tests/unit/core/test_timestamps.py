@@ -0,0 +1,50 @@
+"""
+エポックからの整数時刻の変換のユニットテスト
+"""
+from datetime import UTC, datetime, timedelta, timezone
+
+from core.timestamps import (
+    epoch_days,
+    epoch_microseconds,
+    from_epoch_microseconds,
+    from_epoch_milliseconds,
+    to_epoch_microseconds,
+)
+
+MOMENT = datetime(2024, 5, 20, 12, 34, 56, 789012, tzinfo=UTC)
+
+
+class TestTimestamps:
+    """エポックからの整数時刻の変換のテスト"""
+
+    def test_microseconds_round_trip(self) -> None:
+        """マイクロ秒への変換は丸めずに元の日時に戻せる"""
+        # Act
+        microseconds = epoch_microseconds(MOMENT)
+
+        # Assert
+        assert microseconds == 1_716_208_496_789_012
+        assert from_epoch_microseconds(microseconds) == MOMENT
+
+    def test_offset_aware_datetimes_use_utc(self) -> None:
+        """UTC以外のタイムゾーンの日時も同じ時刻として変換する"""
+        # Arrange
+        jst = MOMENT.astimezone(timezone(timedelta(hours=9)))
+
+        # Act
+        days = epoch_days(jst)
+        microseconds = to_epoch_microseconds([MOMENT, jst])
+
+        # Assert
+        assert days == 19863
+        assert microseconds.tolist() == [epoch_microseconds(MOMENT)] * 2
+
+    def test_before_epoch_is_negative(self) -> None:
+        """エポックより前の日時は負の値になる"""
+        # Act
+        days = epoch_days(datetime(1969, 12, 31, 23, 59, tzinfo=UTC))
+        moment = from_epoch_milliseconds(-1)
+
+        # Assert
+        assert days == -1
+        assert moment == datetime(1969, 12, 31, 23, 59, 59, 999000, tzinfo=UTC)
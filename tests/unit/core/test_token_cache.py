@@ -0,0 +1,95 @@
+"""
+検証済みトークンキャッシュのユニットテスト
+"""
+from src.core.token_cache import TokenVerificationCache
+from src.domain.entities.user import UserInToken
+from tests.conftest import FakeClock
+
+
+def make_user(user_id: str = "user123") -> UserInToken:
+    """テスト用のユーザー情報"""
+    return UserInToken(user_id=user_id, email="test@example.com")
+
+
+class TestTokenVerificationCache:
+    """TokenVerificationCacheのテスト"""
+
+    def test_get_returns_cached_user_and_counts_hits(self) -> None:
+        """登録済みのトークンはキャッシュから返され、ヒット数が増える"""
+        # Arrange
+        cache = TokenVerificationCache(clock=FakeClock())
+        user = make_user()
+
+        # Act
+        miss = cache.get("token-a")
+        cache.set("token-a", user)
+        hit = cache.get("token-a")
+
+        # Assert
+        assert miss is None
+        assert hit is user
+        assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "max_size": 10000}
+
+    def test_entry_expires_at_token_exp(self) -> None:
+        """エントリはトークンのexpで失効する"""
+        # Arrange
+        clock = FakeClock()
+        cache = TokenVerificationCache(ttl_seconds=300, clock=clock)
+        cache.set("token-a", make_user(), expires_at=clock.now + 10)
+
+        # Act & Assert
+        clock.now += 9.999
+        assert cache.get("token-a") is not None
+        clock.now += 0.001
+        assert cache.get("token-a") is None
+        assert cache.stats()["size"] == 0
+
+    def test_entry_expires_after_ttl(self) -> None:
+        """expより先にTTLが来た場合はTTLで失効する"""
+        # Arrange
+        clock = FakeClock()
+        cache = TokenVerificationCache(ttl_seconds=60, clock=clock)
+        cache.set("token-a", make_user(), expires_at=clock.now + 1800)
+
+        # Act
+        clock.now += 60
+
+        # Assert
+        assert cache.get("token-a") is None
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        """最大エントリ数を超えると最も使われていないエントリが削除される"""
+        # Arrange
+        cache = TokenVerificationCache(max_size=2, clock=FakeClock())
+        cache.set("token-a", make_user("a"))
+        cache.set("token-b", make_user("b"))
+        cache.get("token-a")
+
+        # Act
+        cache.set("token-c", make_user("c"))
+
+        # Assert
+        assert cache.get("token-b") is None
+        assert cache.get("token-a").user_id == "a"
+        assert cache.get("token-c").user_id == "c"
+
+    def test_zero_max_size_disables_cache(self) -> None:
+        """最大エントリ数が0の場合はキャッシュしない"""
+        cache = TokenVerificationCache(max_size=0, clock=FakeClock())
+
+        cache.set("token-a", make_user())
+
+        assert cache.get("token-a") is None
+
+    def test_clear_resets_entries_and_counters(self) -> None:
+        """clearでエントリと統計情報が削除される"""
+        # Arrange
+        cache = TokenVerificationCache(clock=FakeClock())
+        cache.set("token-a", make_user())
+        cache.get("token-a")
+
+        # Act
+        cache.clear()
+
+        # Assert
+        assert cache.stats() == {"hits": 0, "misses": 0, "size": 0, "max_size": 10000}
@@ -0,0 +1,166 @@
+"""ゴールの達成判定のドメインサービスのユニットテスト"""
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from domain.entities.goal import Goal, GoalAggregation, GoalPeriod, GoalProgress
+from domain.entities.measurement import MetricType
+from domain.entities.measurement_batch import MeasurementBatch
+from domain.services.goal_evaluation import (
+    aggregate_goal_deltas,
+    period_start,
+    previous_period_start,
+)
+
+CREATED_AT = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def make_goal(goal_id: str = "steps", **fields) -> Goal:
+    """テスト用のゴール"""
+    values = {
+        "goal_id": goal_id,
+        "user_id": "user",
+        "metric_type": MetricType.STEPS,
+        "target": 10_000,
+        "created_at": CREATED_AT,
+        "updated_at": CREATED_AT,
+    }
+    return Goal(**{**values, **fields})
+
+
+def make_batch(rows: list[tuple[str, float, str, datetime]]) -> MeasurementBatch:
+    """(メトリックタイプ, 値, 単位, 測定日時)の行からバッチを生成"""
+    return MeasurementBatch.from_columns(
+        user_id="user",
+        created_at=datetime(2024, 6, 1, tzinfo=UTC),
+        metric_types=[row[0] for row in rows],
+        values=[row[1] for row in rows],
+        units=[row[2] for row in rows],
+        measured_at=[row[3] for row in rows],
+    )
+
+
+class TestPeriodStart:
+    """期間の開始の算出テスト"""
+
+    @pytest.mark.parametrize("moment, period, expected", [
+        (datetime(2024, 5, 22, 15, 30, tzinfo=UTC), GoalPeriod.DAY, datetime(2024, 5, 22, tzinfo=UTC)),
+        # 2024-05-22は水曜日、週は月曜始まり
+        (datetime(2024, 5, 22, 15, 30, tzinfo=UTC), GoalPeriod.WEEK, datetime(2024, 5, 20, tzinfo=UTC)),
+        (datetime(2024, 5, 20, 0, 0, tzinfo=UTC), GoalPeriod.WEEK, datetime(2024, 5, 20, tzinfo=UTC)),
+        (datetime(2024, 5, 26, 23, 59, tzinfo=UTC), GoalPeriod.WEEK, datetime(2024, 5, 20, tzinfo=UTC)),
+    ])
+    def test_period_start(self, moment, period, expected):
+        """UTCの0時・月曜日に切り捨てる"""
+        assert period_start(moment, period) == expected
+
+    def test_previous_period_start(self):
+        """前の期間は日なら1日前、週なら7日前"""
+        start = datetime(2024, 5, 20, tzinfo=UTC)
+
+        assert previous_period_start(start, GoalPeriod.DAY) == start - timedelta(days=1)
+        assert previous_period_start(start, GoalPeriod.WEEK) == start - timedelta(days=7)
+
+
+class TestAggregateGoalDeltas:
+    """バッチのゴール・期間ごとの集計テスト"""
+
+    def test_rows_are_summed_per_goal_and_day(self):
+        """対象のメトリックタイプの行を日ごとに合計し、他のメトリックタイプは除く"""
+        # Arrange
+        day = datetime(2024, 5, 20, tzinfo=UTC)
+        batch = make_batch([
+            ("steps", 4000, "steps", day + timedelta(hours=8)),
+            ("steps", 3000, "steps", day + timedelta(hours=20)),
+            ("heart_rate", 70, "bpm", day + timedelta(hours=9)),
+            ("steps", 5000, "steps", day + timedelta(days=1, hours=1)),
+        ])
+
+        # Act
+        deltas = aggregate_goal_deltas(batch, [make_goal()])
+
+        # Assert
+        assert [(d.period_start, d.value_sum, d.sample_count) for d in deltas] == [
+            (day, 7000.0, 2),
+            (day + timedelta(days=1), 5000.0, 1),
+        ]
+
+    def test_rows_are_grouped_by_monday_week(self):
+        """週のゴールは月曜始まりの週ごとに集計する"""
+        # Arrange（2024-05-19は日曜日）
+        batch = make_batch([
+            ("steps", 1000, "steps", datetime(2024, 5, 19, 23, tzinfo=UTC)),
+            ("steps", 2000, "steps", datetime(2024, 5, 20, 1, tzinfo=UTC)),
+            ("steps", 3000, "steps", datetime(2024, 5, 26, 23, tzinfo=UTC)),
+        ])
+
+        # Act
+        deltas = aggregate_goal_deltas(batch, [make_goal(period=GoalPeriod.WEEK)])
+
+        # Assert
+        assert [(d.period_start, d.value_sum) for d in deltas] == [
+            (datetime(2024, 5, 13, tzinfo=UTC), 1000.0),
+            (datetime(2024, 5, 20, tzinfo=UTC), 5000.0),
+        ]
+
+    def test_unit_filter_and_rows_before_goal_creation_are_excluded(self):
+        """単位を指定したゴールは他の単位を除き、作成した期間より前の測定は集計しない"""
+        # Arrange
+        goal = make_goal(
+            metric_type=MetricType.BODY_WEIGHT,
+            unit="kg",
+            created_at=datetime(2024, 5, 20, 12, tzinfo=UTC),
+        )
+        batch = make_batch([
+            ("body_weight", 70.0, "kg", datetime(2024, 5, 20, 7, tzinfo=UTC)),
+            ("body_weight", 154.0, "lb", datetime(2024, 5, 20, 8, tzinfo=UTC)),
+            ("body_weight", 71.0, "kg", datetime(2024, 5, 19, 7, tzinfo=UTC)),
+        ])
+
+        # Act
+        deltas = aggregate_goal_deltas(batch, [goal])
+
+        # Assert
+        assert [(d.period_start, d.value_sum, d.sample_count) for d in deltas] == [
+            (datetime(2024, 5, 20, tzinfo=UTC), 70.0, 1),
+        ]
+
+    def test_no_matching_rows_returns_no_deltas(self):
+        """対象の行がないゴールの差分は返さない"""
+        batch = make_batch([("heart_rate", 70, "bpm", datetime(2024, 5, 20, tzinfo=UTC))])
+
+        assert aggregate_goal_deltas(batch, [make_goal()]) == []
+
+
+class TestGoal:
+    """ゴールエンティティのテスト"""
+
+    @pytest.mark.parametrize("aggregation, value_sum, count, expected", [
+        (GoalAggregation.SUM, 10_000, 3, True),
+        (GoalAggregation.SUM, 9_999, 3, False),
+        (GoalAggregation.AVERAGE, 30_000, 3, True),
+        (GoalAggregation.AVERAGE, 29_999, 3, False),
+        (GoalAggregation.AVERAGE, 0, 0, False),
+    ])
+    def test_is_achieved(self, aggregation, value_sum, count, expected):
+        """合計または平均が目標値以上で達成とする"""
+        assert make_goal(aggregation=aggregation).is_achieved(value_sum, count) is expected
+
+    def test_progress_value_by_aggregation(self):
+        """進捗の値は集計方法に応じて合計または平均"""
+        progress = GoalProgress(period_start=CREATED_AT, value_sum=300.0, sample_count=4)
+
+        assert progress.value(GoalAggregation.SUM) == 300.0
+        assert progress.value(GoalAggregation.AVERAGE) == 75.0
+
+    def test_invalid_unit_is_rejected(self):
+        """メトリックタイプに対して不正な単位はエラー"""
+        with pytest.raises(ValueError, match="Invalid unit 'kg'"):
+            make_goal(unit="kg")
+
+    def test_unit_is_required_for_metric_with_several_units(self):
+        """単位が複数あるメトリックタイプは単位を省略できず、単位が1つなら省略時にその単位とする"""
+        with pytest.raises(ValueError, match="Unit is required for metric type body_weight"):
+            make_goal(metric_type=MetricType.BODY_WEIGHT)
+
+        assert make_goal().unit == "steps"
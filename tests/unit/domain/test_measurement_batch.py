@@ -0,0 +1,121 @@
+"""測定データの内部表現（MeasurementBatch・MeasurementRow）のユニットテスト"""
+from array import array
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from domain.entities.measurement_batch import (
+    MEASUREMENT_COLUMNS,
+    MeasurementBatch,
+    MeasurementRow,
+)
+
+CREATED_AT = datetime(2024, 1, 1, 12, 0, tzinfo=UTC)
+
+
+def make_batch(count: int = 3) -> MeasurementBatch:
+    """心拍数と歩数を交互に含むバッチ"""
+    return MeasurementBatch.from_columns(
+        user_id="batch_user",
+        created_at=CREATED_AT,
+        metric_types=[("heart_rate", "steps")[i % 2] for i in range(count)],
+        values=[70.0 + i for i in range(count)],
+        units=[("bpm", "steps")[i % 2] for i in range(count)],
+        measured_at=[CREATED_AT - timedelta(minutes=i) for i in range(count)],
+        notes=["朝"] + [None] * (count - 1),
+        ids=[f"id-{i}" for i in range(count)],
+    )
+
+
+class TestMeasurementBatch:
+    """MeasurementBatchのテスト"""
+
+    def test_from_columns_fills_optional_columns_and_ids(self):
+        """省略した列はNoneで埋め、IDは行ごとに採番される"""
+        # Act
+        batch = MeasurementBatch.from_columns(
+            user_id="batch_user",
+            created_at=CREATED_AT,
+            metric_types=["heart_rate", "heart_rate"],
+            values=[70, 71.5],
+            units=["bpm", "bpm"],
+            measured_at=[CREATED_AT, CREATED_AT],
+        )
+
+        # Assert
+        assert len(batch) == 2
+        assert len(set(batch.ids)) == 2
+        assert batch.device_ids == [None, None]
+        assert batch.metadata == [None, None]
+        assert isinstance(batch.values, array)
+        assert batch.values.tolist() == [70.0, 71.5]
+
+    def test_mismatched_column_lengths_raise_error(self):
+        """列の長さが揃っていない場合はエラー"""
+        with pytest.raises(ValueError, match="same length"):
+            MeasurementBatch(user_id="batch_user", created_at=CREATED_AT, ids=["a"])
+
+    def test_to_rows_returns_column_keyed_dicts(self):
+        """行データはmeasurementsテーブルのカラム名をキーとし、範囲を指定できる"""
+        # Arrange
+        batch = make_batch(3)
+
+        # Act
+        rows = batch.to_rows(1, 3)
+
+        # Assert
+        assert [row["id"] for row in rows] == ["id-1", "id-2"]
+        assert all(tuple(row) == MEASUREMENT_COLUMNS for row in rows)
+        assert rows[0] == {
+            "id": "id-1",
+            "user_id": "batch_user",
+            "metric_type": "steps",
+            "value": 71.0,
+            "unit": "steps",
+            "measured_at": CREATED_AT - timedelta(minutes=1),
+            "device_id": None,
+            "metadata": None,
+            "notes": None,
+            "created_at": CREATED_AT,
+        }
+
+    def test_iteration_yields_rows_matching_to_rows(self):
+        """行として取り出した結果は行データと一致する"""
+        # Arrange
+        batch = make_batch(3)
+
+        # Act
+        rows = list(batch)
+
+        # Assert
+        assert all(isinstance(row, MeasurementRow) for row in rows)
+        assert [row.to_dict() for row in rows] == batch.to_rows()
+        assert rows[0].notes == "朝"
+
+    def test_concat_joins_batches_of_same_user(self):
+        """同じユーザーのバッチを順に連結し、異なるユーザーのバッチはエラー"""
+        # Arrange
+        first, second = make_batch(2), make_batch(3).take([2])
+
+        # Act
+        merged = MeasurementBatch.concat([first, second])
+
+        # Assert
+        assert merged.ids == ["id-0", "id-1", "id-2"]
+        assert merged.to_rows() == first.to_rows() + second.to_rows()
+        with pytest.raises(ValueError, match="same user"):
+            MeasurementBatch.concat([first, MeasurementBatch(user_id="other", created_at=CREATED_AT)])
+
+
+class TestMeasurementRow:
+    """MeasurementRowのテスト"""
+
+    def test_row_has_no_instance_dict_and_is_immutable(self):
+        """__slots__で定義され、変更できない"""
+        # Arrange
+        row = make_batch(1).row(0)
+
+        # Act / Assert
+        assert not hasattr(row, "__dict__")
+        with pytest.raises(AttributeError):
+            row.value = 0.0  # type: ignore[misc]
@@ -0,0 +1,88 @@
+"""測定データの一覧取得条件のユニットテスト"""
+from datetime import UTC, datetime, timedelta, timezone
+
+import pytest
+
+from domain.services.measurement_query import (
+    MEASUREMENT_FIELDS,
+    MeasurementQuery,
+    PageCursor,
+    parse_fields,
+)
+
+
+class TestPageCursor:
+    """PageCursorのテスト"""
+
+    def test_round_trip(self):
+        """encodeした文字列からdecodeで同じカーソルを復元できる"""
+        # Arrange
+        cursor = PageCursor(
+            measured_at=datetime(2024, 5, 20, 12, 0, 0, 123456, tzinfo=UTC),
+            id="01900000-0000-7000-8000-000000000001",
+        )
+
+        # Act
+        token = cursor.encode()
+
+        # Assert
+        assert "=" not in token
+        assert PageCursor.decode(token) == cursor
+
+    def test_decode_keeps_offset_as_same_instant(self):
+        """タイムゾーン付きの日時は同じ時刻として復元される"""
+        # Arrange
+        jst = timezone(timedelta(hours=9))
+        cursor = PageCursor(
+            measured_at=datetime(2024, 5, 20, 21, 0, tzinfo=jst),
+            id="01900000-0000-7000-8000-000000000001",
+        )
+
+        # Act
+        decoded = PageCursor.decode(cursor.encode())
+
+        # Assert
+        assert decoded.measured_at == datetime(2024, 5, 20, 12, 0, tzinfo=UTC)
+
+    @pytest.mark.parametrize("token", [
+        "", "not-a-cursor", "W10", "WyJ4IiwiYSJd", "bnVsbA",
+        # ["2024-01-01T00:00:00Z","not-a-uuid"]
+        "WyIyMDI0LTAxLTAxVDAwOjAwOjAwWiIsIm5vdC1hLXV1aWQiXQ",
+    ])
+    def test_invalid_cursor_raises_error(self, token):
+        """形式が不正なカーソル・IDがUUIDでないカーソルはValueError"""
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            PageCursor.decode(token)
+
+
+class TestParseFields:
+    """parse_fieldsのテスト"""
+
+    def test_defaults_to_all_fields(self):
+        """省略時はすべてのフィールド"""
+        assert parse_fields(None) == MEASUREMENT_FIELDS
+        assert "user_id" not in MEASUREMENT_FIELDS
+
+    def test_orders_and_deduplicates_fields(self):
+        """カラム順に並べ、重複と空白を除く"""
+        assert parse_fields(" value,id ,value,") == ("id", "value")
+
+    def test_unknown_field_raises_error(self):
+        """未知のフィールドはValueError"""
+        with pytest.raises(ValueError, match="user_id"):
+            parse_fields("value,user_id")
+
+
+class TestMeasurementQuery:
+    """MeasurementQueryのテスト"""
+
+    def test_selected_columns_include_cursor_fields(self):
+        """カーソルの生成に必要なmeasured_atとidを常にSELECTする"""
+        query = MeasurementQuery(user_id="user", limit=10, fields=("value",))
+
+        assert query.selected_columns == ("id", "value", "measured_at")
+
+    def test_non_positive_limit_raises_error(self):
+        """limitが正でない場合はValueError"""
+        with pytest.raises(ValueError, match="limit"):
+            MeasurementQuery(user_id="user", limit=0)
@@ -0,0 +1,155 @@
+"""時系列のダウンサンプリングのユニットテスト"""
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from domain.services.measurement_series import (
+    aggregate_series_buckets,
+    downsample_lttb,
+    lttb_indices,
+)
+
+START = datetime(2024, 5, 1, tzinfo=UTC)
+START_US = int(START.timestamp()) * 1_000_000
+
+
+def reference_lttb(x: list[float], y: list[float], threshold: int) -> list[int]:
+    """LTTBの逐次実装（比較用）"""
+    size = len(x)
+    every = (size - 2) / (threshold - 2)
+    selected = [0]
+    previous = 0
+    for bucket in range(threshold - 2):
+        lo, hi = int(bucket * every) + 1, int((bucket + 1) * every) + 1
+        if bucket == threshold - 3:
+            cx, cy = x[-1], y[-1]
+        else:
+            next_hi = int((bucket + 2) * every) + 1
+            cx = sum(x[hi:next_hi]) / (next_hi - hi)
+            cy = sum(y[hi:next_hi]) / (next_hi - hi)
+        ax, ay = x[previous], y[previous]
+        areas = [abs((ax - cx) * (y[j] - ay) - (ax - x[j]) * (cy - ay)) for j in range(lo, hi)]
+        previous = lo + areas.index(max(areas))
+        selected.append(previous)
+    selected.append(size - 1)
+    return selected
+
+
+class TestLTTB:
+    """lttb_indicesのテスト"""
+
+    @pytest.mark.parametrize(("size", "threshold"), [(10, 3), (100, 7), (1000, 50), (5000, 333)])
+    def test_matches_sequential_implementation(self, size, threshold):
+        """逐次実装と同じ点を選ぶ"""
+        # Arrange
+        rng = np.random.default_rng(size)
+        x = START_US + np.cumsum(rng.integers(1, 10_000_000, size))
+        y = rng.normal(70, 10, size)
+
+        # Act
+        indices = lttb_indices(x, y, threshold)
+
+        # Assert
+        expected = reference_lttb((x - x[0]).astype(float).tolist(), y.tolist(), threshold)
+        assert indices.tolist() == expected
+
+    def test_keeps_endpoints_and_spike(self):
+        """先頭・末尾と、平坦な系列中のピークを残す"""
+        # Arrange
+        x = np.arange(10_000, dtype=np.int64) * 1_000_000
+        y = np.full(10_000, 60.0)
+        y[4321] = 180.0
+
+        # Act
+        indices = lttb_indices(x, y, 100)
+
+        # Assert
+        assert len(indices) == 100
+        assert indices[0] == 0 and indices[-1] == 9_999
+        assert 4321 in indices
+        assert np.all(np.diff(indices) > 0)
+
+    def test_returns_all_points_within_threshold(self):
+        """点数がthreshold以下の場合はすべて返す"""
+        x = np.arange(5, dtype=np.int64)
+
+        assert lttb_indices(x, x.astype(float), 5).tolist() == [0, 1, 2, 3, 4]
+
+    def test_threshold_below_three_raises_error(self):
+        """thresholdが3未満の場合はValueError"""
+        with pytest.raises(ValueError, match="threshold"):
+            lttb_indices(np.arange(10), np.zeros(10), 2)
+
+    def test_downsample_returns_datetime_points(self):
+        """測定日時をUTCの日時に戻して返す"""
+        # Arrange
+        x = START_US + np.arange(3, dtype=np.int64) * 60_000_000
+
+        # Act
+        points = downsample_lttb(x, np.array([1.0, 2.0, 3.0]), 3)
+
+        # Assert
+        assert [(point.measured_at, point.value) for point in points] == [
+            (START, 1.0),
+            (START + timedelta(minutes=1), 2.0),
+            (START + timedelta(minutes=2), 3.0),
+        ]
+
+
+class TestAggregateSeriesBuckets:
+    """aggregate_series_bucketsのテスト"""
+
+    def test_aggregates_equal_width_buckets(self):
+        """期間を等幅に分け、データのあるバケットのみ集計する"""
+        # Arrange: 1日を4バケット（6時間幅）に分ける
+        hours = np.array([0, 1, 5, 13, 23])
+        timestamps = START_US + hours * 3_600_000_000
+        values = np.array([60.0, 80.0, 70.0, 100.0, 50.0])
+
+        # Act
+        buckets = aggregate_series_buckets(
+            timestamps, values, START, START + timedelta(days=1), 4
+        )
+
+        # Assert
+        assert [bucket.bucket_start for bucket in buckets] == [
+            START, START + timedelta(hours=12), START + timedelta(hours=18),
+        ]
+        assert [bucket.count for bucket in buckets] == [3, 1, 1]
+        assert (buckets[0].minimum, buckets[0].maximum, buckets[0].mean) == (60.0, 80.0, 70.0)
+
+    def test_matches_naive_aggregation(self):
+        """バケットごとの集計が素朴な実装と一致する"""
+        # Arrange
+        rng = np.random.default_rng(0)
+        timestamps = START_US + np.sort(rng.integers(0, 86_400_000_000, 10_000))
+        values = rng.normal(70, 10, 10_000)
+
+        # Act
+        buckets = aggregate_series_buckets(
+            timestamps, values, START, START + timedelta(days=1), 24
+        )
+
+        # Assert
+        hour = (timestamps - START_US) // 3_600_000_000
+        assert len(buckets) == 24
+        for index, bucket in enumerate(buckets):
+            expected = values[hour == index]
+            assert bucket.count == len(expected)
+            assert bucket.mean == pytest.approx(expected.mean())
+            assert bucket.minimum == expected.min()
+            assert bucket.maximum == expected.max()
+
+    def test_empty_series(self):
+        """データがない場合は空のリスト"""
+        buckets = aggregate_series_buckets(
+            np.empty(0, dtype=np.int64), np.empty(0), START, START + timedelta(days=1), 10
+        )
+
+        assert buckets == []
+
+    def test_invalid_range_raises_error(self):
+        """期間が空の場合はValueError"""
+        with pytest.raises(ValueError, match="end must be after start"):
+            aggregate_series_buckets(np.empty(0, dtype=np.int64), np.empty(0), START, START, 10)
@@ -0,0 +1,192 @@
+"""測定データのロールアップ集計サービスのユニットテスト"""
+import math
+import random
+import statistics
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from domain.entities.measurement import MetricType
+from domain.services.measurement_summary import (
+    BucketAggregate,
+    BucketGranularity,
+    BucketStatistics,
+    SummaryPeriod,
+    aggregate_into_buckets,
+    floor_to_bucket,
+    summarize_by_metric,
+    summary_window,
+)
+
+
+class TestSummaryWindow:
+    """集計期間の算出テスト"""
+
+    @pytest.mark.parametrize("period, granularity, width", [
+        (SummaryPeriod.DAY, BucketGranularity.HOUR, timedelta(hours=24)),
+        (SummaryPeriod.WEEK, BucketGranularity.DAY, timedelta(days=7)),
+        (SummaryPeriod.MONTH, BucketGranularity.DAY, timedelta(days=30)),
+    ])
+    def test_window_is_aligned_to_buckets(self, period, granularity, width):
+        """期間はバケット境界に揃い、終端時刻を含むバケットまでを含む"""
+        # Arrange
+        end = datetime(2024, 3, 10, 15, 42, 7, tzinfo=UTC)
+
+        # Act
+        window = summary_window(period, end)
+
+        # Assert
+        assert window.granularity == granularity
+        assert window.end - window.start == width
+        assert window.start <= end < window.end
+        assert window.end == floor_to_bucket(end, granularity) + granularity.width
+
+
+class TestAggregateIntoBuckets:
+    """バケット集計のテスト"""
+
+    def test_aggregates_match_naive_computation(self):
+        """ランダムなデータで素朴な集計と同じ結果になる"""
+        # Arrange
+        rng = random.Random(7)
+        base = datetime(2024, 1, 1, tzinfo=UTC)
+        rows = [
+            (
+                rng.choice([MetricType.HEART_RATE, MetricType.STEPS]).value,
+                rng.uniform(40, 180),
+                base + timedelta(minutes=rng.randrange(60 * 48)),
+            )
+            for _ in range(500)
+        ]
+
+        # Act
+        aggregates = aggregate_into_buckets(
+            metric_types=[row[0] for row in rows],
+            units=["bpm" if row[0] == "heart_rate" else "steps" for row in rows],
+            values=[row[1] for row in rows],
+            measured_at=[row[2] for row in rows],
+            granularity=BucketGranularity.HOUR,
+        )
+
+        # Assert
+        expected: dict[tuple[str, datetime], list[float]] = {}
+        for metric_type, value, measured_at in rows:
+            bucket = measured_at.replace(minute=0, second=0, microsecond=0)
+            expected.setdefault((metric_type, bucket), []).append(value)
+        assert len(aggregates) == len(expected)
+        for aggregate in aggregates:
+            values = expected[(aggregate.metric_type.value, aggregate.bucket_start)]
+            assert aggregate.statistics.count == len(values)
+            assert aggregate.statistics.total == pytest.approx(sum(values))
+            assert aggregate.statistics.minimum == min(values)
+            assert aggregate.statistics.maximum == max(values)
+            assert aggregate.statistics.sum_of_squares == pytest.approx(sum(v * v for v in values))
+
+    def test_daily_buckets_use_utc_days(self):
+        """日バケットはUTCの日付で区切られる"""
+        # Arrange
+        measured_at = [
+            datetime(2024, 1, 1, 23, 59, tzinfo=UTC),
+            datetime(2024, 1, 2, 0, 0, tzinfo=UTC),
+        ]
+
+        # Act
+        aggregates = aggregate_into_buckets(
+            ["steps", "steps"], ["steps", "steps"], [100.0, 200.0], measured_at, BucketGranularity.DAY
+        )
+
+        # Assert
+        assert [aggregate.bucket_start for aggregate in aggregates] == [
+            datetime(2024, 1, 1, tzinfo=UTC),
+            datetime(2024, 1, 2, tzinfo=UTC),
+        ]
+
+    def test_units_are_aggregated_separately(self):
+        """同じメトリックタイプ・バケットでも単位が異なる値は別々に集計する"""
+        # Arrange
+        measured_at = [datetime(2024, 1, 1, 8, minute, tzinfo=UTC) for minute in range(3)]
+
+        # Act
+        aggregates = aggregate_into_buckets(
+            ["body_weight"] * 3, ["lb", "kg", "kg"], [154.0, 70.0, 71.0],
+            measured_at, BucketGranularity.HOUR,
+        )
+
+        # Assert
+        assert [(aggregate.unit, aggregate.statistics.total) for aggregate in aggregates] == [
+            ("kg", 141.0),
+            ("lb", 154.0),
+        ]
+
+    def test_empty_input(self):
+        """空の入力では空のリストを返す"""
+        assert aggregate_into_buckets([], [], [], [], BucketGranularity.HOUR) == []
+
+
+class TestBucketStatistics:
+    """併合可能な集計値のテスト"""
+
+    def test_merge_and_derived_statistics(self):
+        """併合後の平均・標準偏差が全データから求めた値と一致する"""
+        # Arrange
+        first, second = [60.0, 70.0, 80.0], [90.0, 100.0]
+
+        def to_statistics(values):
+            return BucketStatistics(
+                count=len(values),
+                total=sum(values),
+                minimum=min(values),
+                maximum=max(values),
+                sum_of_squares=sum(v * v for v in values),
+            )
+
+        # Act
+        merged = BucketStatistics.merge([to_statistics(first), to_statistics(second)])
+
+        # Assert
+        assert merged.count == 5
+        assert merged.minimum == 60.0
+        assert merged.maximum == 100.0
+        assert merged.mean == pytest.approx(80.0)
+        assert merged.stddev == pytest.approx(statistics.pstdev(first + second))
+
+    def test_stddev_of_constant_values_is_zero(self):
+        """すべて同じ値の場合、丸め誤差があっても標準偏差は0以上"""
+        stats = BucketStatistics(count=3, total=0.3, minimum=0.1, maximum=0.1, sum_of_squares=0.03)
+
+        assert stats.stddev >= 0.0
+        assert math.isclose(stats.stddev, 0.0, abs_tol=1e-7)
+
+    def test_merge_empty_raises_error(self):
+        """空の併合はエラー"""
+        with pytest.raises(ValueError):
+            BucketStatistics.merge([])
+
+
+class TestSummarizeByMetric:
+    """メトリックタイプごとのサマリーのテスト"""
+
+    def test_groups_buckets_per_metric(self):
+        """メトリックタイプごとに併合され、バケットは時刻順に並ぶ"""
+        # Arrange
+        stats = BucketStatistics(count=1, total=5.0, minimum=5.0, maximum=5.0, sum_of_squares=25.0)
+        base = datetime(2024, 1, 1, tzinfo=UTC)
+        aggregates = [
+            BucketAggregate(MetricType.STEPS, "steps", base + timedelta(hours=1), stats),
+            BucketAggregate(MetricType.HEART_RATE, "bpm", base, stats),
+            BucketAggregate(MetricType.STEPS, "steps", base, stats),
+        ]
+
+        # Act
+        summaries = summarize_by_metric(aggregates)
+
+        # Assert
+        assert [summary.metric_type for summary in summaries] == [
+            MetricType.HEART_RATE,
+            MetricType.STEPS,
+        ]
+        assert summaries[1].statistics.count == 2
+        assert [bucket.bucket_start for bucket in summaries[1].buckets] == [
+            base,
+            base + timedelta(hours=1),
+        ]
@@ -0,0 +1,166 @@
+"""測定データのバッチバリデーションのユニットテスト"""
+import random
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import numpy as np
+from pydantic import ValidationError
+
+from domain.entities.measurement import VALID_UNITS, Measurement, MetricType
+from domain.services.measurement_validation import (
+    ensure_utc,
+    validate_measurement_columns,
+)
+
+
+def validate_row_by_row(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Measurementエンティティを1行ずつ生成した場合のエラー一覧（比較用）"""
+    errors = []
+    for index, row in enumerate(rows):
+        try:
+            Measurement(**row)
+        except ValidationError as e:
+            for error in e.errors():
+                errors.append({
+                    "index": index,
+                    "message": error["msg"],
+                    "field": ".".join(str(loc) for loc in error["loc"]) if error["loc"] else None,
+                })
+    return errors
+
+
+def validate_columns(rows: list[dict[str, Any]], now: datetime | None = None):
+    """行データを列に分解してバッチバリデーションを実行"""
+    return validate_measurement_columns(
+        metric_types=[row["metric_type"] for row in rows],
+        values=[row["value"] for row in rows],
+        units=[row["unit"] for row in rows],
+        measured_at=[ensure_utc(row["measured_at"]) for row in rows],
+        now=now,
+    )
+
+
+class TestMeasurementBatchValidation:
+    """バッチバリデーションのテスト"""
+
+    def test_valid_rows_pass(self):
+        """正常なデータはすべて有効と判定される"""
+        # Arrange
+        now = datetime.now(UTC)
+        rows = [
+            {"metric_type": "heart_rate", "value": 72.0, "unit": "bpm", "measured_at": now},
+            {"metric_type": "steps", "value": 0.0, "unit": "steps", "measured_at": now},
+            {"metric_type": "body_weight", "value": 65.5, "unit": "kg", "measured_at": now},
+        ]
+
+        # Act
+        result = validate_columns(rows)
+
+        # Assert
+        assert result.valid_mask.tolist() == [True, True, True]
+        assert result.errors == []
+
+    def test_heart_rate_out_of_range_message(self):
+        """心拍数の範囲外エラーは専用メッセージになる"""
+        # Arrange
+        rows = [{
+            "metric_type": MetricType.HEART_RATE,
+            "value": 300.0,
+            "unit": "bpm",
+            "measured_at": datetime.now(UTC),
+        }]
+
+        # Act
+        result = validate_columns(rows)
+
+        # Assert
+        assert result.valid_mask.tolist() == [False]
+        assert result.errors == [{
+            "index": 0,
+            "message": "Value error, Heart rate value 300.0 is out of range. "
+                       "Expected range: 20.0 to 250.0",
+            "field": None,
+        }]
+
+    def test_field_errors_skip_model_level_checks(self):
+        """値・日時のエラーがある行では単位・範囲チェックを行わない"""
+        # Arrange
+        future = datetime.now(UTC) + timedelta(days=1)
+        rows = [{
+            "metric_type": "heart_rate",
+            "value": -10.0,
+            "unit": "unknown",
+            "measured_at": future,
+        }]
+
+        # Act
+        result = validate_columns(rows)
+
+        # Assert
+        assert [error["field"] for error in result.errors] == ["value", "measured_at"]
+
+    def test_naive_datetime_is_treated_as_utc(self):
+        """タイムゾーンなしの日時はUTCとして未来判定される"""
+        # Arrange
+        now = datetime(2024, 1, 1, 12, 0, tzinfo=UTC)
+        rows = [{
+            "metric_type": "heart_rate",
+            "value": 72.0,
+            "unit": "bpm",
+            "measured_at": datetime(2024, 1, 1, 12, 0, 1),
+        }]
+
+        # Act
+        result = validate_columns(rows, now=now)
+
+        # Assert
+        assert result.errors[0]["field"] == "measured_at"
+
+    def test_custom_indexes_are_reported(self):
+        """indexesを指定するとエラーに元データのインデックスが記録される"""
+        # Arrange
+        now = datetime.now(UTC)
+
+        # Act
+        result = validate_measurement_columns(
+            metric_types=["heart_rate", "heart_rate"],
+            values=[72.0, 10.0],
+            units=["bpm", "bpm"],
+            measured_at=[now, now],
+            indexes=[3, 7],
+        )
+
+        # Assert
+        assert [error["index"] for error in result.errors] == [7]
+
+    def test_empty_batch(self):
+        """空の入力では空の結果を返す"""
+        result = validate_measurement_columns([], [], [], [])
+
+        assert result.valid_mask.shape == (0,)
+        assert result.errors == []
+
+    def test_matches_row_by_row_validation(self):
+        """ランダムなデータで1行ずつのエンティティ検証と同じ結果になる"""
+        # Arrange
+        rng = random.Random(42)
+        now = datetime.now(UTC)
+        all_units = sorted({unit for units in VALID_UNITS.values() for unit in units})
+        rows = []
+        for _ in range(2000):
+            metric_type = rng.choice(list(MetricType))
+            rows.append({
+                "metric_type": metric_type.value,
+                "value": rng.choice([-5.0, 0.0, 0.05, 30.0, 72.0, 120.0, 300.0, 1e6, 2e6]),
+                "unit": rng.choice(all_units),
+                "measured_at": now + timedelta(hours=rng.choice([-48, -1, 1])),
+            })
+
+        # Act
+        result = validate_columns(rows)
+
+        # Assert
+        expected = validate_row_by_row(rows)
+        assert result.errors == expected
+        failed = {error["index"] for error in expected}
+        assert np.flatnonzero(~result.valid_mask).tolist() == sorted(failed)
@@ -0,0 +1,239 @@
+"""
+非同期一括登録キューのユニットテスト
+
+- 共通：受付順の取り出し、行数によるまとめ方、状態の遷移、待機中の行数
+- InMemoryIngestQueue：完了済みの結果の保持数
+- SQLiteIngestQueue：再起動後のジョブの保持、放棄されたジョブの再処理、結果の保持期間、
+  ペイロードを読まない状態の取得
+"""
+from datetime import UTC, datetime
+
+import pytest
+from src.infrastructure.queue import (
+    InMemoryIngestQueue,
+    IngestJob,
+    IngestJobState,
+    IngestJobStatus,
+    SQLiteIngestQueue,
+)
+from src.infrastructure.queue import sqlite_queue
+from tests.conftest import FakeClock
+
+
+def make_job(batch_id: str, rows: int, user_id: str = "queue_user") -> IngestJob:
+    """指定した行数のジョブ"""
+    return IngestJob(
+        batch_id=batch_id,
+        user_id=user_id,
+        rows=[{"metric_type": "steps", "value": float(i), "unit": "steps",
+               "measured_at": "2024-05-20T00:00:00+00:00"} for i in range(rows)],
+        indexes=list(range(1, rows + 1)),
+        errors=[{"index": 0, "message": "Field required", "field": "value"}],
+        total_count=rows + 1,
+        enqueued_at=datetime(2024, 5, 20, tzinfo=UTC),
+    )
+
+
+def completed(job: IngestJob, success_count: int) -> IngestJobState:
+    """ジョブの完了状態"""
+    return IngestJobState(
+        batch_id=job.batch_id,
+        user_id=job.user_id,
+        status=IngestJobStatus.COMPLETED,
+        total_count=job.total_count,
+        success_count=success_count,
+        ids=[f"id-{i}" for i in range(success_count)],
+        errors=job.errors,
+    )
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def queue(request: pytest.FixtureRequest, tmp_path):
+    """各実装のキュー"""
+    if request.param == "memory":
+        yield InMemoryIngestQueue(poll_interval_seconds=0.01)
+        return
+    sqlite_queue = SQLiteIngestQueue(f"{tmp_path}/queue.db", poll_interval_seconds=0.01)
+    yield sqlite_queue
+    sqlite_queue.close()
+
+
+class TestIngestQueue:
+    """キューの共通の振る舞いのテスト"""
+
+    async def test_get_batch_takes_jobs_in_order_up_to_max_rows(self, queue) -> None:
+        """受付順に合計行数がmax_rowsを超えない範囲で取り出し、1件目は行数によらず取り出す"""
+        # Arrange
+        for batch_id, rows in (("a", 3), ("b", 4), ("c", 2), ("d", 10)):
+            await queue.put(make_job(batch_id, rows))
+
+        # Act
+        first = await queue.get_batch(max_rows=7, timeout_seconds=0)
+        second = await queue.get_batch(max_rows=7, timeout_seconds=0)
+        third = await queue.get_batch(max_rows=7, timeout_seconds=0)
+        empty = await queue.get_batch(max_rows=7, timeout_seconds=0)
+
+        # Assert
+        assert [job.batch_id for job in first] == ["a", "b"]
+        assert [job.batch_id for job in second] == ["c"]
+        assert [job.batch_id for job in third] == ["d"]
+        assert empty == []
+
+    async def test_jobs_round_trip(self, queue) -> None:
+        """取り出したジョブは追加したジョブと同じ内容"""
+        # Arrange
+        job = make_job("a", 2)
+        await queue.put(job)
+
+        # Act
+        (taken,) = await queue.get_batch(max_rows=100, timeout_seconds=0)
+
+        # Assert
+        assert taken == job
+
+    async def test_status_follows_job_lifecycle(self, queue) -> None:
+        """状態は待機中・処理中・完了と遷移し、完了後は結果を返す"""
+        # Arrange
+        job = make_job("a", 2)
+
+        # Act
+        await queue.put(job)
+        queued = await queue.status("a")
+        await queue.get_batch(max_rows=100, timeout_seconds=0)
+        processing = await queue.status("a")
+        await queue.complete(completed(job, success_count=2))
+        done = await queue.status("a")
+
+        # Assert
+        assert queued.status is IngestJobStatus.QUEUED
+        assert queued.total_count == 3
+        assert queued.errors == job.errors
+        assert processing.status is IngestJobStatus.PROCESSING
+        assert done.status is IngestJobStatus.COMPLETED
+        assert done.success_count == 2
+        assert done.ids == ["id-0", "id-1"]
+        assert await queue.status("missing") is None
+
+    async def test_pending_rows_counts_queued_jobs(self, queue) -> None:
+        """待機中の行数は取り出したジョブを含まない"""
+        # Arrange
+        await queue.put(make_job("a", 3))
+        await queue.put(make_job("b", 4))
+
+        # Act
+        before = await queue.pending_rows()
+        await queue.get_batch(max_rows=3, timeout_seconds=0)
+        after = await queue.pending_rows()
+
+        # Assert
+        assert before == 7
+        assert after == 4
+
+    async def test_get_batch_waits_until_timeout(self, queue) -> None:
+        """ジョブがない場合はタイムアウトまで待って空のリストを返す"""
+        # Act
+        jobs = await queue.get_batch(max_rows=10, timeout_seconds=0.05)
+
+        # Assert
+        assert jobs == []
+
+
+class TestInMemoryIngestQueue:
+    """InMemoryIngestQueueのテスト"""
+
+    async def test_keeps_latest_results(self) -> None:
+        """完了済みの結果は最大数を超えると古いものから削除する"""
+        # Arrange
+        queue = InMemoryIngestQueue(max_results=2)
+        jobs = [make_job(batch_id, 1) for batch_id in ("a", "b", "c")]
+        for job in jobs:
+            await queue.put(job)
+        await queue.get_batch(max_rows=10, timeout_seconds=0)
+
+        # Act
+        for job in jobs:
+            await queue.complete(completed(job, success_count=1))
+
+        # Assert
+        assert await queue.status("a") is None
+        assert (await queue.status("c")).status is IngestJobStatus.COMPLETED
+
+
+class TestSQLiteIngestQueue:
+    """SQLiteIngestQueueのテスト"""
+
+    async def test_jobs_survive_reopen(self, tmp_path) -> None:
+        """待機中のジョブは開き直しても取り出せる"""
+        # Arrange
+        path = f"{tmp_path}/queue.db"
+        first = SQLiteIngestQueue(path)
+        await first.put(make_job("a", 2))
+        first.close()
+
+        # Act
+        reopened = SQLiteIngestQueue(path)
+        jobs = await reopened.get_batch(max_rows=10, timeout_seconds=0)
+        reopened.close()
+
+        # Assert
+        assert [job.batch_id for job in jobs] == ["a"]
+
+    async def test_abandoned_jobs_are_requeued(self, tmp_path) -> None:
+        """処理中のままタイムアウトしたジョブは再び取り出される"""
+        # Arrange
+        clock = FakeClock()
+        queue = SQLiteIngestQueue(f"{tmp_path}/queue.db", processing_timeout_seconds=60, clock=clock)
+        await queue.put(make_job("a", 2))
+        await queue.get_batch(max_rows=10, timeout_seconds=0)
+
+        # Act
+        clock.now += 30
+        before_timeout = await queue.get_batch(max_rows=10, timeout_seconds=0)
+        clock.now += 31
+        after_timeout = await queue.get_batch(max_rows=10, timeout_seconds=0)
+        queue.close()
+
+        # Assert
+        assert before_timeout == []
+        assert [job.batch_id for job in after_timeout] == ["a"]
+
+    async def test_status_does_not_decode_payload(self, tmp_path, monkeypatch) -> None:
+        """待機中・処理中の状態は行のペイロードを読まずに返す"""
+        # Arrange
+        queue = SQLiteIngestQueue(f"{tmp_path}/queue.db")
+        job = make_job("a", 2)
+        await queue.put(job)
+
+        def fail(*args):
+            raise AssertionError("payload decoded")
+
+        monkeypatch.setattr(sqlite_queue, "_job_from_payload", fail)
+
+        # Act
+        state = await queue.status("a")
+        queue.close()
+
+        # Assert
+        assert state.status is IngestJobStatus.QUEUED
+        assert state.total_count == 3
+        assert state.errors == job.errors
+
+    async def test_expired_results_are_deleted(self, tmp_path) -> None:
+        """保持期間を過ぎた結果は次の完了時に削除する"""
+        # Arrange
+        clock = FakeClock()
+        queue = SQLiteIngestQueue(f"{tmp_path}/queue.db", result_ttl_seconds=60, clock=clock)
+        jobs = [make_job("a", 1), make_job("b", 1)]
+        for job in jobs:
+            await queue.put(job)
+        await queue.get_batch(max_rows=10, timeout_seconds=0)
+        await queue.complete(completed(jobs[0], success_count=1))
+
+        # Act
+        clock.now += 61
+        await queue.complete(completed(jobs[1], success_count=1))
+
+        # Assert
+        assert await queue.status("a") is None
+        assert (await queue.status("b")).status is IngestJobStatus.COMPLETED
+        queue.close()
@@ -0,0 +1,407 @@
+"""
+生データアーカイブのユニットテスト
+
+- MeasurementArchiver: 行数・経過時間のしきい値での書き出し、日付・メトリックタイプごとのキー、
+  書き出しに失敗した行の再書き出し、停止時の書き出し
+- LocalArchiveStorage / S3ArchiveStorage: 保存先へのファイルの保存
+- 形式: gzip圧縮のJSON Lines、Parquet・Arrow IPC（pyarrowがある場合）
+"""
+import asyncio
+import gzip
+import io
+import json
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import pytest
+from core.metrics import ARCHIVE_DROPPED_ROWS
+from src.domain.entities.measurement_batch import MeasurementBatch
+from src.infrastructure.archive import (
+    ARCHIVE_FORMATS,
+    LocalArchiveStorage,
+    MeasurementArchiver,
+    S3ArchiveStorage,
+    get_archive_format,
+)
+from tests.conftest import FakeClock
+
+DAY = datetime(2024, 5, 20, 23, 0, tzinfo=UTC)
+NDJSON = ARCHIVE_FORMATS["ndjson"]
+
+
+class MemoryStorage:
+    """保存したファイルを辞書に保持する保存先（指定した回の呼び出しを失敗させられる）"""
+
+    def __init__(self, fail_calls: frozenset[int] = frozenset()) -> None:
+        self.files: dict[str, bytes] = {}
+        self.fail_calls = fail_calls
+        self.calls = 0
+
+    def put(self, key: str, body: bytes, content_type: str) -> None:
+        self.calls += 1
+        if self.calls in self.fail_calls:
+            raise OSError("storage unavailable")
+        self.files[key] = body
+
+
+class FakeS3Client:
+    """boto3のput_objectの呼び出しを記録するクライアント"""
+
+    def __init__(self) -> None:
+        self.calls: list[dict[str, Any]] = []
+
+    def put_object(self, **kwargs: Any) -> dict[str, Any]:
+        self.calls.append(kwargs)
+        return {}
+
+
+def make_batch(
+    metric_types: list[str],
+    start: datetime = DAY,
+    step: timedelta = timedelta(minutes=30),
+    user_id: str = "archive_user",
+) -> MeasurementBatch:
+    """指定したメトリックタイプの行を一定間隔で並べたバッチ"""
+    count = len(metric_types)
+    return MeasurementBatch.from_columns(
+        user_id=user_id,
+        created_at=start,
+        metric_types=metric_types,
+        values=[60.0 + i for i in range(count)],
+        units=["bpm" if metric == "heart_rate" else "count" for metric in metric_types],
+        measured_at=[start + step * i for i in range(count)],
+        device_ids=["apple_watch_001"] * count,
+        metadata=[{"source": "healthkit"}] * count,
+    )
+
+
+def read_ndjson(body: bytes) -> list[dict[str, Any]]:
+    """gzip圧縮のJSON Linesを読む"""
+    return [json.loads(line) for line in gzip.decompress(body).decode().splitlines()]
+
+
+def dropped_rows() -> float:
+    """archive_dropped_rows_totalの現在値"""
+    samples = [
+        line for line in ARCHIVE_DROPPED_ROWS.render().splitlines()
+        if not line.startswith("#")
+    ]
+    return sum(float(line.rsplit(" ", 1)[1]) for line in samples)
+
+
+def keys_by_partition(files: dict[str, bytes]) -> dict[str, int]:
+    """パーティション（ファイル名を除いたキー）ごとの行数"""
+    rows: dict[str, int] = {}
+    for key, body in files.items():
+        partition = key.rsplit("/", 1)[0]
+        rows[partition] = rows.get(partition, 0) + len(read_ndjson(body))
+    return rows
+
+
+class TestMeasurementArchiver:
+    """MeasurementArchiverのテスト"""
+
+    async def test_add_buffers_rows_without_writing(self):
+        """追加しただけでは書き出さず、しきい値に達するまでバッファする"""
+        # Arrange
+        storage = MemoryStorage()
+        archiver = MeasurementArchiver(storage, NDJSON, max_rows=10, clock=FakeClock())
+
+        # Act
+        archiver.add(make_batch(["heart_rate"] * 3))
+        files = await archiver.flush()
+
+        # Assert
+        assert files == 0
+        assert storage.files == {}
+        assert archiver.buffered_rows() == 3
+
+    async def test_size_threshold_writes_files_partitioned_by_date_and_metric(self):
+        """行数のしきい値を超えたバッファを日付・メトリックタイプごとのファイルに書き出す"""
+        # Arrange
+        storage = MemoryStorage()
+        archiver = MeasurementArchiver(storage, NDJSON, max_rows=3, clock=FakeClock())
+        # 23:00から30分間隔のため、先頭2行が5/20、残りの3行が5/21になる
+        batch = make_batch(["heart_rate", "steps", "heart_rate", "heart_rate", "steps"])
+
+        # Act
+        archiver.add(batch)
+        first = await archiver.flush()
+        rest = await archiver.flush(force=True)
+
+        # Assert
+        assert first == 2
+        assert rest == 2
+        assert keys_by_partition(storage.files) == {
+            "date=2024-05-20/metric_type=heart_rate": 1,
+            "date=2024-05-20/metric_type=steps": 1,
+            "date=2024-05-21/metric_type=heart_rate": 2,
+            "date=2024-05-21/metric_type=steps": 1,
+        }
+        assert all(key.endswith(".ndjson.gz") for key in storage.files)
+        assert archiver.buffered_rows() == 0
+
+    async def test_age_threshold_writes_old_buffers(self):
+        """最初の行を追加してからの経過時間がしきい値を超えたバッファを書き出す"""
+        # Arrange
+        clock = FakeClock()
+        storage = MemoryStorage()
+        archiver = MeasurementArchiver(storage, NDJSON, max_age_seconds=60, clock=clock)
+        archiver.add(make_batch(["heart_rate"]))
+        clock.now += 30
+        archiver.add(make_batch(["heart_rate"], start=DAY + timedelta(minutes=1)))
+
+        # Act
+        before = await archiver.flush()
+        clock.now += 30
+        after = await archiver.flush()
+
+        # Assert
+        assert before == 0
+        assert after == 1
+        (body,) = storage.files.values()
+        assert len(read_ndjson(body)) == 2
+
+    async def test_rows_keep_all_columns(self):
+        """ファイルにはIDからメタデータまですべてのカラムを含め、日時はUTCで保存する"""
+        # Arrange
+        storage = MemoryStorage()
+        archiver = MeasurementArchiver(storage, NDJSON, clock=FakeClock())
+        batch = make_batch(["heart_rate"])
+        batch.measured_at[0] = datetime(2024, 5, 21, 8, 0, tzinfo=UTC).astimezone(
+            datetime.now().astimezone().tzinfo
+        )
+
+        # Act
+        archiver.add(batch)
+        await archiver.flush(force=True)
+
+        # Assert
+        ((key, body),) = storage.files.items()
+        (row,) = read_ndjson(body)
+        assert key.startswith("date=2024-05-21/metric_type=heart_rate/part-")
+        assert row == {
+            "id": batch.ids[0],
+            "user_id": "archive_user",
+            "metric_type": "heart_rate",
+            "value": 60.0,
+            "unit": "bpm",
+            "measured_at": "2024-05-21T08:00:00+00:00",
+            "device_id": "apple_watch_001",
+            "metadata": '{"source":"healthkit"}',
+            "notes": None,
+            "created_at": DAY.isoformat(),
+        }
+
+    async def test_failed_write_keeps_unwritten_rows_for_retry(self):
+        """書き出しに失敗した行はバッファに戻し、書き出し済みの行は再度書き出さない"""
+        # Arrange
+        storage = MemoryStorage(fail_calls=frozenset({2}))
+        archiver = MeasurementArchiver(storage, NDJSON, clock=FakeClock())
+        archiver.add(make_batch(["heart_rate", "steps", "sleep_hours"], step=timedelta(minutes=1)))
+
+        # Act
+        first = await archiver.flush(force=True)
+        buffered = archiver.buffered_rows()
+        retry = await archiver.flush(force=True)
+
+        # Assert
+        assert (first, buffered, retry) == (1, 2, 2)
+        assert sorted(key.split("/")[1] for key in storage.files) == [
+            "metric_type=heart_rate", "metric_type=sleep_hours", "metric_type=steps",
+        ]
+        assert archiver.buffered_rows() == 0
+
+    async def test_stop_flushes_remaining_buffers(self):
+        """停止時はしきい値に達していないバッファもすべて書き出す"""
+        # Arrange
+        storage = MemoryStorage()
+        archiver = MeasurementArchiver(storage, NDJSON, flush_interval_seconds=0.01)
+        archiver.start()
+        archiver.add(make_batch(["heart_rate", "heart_rate"], user_id="user_a"))
+        archiver.add(make_batch(["heart_rate"], user_id="user_b"))
+        await asyncio.sleep(0.03)
+
+        # Act
+        await archiver.stop()
+
+        # Assert
+        assert len(storage.files) == 2
+        assert archiver.buffered_rows() == 0
+
+    async def test_background_task_flushes_due_buffers(self):
+        """バックグラウンドのタスクが一定間隔でしきい値を超えたバッファを書き出す"""
+        # Arrange
+        storage = MemoryStorage()
+        archiver = MeasurementArchiver(storage, NDJSON, max_rows=1, flush_interval_seconds=0.01)
+        archiver.start()
+
+        # Act
+        archiver.add(make_batch(["heart_rate"]))
+        for _ in range(100):
+            if storage.files:
+                break
+            await asyncio.sleep(0.01)
+        buffered = archiver.buffered_rows()
+        await archiver.stop()
+
+        # Assert
+        assert len(storage.files) == 1
+        assert buffered == 0
+
+    async def test_buffer_limit_drops_oldest_rows(self):
+        """書き出し待ちの行数が上限を超えた場合は古い行から破棄し、破棄した行数を記録する"""
+        # Arrange
+        clock = FakeClock()
+        storage = MemoryStorage()
+        archiver = MeasurementArchiver(storage, NDJSON, max_buffered_rows=3, clock=clock)
+        archiver.add(make_batch(["heart_rate", "heart_rate"], user_id="user_a"))
+        clock.now += 1
+        dropped_before = dropped_rows()
+
+        # Act
+        archiver.add(make_batch(["heart_rate", "heart_rate"], user_id="user_b"))
+        buffered = archiver.buffered_rows()
+        await archiver.flush(force=True)
+
+        # Assert
+        assert buffered == 3
+        assert dropped_rows() - dropped_before == 1
+        rows = [row for body in storage.files.values() for row in read_ndjson(body)]
+        users = [row["user_id"] for row in rows]
+        assert sorted(users) == ["user_a", "user_b", "user_b"]
+
+    async def test_failed_write_backs_off_before_retry(self):
+        """書き出しに失敗した後は、失敗が続くほど間隔を空けて書き出し直す"""
+        # Arrange
+        clock = FakeClock()
+        storage = MemoryStorage(fail_calls=frozenset({1, 2}))
+        archiver = MeasurementArchiver(
+            storage, NDJSON, max_age_seconds=0, flush_interval_seconds=1.0, clock=clock,
+        )
+        archiver.add(make_batch(["heart_rate"]))
+
+        # Act
+        await archiver.flush()
+        clock.now += 0.5
+        waiting = await archiver.flush()
+        clock.now += 0.5
+        await archiver.flush()
+        clock.now += 1.5
+        still_waiting = await archiver.flush()
+        clock.now += 0.5
+        retried = await archiver.flush()
+
+        # Assert
+        assert (waiting, still_waiting, retried) == (0, 0, 1)
+        assert storage.calls == 3
+        assert archiver.buffered_rows() == 0
+
+    def test_invalid_max_rows_raises_error(self):
+        """行数のしきい値が0以下の場合はエラー"""
+        with pytest.raises(ValueError):
+            MeasurementArchiver(MemoryStorage(), NDJSON, max_rows=0)
+
+
+class TestArchiveStorage:
+    """保存先のテスト"""
+
+    def test_local_storage_writes_file_under_root(self, tmp_path: Path):
+        """キーのディレクトリを作成して保存し、一時ファイルを残さない"""
+        # Arrange
+        storage = LocalArchiveStorage(tmp_path)
+
+        # Act
+        storage.put("date=2024-05-20/metric_type=steps/part-1.ndjson.gz", b"data", "application/x-ndjson")
+
+        # Assert
+        path = tmp_path / "date=2024-05-20" / "metric_type=steps" / "part-1.ndjson.gz"
+        assert path.read_bytes() == b"data"
+        assert [p.name for p in path.parent.iterdir()] == ["part-1.ndjson.gz"]
+
+    def test_s3_storage_puts_object_with_prefix(self):
+        """接頭辞を付けたキーとContent-TypeでPutObjectを呼び出す"""
+        # Arrange
+        client = FakeS3Client()
+        storage = S3ArchiveStorage(client, "healthsync-data", prefix="raw/measurements/")
+
+        # Act
+        storage.put("date=2024-05-20/metric_type=steps/part-1.parquet", b"data", "application/vnd.apache.parquet")
+
+        # Assert
+        assert client.calls == [{
+            "Bucket": "healthsync-data",
+            "Key": "raw/measurements/date=2024-05-20/metric_type=steps/part-1.parquet",
+            "Body": b"data",
+            "ContentType": "application/vnd.apache.parquet",
+        }]
+
+    def test_s3_storage_with_moto(self):
+        """motoのS3にアーカイバーが書き出したファイルを保存できる"""
+        boto3 = pytest.importorskip("boto3")
+        moto = pytest.importorskip("moto")
+
+        with moto.mock_aws():
+            # Arrange
+            client = boto3.client("s3", region_name="us-east-1")
+            client.create_bucket(Bucket="healthsync-data")
+            archiver = MeasurementArchiver(
+                S3ArchiveStorage(client, "healthsync-data", prefix="raw"), NDJSON
+            )
+            archiver.add(make_batch(["heart_rate"]))
+
+            # Act
+            asyncio.run(archiver.flush(force=True))
+
+            # Assert
+            (item,) = client.list_objects_v2(Bucket="healthsync-data")["Contents"]
+            assert item["Key"].startswith("raw/date=2024-05-20/metric_type=heart_rate/")
+            body = client.get_object(Bucket="healthsync-data", Key=item["Key"])["Body"].read()
+            assert len(read_ndjson(body)) == 1
+
+
+class TestArchiveFormats:
+    """アーカイブファイルの形式のテスト"""
+
+    def test_unknown_format_raises_error(self):
+        """未知の形式名はエラー"""
+        with pytest.raises(ValueError):
+            get_archive_format("csv")
+
+    def test_ndjson_is_deterministic(self):
+        """同じ行からは同じバイト列を生成する"""
+        columns = {
+            "id": ["a"], "user_id": ["u"], "metric_type": ["steps"], "value": [1.0],
+            "unit": ["count"], "measured_at": [DAY], "device_id": [None],
+            "metadata": [None], "notes": [None], "created_at": [DAY],
+        }
+
+        assert NDJSON.encode(columns) == NDJSON.encode(columns)
+
+    @pytest.mark.parametrize("name", ["parquet", "arrow"])
+    async def test_columnar_formats_round_trip(self, name: str):
+        """Parquet・Arrow IPCのファイルから型付きのカラムを読み出せる"""
+        pa = pytest.importorskip("pyarrow")
+        import pyarrow.ipc as pa_ipc
+        import pyarrow.parquet as pa_parquet
+
+        # Arrange
+        storage = MemoryStorage()
+        archiver = MeasurementArchiver(storage, get_archive_format(name), clock=FakeClock())
+        archiver.add(make_batch(["heart_rate", "heart_rate"], step=timedelta(minutes=1)))
+
+        # Act
+        await archiver.flush(force=True)
+
+        # Assert
+        ((key, body),) = storage.files.items()
+        assert key.endswith(f".{name}")
+        table = (
+            pa_parquet.read_table(io.BytesIO(body))
+            if name == "parquet"
+            else pa_ipc.open_file(pa.BufferReader(body)).read_all()
+        )
+        assert table.column("value").to_pylist() == [60.0, 61.0]
+        assert table.schema.field("measured_at").type == pa.timestamp("us", tz="UTC")
+        assert table.column("metadata").to_pylist() == ['{"source":"healthkit"}'] * 2
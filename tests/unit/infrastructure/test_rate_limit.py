@@ -0,0 +1,164 @@
+"""
+レート制限のユニットテスト
+
+- RateLimiter: 上限までのバースト、放出間隔ごとの回復、再試行までの秒数、コストによる消費
+- InMemoryRateLimitBackend: キー数の上限とLRUによる追い出し
+- RedisRateLimitBackend: redis.asyncio互換クライアントへのスクリプトの実行
+"""
+from typing import Any
+
+import pytest
+from src.infrastructure.rate_limit import (
+    InMemoryRateLimitBackend,
+    RateLimiter,
+    RedisRateLimitBackend,
+)
+from src.infrastructure.rate_limit.backends import gcra_update
+from tests.conftest import FakeClock
+
+
+class FakeRedis:
+    """redis.asyncioのevalを模したクライアント（スクリプトの代わりに同じ判定をPythonで行う）"""
+
+    def __init__(self, clock: FakeClock) -> None:
+        self._clock = clock
+        self.data: dict[str, float] = {}
+        self.calls: list[tuple[Any, ...]] = []
+
+    async def eval(self, script: str, numkeys: int, *args: str) -> list[Any]:
+        self.calls.append((numkeys, *args))
+        key, cost, tolerance = args
+        now = self._clock()
+        allowed, tat = gcra_update(self.data.get(key, now), now, float(cost), float(tolerance))
+        if allowed:
+            self.data[key] = tat
+        # Redisはスクリプトの整数を整数、文字列をbytesで返す
+        return [int(allowed), str(tat - now).encode()]
+
+
+class TestRateLimiter:
+    """RateLimiter（InMemoryRateLimitBackend）のテスト"""
+
+    async def test_allows_burst_up_to_limit(self) -> None:
+        """期間あたりの上限までは連続して許可し、超えた分を拒否する"""
+        # Arrange
+        limiter = RateLimiter(InMemoryRateLimitBackend(clock=FakeClock()), 100, 60, "requests")
+
+        # Act
+        decisions = [await limiter.acquire("user") for _ in range(101)]
+
+        # Assert
+        assert all(decision.allowed for decision in decisions[:100])
+        assert [decision.remaining for decision in decisions[:3]] == [99, 98, 97]
+        assert decisions[99].remaining == 0
+        assert not decisions[100].allowed
+
+    async def test_recovers_one_request_per_emission_interval(self) -> None:
+        """上限に達した後は期間 / 上限の間隔で1件ずつ回復する"""
+        # Arrange
+        clock = FakeClock()
+        limiter = RateLimiter(InMemoryRateLimitBackend(clock=clock), 10, 60, "requests")
+        for _ in range(10):
+            await limiter.acquire("user")
+
+        # Act
+        denied = await limiter.acquire("user")
+        clock.now += denied.retry_after_seconds
+        allowed = await limiter.acquire("user")
+        again = await limiter.acquire("user")
+
+        # Assert
+        assert denied.retry_after_seconds == pytest.approx(6.0)
+        assert denied.reset_seconds == pytest.approx(60.0)
+        assert allowed.allowed
+        assert not again.allowed
+
+    async def test_denied_request_consumes_nothing(self) -> None:
+        """拒否したリクエストは消費せず、再試行までの秒数は増えない"""
+        # Arrange
+        limiter = RateLimiter(InMemoryRateLimitBackend(clock=FakeClock()), 2, 60, "requests")
+        await limiter.acquire("user")
+        await limiter.acquire("user")
+
+        # Act
+        first = await limiter.acquire("user")
+        second = await limiter.acquire("user")
+
+        # Assert
+        assert first.retry_after_seconds == second.retry_after_seconds == pytest.approx(30.0)
+
+    async def test_cost_consumes_multiple_units(self) -> None:
+        """コスト（行数）の分だけ消費し、残りが足りない場合は必要な分の回復を待つ"""
+        # Arrange
+        limiter = RateLimiter(InMemoryRateLimitBackend(clock=FakeClock()), 1000, 60, "rows")
+
+        # Act
+        first = await limiter.acquire("user", 800)
+        second = await limiter.acquire("user", 300)
+
+        # Assert
+        assert first.allowed
+        assert first.remaining == 200
+        assert not second.allowed
+        assert second.retry_after_seconds == pytest.approx(6.0)
+
+    async def test_cost_above_limit_is_never_allowed(self) -> None:
+        """上限を超えるコストは再試行しても許可されないため、再試行までの秒数を返さない"""
+        limiter = RateLimiter(InMemoryRateLimitBackend(clock=FakeClock()), 1000, 60, "rows")
+
+        decision = await limiter.acquire("user", 1001)
+
+        assert not decision.allowed
+        assert decision.retry_after_seconds is None
+
+    async def test_users_and_limits_are_independent(self) -> None:
+        """ユーザー・制限の名前ごとに別の状態を持つ"""
+        # Arrange
+        backend = InMemoryRateLimitBackend(clock=FakeClock())
+        requests = RateLimiter(backend, 1, 60, "requests")
+        rows = RateLimiter(backend, 1, 60, "rows")
+        await requests.acquire("alice")
+
+        # Act / Assert
+        assert (await requests.acquire("bob")).allowed
+        assert (await rows.acquire("alice")).allowed
+        assert not (await requests.acquire("alice")).allowed
+
+
+class TestInMemoryRateLimitBackend:
+    """InMemoryRateLimitBackendのテスト"""
+
+    async def test_key_count_is_bounded(self) -> None:
+        """キー数が上限を超えると最も古く使われたキーを削除する"""
+        # Arrange
+        backend = InMemoryRateLimitBackend(max_keys=2, clock=FakeClock())
+        limiter = RateLimiter(backend, 1, 60, "requests")
+
+        # Act
+        for user in ("a", "b", "c"):
+            await limiter.acquire(user)
+
+        # Assert
+        assert backend.stats() == {"keys": 2, "max_keys": 2}
+        assert (await limiter.acquire("a")).allowed
+        assert not (await limiter.acquire("c")).allowed
+
+
+class TestRedisRateLimitBackend:
+    """RedisRateLimitBackendのテスト"""
+
+    async def test_runs_script_with_prefixed_key(self) -> None:
+        """接頭辞付きのキーとコスト・許容値を渡してスクリプトを1往復で実行する"""
+        # Arrange
+        client = FakeRedis(FakeClock())
+        limiter = RateLimiter(RedisRateLimitBackend(client), 2, 60, "requests")
+
+        # Act
+        decisions = [await limiter.acquire("user") for _ in range(3)]
+
+        # Assert
+        assert [decision.allowed for decision in decisions] == [True, True, False]
+        assert decisions[1].remaining == 0
+        assert decisions[2].retry_after_seconds == pytest.approx(30.0)
+        assert client.calls[0] == (1, "ratelimit:requests:user", "30.0", "60")
+        assert len(client.calls) == 3
@@ -0,0 +1,306 @@
+"""
+レスポンスキャッシュのユニットテスト
+
+- InMemoryCacheBackend: TTL・LRUによる追い出し・バージョンの保持
+- RedisCacheBackend: redis.asyncio互換クライアントへのコマンド
+- ResponseCache: タグ（ETag）の計算と、登録範囲に限定した無効化
+"""
+from datetime import UTC, datetime, timedelta
+from typing import Any, Optional
+
+import pytest
+from src.domain.entities.measurement import MetricType
+from src.domain.entities.measurement_batch import MeasurementBatch
+from src.infrastructure.cache import (
+    CacheScope,
+    InMemoryCacheBackend,
+    RedisCacheBackend,
+    ResponseCache,
+    touched_days,
+)
+from tests.conftest import FakeClock
+
+DAY = datetime(2024, 5, 20, tzinfo=UTC)
+
+
+class FakeRedisPipeline:
+    """FakeRedisのコマンドをexecuteまでためるパイプライン"""
+
+    def __init__(self, client: "FakeRedis") -> None:
+        self._client = client
+        self._commands: list[tuple[str, Any, dict[str, Any]]] = []
+
+    def set(self, key: str, value: Any, **options: Any) -> "FakeRedisPipeline":
+        self._commands.append((key, value, options))
+        return self
+
+    async def execute(self) -> list[Optional[bool]]:
+        self._client.round_trips += 1
+        return [self._client.apply_set(key, value, **options) for key, value, options in self._commands]
+
+
+class FakeRedis:
+    """redis.asyncioのget/set/mget/pipelineを模したクライアント（値はbytesで返す）"""
+
+    def __init__(self, clock: FakeClock) -> None:
+        self._clock = clock
+        self._data: dict[str, tuple[float, bytes]] = {}
+        self.round_trips = 0
+
+    def apply_set(self, key: str, value: Any, px: int, nx: bool = False) -> Optional[bool]:
+        if nx and self._lookup(key) is not None:
+            return None
+        data = value if isinstance(value, bytes) else str(value).encode()
+        self._data[key] = (self._clock() + px / 1000, data)
+        return True
+
+    def _lookup(self, key: str) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None or self._clock() >= entry[0]:
+            return None
+        return entry[1]
+
+    async def get(self, key: str) -> Optional[bytes]:
+        self.round_trips += 1
+        return self._lookup(key)
+
+    async def set(self, key: str, value: Any, px: int, nx: bool = False) -> Optional[bool]:
+        self.round_trips += 1
+        return self.apply_set(key, value, px=px, nx=nx)
+
+    async def mget(self, keys: list[str]) -> list[Optional[bytes]]:
+        self.round_trips += 1
+        return [self._lookup(key) for key in keys]
+
+    def pipeline(self, transaction: bool = True) -> FakeRedisPipeline:
+        return FakeRedisPipeline(self)
+
+
+def make_batch(user_id: str, rows: list[tuple[str, datetime]]) -> MeasurementBatch:
+    """(メトリックタイプ, 測定日時)の行からバッチを生成する"""
+    return MeasurementBatch.from_columns(
+        user_id=user_id,
+        created_at=datetime.now(UTC),
+        metric_types=[metric_type for metric_type, _ in rows],
+        values=[1.0] * len(rows),
+        units=["bpm"] * len(rows),
+        measured_at=[measured_at for _, measured_at in rows],
+    )
+
+
+class TestInMemoryCacheBackend:
+    """InMemoryCacheBackendのテスト"""
+
+    async def test_entry_expires_after_ttl(self) -> None:
+        """エントリはTTLを過ぎると取得できない"""
+        # Arrange
+        clock = FakeClock()
+        backend = InMemoryCacheBackend(clock=clock)
+        await backend.set("key", b"body", ttl_seconds=10)
+
+        # Act
+        before = await backend.get("key")
+        clock.now += 10
+        after = await backend.get("key")
+
+        # Assert
+        assert before == b"body"
+        assert after is None
+        assert backend.stats()["entries"] == 0
+
+    async def test_evicts_least_recently_used_entry(self) -> None:
+        """最大数を超えると最も古く参照されたエントリを削除する"""
+        # Arrange
+        backend = InMemoryCacheBackend(max_entries=2, clock=FakeClock())
+        await backend.set("a", b"1", ttl_seconds=60)
+        await backend.set("b", b"2", ttl_seconds=60)
+        await backend.get("a")
+
+        # Act
+        await backend.set("c", b"3", ttl_seconds=60)
+
+        # Assert
+        assert await backend.get("a") == b"1"
+        assert await backend.get("b") is None
+        assert await backend.get("c") == b"3"
+
+    async def test_versions_are_not_evicted_by_entries(self) -> None:
+        """バージョンはエントリの最大数による追い出しの対象にならない"""
+        # Arrange
+        backend = InMemoryCacheBackend(max_entries=1, clock=FakeClock())
+        await backend.set_versions(["v1", "v2"], "ver-a", ttl_seconds=60)
+
+        # Act
+        await backend.set("a", b"1", ttl_seconds=60)
+        await backend.set("b", b"2", ttl_seconds=60)
+
+        # Assert
+        assert await backend.get_versions(["v1", "v2", "v3"]) == ["ver-a", "ver-a", None]
+
+    async def test_add_versions_keeps_existing_versions(self) -> None:
+        """add_versionsは存在しない・失効したキーにだけ設定する"""
+        # Arrange
+        clock = FakeClock()
+        backend = InMemoryCacheBackend(clock=clock)
+        await backend.set_versions(["live"], "old", ttl_seconds=60)
+        await backend.set_versions(["expired"], "old", ttl_seconds=1)
+        clock.now += 1
+
+        # Act
+        await backend.add_versions(["live", "expired", "new"], "fresh", ttl_seconds=60)
+
+        # Assert
+        assert await backend.get_versions(["live", "expired", "new"]) == ["old", "fresh", "fresh"]
+
+
+class TestRedisCacheBackend:
+    """RedisCacheBackendのテスト"""
+
+    async def test_round_trips_entries_and_versions(self) -> None:
+        """エントリ・バージョンを保存・取得でき、バージョンは文字列で返る"""
+        # Arrange
+        clock = FakeClock()
+        client = FakeRedis(clock)
+        backend = RedisCacheBackend(client)
+
+        # Act
+        await backend.set("entry", b"body", ttl_seconds=0.5)
+        await backend.set_versions(["v1", "v2"], "ver-a", ttl_seconds=60)
+        await backend.add_versions(["v2", "v3"], "ver-b", ttl_seconds=60)
+        entry = await backend.get("entry")
+        versions = await backend.get_versions(["v1", "v2", "v3", "v4"])
+        clock.now += 0.5
+        expired = await backend.get("entry")
+
+        # Assert
+        assert entry == b"body"
+        assert versions == ["ver-a", "ver-a", "ver-b", None]
+        assert expired is None
+
+    async def test_sets_versions_in_one_round_trip(self) -> None:
+        """複数キーのバージョンはパイプラインで1往復で設定する"""
+        # Arrange
+        client = FakeRedis(FakeClock())
+        backend = RedisCacheBackend(client)
+
+        # Act
+        await backend.set_versions([f"v{i}" for i in range(20)], "ver", ttl_seconds=60)
+        await backend.set_versions([], "ver", ttl_seconds=60)
+
+        # Assert
+        assert client.round_trips == 1
+
+
+class TestTouchedDays:
+    """touched_daysのテスト"""
+
+    def test_returns_distinct_metric_days(self) -> None:
+        """バッチが含む(メトリックタイプ, UTCの日)を重複なく返す"""
+        # Arrange
+        batch = make_batch("user", [
+            ("heart_rate", DAY + timedelta(hours=1)),
+            ("heart_rate", DAY + timedelta(hours=23)),
+            ("heart_rate", DAY + timedelta(days=1)),
+            ("steps", DAY),
+        ])
+        day = (DAY - datetime(1970, 1, 1, tzinfo=UTC)).days
+
+        # Act
+        days = touched_days(batch)
+
+        # Assert
+        assert days == {("heart_rate", day), ("heart_rate", day + 1), ("steps", day)}
+
+
+@pytest.fixture(params=["memory", "redis"])
+def response_cache(request: pytest.FixtureRequest) -> ResponseCache:
+    """各バックエンドのレスポンスキャッシュ"""
+    clock = FakeClock()
+    if request.param == "memory":
+        return ResponseCache(InMemoryCacheBackend(clock=clock), ttl_seconds=60)
+    return ResponseCache(RedisCacheBackend(FakeRedis(clock)), ttl_seconds=60)
+
+
+class TestResponseCache:
+    """ResponseCacheのテスト"""
+
+    async def test_tag_is_stable_until_invalidated(self, response_cache: ResponseCache) -> None:
+        """同じ条件のタグは無効化されるまで変わらず、条件が異なればタグも異なる"""
+        # Arrange
+        scope = CacheScope("user", MetricType.HEART_RATE, DAY, DAY + timedelta(days=1))
+
+        # Act
+        first = await response_cache.tag("summary", scope, {"period": "day"})
+        second = await response_cache.tag("summary", scope, {"period": "day"})
+        other_params = await response_cache.tag("summary", scope, {"period": "week"})
+        other_endpoint = await response_cache.tag("series", scope, {"period": "day"})
+
+        # Assert
+        assert first == second
+        assert len({first, other_params, other_endpoint}) == 3
+
+    async def test_stores_body_by_tag(self, response_cache: ResponseCache) -> None:
+        """保存したボディはタグで取得できる"""
+        # Arrange
+        tag = await response_cache.tag("summary", CacheScope("user"), {})
+
+        # Act
+        missing = await response_cache.get("summary", tag)
+        await response_cache.set("summary", tag, b'{"metrics":[]}')
+        stored = await response_cache.get("summary", tag)
+
+        # Assert
+        assert missing is None
+        assert stored == b'{"metrics":[]}'
+
+    async def test_invalidate_changes_only_overlapping_tags(self, response_cache: ResponseCache) -> None:
+        """登録した(ユーザー, メトリックタイプ, 日)を含む範囲のタグだけが変わる"""
+        # Arrange
+        week = CacheScope("user", MetricType.HEART_RATE, DAY - timedelta(days=6), DAY + timedelta(days=1))
+        scopes = {
+            "same_metric_week": week,
+            "all_metrics_day": CacheScope("user", None, DAY, DAY + timedelta(days=1)),
+            "unbounded": CacheScope("user", MetricType.HEART_RATE),
+            "other_day": CacheScope("user", MetricType.HEART_RATE, DAY + timedelta(days=1), DAY + timedelta(days=2)),
+            "other_metric": CacheScope("user", MetricType.STEPS, DAY, DAY + timedelta(days=1)),
+            "other_user": CacheScope("other", MetricType.HEART_RATE, DAY, DAY + timedelta(days=1)),
+        }
+        before = {name: await response_cache.tag("list", scope, {}) for name, scope in scopes.items()}
+
+        # Act
+        await response_cache.invalidate_batch(make_batch("user", [("heart_rate", DAY + timedelta(hours=12))]))
+        after = {name: await response_cache.tag("list", scope, {}) for name, scope in scopes.items()}
+
+        # Assert
+        changed = {name for name in scopes if before[name] != after[name]}
+        assert changed == {"same_metric_week", "all_metrics_day", "unbounded"}
+
+    async def test_long_range_uses_whole_period_version(self, response_cache: ResponseCache) -> None:
+        """日ごとのバージョンで判定する最大日数を超える範囲は、期間全体のバージョンで無効化される"""
+        # Arrange
+        scope = CacheScope("user", MetricType.HEART_RATE, DAY - timedelta(days=365), DAY)
+        before = await response_cache.tag("series", scope, {})
+
+        # Act
+        await response_cache.invalidate_batch(make_batch("user", [("heart_rate", DAY + timedelta(days=30))]))
+        after = await response_cache.tag("series", scope, {})
+
+        # Assert
+        assert before != after
+
+    async def test_expired_versions_do_not_restore_old_tags(self) -> None:
+        """バージョンが失効しても、以前のタグ（クライアントが保持するETag）には戻らない"""
+        # Arrange
+        clock = FakeClock()
+        cache = ResponseCache(InMemoryCacheBackend(clock=clock), ttl_seconds=60)
+        scope = CacheScope("user", MetricType.HEART_RATE, DAY, DAY + timedelta(days=1))
+        initial = await cache.tag("summary", scope, {})
+        await cache.invalidate_batch(make_batch("user", [("heart_rate", DAY)]))
+        invalidated = await cache.tag("summary", scope, {})
+
+        # Act
+        clock.now += 120
+        expired = await cache.tag("summary", scope, {})
+
+        # Assert
+        assert len({initial, invalidated, expired}) == 3
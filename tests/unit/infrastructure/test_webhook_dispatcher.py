@@ -0,0 +1,205 @@
+"""
+Webhookの送信処理のテスト（ローカルの受信スタブに実際に送る）
+
+- 送信先ごとにイベントをまとめ、配信ごとにIdempotency-Keyを付けて送る
+- 5xx・接続エラーは同じキーで再送し、4xx・再送回数の超過は再送しない
+- ホストごとの同時送信数の上限、接続の再利用
+- 送信前のイベントはキューを開き直しても送る
+"""
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from domain.entities.goal import GoalAchievedEvent
+from infrastructure.webhooks import WEBHOOK_EVENT_TYPE, WebhookDeliveryQueue, WebhookDispatcher
+from tests.webhook_stub import WebhookStubServer
+
+DAY = datetime(2024, 5, 20, tzinfo=UTC)
+
+
+def make_events(count: int, user_id: str = "user") -> list[GoalAchievedEvent]:
+    """日ごとに1件の達成イベント"""
+    return [
+        GoalAchievedEvent(
+            user_id=user_id,
+            goal_id="daily_steps",
+            metric_type="steps",
+            period="day",
+            period_start=DAY + timedelta(days=i),
+            value=10_500.0,
+            target=10_000.0,
+            streak=i + 1,
+            achieved_at=DAY + timedelta(days=i, hours=20),
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def stub():
+    with WebhookStubServer() as server:
+        yield server
+
+
+@pytest.fixture
+def queue(tmp_path):
+    delivery_queue = WebhookDeliveryQueue(str(tmp_path / "webhooks.db"))
+    yield delivery_queue
+    delivery_queue.close()
+
+
+def make_dispatcher(queue, endpoints, **options) -> WebhookDispatcher:
+    """再送までの待ちがないWebhookの送信処理"""
+    options.setdefault("jitter", lambda: 0.0)
+    options.setdefault("timeout_seconds", 5.0)
+    return WebhookDispatcher(queue, endpoints, **options)
+
+
+class TestWebhookDispatcher:
+    """WebhookDispatcherのテスト"""
+
+    async def test_events_are_batched_per_endpoint_with_idempotency_key(self, stub, queue):
+        """送信先ごとに最大件数ずつまとめて送り、Idempotency-Keyはボディのdelivery_idと同じ"""
+        # Arrange
+        endpoints = [stub.url("/a"), stub.url("/b")]
+        dispatcher = make_dispatcher(queue, endpoints, batch_size=100)
+
+        # Act
+        await dispatcher.publish(make_events(250))
+        sent = await dispatcher.run_once()
+        await dispatcher.stop()
+
+        # Assert
+        assert sent == 6
+        for path in ("/a", "/b"):
+            requests = [request for request in stub.requests if request.path == path]
+            assert sorted(len(request.body["events"]) for request in requests) == [50, 100, 100]
+            event_ids = [event["event_id"] for request in requests for event in request.body["events"]]
+            assert len(set(event_ids)) == 250
+        for request in stub.requests:
+            assert request.body["type"] == WEBHOOK_EVENT_TYPE
+            assert request.headers["idempotency-key"] == request.body["delivery_id"]
+        assert await queue.pending_events() == 0
+
+    async def test_server_error_is_retried_with_same_key(self, stub, queue):
+        """5xx・429は同じIdempotency-Keyで再送し、成功したら完了とする"""
+        # Arrange
+        stub.respond_with(503, 429)
+        dispatcher = make_dispatcher(queue, [stub.url()])
+
+        # Act
+        await dispatcher.publish(make_events(3))
+        await dispatcher.run_once()
+        await dispatcher.stop()
+
+        # Assert
+        assert len(stub.requests) == 3
+        assert len({request.headers["idempotency-key"] for request in stub.requests}) == 1
+        assert await queue.pending_events() == 0
+
+    async def test_client_error_is_not_retried(self, stub, queue):
+        """再送しても成功しない4xxは再送せず、再送しないイベントとして残す"""
+        # Arrange
+        stub.respond_with(400)
+        dispatcher = make_dispatcher(queue, [stub.url()])
+
+        # Act
+        await dispatcher.publish(make_events(2))
+        await dispatcher.run_once()
+        await dispatcher.stop()
+
+        # Assert
+        assert len(stub.requests) == 1
+        assert await queue.dead_letters() == 2
+
+    async def test_retries_stop_after_retry_count(self, stub, queue):
+        """retry_count回再送しても失敗した配信は再送しない"""
+        # Arrange
+        stub.respond_with(*[500] * 10)
+        dispatcher = make_dispatcher(queue, [stub.url()], retry_count=2)
+
+        # Act
+        await dispatcher.publish(make_events(1))
+        await dispatcher.run_once()
+        await dispatcher.stop()
+
+        # Assert
+        assert len(stub.requests) == 3
+        assert await queue.dead_letters() == 1
+
+    async def test_connection_error_is_retried_after_backoff(self, queue):
+        """接続できない送信先への配信は、バックオフの後に再送するためキューに残す"""
+        # Arrange
+        with WebhookStubServer() as closed:
+            url = closed.url()
+        dispatcher = make_dispatcher(queue, [url], jitter=lambda: 0.5, backoff_base_seconds=60)
+
+        # Act
+        await dispatcher.publish(make_events(1))
+        sent = await dispatcher.run_once()
+        await dispatcher.stop()
+
+        # Assert
+        assert sent == 1
+        assert await queue.pending_events() == 1
+        assert await queue.claim(url, max_events=10, lease_seconds=1) is None
+
+    async def test_concurrency_is_capped_per_host(self, queue):
+        """ホストごとの同時送信数は上限を超えず、接続は上限の数まで再利用する"""
+        with WebhookStubServer(delay_seconds=0.05) as slow:
+            # Arrange
+            dispatcher = make_dispatcher(queue, [slow.url()], batch_size=1, max_concurrency_per_host=3)
+
+            # Act
+            await dispatcher.publish(make_events(12))
+            await dispatcher.run_once()
+            await dispatcher.stop()
+
+        # Assert
+        assert len(slow.requests) == 12
+        assert slow.max_in_flight == 3
+        assert slow.connections <= 3
+
+    async def test_queued_events_are_sent_after_restart(self, stub, tmp_path):
+        """送信前に停止した場合も、同じキューファイルを開いた送信処理が送る"""
+        # Arrange
+        path = str(tmp_path / "restart.db")
+        first_queue = WebhookDeliveryQueue(path)
+        await make_dispatcher(first_queue, [stub.url()]).publish(make_events(5))
+        first_queue.close()
+
+        # Act
+        second_queue = WebhookDeliveryQueue(path)
+        dispatcher = make_dispatcher(second_queue, [stub.url()])
+        await dispatcher.run_once()
+        await dispatcher.stop()
+        second_queue.close()
+
+        # Assert
+        assert [len(request.body["events"]) for request in stub.requests] == [5]
+
+    async def test_background_dispatch_sends_published_events(self, stub, queue):
+        """バックグラウンドの送信はイベントの追加で起き、間隔を待たずに送る"""
+        # Arrange
+        dispatcher = make_dispatcher(queue, [stub.url()], poll_interval_seconds=60)
+        dispatcher.start()
+
+        # Act
+        await dispatcher.publish(make_events(1))
+        for _ in range(100):
+            if await queue.pending_events() == 0:
+                break
+            await asyncio.sleep(0.01)
+        await dispatcher.stop()
+
+        # Assert
+        assert len(stub.requests) == 1
+
+    def test_backoff_grows_exponentially_up_to_maximum(self, queue):
+        """再送までの秒数の上限は失敗ごとに2倍になり、backoff_max_secondsで頭打ちになる"""
+        dispatcher = make_dispatcher(
+            queue, [], jitter=lambda: 1.0, backoff_base_seconds=1.0, backoff_max_seconds=10.0
+        )
+
+        assert [dispatcher.backoff_seconds(attempt) for attempt in range(1, 6)] == [1, 2, 4, 8, 10]
@@ -0,0 +1,126 @@
+"""Webhook通知の永続キューのユニットテスト"""
+import pytest
+
+from infrastructure.webhooks import WebhookDeliveryQueue
+from tests.conftest import FakeClock
+
+
+def events(*ids: str) -> list[tuple[str, dict]]:
+    """イベントIDと内容の組"""
+    return [(event_id, {"event_id": event_id}) for event_id in ids]
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    """テストごとに独立したSQLiteファイルのキュー"""
+    delivery_queue = WebhookDeliveryQueue(str(tmp_path / "webhooks.db"), clock=clock)
+    yield delivery_queue
+    delivery_queue.close()
+
+
+def event_ids(delivery) -> list[str]:
+    return [payload["event_id"] for payload in delivery.payloads]
+
+
+class TestWebhookDeliveryQueue:
+    """WebhookDeliveryQueueのテスト"""
+
+    async def test_claim_batches_events_per_endpoint(self, queue):
+        """送信先ごとに古い順に最大件数までまとめ、配信ごとに別のキーを採番する"""
+        # Arrange
+        await queue.put("http://a/hook", events("e1", "e2", "e3"))
+        await queue.put("http://b/hook", events("e1"))
+
+        # Act
+        first = await queue.claim("http://a/hook", max_events=2, lease_seconds=60)
+        second = await queue.claim("http://a/hook", max_events=2, lease_seconds=60)
+        third = await queue.claim("http://a/hook", max_events=2, lease_seconds=60)
+        other = await queue.claim("http://b/hook", max_events=2, lease_seconds=60)
+
+        # Assert
+        assert event_ids(first) == ["e1", "e2"]
+        assert event_ids(second) == ["e3"]
+        assert third is None
+        assert event_ids(other) == ["e1"]
+        assert len({first.delivery_key, second.delivery_key, other.delivery_key}) == 3
+
+    async def test_duplicate_event_is_ignored(self, queue):
+        """同じ送信先に追加済みのイベントIDは追加しない"""
+        await queue.put("http://a/hook", events("e1"))
+        await queue.put("http://a/hook", events("e1", "e2"))
+
+        assert await queue.pending_events() == 2
+
+    async def test_retry_redelivers_same_batch_with_same_key(self, queue, clock):
+        """再送は再送時刻になってから、同じイベントの組み合わせ・同じキーで取り出す"""
+        # Arrange
+        await queue.put("http://a/hook", events("e1", "e2"))
+        delivery = await queue.claim("http://a/hook", max_events=10, lease_seconds=60)
+        await queue.retry(delivery.delivery_key, delay_seconds=30)
+        await queue.put("http://a/hook", events("e3"))
+
+        # Act
+        before = await queue.claim("http://a/hook", max_events=10, lease_seconds=60)
+        clock.now += 30
+        retried = await queue.claim("http://a/hook", max_events=10, lease_seconds=60)
+
+        # Assert
+        assert event_ids(before) == ["e3"]
+        assert retried.delivery_key == delivery.delivery_key
+        assert event_ids(retried) == ["e1", "e2"]
+        assert retried.attempts == 1
+
+    async def test_expired_lease_is_claimed_again(self, queue, clock):
+        """完了・再送の記録がないままリース期間を過ぎた配信は同じキーで取り出し直す"""
+        # Arrange
+        await queue.put("http://a/hook", events("e1"))
+        delivery = await queue.claim("http://a/hook", max_events=10, lease_seconds=60)
+
+        # Act
+        leased = await queue.claim("http://a/hook", max_events=10, lease_seconds=60)
+        clock.now += 60
+        reclaimed = await queue.claim("http://a/hook", max_events=10, lease_seconds=60)
+
+        # Assert
+        assert leased is None
+        assert reclaimed.delivery_key == delivery.delivery_key
+        assert reclaimed.attempts == 0
+
+    async def test_complete_and_dead_letter(self, queue, clock):
+        """完了した配信は削除し、再送しない配信は取り出さずに残す"""
+        # Arrange
+        await queue.put("http://a/hook", events("e1"))
+        await queue.put("http://a/hook", events("e2"))
+        delivered = await queue.claim("http://a/hook", max_events=1, lease_seconds=60)
+        failed = await queue.claim("http://a/hook", max_events=1, lease_seconds=60)
+
+        # Act
+        await queue.complete(delivered.delivery_key)
+        await queue.dead_letter(failed.delivery_key)
+        clock.now += 3600
+
+        # Assert
+        assert await queue.claim("http://a/hook", max_events=10, lease_seconds=60) is None
+        assert await queue.pending_events() == 0
+        assert await queue.dead_letters() == 1
+
+    async def test_events_survive_reopen(self, tmp_path, clock):
+        """キューを開き直しても未送信のイベントは残る"""
+        # Arrange
+        path = str(tmp_path / "durable.db")
+        first = WebhookDeliveryQueue(path, clock=clock)
+        await first.put("http://a/hook", events("e1", "e2"))
+        first.close()
+
+        # Act
+        reopened = WebhookDeliveryQueue(path, clock=clock)
+        delivery = await reopened.claim("http://a/hook", max_events=10, lease_seconds=60)
+        reopened.close()
+
+        # Assert
+        assert event_ids(delivery) == ["e1", "e2"]
@@ -0,0 +1,110 @@
+"""Webhookの受信スタブ（ローカルのHTTPサーバー）
+
+別スレッドでHTTP/1.1のサーバーを起動し、受信したリクエストと同時処理数を記録する。
+Webhookの送信処理のテスト・ベンチマークで、実際の接続（キープアライブを含む）に対して送る。
+"""
+import json
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+
+@dataclass(frozen=True)
+class StubRequest:
+    """受信したリクエスト
+
+    Attributes:
+        path: パス
+        headers: ヘッダー（名前は小文字）
+        body: JSONとして解釈したボディ
+        received_at: 受信時刻（time.perf_counter）
+    """
+
+    path: str
+    headers: dict[str, str]
+    body: Any
+    received_at: float
+
+
+class WebhookStubServer:
+    """受信したリクエストを記録し、指定したステータスコードを返すHTTPサーバー"""
+
+    def __init__(self, delay_seconds: float = 0.0, statuses: Iterable[int] = ()) -> None:
+        """
+        Args:
+            delay_seconds: 応答までの秒数
+            statuses: 先頭のリクエストから順に返すステータスコード（以降は200）
+        """
+        self.delay_seconds = delay_seconds
+        self.requests: list[StubRequest] = []
+        self.max_in_flight = 0
+        self.connections = 0
+        self._statuses = deque(statuses)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    def url(self, path: str = "/goal-achieved") -> str:
+        """送信先のURL"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def respond_with(self, *statuses: int) -> None:
+        """次のリクエストから順に返すステータスコードを追加する"""
+        with self._lock:
+            self._statuses.extend(statuses)
+
+    def __enter__(self) -> "WebhookStubServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _receive(self, path: str, headers: dict[str, str], body: bytes) -> int:
+        with self._lock:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            if self.delay_seconds:
+                time.sleep(self.delay_seconds)
+            with self._lock:
+                self.requests.append(StubRequest(path, headers, json.loads(body), time.perf_counter()))
+                return self._statuses.popleft() if self._statuses else 200
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_POST(self) -> None:
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                headers = {name.lower(): value for name, value in self.headers.items()}
+                status = stub._receive(self.path, headers, body)
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler